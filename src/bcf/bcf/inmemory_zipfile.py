@@ -6,6 +6,9 @@ Copyright (c) 2017-2020 Anthon van der Neut, Ruamel bvba
 original idea from https://stackoverflow.com/a/19722365/1307905
 """
 
+import os
+import struct
+import uuid
 import zipfile
 from io import BytesIO
 from os import PathLike
@@ -53,3 +56,83 @@ class InMemoryZipFile:
     def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
         if self._file_name:
             self.write_to_file(self._file_name)
+
+
+class AtomicZipFile:
+    """Writes a zip file next to the destination, which replaces it once closed.
+
+    Unlike InMemoryZipFile, the archive is never held in memory, and members
+    of another zip file may be copied without being parsed. As the
+    destination is only replaced once complete, members may be copied from
+    the very file being overwritten.
+    """
+
+    def __init__(self, file_name: str | Path, compression: int = zipfile.ZIP_DEFLATED) -> None:
+        self._file_name = Path(file_name)
+        self._temp_name = self._file_name.with_name(f"{self._file_name.name}.{uuid.uuid4().hex}.tmp")
+        self.zip_file = zipfile.ZipFile(self._temp_name, "x", compression)
+        self.written: set[str] = set()
+
+    def writestr(self, filename_in_zip: str | zipfile.ZipInfo, file_contents: bytes | str) -> None:
+        """Appends a file with name filename_in_zip and contents of
+        file_contents to the zip."""
+        self.zip_file.writestr(filename_in_zip, file_contents)
+        self.written.add(getattr(filename_in_zip, "filename", filename_in_zip))
+
+    def copy(self, source: zipfile.ZipFile, name: str) -> None:
+        """Copies the unchanged contents of a member of another zip file.
+
+        The compressed data is copied as is, with the original compression
+        type, rather than being decompressed and compressed again.
+        """
+        info = source.getinfo(name)
+        target = zipfile.ZipInfo(name, date_time=info.date_time)
+        target.external_attr = info.external_attr
+        if info.is_dir():
+            self.zip_file.writestr(target, b"")
+            self.written.add(name)
+            return
+        target.compress_type = info.compress_type
+        # The sizes and CRC are stored in the local header instead of a data descriptor.
+        target.flag_bits = info.flag_bits & ~0x08
+        target.CRC = info.CRC
+        target.compress_size = info.compress_size
+        target.file_size = info.file_size
+        zip64 = info.file_size > zipfile.ZIP64_LIMIT or info.compress_size > zipfile.ZIP64_LIMIT
+        with open(source.filename, "rb") as src:
+            src.seek(info.header_offset)
+            header = src.read(zipfile.sizeFileHeader)
+            if header[:4] != zipfile.stringFileHeader:
+                raise zipfile.BadZipFile(f"Bad magic number for file header of {name}")
+            name_length, extra_length = struct.unpack("<HH", header[26:30])
+            src.seek(name_length + extra_length, os.SEEK_CUR)
+            dst = self.zip_file.fp
+            dst.seek(self.zip_file.start_dir)
+            target.header_offset = dst.tell()
+            dst.write(target.FileHeader(zip64))
+            remaining = info.compress_size
+            while remaining > 0:
+                data = src.read(min(remaining, 1 << 20))
+                if not data:
+                    raise EOFError(f"Unexpected end of data of {name}")
+                dst.write(data)
+                remaining -= len(data)
+        self.zip_file.start_dir = dst.tell()
+        self.zip_file.filelist.append(target)
+        self.zip_file.NameToInfo[name] = target
+        self.zip_file._didModify = True
+        self.written.add(name)
+
+    def __enter__(self) -> "AtomicZipFile":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        # Mark the files as having been created on Windows so that
+        # Unix permissions are not inferred as 0000
+        for zfile in self.zip_file.filelist:
+            zfile.create_system = 0
+        self.zip_file.close()
+        if exc_type is None:
+            os.replace(self._temp_name, self._file_name)
+        else:
+            self._temp_name.unlink()
@@ -3,11 +3,12 @@
 import uuid
 import warnings
 import zipfile
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, NoReturn, Optional, TypeVar
 
 import bcf.v3.model as mdl
-from bcf.inmemory_zipfile import InMemoryZipFile, ZipFileInterface
+from bcf.inmemory_zipfile import AtomicZipFile, ZipFileInterface
 from bcf.v3.document import DocumentsHandler
 from bcf.v3.topic import TopicHandler
 from bcf.xml_parser import AbstractXmlParserSerializer, XmlParserSerializer
@@ -16,10 +17,19 @@ T = TypeVar("T")
 
 
 class BcfXml:
-    """BCF XML handler."""
+    """BCF XML handler.
+
+    Topics are indexed from the zip file when first accessed, and each
+    topic's markup is only parsed on demand. To bound memory use for large
+    BCF files, max_parsed_topics limits how many topics keep their parsed
+    markup, discarding the least recently used unchanged ones.
+    """
 
     def __init__(
-        self, filename: Optional[Path] = None, xml_handler: Optional[AbstractXmlParserSerializer] = None
+        self,
+        filename: Optional[Path] = None,
+        xml_handler: Optional[AbstractXmlParserSerializer] = None,
+        max_parsed_topics: Optional[int] = None,
     ) -> None:
         self._filename = filename
         self._xml_handler = xml_handler or XmlParserSerializer()
@@ -28,6 +38,8 @@ class BcfXml:
         self._extensions: Optional[mdl.Extensions] = None
         self._topics: Optional[dict[str, TopicHandler]] = None
         self._documents: Optional[DocumentsHandler] = None
+        self._max_parsed_topics = max_parsed_topics
+        self._parsed_topics: OrderedDict[int, TopicHandler] = OrderedDict()
         self._zip_file = self._load_zip_file()
 
     def __enter__(self) -> "BcfXml":
@@ -42,6 +54,7 @@ class BcfXml:
     def close(self) -> None:
         if self._zip_file:
             self._zip_file.close()
+            self._zip_file = None
 
     def _load_zip_file(self) -> Optional[zipfile.ZipFile]:
         return zipfile.ZipFile(self._filename) if self._filename else None
@@ -99,15 +112,25 @@ class BcfXml:
         topics = {}
         if self._zip_file is None:
             return topics
-        for topic_dir in zipfile.Path(self._zip_file).iterdir():
-            if not topic_dir.is_dir():
-                continue
-            markup_path = topic_dir.joinpath("markup.bcf")
-            if not markup_path.exists():
-                continue
-            topics[topic_dir.name] = TopicHandler(topic_dir, self._xml_handler)
+        # Index topics from the central directory, rather than checking each
+        # topic directory and markup in turn.
+        root = zipfile.Path(self._zip_file)
+        for name in self._zip_file.namelist():
+            topic_dir, _, filename = name.partition("/")
+            if filename == "markup.bcf":
+                topics[topic_dir] = TopicHandler(root.joinpath(topic_dir), self._xml_handler, self._on_topic_access)
         return topics
 
+    def _on_topic_access(self, topic_handler: TopicHandler) -> None:
+        if self._max_parsed_topics is None:
+            return
+        key = id(topic_handler)
+        self._parsed_topics[key] = topic_handler
+        self._parsed_topics.move_to_end(key)
+        while len(self._parsed_topics) > self._max_parsed_topics:
+            # Changed topics are no longer tracked, and are kept until saved.
+            self._parsed_topics.popitem(last=False)[1].unload()
+
     @property
     def documents(self) -> Optional[DocumentsHandler]:
         """Documents stored in the BCF file."""
@@ -116,13 +139,20 @@ class BcfXml:
         return self._documents
 
     @classmethod
-    def load(cls, filename: Path, xml_handler: Optional[AbstractXmlParserSerializer] = None) -> Optional["BcfXml"]:
+    def load(
+        cls,
+        filename: Path,
+        xml_handler: Optional[AbstractXmlParserSerializer] = None,
+        max_parsed_topics: Optional[int] = None,
+    ) -> Optional["BcfXml"]:
         """
         Create a BcfXml object from a file.
 
         Args:
             filename: Path to the file.
             xml_handler: XML parser and serializer.
+            max_parsed_topics: The maximum number of unchanged topics to keep
+                parsed in memory. Unlimited if None.
 
         Returns:
             A BcfXml object with the file contents.
@@ -133,7 +163,7 @@ class BcfXml:
         if not filename:
             raise ValueError("filename is required")
         xml_handler = xml_handler or XmlParserSerializer()
-        return cls(xml_handler=xml_handler, filename=filename)
+        return cls(xml_handler=xml_handler, filename=filename, max_parsed_topics=max_parsed_topics)
 
     @classmethod
     def create_new(
@@ -159,19 +189,37 @@ class BcfXml:
         return instance
 
     def save(self, filename: Optional[Path] = None, keep_open: bool = False) -> None:
-        """Save the BCF file to the given filename."""
+        """Save the BCF file to the given filename.
+
+        Only the parts of topics which changed since they were read from the
+        original BCF file are serialized again. All other files of these
+        topics are copied unchanged from the original BCF file.
+
+        Args:
+            filename: The file to save to, defaults to the file it was loaded from.
+            keep_open: Whether to open the saved file for reading. A BCF which
+                was loaded from a file always reads its topics from the saved
+                file, as topics are read on demand.
+        """
         if not filename and not self._filename:
             raise ValueError("No file name specified, cannot save BCF file.")
         if filename:
             self._filename = filename
-        with InMemoryZipFile(self._filename) as bcf_zip:
+        is_open = self._zip_file is not None
+        with AtomicZipFile(self._filename) as bcf_zip:
             self._save_project(bcf_zip)
             self._save_version(bcf_zip)
             self._save_extensions(bcf_zip)
             self._save_documents(bcf_zip)
             self._save_topics(bcf_zip)
-        if keep_open:
+            # The original file may be about to be replaced.
+            self.close()
+        if is_open or keep_open:
             self._zip_file = self._load_zip_file()
+            root = zipfile.Path(self._zip_file)
+            for topic_handler in (self._topics or {}).values():
+                if topic_handler.topic_dir:
+                    topic_handler.topic_dir = root.joinpath(topic_handler.topic_dir.name)
 
     def _save_project(self, destination_zip: ZipFileInterface) -> None:
         self._smart_save_xml(destination_zip, self._project_info, "project.bcfp")
@@ -198,9 +246,30 @@ class BcfXml:
         if self.documents:
             self.documents.save(bcf_zip)
 
-    def _save_topics(self, destination_zip: ZipFileInterface) -> None:
+    def _save_topics(self, destination_zip: AtomicZipFile) -> None:
+        stored_topic_dirs = set()
         for topic_handler in self.topics.values():
-            topic_handler.save(destination_zip)
+            if topic_handler.is_loaded:
+                topic_handler.save(destination_zip)
+            if isinstance(topic_handler.topic_dir, zipfile.Path):
+                stored_topic_dirs.add(topic_handler.topic_dir.name)
+        if not self._zip_file:
+            return
+        source_topic_dirs = {
+            name.partition("/")[0] for name in self._zip_file.namelist() if name.partition("/")[2] == "markup.bcf"
+        }
+        for name in self._zip_file.namelist():
+            # Directories are implied by their contents, and zipfile.Path adds
+            # them to the namelist.
+            if name.endswith("/") or name in destination_zip.written:
+                continue
+            top_dir, separator, _ = name.partition("/")
+            if top_dir in stored_topic_dirs:
+                destination_zip.copy(self._zip_file, name)
+            elif separator and top_dir not in source_topic_dirs and top_dir != "documents":
+                # Files shared between topics, which may be referenced by
+                # topics which weren't loaded.
+                destination_zip.copy(self._zip_file, name)
 
     def add_topic(
         self, title: str, description: str, author: str, topic_type: str = "", topic_status: str = ""
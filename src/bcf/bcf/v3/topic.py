@@ -1,10 +1,12 @@
 """BCF XML V3 Topic handler."""
 
 import datetime
+import hashlib
+import pickle
 import uuid
 import zipfile
 from pathlib import Path
-from typing import Any, NoReturn, Optional
+from typing import Any, Callable, NoReturn, Optional, Union
 
 import numpy as np
 from ifcopenshell import entity_instance
@@ -17,6 +19,13 @@ from bcf.v3.visinfo import VisualizationInfoHandler
 from bcf.xml_parser import AbstractXmlParserSerializer, XmlParserSerializer
 
 
+def get_digest(value: Any) -> bytes:
+    # Pickling is much faster than serializing to XML, or reading and parsing
+    # the data again. Equal data may occasionally produce a different digest,
+    # which only means that it is considered changed.
+    return hashlib.sha1(pickle.dumps(value, pickle.HIGHEST_PROTOCOL)).digest()
+
+
 class TopicHandler:
     """BCF Topic and related objects handler."""
 
@@ -24,13 +33,19 @@ class TopicHandler:
         self,
         topic_dir: Optional[zipfile.Path] = None,
         xml_handler: Optional[AbstractXmlParserSerializer] = None,
+        on_access: Optional[Callable[["TopicHandler"], None]] = None,
     ) -> None:
         self._markup: Optional[mdl.Markup] = None
+        self._markup_digest: Optional[bytes] = None
         self._viewpoints: Optional[dict[str, VisualizationInfoHandler]] = None
+        self._viewpoint_digests: Optional[dict[str, bytes]] = None
         self._reference_files: Optional[dict[str, bytes]] = None
+        self._stored_reference_files: Optional[dict[str, bytes]] = None
         self._bim_snippet: Optional[bytes] = None
+        self._stored_bim_snippet: Optional[bytes] = None
         self._xml_handler = xml_handler or XmlParserSerializer()
         self._topic_dir = topic_dir
+        self._on_access = on_access
 
     @property
     def markup(self) -> Optional[mdl.Markup]:
@@ -38,11 +53,76 @@ class TopicHandler:
             markup_path = self._topic_dir.joinpath("markup.bcf")
             if markup_path.exists():
                 self._markup = self._xml_handler.parse(markup_path.read_bytes(), mdl.Markup)
-        return self._markup
+                self._markup_digest = self._get_markup_digest()
+        markup = self._markup
+        if markup and self._on_access:
+            self._on_access(self)
+        return markup
 
     @markup.setter
     def markup(self, value: mdl.Markup) -> None:
         self._markup = value
+        self._markup_digest = None
+
+    @property
+    def topic_dir(self) -> Optional[Union[zipfile.Path, Path]]:
+        """Return the directory of the topic in the BCF zip file."""
+        return self._topic_dir
+
+    @topic_dir.setter
+    def topic_dir(self, value: Optional[Union[zipfile.Path, Path]]) -> None:
+        self._topic_dir = value
+        # The loaded data is assumed to match the data stored in the new
+        # location, such as after saving.
+        self._markup_digest = self._get_markup_digest() if self._markup is not None else None
+        self._viewpoint_digests = self._get_viewpoint_digests() if self._viewpoints is not None else None
+        self._stored_reference_files = dict(self._reference_files) if self._reference_files is not None else None
+        self._stored_bim_snippet = self._bim_snippet
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the topic has data in memory, rather than only in a BCF zip file."""
+        return not isinstance(self._topic_dir, zipfile.Path) or any(
+            data is not None for data in (self._markup, self._viewpoints, self._reference_files, self._bim_snippet)
+        )
+
+    def unload(self) -> bool:
+        """
+        Discard the parsed markup if it is unchanged from the BCF zip file.
+
+        The markup is parsed again the next time it is accessed.
+
+        Returns:
+            Whether the topic was unloaded. Topics which are changed, not yet
+            saved, or which have viewpoints, files or snippets loaded, are kept.
+        """
+        if not isinstance(self._topic_dir, zipfile.Path) or self._markup is None:
+            return False
+        if any(data is not None for data in (self._viewpoints, self._reference_files, self._bim_snippet)):
+            return False
+        if self._is_markup_changed():
+            return False
+        self._markup = None
+        self._markup_digest = None
+        return True
+
+    def _get_markup_digest(self) -> bytes:
+        return get_digest(self._markup)
+
+    def _get_viewpoint_digests(self) -> dict[str, bytes]:
+        # Viewpoints are only loaded along with the markup
+        topic = self._markup.topic if self._markup else None
+        viewpoints = topic.viewpoints.view_point if topic and topic.viewpoints else []
+        return {
+            vpt.viewpoint: get_digest((vpt, vh.visualization_info, vh.snapshot, vh.bitmaps))
+            for vpt in viewpoints
+            if (vh := self._viewpoints.get(vpt.viewpoint))
+        }
+
+    def _is_markup_changed(self) -> bool:
+        return self._markup is not None and (
+            self._markup_digest is None or self._get_markup_digest() != self._markup_digest
+        )
 
     @property
     def topic(self) -> mdl.Topic:
@@ -83,7 +163,7 @@ class TopicHandler:
     @property
     def bim_snippet(self) -> Optional[bytes]:
         if not self._bim_snippet and self._topic_dir:
-            self._bim_snippet = self._load_bim_snippet()
+            self._bim_snippet = self._stored_bim_snippet = self._load_bim_snippet()
         return self._bim_snippet
 
     @bim_snippet.setter
@@ -94,6 +174,7 @@ class TopicHandler:
     def viewpoints(self) -> dict[str, "VisualizationInfoHandler"]:
         if self._viewpoints is None:
             self._viewpoints = self._load_viewpoints()
+            self._viewpoint_digests = self._get_viewpoint_digests()
         return self._viewpoints
 
     def _load_viewpoints(self) -> dict[str, "VisualizationInfoHandler"]:
@@ -128,6 +209,7 @@ class TopicHandler:
             for path_part in ref.reference.split("/"):
                 real_path = real_path.parent if path_part == ".." else real_path.joinpath(path_part)
             self._reference_files[ref.reference] = real_path.read_bytes()
+        self._stored_reference_files = dict(self._reference_files)
         return self._reference_files
 
     @classmethod
@@ -174,18 +256,33 @@ class TopicHandler:
         """
         Save the topic to a BCF zip file.
 
+        Topics read from a BCF zip file only write the markup, viewpoints,
+        snippet and reference files which changed since they were read. The
+        unchanged files are to be copied from the original BCF zip file, as
+        done by BcfXml.save.
+
         Args:
             bcf_zip: The BCF zip file to save to.
         """
         topic_dir = self.guid
-        self._save_xml(destination_zip, self._markup, "markup.bcf")
+        is_stored = isinstance(self._topic_dir, zipfile.Path)
+        if not is_stored or self._is_markup_changed():
+            self._save_xml(destination_zip, self._markup, "markup.bcf")
         self._save_viewpoints(destination_zip, topic_dir)
-        self._save_bim_snippet(destination_zip)
-        self._save_reference_files(destination_zip)
+        if not is_stored or self._bim_snippet is not self._stored_bim_snippet:
+            self._save_bim_snippet(destination_zip)
+        if not is_stored or self._reference_files != self._stored_reference_files:
+            self._save_reference_files(destination_zip)
 
     def _save_viewpoints(self, destination_zip: ZipFileInterface, topic_dir: str) -> None:
         if not self.topic.viewpoints or not (viewpoints := self.topic.viewpoints.view_point):
             return
+        if isinstance(self._topic_dir, zipfile.Path):
+            if self._viewpoints is None:
+                return
+            stored_digests = self._viewpoint_digests or {}
+            digests = self._get_viewpoint_digests()
+            viewpoints = [vpt for vpt in viewpoints if digests.get(vpt.viewpoint) != stored_digests.get(vpt.viewpoint)]
         for vpt in viewpoints:
             if vpt.viewpoint:
                 self.viewpoints[vpt.viewpoint].save(destination_zip, topic_dir, vpt)
@@ -0,0 +1,59 @@
+"""Bulk BCF XML writer tests."""
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import pytest
+
+from bcf.v2.bcfxml import BcfXml
+from bcf.v2.bulk import NewTopic, write_topics
+
+
+def build_topics(total: int) -> list[NewTopic]:
+    return [
+        NewTopic(
+            f"Topic {i}",
+            f"Message {i}",
+            "Test author",
+            np.array([float(i), 0.0, 0.0]),
+            guids=(f"guid-a-{i}", f"guid-b-{i}"),
+            topic_type="Test type",
+        )
+        for i in range(total)
+    ]
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_write_topics(xml_handler, processes) -> None:
+    """Written topics are equivalent to those created one at a time."""
+    topics = build_topics(5)
+    with TemporaryDirectory() as tmp_dir:
+        file_path = Path(tmp_dir) / "test.bcf"
+        guids = write_topics(file_path, iter(topics), "Test project", processes=processes, batch_size=2)
+        with BcfXml.load(file_path, xml_handler=xml_handler) as parsed:
+            assert parsed.project.name == "Test project"
+            assert parsed.version.version_id == "2.1"
+            assert list(parsed.topics) == guids
+            for guid, topic in zip(guids, topics):
+                th = parsed.topics[guid]
+                assert th.topic.title == topic.title
+                assert th.topic.description == topic.description
+                assert th.topic.creation_author == topic.author
+                assert th.topic.topic_type == topic.topic_type
+                (viewpoint,) = th.viewpoints.values()
+                assert viewpoint.get_selected_guids() == list(topic.guids)
+                assert viewpoint.snapshot is None
+
+
+def test_write_topics_with_snapshot(xml_handler) -> None:
+    topic = build_topics(1)[0]
+    topic.snapshot = ("snapshot.png", b"image")
+    with TemporaryDirectory() as tmp_dir:
+        file_path = Path(tmp_dir) / "test.bcf"
+        (guid,) = write_topics(file_path, [topic])
+        with BcfXml.load(file_path, xml_handler=xml_handler) as parsed:
+            th = parsed.topics[guid]
+            assert th.markup.viewpoints[0].snapshot == "snapshot.png"
+            (viewpoint,) = th.viewpoints.values()
+            assert viewpoint.snapshot == b"image"
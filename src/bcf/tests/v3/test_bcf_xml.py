@@ -1,6 +1,7 @@
 """BCF XML tests."""
 
 import uuid
+import zipfile
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
@@ -96,6 +97,14 @@ def test_save_keep_open(build_sample) -> None:
         bcf._zip_file.close()
 
 
+def test_save_without_keep_open(build_sample) -> None:
+    bcf, _ = build_sample
+    with TemporaryDirectory() as tmp_dir:
+        file_path = Path(tmp_dir) / "test.bcf"
+        bcf.save(file_path, keep_open=False)
+        assert bcf._zip_file is None
+
+
 def test_massive_bcf(xml_handler) -> None:
     ext = mdl.Extensions(topic_types=mdl.ExtensionsTopicTypes(topic_type=["Test type"]))
     bcf = BcfXml.create_new("Test project", extensions=ext, xml_handler=xml_handler)
@@ -114,6 +123,152 @@ def test_massive_bcf(xml_handler) -> None:
         bcf.save(file_path)
 
 
+@pytest.fixture()
+def build_saved_sample(xml_handler: XmlParserSerializer):
+    bcf = BcfXml.create_new("Test project", xml_handler=xml_handler)
+    for i in range(3):
+        th = bcf.add_topic(f"Topic {i}", f"Message {i}", "Test author", "Test type")
+        vi = mdl.VisualizationInfo(
+            guid=str(uuid.uuid4()),
+            components=build_components(str(uuid.uuid4())),
+            perspective_camera=build_camera_from_vectors([i, 0, 0], [0, 1, 0], [0, 0, 1]),
+        )
+        th.add_visinfo_handler(VisualizationInfoHandler(visualization_info=vi, xml_handler=xml_handler))
+    with TemporaryDirectory() as tmp_dir:
+        file_path = Path(tmp_dir) / "test.bcf"
+        bcf.save(file_path)
+        yield file_path, [th.guid for th in bcf.topics.values()]
+
+
+def test_topics_are_indexed_without_parsing(xml_handler, build_saved_sample) -> None:
+    file_path, guids = build_saved_sample
+    with BcfXml.load(file_path, xml_handler=xml_handler) as parsed:
+        assert list(parsed.topics) == guids
+        assert not any(th.is_loaded for th in parsed.topics.values())
+        assert parsed.topics[guids[0]].topic.title == "Topic 0"
+        assert parsed.topics[guids[0]].is_loaded
+
+
+def test_unloaded_topics_are_copied_on_save(xml_handler, build_saved_sample) -> None:
+    file_path, guids = build_saved_sample
+    with BcfXml.load(file_path, xml_handler=xml_handler) as parsed:
+        parsed.topics[guids[0]].topic.title = "New Topic Title"
+        modified_path = file_path.with_name("edited.bcf")
+        parsed.save(modified_path)
+    with zipfile.ZipFile(file_path) as original, zipfile.ZipFile(modified_path) as modified:
+        assert sorted(original.namelist()) == sorted(modified.namelist())
+        assert original.read(f"{guids[0]}/markup.bcf") != modified.read(f"{guids[0]}/markup.bcf")
+        for name in original.namelist():
+            if not name.startswith(guids[0]):
+                assert original.read(name) == modified.read(name)
+    with BcfXml.load(modified_path, xml_handler=xml_handler) as modified_parsed:
+        assert [th.topic.title for th in modified_parsed.topics.values()] == ["New Topic Title", "Topic 1", "Topic 2"]
+        assert all(len(th.viewpoints) == 1 for th in modified_parsed.topics.values())
+
+
+def test_unloaded_topics_are_readable_after_saving_in_place(xml_handler, build_saved_sample) -> None:
+    file_path, guids = build_saved_sample
+    with BcfXml.load(file_path, xml_handler=xml_handler) as parsed:
+        topics = parsed.topics
+        topics[guids[0]].topic.title = "New Topic Title"
+        parsed.save()
+        assert topics[guids[1]].topic.title == "Topic 1"
+        assert len(topics[guids[2]].viewpoints) == 1
+    with BcfXml.load(file_path, xml_handler=xml_handler) as modified_parsed:
+        assert modified_parsed.topics[guids[0]].topic.title == "New Topic Title"
+
+
+def test_unchanged_loaded_topics_are_copied_on_save(xml_handler, build_saved_sample, monkeypatch) -> None:
+    file_path, guids = build_saved_sample
+    with BcfXml.load(file_path, xml_handler=xml_handler) as parsed:
+        assert all(th.topic and len(th.viewpoints) == 1 for th in parsed.topics.values())
+        serialized_types = []
+        serialize = xml_handler.serialize
+        monkeypatch.setattr(
+            xml_handler, "serialize", lambda obj, *args: serialized_types.append(type(obj)) or serialize(obj, *args)
+        )
+        modified_path = file_path.with_name("edited.bcf")
+        parsed.save(modified_path)
+        assert mdl.Markup not in serialized_types
+        assert mdl.VisualizationInfo not in serialized_types
+    with zipfile.ZipFile(file_path) as original, zipfile.ZipFile(modified_path) as modified:
+        assert sorted(original.namelist()) == sorted(modified.namelist())
+        for name in original.namelist():
+            assert original.read(name) == modified.read(name)
+
+
+def test_unchanged_viewpoints_of_changed_topics_are_copied_on_save(xml_handler, build_saved_sample) -> None:
+    file_path, guids = build_saved_sample
+    with BcfXml.load(file_path, xml_handler=xml_handler) as parsed:
+        topic = parsed.topics[guids[0]]
+        viewpoint = next(iter(topic.viewpoints))
+        topic.topic.title = "New Topic Title"
+        modified_path = file_path.with_name("edited.bcf")
+        parsed.save(modified_path)
+    with zipfile.ZipFile(file_path) as original, zipfile.ZipFile(modified_path) as modified:
+        assert original.read(f"{guids[0]}/markup.bcf") != modified.read(f"{guids[0]}/markup.bcf")
+        assert original.read(f"{guids[0]}/{viewpoint}") == modified.read(f"{guids[0]}/{viewpoint}")
+
+
+def test_copied_files_keep_their_compression(xml_handler, build_saved_sample) -> None:
+    file_path, guids = build_saved_sample
+    with zipfile.ZipFile(file_path) as original, zipfile.ZipFile(file_path.with_name("stored.bcf"), "w") as stored:
+        for info in original.infolist():
+            stored.writestr(info.filename, original.read(info), compress_type=zipfile.ZIP_STORED)
+    with BcfXml.load(file_path.with_name("stored.bcf"), xml_handler=xml_handler) as parsed:
+        parsed.topics[guids[0]].topic.title = "New Topic Title"
+        modified_path = file_path.with_name("edited.bcf")
+        parsed.save(modified_path)
+    with zipfile.ZipFile(file_path.with_name("stored.bcf")) as original, zipfile.ZipFile(modified_path) as modified:
+        assert modified.testzip() is None
+        for info in original.infolist():
+            if info.filename.partition("/")[0] in guids and info.filename != f"{guids[0]}/markup.bcf":
+                copied_info = modified.getinfo(info.filename)
+                assert copied_info.compress_type == zipfile.ZIP_STORED
+                assert copied_info.CRC == info.CRC
+                assert copied_info.compress_size == info.compress_size
+
+
+def test_max_parsed_topics(xml_handler, build_saved_sample) -> None:
+    file_path, guids = build_saved_sample
+    with BcfXml.load(file_path, xml_handler=xml_handler, max_parsed_topics=1) as parsed:
+        topics = [parsed.topics[guid] for guid in guids]
+        topics[0].topic.title = "New Topic Title"
+        assert topics[1].topic.title == "Topic 1"
+        assert topics[2].topic.title == "Topic 2"
+        assert [th.is_loaded for th in topics] == [True, False, True]
+        assert topics[1].topic.title == "Topic 1"
+        assert [th.is_loaded for th in topics] == [True, True, False]
+        parsed.save()
+    with BcfXml.load(file_path, xml_handler=xml_handler) as modified_parsed:
+        assert modified_parsed.topics[guids[0]].topic.title == "New Topic Title"
+
+
+def test_unloading_topics_does_not_parse_markup_again(xml_handler, build_saved_sample, monkeypatch) -> None:
+    file_path, guids = build_saved_sample
+    with BcfXml.load(file_path, xml_handler=xml_handler, max_parsed_topics=1) as parsed:
+        topics = [parsed.topics[guid] for guid in guids]
+        parsed_types = []
+        parse = xml_handler.parse
+        monkeypatch.setattr(xml_handler, "parse", lambda data, clazz: parsed_types.append(clazz) or parse(data, clazz))
+        assert [th.topic.title for th in topics] == ["Topic 0", "Topic 1", "Topic 2"]
+        assert [th.is_loaded for th in topics] == [False, False, True]
+        assert parsed_types.count(mdl.Markup) == 3
+
+
+def test_changed_topics_are_not_unloaded(xml_handler, build_saved_sample) -> None:
+    file_path, guids = build_saved_sample
+    with BcfXml.load(file_path, xml_handler=xml_handler) as parsed:
+        topic = parsed.topics[guids[0]]
+        topic.topic.title = "New Topic Title"
+        assert not topic.unload()
+        topic.topic.title = "Topic 0"
+        assert topic.unload()
+        assert not topic.is_loaded
+        topic.markup = topic.markup
+        assert not topic.unload()
+
+
 def test_equality_with_wrong_object(build_sample) -> None:
     assert build_sample[0] != "Wrong object"
 
@@ -19,6 +19,7 @@
 from __future__ import annotations
 import bpy
 import time
+import os
 import json
 import logging
 import mathutils
@@ -35,6 +36,7 @@ import ifcopenshell.util.shape
 import bonsai.tool as tool
 from itertools import chain, accumulate
 from bonsai.bim.ifc import IfcStore, IFC_CONNECTED_TYPE
+from bonsai.bim.mesh_cache import MeshCache, ShapeKeys
 from bonsai.tool.loader import OBJECT_DATA_TYPE
 from typing import Dict, Union, Optional, Any
 
@@ -198,6 +200,8 @@ class IfcImporter:
         self.type_products = {}
         self.meshes: dict[str, OBJECT_DATA_TYPE] = {}
         self.mesh_shapes = {}
+        self.mesh_cache: Optional[MeshCache] = None
+        self.shape_keys: Optional[ShapeKeys] = None
         self.time = 0
         self.unit_scale = 1
         # ifc definition ids to blender elements mapping
@@ -241,6 +245,8 @@ class IfcImporter:
         self.profile_code("Process element filter")
         self.create_styles()
         self.profile_code("Create styles")
+        self.load_mesh_cache()
+        self.profile_code("Load mesh cache")
         self.parse_native_elements()
         self.profile_code("Parsing native elements")
         self.create_native_elements()
@@ -257,6 +263,9 @@ class IfcImporter:
         self.profile_code("Create structural items")
         self.create_element_types()
         self.profile_code("Create element types")
+        if self.mesh_cache:
+            self.mesh_cache.prune()
+            self.mesh_cache.close()
         self.place_objects_in_collections()
         self.profile_code("Place objects in collections")
         self.add_project_to_scene()
@@ -715,6 +724,15 @@ class IfcImporter:
         results = set()
         if not products:
             return results
+        keys = {}
+        if self.mesh_cache:
+            keys = self.shape_keys.get_keys(products, settings, self.ifc_import_settings.geometry_library)
+            for product, shape in self.mesh_cache.get_shapes(keys).items():
+                self.create_product(product, shape)
+                results.add(product)
+            # An empty include would process all elements
+            if not (products := products - results):
+                return results
         if tool.Loader.settings.should_use_cpu_multiprocessing:
             iterator = ifcopenshell.geom.iterator(
                 settings,
@@ -757,8 +775,12 @@ class IfcImporter:
                 product = self.file.by_id(shape.id)
                 self.create_product(product, shape)
                 results.add(product)
+                if key := keys.get(product):
+                    self.mesh_cache.add_shape(key, shape)
             if not iterator.next():
                 break
+        if self.mesh_cache:
+            self.mesh_cache.commit()
         print("Done creating geometry")
         return results
 
@@ -1241,6 +1263,17 @@ class IfcImporter:
         else:
             blender_material.BIMStyleProperties.active_style_type = "Shading"
 
+    def load_mesh_cache(self) -> None:
+        """Open the mesh cache, so unchanged shapes are not processed again when reloading a model."""
+        if not self.ifc_import_settings.should_cache_meshes or not self.ifc_import_settings.should_load_geometry:
+            return
+        if isinstance(self.file, ifcopenshell.sqlite):
+            return
+        cache_dir = os.path.join(bpy.context.scene.BIMProperties.data_dir, "cache")
+        os.makedirs(cache_dir, exist_ok=True)
+        self.mesh_cache = MeshCache(os.path.join(cache_dir, "meshes.sqlite"))
+        self.shape_keys = ShapeKeys(self.file)
+
     def place_objects_in_collections(self) -> None:
         for ifc_definition_id, obj in self.added_data.items():
             if isinstance(obj, bpy.types.Object):
@@ -1343,28 +1376,26 @@ class IfcImporter:
 
             mesh = bpy.data.meshes.new(tool.Loader.get_mesh_name_from_shape(geometry))
 
-            if geometry.verts and tool.Loader.is_point_far_away(
-                (geometry.verts[0], geometry.verts[1], geometry.verts[2]), is_meters=True
-            ):
+            # Buffers are read directly, as converting them to Python lists is slow for large meshes
+            verts = np.frombuffer(geometry.verts_buffer, dtype="d")
+            if len(verts) and tool.Loader.is_point_far_away(verts[0:3], is_meters=True):
                 # Shift geometry close to the origin based off that first vert it found
-                verts_array = np.array(geometry.verts)
-                offset = np.array([-geometry.verts[0], -geometry.verts[1], -geometry.verts[2]])
-                offset_verts = verts_array + np.tile(offset, len(verts_array) // 3)
-                verts = offset_verts.tolist()
+                offset = verts[0:3].tolist()
+                verts = verts - np.tile(verts[0:3], len(verts) // 3)
 
                 mesh["has_cartesian_point_offset"] = True
-                mesh["cartesian_point_offset"] = f"{geometry.verts[0]},{geometry.verts[1]},{geometry.verts[2]}"
+                mesh["cartesian_point_offset"] = f"{offset[0]},{offset[1]},{offset[2]}"
             else:
-                verts = geometry.verts
                 mesh["has_cartesian_point_offset"] = False
 
-            if geometry.faces:
+            faces = np.frombuffer(geometry.faces_buffer, dtype="i")
+            if len(faces):
                 num_vertices = len(verts) // 3
-                total_faces = len(geometry.faces)
-                loop_start = range(0, total_faces, 3)
+                total_faces = len(faces)
+                loop_start = np.arange(0, total_faces, 3, dtype="i")
                 num_loops = total_faces // 3
-                loop_total = [3] * num_loops
-                num_vertex_indices = len(geometry.faces)
+                loop_total = np.full(num_loops, 3, dtype="i")
+                num_vertex_indices = len(faces)
 
                 # See bug 3546
                 # ios_edges holds true edges that aren't triangulated.
@@ -1374,17 +1405,17 @@ class IfcImporter:
                 mesh["ios_item_ids"] = ifcopenshell.util.shape.get_representation_item_ids(geometry).tolist()
 
                 mesh.vertices.add(num_vertices)
-                mesh.vertices.foreach_set("co", verts)
+                mesh.vertices.foreach_set("co", verts.astype("f"))
                 mesh.loops.add(num_vertex_indices)
-                mesh.loops.foreach_set("vertex_index", geometry.faces)
+                mesh.loops.foreach_set("vertex_index", faces)
                 mesh.polygons.add(num_loops)
                 mesh.polygons.foreach_set("loop_start", loop_start)
                 mesh.polygons.foreach_set("loop_total", loop_total)
                 mesh.polygons.foreach_set("use_smooth", [0] * total_faces)
                 mesh.update()
             else:
-                e = geometry.edges
-                v = verts
+                e = np.frombuffer(geometry.edges_buffer, dtype="i").tolist()
+                v = verts.tolist()
                 vertices = [[v[i], v[i + 1], v[i + 2]] for i in range(0, len(v), 3)]
                 edges = [[e[i], e[i + 1]] for i in range(0, len(e), 2)]
                 mesh.from_pydata(vertices, edges, [])
@@ -1477,6 +1508,7 @@ class IfcImportSettings:
         self.should_use_native_meshes = False
         self.should_clean_mesh = False
         self.should_cache = True
+        self.should_cache_meshes = False
         self.deflection_tolerance = 0.001
         self.angular_tolerance = 0.5
         self.void_limit = 30
@@ -1513,6 +1545,7 @@ class IfcImportSettings:
         settings.should_use_native_meshes = props.should_use_native_meshes
         settings.should_clean_mesh = props.should_clean_mesh
         settings.should_cache = props.should_cache
+        settings.should_cache_meshes = props.should_cache_meshes
         settings.deflection_tolerance = props.deflection_tolerance
         settings.angular_tolerance = props.angular_tolerance
         settings.void_limit = props.void_limit
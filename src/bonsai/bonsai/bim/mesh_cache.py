@@ -0,0 +1,400 @@
+# Bonsai - OpenBIM Blender Add-on
+# Copyright (C) 2020, 2021, 2022 Dion Moult <dion@thinkmoult.com>
+#
+# This file is part of Bonsai.
+#
+# Bonsai is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Bonsai is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Bonsai.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import annotations
+import hashlib
+import sqlite3
+import time
+import numpy as np
+import ifcopenshell
+import ifcopenshell.geom
+import ifcopenshell.util.element
+import ifcopenshell.util.unit
+from typing import Any, Iterable, NamedTuple, Optional
+
+
+class CachedMaterial(NamedTuple):
+    id: int
+
+    def instance_id(self) -> int:
+        return self.id
+
+
+class CachedGeometry:
+    """Tessellated geometry loaded from the mesh cache
+
+    It has the same buffers as the triangulation of a shape processed by the
+    geometry iterator, so it can be loaded the same way.
+    """
+
+    def __init__(
+        self,
+        id: str,
+        verts_buffer: bytes,
+        faces_buffer: bytes,
+        edges_buffer: bytes,
+        item_ids_buffer: bytes,
+        material_ids_buffer: bytes,
+        materials_buffer: bytes,
+    ):
+        self.id = id
+        self.verts_buffer = verts_buffer
+        self.faces_buffer = faces_buffer
+        self.edges_buffer = edges_buffer
+        self.item_ids_buffer = item_ids_buffer
+        self.material_ids_buffer = material_ids_buffer
+        self.materials = [CachedMaterial(i) for i in np.frombuffer(materials_buffer, dtype="i").tolist()]
+
+    @property
+    def verts(self) -> np.ndarray:
+        return np.frombuffer(self.verts_buffer, dtype="d")
+
+    @property
+    def faces(self) -> np.ndarray:
+        return np.frombuffer(self.faces_buffer, dtype="i")
+
+    @property
+    def edges(self) -> np.ndarray:
+        return np.frombuffer(self.edges_buffer, dtype="i")
+
+    @property
+    def material_ids(self) -> list[int]:
+        return np.frombuffer(self.material_ids_buffer, dtype="i").tolist()
+
+
+class CachedTransformation(NamedTuple):
+    matrix: tuple[float, ...]
+
+
+class CachedShape(NamedTuple):
+    id: int
+    geometry: CachedGeometry
+    transformation: CachedTransformation
+
+
+class MeshCache:
+    """Stores the shapes of elements processed by the geometry iterator
+
+    Shapes are stored by a key calculated by :class:`ShapeKeys`, so that a
+    shape is only reused if nothing it depends on has changed. Shapes of
+    elements sharing the same geometry, such as occurrences of a type, share
+    a single copy of its tessellation.
+
+    The cache is shared by all models, so it is kept to a maximum size by
+    :meth:`prune`, which discards the least recently used shapes first.
+    """
+
+    chunk_size = 500
+    schema_version = 2
+    # Shapes are discarded when unused for this long (in seconds), or when
+    # the tessellations exceed this size (in bytes).
+    max_age = 90 * 24 * 60 * 60
+    max_size = 1 << 30
+
+    def __init__(self, database: str):
+        self.connection = sqlite3.connect(database)
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] != self.schema_version:
+            # It's only a cache, so older versions are simply discarded
+            self.connection.executescript(f"""
+                DROP TABLE IF EXISTS geometries;
+                DROP TABLE IF EXISTS shapes;
+                PRAGMA user_version = {self.schema_version};
+                """)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS geometries (
+                key TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                last_used INTEGER NOT NULL,
+                verts BLOB NOT NULL,
+                faces BLOB NOT NULL,
+                edges BLOB NOT NULL,
+                item_ids BLOB NOT NULL,
+                material_ids BLOB NOT NULL,
+                materials BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS geometries_last_used ON geometries (last_used);
+            CREATE TABLE IF NOT EXISTS shapes (
+                key TEXT PRIMARY KEY,
+                last_used INTEGER NOT NULL,
+                geometry_key TEXT NOT NULL,
+                geometry_id TEXT NOT NULL,
+                matrix BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS shapes_geometry_key ON shapes (geometry_key);
+            """)
+        # Geometry IDs are only unique for a single run of the iterator
+        self.geometry_keys: dict[str, str] = {}
+        self.now = int(time.time())
+
+    def __enter__(self) -> MeshCache:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def get_shapes(
+        self, keys: dict[ifcopenshell.entity_instance, str]
+    ) -> dict[ifcopenshell.entity_instance, CachedShape]:
+        """Loads the cached shapes of elements
+
+        :param keys: The shape key of each element.
+        :return: The shape of each element found in the cache.
+        """
+        rows = {}
+        for chunk in self.get_chunks(list(set(keys.values()))):
+            query = "SELECT key, geometry_key, geometry_id, matrix FROM shapes WHERE key IN ({})"
+            for key, geometry_key, geometry_id, matrix in self.connection.execute(
+                query.format(",".join("?" * len(chunk))), chunk
+            ):
+                rows[key] = (geometry_key, geometry_id, matrix)
+            query = "UPDATE shapes SET last_used = ? WHERE key IN ({})"
+            self.connection.execute(query.format(",".join("?" * len(chunk))), (self.now, *chunk))
+
+        buffers = {}
+        for chunk in self.get_chunks(list({row[0] for row in rows.values()})):
+            query = (
+                "SELECT key, verts, faces, edges, item_ids, material_ids, materials FROM geometries WHERE key IN ({})"
+            )
+            for key, *geometry_buffers in self.connection.execute(query.format(",".join("?" * len(chunk))), chunk):
+                buffers[key] = geometry_buffers
+            query = "UPDATE geometries SET last_used = ? WHERE key IN ({})"
+            self.connection.execute(query.format(",".join("?" * len(chunk))), (self.now, *chunk))
+
+        results = {}
+        geometries: dict[tuple[str, str], CachedGeometry] = {}
+        for element, key in keys.items():
+            if not (row := rows.get(key)) or (geometry_buffers := buffers.get(row[0])) is None:
+                continue
+            if (geometry := geometries.get(row[:2])) is None:
+                geometry = geometries[row[:2]] = CachedGeometry(row[1], *geometry_buffers)
+            matrix = CachedTransformation(tuple(np.frombuffer(row[2], dtype="d").tolist()))
+            results[element] = CachedShape(element.id(), geometry, matrix)
+        return results
+
+    def add_shape(self, key: str, shape: ifcopenshell.geom.ShapeElementType) -> None:
+        """Stores the shape of an element
+
+        Changes are only saved once :meth:`commit` is called.
+
+        :param key: The shape key of the element.
+        :param shape: The shape processed by the geometry iterator.
+        """
+        geometry = shape.geometry
+        if (geometry_key := self.geometry_keys.get(geometry.id)) is None:
+            geometry_key = self.geometry_keys[geometry.id] = key
+            geometry_buffers = (
+                geometry.verts_buffer,
+                geometry.faces_buffer,
+                geometry.edges_buffer,
+                geometry.item_ids_buffer,
+                geometry.material_ids_buffer,
+                np.array([m.instance_id() for m in geometry.materials], dtype="i").tobytes(),
+            )
+            self.connection.execute(
+                "INSERT INTO geometries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (key) DO UPDATE SET last_used = excluded.last_used",
+                (geometry_key, sum(len(b) for b in geometry_buffers), self.now, *geometry_buffers),
+            )
+        matrix = np.array(shape.transformation.matrix, dtype="d")
+        self.connection.execute(
+            "INSERT OR REPLACE INTO shapes VALUES (?, ?, ?, ?, ?)",
+            (key, self.now, geometry_key, geometry.id, matrix.tobytes()),
+        )
+
+    def commit(self) -> None:
+        self.connection.commit()
+        self.geometry_keys = {}
+
+    def prune(self, max_size: Optional[int] = None, max_age: Optional[int] = None) -> None:
+        """Discards the least recently used shapes
+
+        Shapes which haven't been loaded or stored for longer than the maximum
+        age are discarded. Then, if the tessellations still exceed the maximum
+        size, those least recently used are discarded along with their shapes.
+
+        :param max_size: The maximum total size in bytes of the tessellations,
+            defaulting to :attr:`max_size`.
+        :param max_age: The maximum time in seconds since a shape was last
+            used, defaulting to :attr:`max_age`.
+        """
+        max_size = self.max_size if max_size is None else max_size
+        max_age = self.max_age if max_age is None else max_age
+        with self.connection:
+            self.connection.execute("DELETE FROM shapes WHERE last_used < ?", (self.now - max_age,))
+            self.connection.execute(
+                "DELETE FROM geometries WHERE last_used < ? OR key NOT IN (SELECT geometry_key FROM shapes)",
+                (self.now - max_age,),
+            )
+            total_size = 0
+            discarded = []
+            for key, size in self.connection.execute("SELECT key, size FROM geometries ORDER BY last_used DESC"):
+                total_size += size
+                if total_size > max_size:
+                    discarded.append(key)
+            for chunk in self.get_chunks(discarded):
+                placeholders = ",".join("?" * len(chunk))
+                self.connection.execute(f"DELETE FROM geometries WHERE key IN ({placeholders})", chunk)
+                self.connection.execute(f"DELETE FROM shapes WHERE geometry_key IN ({placeholders})", chunk)
+
+    def get_chunks(self, keys: list[str]) -> Iterable[list[str]]:
+        for i in range(0, len(keys), self.chunk_size):
+            yield keys[i : i + self.chunk_size]
+
+
+class ShapeKeys:
+    """Calculates the keys of element shapes in the mesh cache
+
+    The key of a shape hashes everything its tessellation depends on: the
+    geometry settings, the project units, the representation of the element including any
+    mapped representations and styles, its material, its openings, and its
+    placement. Entity IDs are hashed too, as shapes refer to representation
+    items, styles, and materials by ID. Therefore, a key only changes when
+    an element or something it references is edited, regardless of the rest
+    of the file.
+    """
+
+    def __init__(self, file: ifcopenshell.file):
+        self.file = file
+        self.hashes: dict[int, bytes] = {}
+        self.element_hashes: dict[int, Optional[bytes]] = {}
+
+    def get_keys(
+        self,
+        elements: Iterable[ifcopenshell.entity_instance],
+        settings: ifcopenshell.geom.main.settings,
+        geometry_library: str,
+    ) -> dict[ifcopenshell.entity_instance, str]:
+        """Gets the shape keys of elements
+
+        :param elements: The elements to process.
+        :param settings: The geometry settings used to process the elements.
+        :param geometry_library: The geometry library used to process the elements.
+        :return: The key of each element that has a representation.
+        """
+        # Shapes are converted from the project units to SI units.
+        unit_scales = tuple(
+            ifcopenshell.util.unit.calculate_unit_scale(self.file, unit_type)
+            for unit_type in ("LENGTHUNIT", "PLANEANGLEUNIT")
+        )
+        settings_key = f"{ifcopenshell.version_core}|{geometry_library}|{settings!r}|{unit_scales!r}".encode()
+        results = {}
+        for element in elements:
+            element_hash = self.element_hashes.get(element.id(), ...)
+            if element_hash is ...:
+                element_hash = self.element_hashes[element.id()] = self.get_element_hash(element)
+            if element_hash is not None:
+                results[element] = hashlib.md5(settings_key + element_hash).hexdigest()
+        return results
+
+    def get_element_hash(self, element: ifcopenshell.entity_instance) -> Optional[bytes]:
+        if not (representation := getattr(element, "Representation", None)):
+            return None
+        # Other attributes of elements, such as their names, don't affect their shapes
+        result = hashlib.md5(repr((element.id(), element.is_a())).encode())
+        result.update(self.get_product_representation_hash(representation))
+        if material := ifcopenshell.util.element.get_material(element):
+            result.update(self.get_material_hash(material))
+        if placement := element.ObjectPlacement:
+            result.update(self.get_traversal_hash(placement))
+        for rel in getattr(element, "HasOpenings", None) or []:
+            opening = rel.RelatedOpeningElement
+            result.update(repr((rel.id(), opening.id(), opening.is_a())).encode())
+            if opening.Representation:
+                result.update(self.get_product_representation_hash(opening.Representation))
+            if opening.ObjectPlacement:
+                result.update(self.get_traversal_hash(opening.ObjectPlacement))
+        return result.digest()
+
+    def get_product_representation_hash(self, representation: ifcopenshell.entity_instance) -> bytes:
+        result = hashlib.md5(self.serialise(representation))
+        for shape_representation in representation.Representations:
+            result.update(self.get_representation_hash(shape_representation))
+        return result.digest()
+
+    def get_representation_hash(self, representation: ifcopenshell.entity_instance) -> bytes:
+        result = hashlib.md5(self.serialise(representation))
+        result.update(self.get_traversal_hash(representation.ContextOfItems))
+        for item in representation.Items:
+            if item.is_a("IfcMappedItem"):
+                result.update(self.serialise(item))
+                result.update(self.get_traversal_hash(item.MappingTarget))
+                result.update(self.get_representation_map_hash(item.MappingSource))
+            else:
+                result.update(self.get_traversal_hash(item))
+            for styled_item in self.get_styled_items(item):
+                result.update(self.get_traversal_hash(styled_item))
+        return result.digest()
+
+    def get_representation_map_hash(self, representation_map: ifcopenshell.entity_instance) -> bytes:
+        if (result := self.hashes.get(representation_map.id())) is None:
+            digest = hashlib.md5(self.serialise(representation_map))
+            digest.update(self.get_traversal_hash(representation_map.MappingOrigin))
+            digest.update(self.get_representation_hash(representation_map.MappedRepresentation))
+            result = self.hashes[representation_map.id()] = digest.digest()
+        return result
+
+    def get_material_hash(self, material: ifcopenshell.entity_instance) -> bytes:
+        if (result := self.hashes.get(material.id())) is None:
+            digest = hashlib.md5()
+            for entity in self.file.traverse(material):
+                digest.update(self.serialise(entity))
+                # Material styles are used when items have no styles of their own
+                for definition in getattr(entity, "HasRepresentation", None) or []:
+                    digest.update(self.get_traversal_hash(definition))
+            result = self.hashes[material.id()] = digest.digest()
+        return result
+
+    def get_traversal_hash(self, entity: ifcopenshell.entity_instance) -> bytes:
+        if (result := self.hashes.get(entity.id())) is None:
+            digest = hashlib.md5()
+            for subentity in self.file.traverse(entity):
+                digest.update(self.serialise(subentity))
+            result = self.hashes[entity.id()] = digest.digest()
+        return result
+
+    def get_styled_items(self, item: ifcopenshell.entity_instance) -> Iterable[ifcopenshell.entity_instance]:
+        # The first operand of a boolean result is what gets styled
+        while item:
+            yield from getattr(item, "StyledByItem", None) or []
+            item = item.FirstOperand if item.is_a("IfcBooleanResult") else None
+
+    def serialise(self, entity: ifcopenshell.entity_instance) -> bytes:
+        # Stringifying an entity is much slower than reading its attributes
+        return repr((entity.id(), entity.is_a(), tuple(self.serialise_value(v) for v in entity))).encode()
+
+    def serialise_value(self, value: Any) -> Any:
+        if isinstance(value, ifcopenshell.entity_instance):
+            return value.id() or (value.is_a(), self.serialise_value(value.wrappedValue))
+        elif isinstance(value, tuple) and value:
+            if (
+                isinstance(value[0], tuple)
+                and value[0]
+                and not isinstance(value[0][0], (ifcopenshell.entity_instance, tuple))
+            ):
+                # Large coordinate and index lists are hashed as arrays
+                try:
+                    array = np.array(value)
+                    return (array.dtype.str, array.shape, hashlib.md5(array.tobytes()).digest())
+                except ValueError:
+                    pass
+            if isinstance(value[0], (ifcopenshell.entity_instance, tuple)):
+                return tuple(self.serialise_value(v) for v in value)
+        return value
@@ -159,6 +159,7 @@ class BIMProjectProperties(PropertyGroup):
     should_use_native_meshes: BoolProperty(name="Native Meshes", default=False)
     should_clean_mesh: BoolProperty(name="Clean Meshes", default=False)
     should_cache: BoolProperty(name="Cache", default=False)
+    should_cache_meshes: BoolProperty(name="Cache Meshes", default=False)
     deflection_tolerance: FloatProperty(name="Deflection Tolerance", default=0.001)
     angular_tolerance: FloatProperty(name="Angular Tolerance", default=0.5)
     void_limit: IntProperty(name="Void Limit", default=30)
@@ -169,6 +169,8 @@ class BIM_PT_project(Panel):
         row = self.layout.row()
         row.prop(pprops, "should_cache")
         row = self.layout.row()
+        row.prop(pprops, "should_cache_meshes")
+        row = self.layout.row()
         row.prop(pprops, "should_load_geometry")
         row = self.layout.row()
         row.prop(pprops, "should_use_native_meshes")
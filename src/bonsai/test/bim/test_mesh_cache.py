@@ -0,0 +1,198 @@
+# Bonsai - OpenBIM Blender Add-on
+# Copyright (C) 2026 Dion Moult <dion@thinkmoult.com>
+#
+# This file is part of Bonsai.
+#
+# Bonsai is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Bonsai is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Bonsai.  If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+import pytest
+import ifcopenshell
+import ifcopenshell.api.context
+import ifcopenshell.api.geometry
+import ifcopenshell.api.root
+import ifcopenshell.api.unit
+import ifcopenshell.geom
+import ifcopenshell.util.unit
+from bonsai.bim.mesh_cache import MeshCache, ShapeKeys
+
+
+@pytest.fixture
+def ifc_file():
+    ifc_file = ifcopenshell.file()
+    ifcopenshell.api.root.create_entity(ifc_file, ifc_class="IfcProject")
+    ifcopenshell.api.unit.assign_unit(ifc_file)
+    model = ifcopenshell.api.context.add_context(ifc_file, context_type="Model")
+    body = ifcopenshell.api.context.add_context(
+        ifc_file, context_type="Model", context_identifier="Body", target_view="MODEL_VIEW", parent=model
+    )
+    for i in range(2):
+        wall = ifcopenshell.api.root.create_entity(ifc_file, ifc_class="IfcWall")
+        ifcopenshell.api.geometry.edit_object_placement(ifc_file, product=wall, matrix=get_matrix(i))
+        representation = ifcopenshell.api.geometry.add_wall_representation(
+            ifc_file, context=body, length=5, height=3, thickness=0.2
+        )
+        ifcopenshell.api.geometry.assign_representation(ifc_file, product=wall, representation=representation)
+    return ifc_file
+
+
+@pytest.fixture
+def settings():
+    return ifcopenshell.geom.settings()
+
+
+def get_matrix(x):
+    matrix = np.eye(4)
+    matrix[0][3] = x
+    return matrix
+
+
+def get_keys(ifc_file, settings):
+    return ShapeKeys(ifc_file).get_keys(ifc_file.by_type("IfcWall"), settings, "opencascade")
+
+
+def add_shapes(mesh_cache, ifc_file, settings, keys):
+    shapes = {}
+    iterator = ifcopenshell.geom.iterator(settings, ifc_file, include=list(keys))
+    assert iterator.initialize()
+    while True:
+        shape = iterator.get()
+        element = ifc_file.by_id(shape.id)
+        mesh_cache.add_shape(keys[element], shape)
+        shapes[element] = (
+            np.array(shape.geometry.verts),
+            np.array(shape.geometry.faces),
+            tuple(shape.transformation.matrix),
+        )
+        if not iterator.next():
+            break
+    mesh_cache.commit()
+    return shapes
+
+
+class TestMeshCache:
+    def test_storing_and_loading_shapes(self, tmp_path, ifc_file, settings):
+        keys = get_keys(ifc_file, settings)
+        with MeshCache(str(tmp_path / "meshes.sqlite")) as mesh_cache:
+            shapes = add_shapes(mesh_cache, ifc_file, settings, keys)
+        with MeshCache(str(tmp_path / "meshes.sqlite")) as mesh_cache:
+            results = mesh_cache.get_shapes(keys)
+        assert set(results) == set(ifc_file.by_type("IfcWall"))
+        for element, shape in results.items():
+            verts, faces, matrix = shapes[element]
+            assert shape.id == element.id()
+            assert np.array_equal(shape.geometry.verts, verts)
+            assert np.array_equal(shape.geometry.faces, faces)
+            assert shape.transformation.matrix == matrix
+
+    def test_loading_shapes_which_are_not_cached(self, tmp_path, ifc_file, settings):
+        with MeshCache(str(tmp_path / "meshes.sqlite")) as mesh_cache:
+            assert mesh_cache.get_shapes(get_keys(ifc_file, settings)) == {}
+
+    def test_pruning_shapes_exceeding_the_maximum_size(self, tmp_path, ifc_file, settings):
+        keys = get_keys(ifc_file, settings)
+        wall1, wall2 = ifc_file.by_type("IfcWall")
+        with MeshCache(str(tmp_path / "meshes.sqlite")) as mesh_cache:
+            add_shapes(mesh_cache, ifc_file, settings, {wall1: keys[wall1]})
+        with MeshCache(str(tmp_path / "meshes.sqlite")) as mesh_cache:
+            mesh_cache.now += 1
+            add_shapes(mesh_cache, ifc_file, settings, {wall2: keys[wall2]})
+            size = mesh_cache.connection.execute("SELECT MAX(size) FROM geometries").fetchone()[0]
+            mesh_cache.prune(max_size=size)
+            assert set(mesh_cache.get_shapes(keys)) == {wall2}
+            mesh_cache.prune(max_size=0)
+            assert mesh_cache.get_shapes(keys) == {}
+
+    def test_loading_shapes_marks_them_as_recently_used(self, tmp_path, ifc_file, settings):
+        keys = get_keys(ifc_file, settings)
+        wall1, wall2 = ifc_file.by_type("IfcWall")
+        with MeshCache(str(tmp_path / "meshes.sqlite")) as mesh_cache:
+            add_shapes(mesh_cache, ifc_file, settings, {wall1: keys[wall1]})
+            mesh_cache.now += 1
+            add_shapes(mesh_cache, ifc_file, settings, {wall2: keys[wall2]})
+            mesh_cache.now += 1
+            mesh_cache.get_shapes({wall1: keys[wall1]})
+            size = mesh_cache.connection.execute("SELECT MAX(size) FROM geometries").fetchone()[0]
+            mesh_cache.prune(max_size=size)
+            assert set(mesh_cache.get_shapes(keys)) == {wall1}
+
+    def test_pruning_shapes_exceeding_the_maximum_age(self, tmp_path, ifc_file, settings):
+        keys = get_keys(ifc_file, settings)
+        with MeshCache(str(tmp_path / "meshes.sqlite")) as mesh_cache:
+            add_shapes(mesh_cache, ifc_file, settings, keys)
+            mesh_cache.prune(max_age=10)
+            assert len(mesh_cache.get_shapes(keys)) == 2
+            mesh_cache.now += 11
+            mesh_cache.prune(max_age=10)
+            assert mesh_cache.get_shapes(keys) == {}
+            assert mesh_cache.connection.execute("SELECT COUNT(*) FROM geometries").fetchone()[0] == 0
+
+    def test_discarding_caches_of_an_older_version(self, tmp_path, ifc_file, settings):
+        keys = get_keys(ifc_file, settings)
+        with MeshCache(str(tmp_path / "meshes.sqlite")) as mesh_cache:
+            add_shapes(mesh_cache, ifc_file, settings, keys)
+            mesh_cache.connection.execute("PRAGMA user_version = 1")
+        with MeshCache(str(tmp_path / "meshes.sqlite")) as mesh_cache:
+            assert mesh_cache.get_shapes(keys) == {}
+
+
+class TestShapeKeys:
+    def test_keys_are_only_calculated_for_elements_with_representations(self, ifc_file, settings):
+        element = ifcopenshell.api.root.create_entity(ifc_file, ifc_class="IfcWall")
+        keys = get_keys(ifc_file, settings)
+        assert len(keys) == 2
+        assert element not in keys
+
+    def test_keys_are_unique_per_element(self, ifc_file, settings):
+        assert len(set(get_keys(ifc_file, settings).values())) == 2
+
+    def test_keys_are_stable(self, ifc_file, settings):
+        assert get_keys(ifc_file, settings) == get_keys(ifc_file, settings)
+
+    def test_keys_ignore_attributes_which_do_not_affect_shapes(self, ifc_file, settings):
+        keys = get_keys(ifc_file, settings)
+        ifc_file.by_type("IfcWall")[0].Name = "Foo"
+        assert get_keys(ifc_file, settings) == keys
+
+    def test_keys_change_with_settings(self, ifc_file, settings):
+        keys = get_keys(ifc_file, settings)
+        settings.set("weld-vertices", not settings.get("weld-vertices"))
+        assert set(get_keys(ifc_file, settings).values()).isdisjoint(keys.values())
+
+    def test_keys_change_with_the_project_length_unit(self, ifc_file, settings):
+        keys = get_keys(ifc_file, settings)
+        unit = ifcopenshell.util.unit.get_project_unit(ifc_file, "LENGTHUNIT")
+        ifcopenshell.api.unit.edit_named_unit(ifc_file, unit=unit, attributes={"Prefix": None})
+        assert set(get_keys(ifc_file, settings).values()).isdisjoint(keys.values())
+
+    def test_keys_change_with_the_geometry_library(self, ifc_file, settings):
+        keys = get_keys(ifc_file, settings)
+        results = ShapeKeys(ifc_file).get_keys(ifc_file.by_type("IfcWall"), settings, "cgal")
+        assert set(results.values()).isdisjoint(keys.values())
+
+    def test_keys_change_with_representation_items(self, ifc_file, settings):
+        keys = get_keys(ifc_file, settings)
+        wall1, wall2 = ifc_file.by_type("IfcWall")
+        wall1.Representation.Representations[0].Items[0].Depth = 10
+        results = get_keys(ifc_file, settings)
+        assert results[wall1] != keys[wall1]
+        assert results[wall2] == keys[wall2]
+
+    def test_keys_change_with_placements(self, ifc_file, settings):
+        keys = get_keys(ifc_file, settings)
+        wall1, wall2 = ifc_file.by_type("IfcWall")
+        ifcopenshell.api.geometry.edit_object_placement(ifc_file, product=wall1, matrix=get_matrix(10))
+        results = get_keys(ifc_file, settings)
+        assert results[wall1] != keys[wall1]
+        assert results[wall2] == keys[wall2]
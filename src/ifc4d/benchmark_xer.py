@@ -0,0 +1,276 @@
+# Ifc4D - IFC scheduling utility
+# Copyright (C) 2021 Dion Moult <dion@thinkmoult.com>
+#
+# This file is part of Ifc4D.
+#
+# Ifc4D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ifc4D is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Ifc4D.  If not, see <http://www.gnu.org/licenses/>.
+
+# Compares importing a synthetic P6 XER file by creating each task, task time,
+# and sequence with individual API calls against the bulk import in
+# ifc4d.p6xer2ifc, and checks that both give the same schedule.
+#
+# Usage: python benchmark_xer.py [number of activities] [path to XER]
+
+import os
+import sys
+import time
+import tempfile
+import ifcopenshell
+import ifcopenshell.api
+import ifcopenshell.util.sequence
+from datetime import datetime, timedelta
+from ifc4d.common import ScheduleIfcGenerator
+from ifc4d.p6xer2ifc import P6XER2Ifc
+
+CALENDAR_DATA = (
+    "(0||CalendarData()("
+    "(0||DaysOfWeek()("
+    "(0||1()())"
+    + "".join(f"(0||{d}()((0||0(s|08:00|f|12:00)())(0||1(s|13:00|f|17:00)())))" for d in range(2, 7))
+    + "(0||7()())))"
+    "(0||VIEW(ShowTotal|Y)())"
+    "(0||Exceptions()((0||0(d|45292)())(0||1(d|45407)())(0||2(d|45650)())))))"
+)
+
+
+def write_xer(path: str, total: int) -> None:
+    def table(name, fields, records):
+        lines = [f"%T\t{name}", "%F\t" + "\t".join(fields)]
+        lines.extend("%R\t" + "\t".join(str(v) for v in record) for record in records)
+        return lines
+
+    start = datetime(2024, 1, 1, 8)
+    wbs_total = max(1, total // 50)
+    activities = []
+    relationships = []
+    for i in range(1, total + 1):
+        activity_start = start + timedelta(days=(i % 500))
+        activity_finish = activity_start + timedelta(days=i % 20)
+        is_milestone = i % 100 == 0
+        activities.append(
+            (
+                i,
+                1,
+                1 + (i % wbs_total),
+                1 + i % 2,
+                f"A{i:06}",
+                f"Activity {i}",
+                "TT_Mile" if is_milestone else "TT_Task",
+                ("TK_NotStart", "TK_Active", "TK_Complete")[i % 3],
+                0 if is_milestone else 8 * (1 + i % 20),
+                activity_start.strftime("%Y-%m-%d %H:%M"),
+                (activity_start if is_milestone else activity_finish).strftime("%Y-%m-%d %H:%M"),
+            )
+        )
+        if i > 1 and i % 10:
+            relationships.append((i, i, i - 1, ("PR_FS", "PR_SS", "PR_FF")[i % 3], 8 if i % 7 == 0 else 0))
+    lines = ["ERMHDR\t20.12\t2024-01-01\tProject\tadmin\tadmin\tdbxDatabaseNoName\tProject Management\tUSD"]
+    lines += table("PROJECT", ("proj_id", "proj_short_name"), [(1, "Synthetic")])
+    lines += table(
+        "CALENDAR",
+        ("clndr_id", "clndr_name", "clndr_type", "day_hr_cnt", "clndr_data"),
+        [(1, "Standard", "CA_Base", 8, CALENDAR_DATA), (2, "Night", "CA_Project", 8, CALENDAR_DATA)],
+    )
+    lines += table(
+        "PROJWBS",
+        ("wbs_id", "proj_id", "wbs_short_name", "wbs_name", "parent_wbs_id"),
+        [(i, 1, f"W{i}", f"WBS {i}", (i // 10) or "") for i in range(1, wbs_total + 1)],
+    )
+    lines += table(
+        "TASK",
+        (
+            "task_id",
+            "proj_id",
+            "wbs_id",
+            "clndr_id",
+            "task_code",
+            "task_name",
+            "task_type",
+            "status_code",
+            "target_drtn_hr_cnt",
+            "target_start_date",
+            "target_end_date",
+        ),
+        activities,
+    )
+    lines += table(("TASKPRED"), ("task_pred_id", "task_id", "pred_task_id", "pred_type", "lag_hr_cnt"), relationships)
+    lines += table(
+        "RSRC",
+        ("rsrc_id", "parent_rsrc_id", "rsrc_name", "rsrc_short_name", "rsrc_type"),
+        [(1, "", "Crew", "CREW", "RT_Labor"), (2, 1, "Labourer", "LAB", "RT_Labor")],
+    )
+    lines.append("%E")
+    with open(path, "w", encoding="utf-8") as xer:
+        xer.write("\n".join(lines) + "\n")
+
+
+class ScheduleIfcGeneratorByCall(ScheduleIfcGenerator):
+    # Reference implementation, creating each task, task time, and sequence
+    # with individual API calls.
+    def create_task_from_wbs(self, wbs, work_schedule):
+        if not self.wbs.get(wbs["ParentObjectId"]):
+            wbs["ParentObjectId"] = None
+        wbs["ifc"] = ifcopenshell.api.run(
+            "sequence.add_task",
+            self.file,
+            work_schedule=None if wbs["ParentObjectId"] else work_schedule,
+            parent_task=self.wbs[wbs["ParentObjectId"]]["ifc"] if wbs["ParentObjectId"] else None,
+        )
+        identification = wbs["Code"]
+        if wbs["ParentObjectId"]:
+            identification = str(self.wbs[wbs["ParentObjectId"]]["ifc"].Identification) + "." + str(wbs["Code"])
+        ifcopenshell.api.run(
+            "sequence.edit_task",
+            self.file,
+            task=wbs["ifc"],
+            attributes={"Name": wbs["Name"], "Identification": str(identification)},
+        )
+        for activity_id in wbs["activities"]:
+            self.create_task_from_activity(self.activities[activity_id], wbs, None)
+
+    def create_task_from_activity(self, activity, wbs, work_schedule):
+        activity["ifc"] = ifcopenshell.api.run(
+            "sequence.add_task",
+            self.file,
+            work_schedule=None if wbs else work_schedule,
+            parent_task=wbs["ifc"] if wbs else None,
+        )
+        ifcopenshell.api.run(
+            "sequence.edit_task",
+            self.file,
+            task=activity["ifc"],
+            attributes={
+                "Name": activity["Name"],
+                "Identification": str(activity["Identification"]),
+                "Status": activity["Status"],
+                "IsMilestone": activity["StartDate"] == activity["FinishDate"],
+                "PredefinedType": "CONSTRUCTION",
+            },
+        )
+        task_time = ifcopenshell.api.run("sequence.add_task_time", self.file, task=activity["ifc"])
+        calendar = self.calendars[activity["CalendarObjectId"]]
+        ifcopenshell.api.run(
+            "control.assign_control", self.file, relating_control=calendar["ifc"], related_object=activity["ifc"]
+        )
+        ifcopenshell.api.run(
+            "sequence.edit_task_time",
+            self.file,
+            task_time=task_time,
+            attributes={
+                "ScheduleStart": activity["StartDate"],
+                "ScheduleFinish": activity["FinishDate"],
+                "DurationType": "WORKTIME" if activity["PlannedDuration"] else None,
+                "ScheduleDuration": (
+                    timedelta(days=float(activity["PlannedDuration"]) / float(calendar["HoursPerDay"] or 8)) or None
+                    if activity["PlannedDuration"]
+                    else None
+                ),
+            },
+        )
+
+    def create_rel_sequences(self):
+        for relationship in self.relationships.values():
+            rel_sequence = ifcopenshell.api.run(
+                "sequence.assign_sequence",
+                self.file,
+                relating_process=self.activities[relationship["PredecessorActivity"]]["ifc"],
+                related_process=self.activities[relationship["SuccessorActivity"]]["ifc"],
+            )
+            if lag := float(relationship["Lag"] or 0):
+                calendar = self.calendars[self.activities[relationship["PredecessorActivity"]]["CalendarObjectId"]]
+                ifcopenshell.api.run(
+                    "sequence.assign_lag_time",
+                    self.file,
+                    rel_sequence=rel_sequence,
+                    lag_value=timedelta(days=lag / float(calendar["HoursPerDay"] or 8)),
+                    duration_type="WORKTIME",
+                )
+            # Editing the sequence cascades the schedule, including the lag.
+            ifcopenshell.api.run(
+                "sequence.edit_sequence",
+                self.file,
+                rel_sequence=rel_sequence,
+                attributes={"SequenceType": relationship["Type"]},
+            )
+
+
+def import_xer(path: str, generator: type) -> ifcopenshell.file:
+    ifcopenshell.util.sequence.clear_calendar_cache()
+    p6xer = P6XER2Ifc()
+    p6xer.xer = path
+    p6xer.file = ifcopenshell.api.run("project.create_file")
+    ifcopenshell.api.run("root.create_entity", p6xer.file, ifc_class="IfcProject")
+    p6xer.work_plan = ifcopenshell.api.run("sequence.add_work_plan", p6xer.file)
+    p6xer.parse_xer()
+    settings = {
+        "work_plan": p6xer.work_plan,
+        "project": p6xer.project,
+        "calendars": p6xer.calendars,
+        "wbs": p6xer.wbs,
+        "root_activities": p6xer.root_activites,
+        "activities": p6xer.activities,
+        "relationships": p6xer.relationships,
+        "resources": p6xer.resources,
+    }
+    generator(p6xer.file, None, settings).create_ifc()
+    return p6xer.file
+
+
+def get_schedule(f: ifcopenshell.file) -> tuple:
+    tasks = {}
+    for task in f.by_type("IfcTask"):
+        task_time = task.TaskTime
+        calendar = ifcopenshell.util.sequence.derive_calendar(task)
+        tasks[task.Identification] = (
+            task.Name,
+            task.Status,
+            task.IsMilestone,
+            task.PredefinedType,
+            calendar.Name if calendar else None,
+            ifcopenshell.util.sequence.get_parent_task(task).Identification if task.Nests else None,
+            (task_time.ScheduleStart, task_time.ScheduleFinish, task_time.ScheduleDuration) if task_time else None,
+        )
+    sequences = {
+        (
+            rel.RelatingProcess.Identification,
+            rel.RelatedProcess.Identification,
+            rel.SequenceType,
+            rel.TimeLag.LagValue.wrappedValue if rel.TimeLag else None,
+        )
+        for rel in f.by_type("IfcRelSequence")
+    }
+    return tasks, sequences
+
+
+def run(path: str) -> None:
+    start = time.perf_counter()
+    f = import_xer(path, ScheduleIfcGeneratorByCall)
+    print(f"Call by call: {time.perf_counter() - start:.2f}s")
+    expected = get_schedule(f)
+
+    start = time.perf_counter()
+    f = import_xer(path, ScheduleIfcGenerator)
+    print(f"Bulk import: {time.perf_counter() - start:.2f}s")
+    assert get_schedule(f) == expected
+    print(f"{len(expected[0])} tasks, {len(expected[1])} sequences")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        run(sys.argv[2])
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "benchmark.xer")
+            write_xer(path, int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
+            run(path)
@@ -1,8 +1,181 @@
-from xerparser.reader import Reader
 import ifcopenshell
 import ifcopenshell.api
+import ifcopenshell.api.owner
+import ifcopenshell.guid
 import ifcopenshell.util.date
-from datetime import datetime, timedelta, date
+import ifcopenshell.util.sequence
+from ifcopenshell.api.sequence.cascade_schedule import Usecase as CascadeSchedule
+from datetime import datetime, timedelta, date, time
+
+
+class TaskBuilder:
+    """Creates the tasks, task times and sequences of an imported schedule in bulk
+
+    This gives the same result as adding each task with sequence.add_task,
+    sequence.edit_task, control.assign_control, sequence.add_task_time and
+    sequence.edit_task_time, and each sequence with sequence.assign_sequence,
+    sequence.edit_sequence and sequence.assign_lag_time. However, assignments
+    to work schedules and calendars, and nestings, are created once per
+    relating object when the builder is executed, and the schedule is
+    cascaded once, starting from the tasks without predecessors, rather than
+    after every sequence.
+    """
+
+    def __init__(self, file):
+        self.file = file
+        self.owner_history = ifcopenshell.api.owner.create_owner_history(file)
+        self.work_schedule_tasks = {}
+        self.calendar_tasks = {}
+        self.nested_tasks = {}
+        self.task_calendars = {}
+        self.parent_tasks = {}
+        self.sequences = {}
+
+    def add_task(self, work_schedule=None, parent_task=None, calendar=None, attributes=None):
+        task = self.file.create_entity(
+            "IfcTask",
+            GlobalId=ifcopenshell.guid.new(),
+            OwnerHistory=self.owner_history,
+            IsMilestone=False,
+            PredefinedType="NOTDEFINED",
+        )
+        if work_schedule:
+            self.work_schedule_tasks.setdefault(work_schedule, []).append(task)
+        elif parent_task:
+            self.nested_tasks.setdefault(parent_task, []).append(task)
+            self.parent_tasks[task] = parent_task
+        if calendar:
+            self.calendar_tasks.setdefault(calendar, []).append(task)
+            self.task_calendars[task] = calendar
+        for name, value in (attributes or {}).items():
+            setattr(task, name, value)
+        return task
+
+    def derive_calendar(self, task):
+        while task:
+            if calendar := self.task_calendars.get(task):
+                return calendar
+            task = self.parent_tasks.get(task)
+
+    def add_task_time(self, task, attributes):
+        # Equivalent to sequence.edit_task_time on a new task time
+        task_time = self.file.create_entity("IfcTaskTime")
+        task.TaskTime = task_time
+        calendar = self.derive_calendar(task)
+        attributes = attributes.copy()
+        if attributes.get("ScheduleDuration") and "ScheduleFinish" in attributes:
+            del attributes["ScheduleFinish"]
+        duration_type = attributes.get("DurationType")
+        for name, hour in (("ScheduleFinish", 17), ("ScheduleStart", 9)):
+            if value := attributes.get(name):
+                value = ifcopenshell.util.sequence.get_soonest_working_day(value, duration_type, calendar)
+                attributes[name] = datetime.combine(value, time(hour))
+        for name, value in attributes.items():
+            if value is not None:
+                if "Start" in name or "Finish" in name or name == "StatusTime":
+                    value = ifcopenshell.util.date.datetime2ifc(value, "IfcDateTime")
+                elif name in ("ScheduleDuration", "ActualDuration", "RemainingTime"):
+                    value = ifcopenshell.util.date.datetime2ifc(value, "IfcDuration")
+            setattr(task_time, name, value)
+        if task_time.ScheduleDuration and task_time.ScheduleStart:
+            finish = ifcopenshell.util.sequence.get_start_or_finish_date(
+                ifcopenshell.util.date.ifc2datetime(task_time.ScheduleStart),
+                ifcopenshell.util.date.ifc2datetime(task_time.ScheduleDuration),
+                task_time.DurationType,
+                calendar,
+                date_type="FINISH",
+            )
+            task_time.ScheduleFinish = ifcopenshell.util.date.datetime2ifc(finish, "IfcDateTime")
+        elif attributes.get("ScheduleFinish") and task_time.ScheduleStart:
+            task_time.ScheduleDuration = ifcopenshell.util.date.datetime2ifc(
+                self.get_duration(attributes["ScheduleStart"], attributes["ScheduleFinish"], task_time, calendar),
+                "IfcDuration",
+            )
+        return task_time
+
+    def get_duration(self, start, finish, task_time, calendar):
+        # Equivalent to sequence.edit_task_time, which counts the finish day and
+        # the working days before it
+        current_date, finish_date = start.date(), finish.date()
+        duration = timedelta(days=1)
+        if task_time.DurationType == "ELAPSEDTIME" or not calendar:
+            return duration + max(finish_date - current_date, timedelta())
+        compiled_calendar = ifcopenshell.util.sequence.get_compiled_calendar(calendar)
+        while current_date < finish_date:
+            first, _, working, _ = compiled_calendar.get_year(current_date.year)
+            end_date = min(finish_date, date(current_date.year + 1, 1, 1))
+            working_days = working[current_date.toordinal() - first : end_date.toordinal() - first].count(1)
+            duration += timedelta(days=working_days)
+            current_date = end_date
+        return duration
+
+    def add_sequence(self, relating_process, related_process, sequence_type="FINISH_START", lag_value=None):
+        rel = self.sequences.get((relating_process, related_process))
+        if rel:
+            rel.SequenceType = sequence_type
+        else:
+            rel = self.sequences[(relating_process, related_process)] = self.file.create_entity(
+                "IfcRelSequence",
+                GlobalId=ifcopenshell.guid.new(),
+                OwnerHistory=self.owner_history,
+                RelatingProcess=relating_process,
+                RelatedProcess=related_process,
+                SequenceType=sequence_type,
+            )
+        if lag_value:
+            lag_value = self.file.createIfcDuration(ifcopenshell.util.date.datetime2ifc(lag_value, "IfcDuration"))
+            rel.TimeLag = self.file.create_entity("IfcLagTime", DurationType="WORKTIME", LagValue=lag_value)
+        return rel
+
+    def execute(self):
+        for work_schedule, tasks in self.work_schedule_tasks.items():
+            self.assign_control(work_schedule, tasks)
+        for calendar, tasks in self.calendar_tasks.items():
+            if calendar.Controls:
+                controls = calendar.Controls[0]
+                controls.RelatedObjects = list(controls.RelatedObjects) + tasks
+            else:
+                self.assign_control(calendar, tasks)
+        for parent_task, tasks in self.nested_tasks.items():
+            self.file.create_entity(
+                "IfcRelNests",
+                GlobalId=ifcopenshell.guid.new(),
+                OwnerHistory=self.owner_history,
+                RelatedObjects=tasks,
+                RelatingObject=parent_task,
+            )
+        self.cascade_schedule()
+
+    def cascade_schedule(self):
+        # sequence.cascade_schedule stops at successors whose dates are
+        # unchanged, assuming that they were already cascaded, which is not the
+        # case for imported dates. Instead, starting from the tasks without
+        # predecessors, each task is updated once all of its predecessors have
+        # been.
+        usecase = CascadeSchedule()
+        usecase.file = self.file
+        usecase.calendar_cache = {}
+        predecessor_counts = {}
+        successors = {}
+        for relating_process, related_process in self.sequences:
+            predecessor_counts[related_process] = predecessor_counts.get(related_process, 0) + 1
+            successors.setdefault(relating_process, []).append(related_process)
+        queue = [task for task in successors if task not in predecessor_counts]
+        while queue:
+            for successor in successors.get(queue.pop(), []):
+                predecessor_counts[successor] -= 1
+                if not predecessor_counts[successor]:
+                    usecase.update_task(successor)
+                    queue.append(successor)
+
+    def assign_control(self, relating_control, related_objects):
+        self.file.create_entity(
+            "IfcRelAssignsToControl",
+            GlobalId=ifcopenshell.guid.new(),
+            OwnerHistory=self.owner_history,
+            RelatedObjects=related_objects,
+            RelatingControl=relating_control,
+        )
 
 
 class ScheduleIfcGenerator:
@@ -34,8 +207,10 @@ class ScheduleIfcGenerator:
             self.work_plan = ifcopenshell.api.run("sequence.add_work_plan", self.file)
         work_schedule = self.create_work_schedule()
         self.create_calendars()
+        self.task_builder = TaskBuilder(self.file)
         self.create_tasks(work_schedule)
         self.create_rel_sequences()
+        self.task_builder.execute()
         self.create_resources()
         if self.output:
             self.file.write(self.output)
@@ -188,36 +363,24 @@ class ScheduleIfcGenerator:
     def create_task_from_wbs(self, wbs, work_schedule):
         if not self.wbs.get(wbs["ParentObjectId"]):
             wbs["ParentObjectId"] = None
-        wbs["ifc"] = ifcopenshell.api.run(
-            "sequence.add_task",
-            self.file,
-            work_schedule=None if wbs["ParentObjectId"] else work_schedule,
-            parent_task=self.wbs[wbs["ParentObjectId"]]["ifc"] if wbs["ParentObjectId"] else None,
-        )
+        parent_task = self.wbs[wbs["ParentObjectId"]]["ifc"] if wbs["ParentObjectId"] else None
         identification = wbs["Code"]
-        if wbs["ParentObjectId"]:
-            if self.wbs[wbs["ParentObjectId"]]["ifc"]:
-                identification = str(self.wbs[wbs["ParentObjectId"]]["ifc"].Identification) + "." + str(wbs["Code"])
-        ifcopenshell.api.run(
-            "sequence.edit_task",
-            self.file,
-            task=wbs["ifc"],
+        if parent_task:
+            identification = str(parent_task.Identification) + "." + str(wbs["Code"])
+        wbs["ifc"] = self.task_builder.add_task(
+            work_schedule=None if wbs["ParentObjectId"] else work_schedule,
+            parent_task=parent_task,
             attributes={"Name": wbs["Name"], "Identification": str(identification)},
         )
         for activity_id in wbs["activities"]:
             self.create_task_from_activity(self.activities[activity_id], wbs, None)
 
     def create_task_from_activity(self, activity, wbs, work_schedule):
-        activity["ifc"] = ifcopenshell.api.run(
-            "sequence.add_task",
-            self.file,
+        calendar = self.calendars[activity["CalendarObjectId"]]
+        activity["ifc"] = self.task_builder.add_task(
             work_schedule=None if wbs else work_schedule,
             parent_task=wbs["ifc"] if wbs else None,
-        )
-        ifcopenshell.api.run(
-            "sequence.edit_task",
-            self.file,
-            task=activity["ifc"],
+            calendar=calendar["ifc"],
             attributes={
                 "Name": activity["Name"],
                 "Identification": str(activity["Identification"]),
@@ -226,23 +389,9 @@ class ScheduleIfcGenerator:
                 "PredefinedType": "CONSTRUCTION",
             },
         )
-        task_time = ifcopenshell.api.run("sequence.add_task_time", self.file, task=activity["ifc"])
-        calendar = self.calendars[activity["CalendarObjectId"]]
-        # print(calendar, self.calendars)
-        # Seems intermittently crashy - can we investigate for larger files?
-        ifcopenshell.api.run(
-            "control.assign_control",
-            self.file,
-            **{
-                "relating_control": calendar["ifc"],
-                "related_object": activity["ifc"],
-            },
-        )
-        ifcopenshell.api.run(
-            "sequence.edit_task_time",
-            self.file,
-            task_time=task_time,
-            attributes={
+        self.task_builder.add_task_time(
+            activity["ifc"],
+            {
                 "ScheduleStart": activity["StartDate"],
                 "ScheduleFinish": activity["FinishDate"],
                 "DurationType": "WORKTIME" if activity["PlannedDuration"] else None,
@@ -255,35 +404,17 @@ class ScheduleIfcGenerator:
         )
 
     def create_rel_sequences(self):
-        self.sequence_type_map = {
-            "Start to Start": "START_START",
-            "Start to Finish": "START_FINISH",
-            "Finish to Start": "FINISH_START",
-            "Finish to Finish": "FINISH_FINISH",
-        }
         for relationship in self.relationships.values():
-            rel_sequence = ifcopenshell.api.run(
-                "sequence.assign_sequence",
-                self.file,
-                relating_process=self.activities[relationship["PredecessorActivity"]]["ifc"],
-                related_process=self.activities[relationship["SuccessorActivity"]]["ifc"],
-            )
-            ifcopenshell.api.run(
-                "sequence.edit_sequence",
-                self.file,
-                rel_sequence=rel_sequence,
-                attributes={"SequenceType": relationship["Type"]},
-            )
-            lag = float(relationship["Lag"])
-            if lag:
+            lag_value = None
+            if lag := float(relationship["Lag"] or 0):
                 calendar = self.calendars[self.activities[relationship["PredecessorActivity"]]["CalendarObjectId"]]
-                ifcopenshell.api.run(
-                    "sequence.assign_lag_time",
-                    self.file,
-                    rel_sequence=rel_sequence,
-                    lag_value=timedelta(days=lag / float(calendar["HoursPerDay"] or 8)),
-                    duration_type="WORKTIME",
-                )
+                lag_value = timedelta(days=lag / float(calendar["HoursPerDay"] or 8))
+            self.task_builder.add_sequence(
+                self.activities[relationship["PredecessorActivity"]]["ifc"],
+                self.activities[relationship["SuccessorActivity"]]["ifc"],
+                sequence_type=relationship["Type"],
+                lag_value=lag_value,
+            )
 
     def create_resources(self):
         # print("Resources", self.resources)
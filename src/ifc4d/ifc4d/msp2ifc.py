@@ -23,6 +23,7 @@ import ifcopenshell
 import ifcopenshell.api
 import ifcopenshell.util.date
 import xml.etree.ElementTree as ET
+from .common import TaskBuilder
 
 
 class MSP2Ifc:
@@ -212,8 +213,13 @@ class MSP2Ifc:
             self.work_plan = ifcopenshell.api.run("sequence.add_work_plan", self.file)
         work_schedule = self.create_work_schedule()
         self.create_calendars()
+        self.task_builder = TaskBuilder(self.file)
+        self.psets = {}
         self.create_tasks(work_schedule)
         self.create_rel_sequences()
+        self.task_builder.execute()
+        if self.psets:
+            ifcopenshell.api.run("pset.edit_psets", self.file, psets=self.psets)
 
     def create_boilerplate_ifc(self):
         self.file = ifcopenshell.file(schema="IFC4")
@@ -244,45 +250,25 @@ class MSP2Ifc:
             self.process_exceptions(calendar["HolidayOrExceptions"], calendar["ifc"])
 
     def create_task(self, task, work_schedule=None, parent_task=None):
-        task["ifc"] = ifcopenshell.api.run(
-            "sequence.add_task",
-            self.file,
-            work_schedule=work_schedule if work_schedule else None,
-            parent_task=parent_task["ifc"] if parent_task else None,
-        )
-
         calendar = None
         if task["CalendarUID"] != "-1":
             calendar = self.calendars[task["CalendarUID"]]["ifc"]
         elif not parent_task and self.project["CalendarUID"]:
             calendar = self.calendars[self.project["CalendarUID"]]["ifc"]
 
-        if calendar:
-            ifcopenshell.api.run(
-                "control.assign_control",
-                self.file,
-                **{
-                    "relating_control": calendar,
-                    "related_object": task["ifc"],
-                },
-            )
-
-        ifcopenshell.api.run(
-            "sequence.edit_task",
-            self.file,
-            task=task["ifc"],
+        task["ifc"] = self.task_builder.add_task(
+            work_schedule=work_schedule if work_schedule else None,
+            parent_task=parent_task["ifc"] if parent_task else None,
+            calendar=calendar,
             attributes={
                 "Name": task["Name"],
                 "Identification": task["OutlineNumber"],
                 "IsMilestone": task["Start"] == task["Finish"],
             },
         )
-        task_time = ifcopenshell.api.run("sequence.add_task_time", self.file, task=task["ifc"])
-        ifcopenshell.api.run(
-            "sequence.edit_task_time",
-            self.file,
-            task_time=task_time,
-            attributes={
+        self.task_builder.add_task_time(
+            task["ifc"],
+            {
                 "ScheduleStart": task["Start"],
                 "ScheduleFinish": task["Finish"],
                 "DurationType": "WORKTIME" if task["Duration"] else None,
@@ -294,14 +280,9 @@ class MSP2Ifc:
 
         # create pset for optional columns
         if len(self.optionalColumns):
-            pset = ifcopenshell.api.run("pset.add_pset", self.file, product=task["ifc"], name="Pset_MSP_Task")
-
-            ifcopenshell.api.run(
-                "pset.edit_pset",
-                self.file,
-                pset=pset,
-                properties={name: str(task[name]) for name in self.optionalColumns if task[name]},
-            )
+            self.psets[task["ifc"]] = {
+                "Pset_MSP_Task": {name: str(task[name]) for name in self.optionalColumns if task[name]}
+            }
 
     def process_working_week(self, week, calendar):
         day_map = {
@@ -368,19 +349,13 @@ class MSP2Ifc:
             if not task["PredecessorTasks"]:
                 continue
             for predecessor in task["PredecessorTasks"].values():
-                rel_sequence = ifcopenshell.api.run(
-                    "sequence.assign_sequence",
-                    self.file,
-                    related_process=task["ifc"],
-                    relating_process=self.tasks[predecessor["PredecessorTask"]]["ifc"],
+                self.task_builder.add_sequence(
+                    self.tasks[predecessor["PredecessorTask"]]["ifc"],
+                    task["ifc"],
+                    sequence_type=(
+                        self.sequence_type_map[predecessor["Type"]] if predecessor["Type"] else "FINISH_START"
+                    ),
                 )
-                if predecessor["Type"]:
-                    ifcopenshell.api.run(
-                        "sequence.edit_sequence",
-                        self.file,
-                        rel_sequence=rel_sequence,
-                        attributes={"SequenceType": self.sequence_type_map[predecessor["Type"]]},
-                    )
 
     def parse_resources_xml(self, project):
         resources_lst = project.find("pr:Resources", self.ns)
@@ -16,7 +16,7 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with Ifc4D.  If not, see <http://www.gnu.org/licenses/>.
 
-from xerparser.reader import Reader
+from xerparser.model.classes.calendar_data import CalendarData
 import ifcopenshell
 import ifcopenshell.api
 import ifcopenshell.util.date
@@ -24,6 +24,49 @@ from datetime import datetime, timedelta, date
 from .common import ScheduleIfcGenerator
 
 
+def read_xer_tables(path, tables):
+    """Reads the records of some tables of an XER file in a single pass
+
+    XER files are tab separated. A %T line starts a table, followed by a %F
+    line of field names and %R lines of records. Records of other tables are
+    skipped without being split.
+
+    :param path: The path to the XER file.
+    :param tables: The names of the tables to read, such as "TASK".
+    :return: A dictionary of table names to lists of records, where each
+        record is a dictionary of field names to unconverted string values.
+    """
+    results = {table: [] for table in tables}
+    records = None
+    fields = []
+    with open(path, encoding="utf-8", errors="ignore") as xer:
+        for line in xer:
+            if line.startswith("%R\t"):
+                if records is not None:
+                    records.append(dict(zip(fields, line.rstrip("\r\n").split("\t")[1:])))
+            elif line.startswith("%T\t"):
+                records = results.get(line.rstrip("\r\n").split("\t")[1].strip())
+            elif line.startswith("%F\t"):
+                fields = [field.strip() for field in line.rstrip("\r\n").split("\t")[1:]]
+    return results
+
+
+def to_string(value):
+    return value.strip() if value else None
+
+
+def to_int(value):
+    return int(value) if value else None
+
+
+def to_float(value):
+    return float(value) if value else None
+
+
+def to_datetime(value):
+    return datetime.fromisoformat(value.strip()) if value and value.strip() else None
+
+
 class P6XER2Ifc:
     status_map = {"TK_NotStart": "Not Start", "TK_Complete": "Completed", "TK_Active": "Progress"}
 
@@ -54,7 +97,7 @@ class P6XER2Ifc:
     def __init__(self):
         self.xer = None
         self.file = None
-        self.model = None
+        self.tables = None
         self.work_plan = None
         self.project = {}
         self.calendars = {}
@@ -91,91 +134,91 @@ class P6XER2Ifc:
         ifcCreator.create_ifc()
 
     def parse_xer(self):
-        self.model = Reader(self.xer)
-        # for project in self.model.projects:
-        #     if not self.project.get("Name"):
-        self.project["Name"] = self.model.projects._projects[0].proj_short_name
+        self.tables = read_xer_tables(self.xer, ("PROJECT", "CALENDAR", "PROJWBS", "TASK", "TASKPRED", "RSRC"))
+        self.project["Name"] = to_string(self.tables["PROJECT"][0].get("proj_short_name"))
         self.parse_calendar_xer()
         self.parse_wbs_xer()
         self.parse_activity_xer()
         self.parse_relationship_xer()
         self.parse_resource_xer()
-        # work_schedule = self.create_work_schedule()
-        # self.create_tasks(work_schedule)
 
     def parse_wbs_xer(self):
-        for wbs in self.model.wbss:
-            self.wbs[wbs.wbs_id] = {
-                "Name": wbs.wbs_name,
-                "Code": wbs.wbs_short_name,
-                "ParentObjectId": wbs.parent_wbs_id,
+        for wbs in self.tables["PROJWBS"]:
+            self.wbs[to_int(wbs.get("wbs_id"))] = {
+                "Name": wbs["wbs_name"].strip(),
+                "Code": wbs["wbs_short_name"].strip(),
+                "ParentObjectId": to_int(wbs.get("parent_wbs_id")),
                 "ifc": None,
                 "rel": None,
                 "activities": [],
             }
-        # print(self.wbs)
 
     def parse_calendar_xer(self):
-        standard_work_week = []
         exceptions = {}
-        for cal in self.model.calendars:
-            standard_work_week = cal.working_hours
-            except_lst = cal.exceptions
+        for cal in self.tables["CALENDAR"]:
+            standard_work_week = []
+            except_lst = []
+            if clndr_data := to_string(cal.get("clndr_data")):
+                calendar_data = CalendarData(clndr_data)
+                standard_work_week = calendar_data.get_work_pattern()
+                except_lst = calendar_data.get_exceptions()
             for exception in except_lst:
                 month = exceptions.setdefault(exception.year, {}).setdefault(exception.month, {})
                 month.setdefault("FullDay", [])
                 month.setdefault("WorkTime", [])
                 exceptions[exception.year][exception.month]["FullDay"].append(exception.day)
 
-            self.calendars[cal.clndr_id] = {
-                "Name": cal.clndr_name,
-                "Type": cal.clndr_type,
-                "HoursPerDay": cal.day_hr_cnt,
+            self.calendars[to_int(cal.get("clndr_id"))] = {
+                "Name": to_string(cal.get("clndr_name")),
+                "Type": to_string(cal.get("clndr_type")),
+                "HoursPerDay": to_float(cal.get("day_hr_cnt")),
                 "StandardWorkWeek": standard_work_week,
                 "HolidayOrExceptions": exceptions,
             }
 
     def parse_activity_xer(self):
-        for activity in self.model.activities:
-            activity_type = activity.task_type
+        for activity in self.tables["TASK"]:
+            activity_type = to_string(activity.get("task_type"))
             if activity_type == "TT_LOE":
                 continue
-            wbs_id = activity.wbs_id
+            task_id = to_int(activity.get("task_id"))
+            wbs_id = to_int(activity.get("wbs_id"))
             if wbs_id:
-                self.wbs[wbs_id]["activities"].append(activity.task_id)
+                self.wbs[wbs_id]["activities"].append(task_id)
             else:
-                self.root_activites.append(activity.task_id)
-            self.activities[activity.task_id] = {
-                "Name": activity.task_name,
-                "Identification": activity.task_code,
-                "StartDate": activity.start_date,
-                "FinishDate": activity.end_date,
-                "PlannedDuration": activity.target_drtn_hr_cnt,
-                "Status": self.status_map[activity.status_code],
-                "CalendarObjectId": activity.clndr_id,
+                self.root_activites.append(task_id)
+            self.activities[task_id] = {
+                "Name": to_string(activity.get("task_name")),
+                "Identification": to_string(activity.get("task_code")),
+                "StartDate": to_datetime(activity.get("act_start_date"))
+                or to_datetime(activity.get("target_start_date")),
+                "FinishDate": to_datetime(activity.get("act_end_date")) or to_datetime(activity.get("target_end_date")),
+                "PlannedDuration": to_float(activity.get("target_drtn_hr_cnt")),
+                "Status": self.status_map[to_string(activity.get("status_code"))],
+                "CalendarObjectId": to_int(activity.get("clndr_id")),
                 "ifc": None,
             }
 
     def parse_relationship_xer(self):
-        for rel in self.model.relations:
-            predecessor = rel.pred_task_id
-            successor = rel.task_id
+        for rel in self.tables["TASKPRED"]:
+            predecessor = to_int(rel.get("pred_task_id"))
+            successor = to_int(rel.get("task_id"))
             if predecessor not in self.activities or successor not in self.activities:
                 continue
-            self.relationships[rel.task_pred_id] = {
+            self.relationships[to_string(rel.get("task_pred_id"))] = {
                 "PredecessorActivity": predecessor,
                 "SuccessorActivity": successor,
-                "Type": self.RELATIONSHIP_TYPE_MAPPING[rel.pred_type],
-                "Lag": rel.lag_hr_cnt,
+                "Type": self.RELATIONSHIP_TYPE_MAPPING[to_string(rel.get("pred_type"))],
+                "Lag": to_float(rel.get("lag_hr_cnt")),
             }
 
     def parse_resource_xer(self):
-        for rsrc in self.model.resources:
-            self.resources[rsrc.rsrc_id] = {
-                "Name": rsrc.rsrc_name,
-                "Code": rsrc.rsrc_short_name,
-                "ParentObjectId": rsrc.parent_rsrc_id,
-                "Type": self.resource_type_map[rsrc.rsrc_type],
+        for rsrc in self.tables["RSRC"]:
+            self.resources[to_int(rsrc.get("rsrc_id"))] = {
+                "Name": to_string(rsrc.get("rsrc_name")),
+                "Code": to_string(rsrc.get("rsrc_short_name")),
+                "ParentObjectId": to_int(rsrc.get("parent_rsrc_id")),
+                "Type": self.resource_type_map[to_string(rsrc.get("rsrc_type"))],
                 "ifc": None,
                 "rel": None,
             }
@@ -0,0 +1,106 @@
+# Ifc5D - IFC costing utility
+# Copyright (C) 2021 Dion Moult <dion@thinkmoult.com>
+#
+# This file is part of Ifc5D.
+#
+# Ifc5D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ifc5D is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Ifc5D.  If not, see <http://www.gnu.org/licenses/>.
+
+# Compares calculating base quantities shape by shape against the batched
+# takeoff in ifc5d.qto, and times writing the results.
+#
+# Usage: python benchmark_qto.py [number of walls] [path to IFC]
+
+import sys
+import time
+import ifcopenshell
+import ifcopenshell.api.context
+import ifcopenshell.api.geometry
+import ifcopenshell.api.project
+import ifcopenshell.api.root
+import ifcopenshell.api.unit
+import ifcopenshell.geom
+import ifcopenshell.util.placement
+import ifcopenshell.util.selector
+import ifcopenshell.util.shape
+import ifc5d.qto
+
+
+def create_file(total: int) -> ifcopenshell.file:
+    f = ifcopenshell.api.project.create_file()
+    ifcopenshell.api.root.create_entity(f, ifc_class="IfcProject")
+    ifcopenshell.api.unit.assign_unit(f)
+    model = ifcopenshell.api.context.add_context(f, context_type="Model")
+    body = ifcopenshell.api.context.add_context(
+        f, context_type="Model", context_identifier="Body", target_view="MODEL_VIEW", parent=model
+    )
+    for i in range(total):
+        wall = ifcopenshell.api.root.create_entity(f, ifc_class="IfcWall")
+        matrix = ifcopenshell.util.placement.rotation(0.0, "Z")
+        matrix[0][3] = float(i % 100) * 2.0
+        matrix[1][3] = float(i // 100) * 2.0
+        ifcopenshell.api.geometry.edit_object_placement(f, product=wall, matrix=matrix)
+        representation = ifcopenshell.api.geometry.add_wall_representation(
+            f, context=body, length=1.0 + (i % 7) * 0.1, height=3.0, thickness=0.2
+        )
+        ifcopenshell.api.geometry.assign_representation(f, product=wall, representation=representation)
+    return f
+
+
+def quantify_by_shape(f: ifcopenshell.file, elements: set, rules: dict) -> dict:
+    # Reference implementation, tessellating once per query and per gross or
+    # net settings, and calculating each formula for each shape individually.
+    gross_settings = ifcopenshell.geom.settings()
+    gross_settings.set("disable-opening-subtractions", True)
+    net_settings = ifcopenshell.geom.settings()
+    results = {}
+    for queries in rules["calculators"].values():
+        for query, qtos in queries.items():
+            filtered_elements = ifcopenshell.util.selector.filter_elements(f, query, elements)
+            if not filtered_elements:
+                continue
+            for prefix, settings in (("gross_", gross_settings), ("net_", net_settings)):
+                for shape in ifcopenshell.geom.iterate(settings, f, include=list(filtered_elements)):
+                    element = f.by_id(shape.id)
+                    for name, quantities in qtos.items():
+                        for quantity, formula in quantities.items():
+                            if not formula or not formula.startswith(prefix) or formula.endswith("segment_length"):
+                                continue
+                            function = getattr(ifcopenshell.util.shape, formula.removeprefix(prefix))
+                            results.setdefault(element, {}).setdefault(name, {})[quantity] = function(shape.geometry)
+    return results
+
+
+def run(f: ifcopenshell.file) -> None:
+    rules = ifc5d.qto.rules["IFC4QtoBaseQuantities"]
+    elements = set(f.by_type("IfcElement"))
+    print(f"{len(elements)} elements")
+
+    start = time.perf_counter()
+    quantify_by_shape(f, elements, rules)
+    print(f"Shape by shape: {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    results = ifc5d.qto.quantify(f, elements, rules)
+    print(f"ifc5d.qto.quantify: {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    ifc5d.qto.edit_qtos(f, results)
+    print(f"ifc5d.qto.edit_qtos: {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        run(ifcopenshell.open(sys.argv[2]))
+    else:
+        run(create_file(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000))
@@ -28,8 +28,7 @@ import ifcopenshell.util.shape
 import ifcopenshell.util.representation
 import multiprocessing
 from collections import namedtuple
-from typing import Any, Literal, get_args
-
+from typing import Any, Literal, Optional, get_args
 
 Function = namedtuple("Function", ["measure", "name", "description"])
 RULE_SET = Literal["IFC4QtoBaseQuantities", "IFC4QtoBaseQuantitiesBlender"]
@@ -50,10 +49,17 @@ def quantify(ifc_file: ifcopenshell.file, elements: set[ifcopenshell.entity_inst
     results = {}
     for calculator, queries in rules["calculators"].items():
         calculator = calculators[calculator]
+        # Elements matching several queries are only calculated once.
+        element_qtos = {}
         for query, qtos in queries.items():
             filtered_elements = ifcopenshell.util.selector.filter_elements(ifc_file, query, elements)
-            if filtered_elements:
-                calculator.calculate(ifc_file, filtered_elements, qtos, results)
+            for element in filtered_elements:
+                for name, quantities in qtos.items():
+                    # A quantity without a formula doesn't override a previous query.
+                    quantities = {k: v for k, v in quantities.items() if v}
+                    element_qtos.setdefault(element, {}).setdefault(name, {}).update(quantities)
+        if element_qtos:
+            calculator.calculate_many(ifc_file, element_qtos, results)
     return results
 
 
@@ -63,14 +69,7 @@ def edit_qtos(ifc_file: ifcopenshell.file, results: dict[ifcopenshell.entity_ins
     :param results: Results from `ifc5d.qto.quantify`.
 
     """
-    for element, qtos in results.items():
-        for name, quantities in qtos.items():
-            qto = ifcopenshell.util.element.get_pset(element, name, should_inherit=False)
-            if qto:
-                qto = ifc_file.by_id(qto["id"])
-            else:
-                qto = ifcopenshell.api.pset.add_qto(ifc_file, element, name)
-            ifcopenshell.api.pset.edit_qto(ifc_file, qto=qto, properties=quantities)
+    ifcopenshell.api.pset.edit_qtos(ifc_file, results)
 
 
 class SI2ProjectUnitConverter:
@@ -100,6 +99,14 @@ class SI2ProjectUnitConverter:
         return value
 
 
+class ShapeBuffers:
+    """The triangulation buffers of a geometry, which stay valid after the iterator moves on"""
+
+    def __init__(self, geometry):
+        self.verts_buffer = geometry.verts_buffer
+        self.faces_buffer = geometry.faces_buffer
+
+
 class IfcOpenShell:
     """Calculates Model body context geometry using the default IfcOpenShell
     iterator on triangulation elements."""
@@ -153,6 +160,17 @@ class IfcOpenShell:
         functions[f"gross_{k}"] = Function(v.measure, f"Gross {v.name}", v.description)
         functions[f"net_{k}"] = Function(v.measure, f"Net {v.name}", v.description)
 
+    # Functions which calculate many geometries at once.
+    batch_functions = {
+        "get_area": "get_areas",
+        "get_footprint_area": "get_footprint_areas",
+        "get_max_side_area": "get_max_side_areas",
+        "get_side_area": "get_side_areas",
+        "get_volume": "get_volumes",
+    }
+
+    batch_size = 1000
+
     @classmethod
     def calculate(
         cls,
@@ -161,64 +179,125 @@ class IfcOpenShell:
         qtos: dict,
         results: dict,
     ) -> None:
-        import ifcopenshell
-        import ifcopenshell.geom
-        import ifcopenshell.util.shape
+        cls.calculate_many(ifc_file, {element: qtos for element in elements}, results)
 
-        formula_functions = {}
+    @classmethod
+    def calculate_many(
+        cls,
+        ifc_file: ifcopenshell.file,
+        element_qtos: dict[ifcopenshell.entity_instance, dict],
+        results: dict,
+    ) -> None:
+        """Calculates quantities where each element may request different quantities
+
+        Each element is tessellated at most once with openings (for net
+        quantities) and once without (for gross quantities). Shapes are then
+        calculated in batches, so that each formula is evaluated for many
+        shapes at once.
+
+        :param element_qtos: A mapping of elements to the quantities to
+            calculate, in the same format as a single query in the rules.
+        """
+        import ifcopenshell.geom
 
         cls.gross_settings = ifcopenshell.geom.settings()
         cls.gross_settings.set("disable-opening-subtractions", True)
         cls.net_settings = ifcopenshell.geom.settings()
         cls.unit_scale = ifcopenshell.util.unit.calculate_unit_scale(ifc_file)
+        cls.unit_converter = SI2ProjectUnitConverter(ifc_file)
+        cls.scales = {}
 
         gross_qtos = {}
         net_qtos = {}
 
-        for name, quantities in qtos.items():
-            for quantity, formula in quantities.items():
-                if not formula:
-                    continue
-                gross_or_net_qtos = gross_qtos if formula.startswith("gross_") else net_qtos
-                if formula.endswith("get_segment_length"):
-                    gross_or_net_qtos.setdefault(name, {})[quantity] = formula.partition("_")[2]
-                elif formula.startswith("gross_"):
-                    formula = formula.partition("_")[2]
-                    gross_or_net_qtos.setdefault(name, {})[quantity] = formula
-                    formula_functions[formula] = getattr(ifcopenshell.util.shape, formula)
-                elif formula.startswith("net_"):
-                    formula = formula.partition("_")[2]
-                    gross_or_net_qtos.setdefault(name, {})[quantity] = formula
-                    formula_functions[formula] = getattr(ifcopenshell.util.shape, formula)
-
-        tasks = []
-
-        if gross_qtos:
-            tasks.append((IfcOpenShell.create_iterator(ifc_file, cls.gross_settings, list(elements)), gross_qtos))
-
-        if net_qtos:
-            tasks.append((IfcOpenShell.create_iterator(ifc_file, cls.net_settings, list(elements)), net_qtos))
-
-        cls.unit_converter = SI2ProjectUnitConverter(ifc_file)
-
-        for iterator, qtos in tasks:
+        for element, qtos in element_qtos.items():
+            for name, quantities in qtos.items():
+                for quantity, formula in quantities.items():
+                    if not formula:
+                        continue
+                    gross_or_net, _, formula = formula.partition("_")
+                    if gross_or_net == "gross":
+                        gross_qtos.setdefault(element, {}).setdefault(name, {})[quantity] = formula
+                    elif gross_or_net == "net":
+                        net_qtos.setdefault(element, {}).setdefault(name, {})[quantity] = formula
+
+        for settings, qtos in ((cls.gross_settings, gross_qtos), (cls.net_settings, net_qtos)):
+            if not qtos:
+                continue
+            iterator = IfcOpenShell.create_iterator(ifc_file, settings, list(qtos))
+            batch = []
             if iterator.initialize():
                 while True:
-                    shape = iterator.get()
-                    element = ifc_file.by_id(shape.id)
-                    results.setdefault(element, {})
-                    for name, quantities in qtos.items():
-                        results[element].setdefault(name, {})
-                        for quantity, formula in quantities.items():
-                            if formula == "get_segment_length":
-                                results[element][name][quantity] = cls.get_segment_length(ifc_file, shape)
-                            else:
-                                results[element][name][quantity] = cls.unit_converter.convert(
-                                    formula_functions[formula](shape.geometry),
-                                    IfcOpenShell.raw_functions[formula].measure,
-                                )
+                    if item := cls.read_shape(ifc_file, iterator.get(), qtos, results):
+                        batch.append(item)
+                    if len(batch) == cls.batch_size:
+                        cls.calculate_batch(batch, qtos, results)
+                        batch = []
                     if not iterator.next():
                         break
+            if batch:
+                cls.calculate_batch(batch, qtos, results)
+
+    @classmethod
+    def read_shape(
+        cls, ifc_file: ifcopenshell.file, shape, qtos: dict, results: dict
+    ) -> Optional[tuple[ifcopenshell.entity_instance, "ShapeBuffers"]]:
+        """Calculates the quantities of a shape which have no batch function
+
+        The shape is only valid until the iterator moves to the next one, so
+        its buffers are copied for the remaining quantities to be calculated
+        later in a batch.
+        """
+        element = ifc_file.by_id(shape.id)
+        if element not in qtos:
+            return None
+        element_results = results.setdefault(element, {})
+        values = {}
+        is_batched = False
+        for name, quantities in qtos[element].items():
+            qto_results = element_results.setdefault(name, {})
+            for quantity, formula in quantities.items():
+                if formula in cls.batch_functions:
+                    qto_results[quantity] = None  # Keeps the order of quantities until the batch is calculated
+                    is_batched = True
+                    continue
+                if formula not in values:
+                    if formula == "get_segment_length":
+                        values[formula] = cls.get_segment_length(ifc_file, shape)
+                    else:
+                        function = getattr(ifcopenshell.util.shape, formula)
+                        values[formula] = function(shape.geometry) * cls.get_scale(formula)
+                qto_results[quantity] = values[formula]
+        if is_batched:
+            return element, ShapeBuffers(shape.geometry)
+
+    @classmethod
+    def calculate_batch(
+        cls, batch: list[tuple[ifcopenshell.entity_instance, "ShapeBuffers"]], qtos: dict, results: dict
+    ) -> None:
+        # Group shapes by formula, so that each formula runs once per batch.
+        formula_shapes: dict[str, list[int]] = {}
+        for i, (element, _) in enumerate(batch):
+            formulas = {f for quantities in qtos[element].values() for f in quantities.values()}
+            for formula in formulas:
+                if formula in cls.batch_functions:
+                    formula_shapes.setdefault(formula, []).append(i)
+
+        for formula, indices in formula_shapes.items():
+            function = getattr(ifcopenshell.util.shape, cls.batch_functions[formula])
+            scale = cls.get_scale(formula)
+            for i, value in zip(indices, function([batch[i][1] for i in indices])):
+                element = batch[i][0]
+                for name, quantities in qtos[element].items():
+                    for quantity, element_formula in quantities.items():
+                        if element_formula == formula:
+                            results[element][name][quantity] = value * scale
+
+    @classmethod
+    def get_scale(cls, formula: str) -> float:
+        if (scale := cls.scales.get(formula)) is None:
+            scale = cls.scales[formula] = cls.unit_converter.convert(1.0, IfcOpenShell.raw_functions[formula].measure)
+        return scale
 
     @staticmethod
     def create_iterator(
@@ -299,6 +378,12 @@ class Blender:
     @staticmethod
     def calculate(
         ifc_file: ifcopenshell.file, elements: set[ifcopenshell.entity_instance], qtos: dict, results: dict
+    ) -> None:
+        Blender.calculate_many(ifc_file, {element: qtos for element in elements}, results)
+
+    @staticmethod
+    def calculate_many(
+        ifc_file: ifcopenshell.file, element_qtos: dict[ifcopenshell.entity_instance, dict], results: dict
     ) -> None:
         import bonsai.tool as tool
         import bonsai.bim.module.qto.calculator as calculator
@@ -306,7 +391,7 @@ class Blender:
         unit_converter = SI2ProjectUnitConverter(ifc_file)
         formula_functions = {}
 
-        for element in elements:
+        for element, qtos in element_qtos.items():
             obj = tool.Ifc.get_object(element)
             if not obj or obj.type != "MESH":
                 continue
@@ -0,0 +1,126 @@
+# Ifc5D - IFC costing utility
+# Copyright (C) 2026 Dion Moult <dion@thinkmoult.com>
+#
+# This file is part of Ifc5D.
+#
+# Ifc5D is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ifc5D is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Ifc5D.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+import ifcopenshell
+import ifcopenshell.api.context
+import ifcopenshell.api.geometry
+import ifcopenshell.api.project
+import ifcopenshell.api.pset
+import ifcopenshell.api.root
+import ifcopenshell.api.unit
+import ifcopenshell.util.element
+import ifcopenshell.util.placement
+import ifc5d.qto as subject
+
+
+class Bootstrap:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.file = ifcopenshell.api.project.create_file()
+        ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcProject")
+        ifcopenshell.api.unit.assign_unit(self.file)
+        model = ifcopenshell.api.context.add_context(self.file, context_type="Model")
+        self.body = ifcopenshell.api.context.add_context(
+            self.file, context_type="Model", context_identifier="Body", target_view="MODEL_VIEW", parent=model
+        )
+        self.rules = subject.rules["IFC4QtoBaseQuantities"]
+
+    def add_wall(self, length: float, height: float, thickness: float, x: float = 0.0) -> ifcopenshell.entity_instance:
+        wall = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWall")
+        matrix = ifcopenshell.util.placement.rotation(0.0, "Z")
+        matrix[0][3] = x
+        ifcopenshell.api.geometry.edit_object_placement(self.file, product=wall, matrix=matrix)
+        representation = ifcopenshell.api.geometry.add_wall_representation(
+            self.file, context=self.body, length=length, height=height, thickness=thickness
+        )
+        ifcopenshell.api.geometry.assign_representation(self.file, product=wall, representation=representation)
+        return wall
+
+
+class TestQuantify(Bootstrap):
+    def test_run(self):
+        wall1 = self.add_wall(1.0, 3.0, 0.2)
+        wall2 = self.add_wall(2.0, 2.5, 0.1, x=5.0)
+        results = subject.quantify(self.file, {wall1, wall2}, self.rules)
+        qto1 = results[wall1]["Qto_WallBaseQuantities"]
+        qto2 = results[wall2]["Qto_WallBaseQuantities"]
+        assert qto1["NetVolume"] == pytest.approx(0.6)
+        assert qto1["GrossVolume"] == pytest.approx(0.6)
+        assert qto1["NetSideArea"] == pytest.approx(3.0)
+        assert qto2["NetVolume"] == pytest.approx(0.5)
+        assert qto2["GrossSideArea"] == pytest.approx(5.0)
+
+    def test_elements_without_geometry_are_ignored(self):
+        wall = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWall")
+        assert subject.quantify(self.file, {wall}, self.rules) == {}
+
+
+class TestCalculateMany(Bootstrap):
+    def test_batches_match_calculating_each_element_individually(self, monkeypatch):
+        walls = [self.add_wall(1.0 + i * 0.1, 3.0 - i * 0.2, 0.1 + i * 0.05, x=i * 2.0) for i in range(7)]
+        qtos = {
+            "Qto_WallBaseQuantities": {
+                "GrossVolume": "gross_get_volume",
+                "NetVolume": "net_get_volume",
+                "GrossSideArea": "gross_get_side_area",
+                "NetSideArea": "net_get_max_side_area",
+                "NetFootprintArea": "net_get_footprint_area",
+                "Length": "net_get_x",
+            },
+            "Foo_Bar": {"Area": "net_get_area"},
+        }
+        monkeypatch.setattr(subject.IfcOpenShell, "batch_size", 3)
+        results = {}
+        subject.IfcOpenShell.calculate_many(self.file, {wall: qtos for wall in walls}, results)
+
+        # Without batch functions, every formula is calculated one shape at a time.
+        monkeypatch.setattr(subject.IfcOpenShell, "batch_functions", {})
+        for wall in walls:
+            expected = {}
+            subject.IfcOpenShell.calculate_many(self.file, {wall: qtos}, expected)
+            for name, quantities in expected[wall].items():
+                assert results[wall][name] == pytest.approx(quantities)
+
+    def test_elements_may_request_different_quantities(self):
+        wall1 = self.add_wall(1.0, 3.0, 0.2)
+        wall2 = self.add_wall(2.0, 3.0, 0.2, x=5.0)
+        results = {}
+        subject.IfcOpenShell.calculate_many(
+            self.file,
+            {
+                wall1: {"Qto_WallBaseQuantities": {"NetVolume": "net_get_volume"}},
+                wall2: {"Qto_WallBaseQuantities": {"GrossVolume": "gross_get_volume"}},
+            },
+            results,
+        )
+        assert results[wall1] == {"Qto_WallBaseQuantities": {"NetVolume": pytest.approx(0.6)}}
+        assert results[wall2] == {"Qto_WallBaseQuantities": {"GrossVolume": pytest.approx(1.2)}}
+
+
+class TestEditQtos(Bootstrap):
+    def test_run(self):
+        wall = self.add_wall(1.0, 3.0, 0.2)
+        qto = ifcopenshell.api.pset.add_qto(self.file, product=wall, name="Qto_WallBaseQuantities")
+        ifcopenshell.api.pset.edit_qto(self.file, qto=qto, properties={"NetVolume": 42.0, "Height": 1.0})
+        subject.edit_qtos(self.file, subject.quantify(self.file, {wall}, self.rules))
+        quantities = ifcopenshell.util.element.get_pset(wall, "Qto_WallBaseQuantities")
+        assert quantities["id"] == qto.id()
+        assert quantities["NetVolume"] == pytest.approx(0.6)
+        assert quantities["Height"] == pytest.approx(3000.0)  # Project lengths are in millimetres
+        assert len(self.file.by_type("IfcElementQuantity")) == 1
@@ -34,6 +34,12 @@ def cmdline():
         "--no-split-lod", dest="split", action="store_false", help="Do not split the file in multiple LoDs"
     )
     parser.add_argument("--lod", type=str, help="extract LOD value (example: 1.2)")
+    parser.add_argument(
+        "--face-sets",
+        action="store_true",
+        help="Create surfaces and solids as indexed face sets, and geometry instances as mapped items",
+    )
+    parser.add_argument("--batch-size", type=int, help="Number of city objects converted per batch")
     parser.set_defaults(split=True)
     args = parser.parse_args()
 
@@ -45,7 +51,10 @@ def cmdline():
         data["file_destination"] = args.output
     if args.lod:
         data["lod"] = args.lod
+    if args.batch_size:
+        data["batch_size"] = args.batch_size
     data["split"] = args.split
+    data["face_sets"] = args.face_sets
 
     converter = Cityjson2ifc()
     converter.configuration(**data)
@@ -18,6 +18,7 @@
 # along with ifccityjson.  If not, see <http://www.gnu.org/licenses/>.
 
 import os
+import itertools
 import ifcopenshell
 import ifcopenshell.api
 import ifcopenshell.guid
@@ -103,6 +104,7 @@ class Cityjson2ifc:
         self.IFC_model = None
         self.properties = {}
         self.geometry = GeometryIO()
+        self.IFC_representation_maps = {}
         self.configuration()
 
     def configuration(
@@ -115,6 +117,8 @@ class Cityjson2ifc:
         name_site=None,
         name_person_family=None,
         name_person_given=None,
+        face_sets=False,
+        batch_size=1000,
     ):
         self.properties["file_destination"], self.properties["file_extension"] = os.path.splitext(file_destination)
         self.properties["name_attribute"] = name_attribute
@@ -124,12 +128,18 @@ class Cityjson2ifc:
         self.properties["name_site"] = name_site
         self.properties["name_person_family"] = name_person_family
         self.properties["name_person_given"] = name_person_given
+        self.properties["face_sets"] = face_sets
+        self.properties["batch_size"] = batch_size
 
     def convert(self, city_model):
         self.city_model = city_model
         self.create_new_file()
         self.create_metadata()
         self.geometry.set_scale(self.properties["local_scale"])
+        self.geometry.set_face_sets(self.properties["face_sets"])
+        if self.properties["face_sets"]:
+            self.geometry.set_city_vertices(city_model.j["vertices"])
+        self.IFC_representation_maps = {}
         # self.geometry.build_vertices(self.IFC_model,
         #                             coords=city_model.j["vertices"],
         #                             scale=self.properties["local_scale"])
@@ -278,7 +288,7 @@ class Cityjson2ifc:
     def create_IFC_classes(self):
         parents_children_relations = {"IfcSite": {"Parent": self.IFC_site, "Children": []}}
         geometries = {}
-        for obj_id, obj in self.city_model.get_cityobjects().items():
+        for obj_id, obj in self.iter_city_objects():
             # CityJSON type to class
             try:
                 mapping = JSON_TO_IFC[obj.type]
@@ -302,8 +312,8 @@ class Cityjson2ifc:
 
             IFC_semantic_surface_children = []
             IFC_shape_representations = []
-            for geometry in obj.geometry:
-                lod = geometry.lod
+            for geometry, json_geometry in zip(obj.geometry, self.get_json_geometries(obj_id)):
+                lod = self.get_lod(geometry, json_geometry)
                 if self.properties["lod"] is not None and lod != self.properties["lod"]:
                     continue
                 if lod not in self.IFC_representation_sub_contexts:
@@ -312,10 +322,19 @@ class Cityjson2ifc:
                 IFC_geometry, shape_representation_type = None, None
 
                 if geometry and geometry.surfaces:
-                    IFC_semantic_surface_children.extend(self.create_IFC_semantic_surface_children(geometry, lod))
+                    IFC_semantic_surface_children.extend(
+                        self.create_IFC_semantic_surface_children(geometry, lod, json_geometry)
+                    )
+                elif geometry and geometry.type == "GeometryInstance" and self.properties["face_sets"]:
+                    representation_map = self.get_IFC_representation_map(json_geometry["template"])
+                    if representation_map:
+                        IFC_geometry = self.geometry.create_IFC_mapped_item(
+                            self.IFC_model, json_geometry, representation_map
+                        )
+                        shape_representation_type = "MappedRepresentation"
                 elif geometry:
                     IFC_geometry, shape_representation_type = self.geometry.create_IFC_geometry(
-                        self.IFC_model, geometry
+                        self.IFC_model, geometry, json_geometry
                     )
                 if IFC_geometry:
                     IFC_shape_representation = self.create_IFC_shape_representation(
@@ -368,16 +387,66 @@ class Cityjson2ifc:
                 },
             )
 
-    def create_IFC_semantic_surface_children(self, geometry, lod):
+    def iter_city_objects(self):
+        # City objects are converted in batches, so that the vertices of the
+        # face sets of a batch are prepared at once.
+        city_objects = iter(self.city_model.get_cityobjects().items())
+        while batch := list(itertools.islice(city_objects, self.properties["batch_size"])):
+            if self.properties["face_sets"]:
+                point_lists = self.geometry.build_point_lists([self.get_json_geometries(obj_id) for obj_id, _ in batch])
+            for i, (obj_id, obj) in enumerate(batch):
+                if self.properties["face_sets"]:
+                    self.geometry.set_points(point_lists[i])
+                yield obj_id, obj
+        self.geometry.set_points(None)
+
+    def get_json_geometries(self, obj_id):
+        return self.city_model.j["CityObjects"][obj_id].get("geometry", [])
+
+    def get_lod(self, geometry, json_geometry):
+        # Geometry instances have the LoD of their template
+        if geometry.type == "GeometryInstance":
+            return str(self.get_template(json_geometry["template"])["lod"])
+        return geometry.lod
+
+    def get_template(self, template_id):
+        return self.city_model.j["geometry-templates"]["templates"][template_id]
+
+    def get_IFC_representation_map(self, template_id):
+        if template_id in self.IFC_representation_maps:
+            return self.IFC_representation_maps[template_id]
+
+        template = self.get_template(template_id)
+        IFC_geometry = self.geometry.create_IFC_template_geometry(
+            self.IFC_model, template, self.city_model.j["geometry-templates"]["vertices-templates"]
+        )
+        representation_map = None
+        if IFC_geometry:
+            origin = self.IFC_model.create_entity(
+                "IfcAxis2Placement3D", self.IFC_model.create_entity("IfcCartesianPoint", (0.0, 0.0, 0.0))
+            )
+            IFC_shape_representation = self.create_IFC_shape_representation(
+                IFC_geometry, "Tessellation", str(template["lod"])
+            )
+            representation_map = self.IFC_model.create_entity(
+                "IfcRepresentationMap", MappingOrigin=origin, MappedRepresentation=IFC_shape_representation
+            )
+        self.IFC_representation_maps[template_id] = representation_map
+        return representation_map
+
+    def create_IFC_semantic_surface_children(self, geometry, lod, json_geometry=None):
         IFC_semantic_surface_children = []
         for surface_id in geometry.surfaces:
             IFC_child_class = JSON_TO_IFC[geometry.surfaces[surface_id]["type"]][0]
             child_data = {"GlobalId": ifcopenshell.guid.new(), "Name": IFC_child_class}
 
             # CREATE ENTITY
-            surface_geometry = self.geometry.create_IFC_surface(self.IFC_model, geometry, surface_id)
+            surface_geometry = self.geometry.create_IFC_surface(self.IFC_model, geometry, surface_id, json_geometry)
             if surface_geometry:
-                IFC_shape_representation = self.create_IFC_shape_representation(surface_geometry, "brep", lod)
+                shape_representation_type = "Tessellation" if self.properties["face_sets"] else "brep"
+                IFC_shape_representation = self.create_IFC_shape_representation(
+                    surface_geometry, shape_representation_type, lod
+                )
 
                 child_data["Representation"] = self.IFC_model.create_entity(
                     "IfcProductDefinitionShape", Representations=[IFC_shape_representation]
@@ -16,17 +16,90 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with ifccityjson.  If not, see <http://www.gnu.org/licenses/>.
 
+import itertools
 import warnings
+import numpy as np
+
+# Nesting depth of the vertex indices in the boundaries of geometries which
+# may be created as face sets.
+# https://www.cityjson.org/dev/geom-arrays/
+FACE_SET_DEPTHS = {"CompositeSurface": 3, "MultiSurface": 3, "Solid": 4, "CompositeSolid": 5, "MultiSolid": 5}
+
+
+class PointList:
+    """The vertices used by the face sets of a single city object or template
+
+    The IfcCartesianPointList3D is only created once a face set uses it.
+    """
+
+    def __init__(self, coordinates, vertex_ids):
+        self.coordinates = coordinates
+        # CityJSON vertex indices to 1-based IFC indices
+        self.indices = dict(zip(vertex_ids.tolist(), range(1, len(vertex_ids) + 1)))
+        self.IFC_point_list = None
+
+    def get_IFC_point_list(self, IFC_model):
+        if self.IFC_point_list is None:
+            self.IFC_point_list = IFC_model.create_entity("IfcCartesianPointList3D", self.coordinates.tolist())
+        return self.IFC_point_list
 
 
 class GeometryIO:
-    def __init__(self, scale=None):
+    def __init__(self, scale=None, face_sets=False):
         self.vertices = {}
         self.scale = scale
+        self.face_sets = face_sets
+        self.city_vertices = None
+        self.points = None
 
     def set_scale(self, scale):
         self.scale = scale
 
+    def set_face_sets(self, face_sets):
+        self.face_sets = face_sets
+
+    def set_city_vertices(self, vertices):
+        self.city_vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+        if self.scale:
+            self.city_vertices *= np.asarray(self.scale, dtype=np.float64)
+
+    def set_points(self, points):
+        self.points = points
+
+    def get_vertex_indices(self, json_geometry):
+        indices = json_geometry["boundaries"]
+        for _ in range(FACE_SET_DEPTHS[json_geometry["type"]] - 1):
+            indices = itertools.chain.from_iterable(indices)
+        return np.fromiter(indices, dtype=np.int64)
+
+    def build_point_lists(self, objects_geometries):
+        """Builds the point lists of a batch of city objects
+
+        Each city object gets one point list, shared by all of its face sets,
+        containing each vertex it uses once. Vertices of the whole batch are
+        deduplicated in a single pass.
+
+        :param objects_geometries: For each city object, its list of CityJSON
+            geometries.
+        :return: A list of PointList, or None if a city object has no face
+            sets, in the same order as the city objects.
+        """
+        total = len(self.city_vertices)
+        keys = []
+        for i, geometries in enumerate(objects_geometries):
+            for json_geometry in geometries:
+                if json_geometry["type"] in FACE_SET_DEPTHS:
+                    keys.append(self.get_vertex_indices(json_geometry) + i * total)
+        if not keys:
+            return [None] * len(objects_geometries)
+        objects, vertex_ids = np.divmod(np.unique(np.concatenate(keys)), total)
+        coordinates = self.city_vertices[vertex_ids]
+        bounds = np.searchsorted(objects, np.arange(len(objects_geometries) + 1))
+        return [
+            PointList(coordinates[start:end], vertex_ids[start:end]) if start != end else None
+            for start, end in zip(bounds[:-1], bounds[1:])
+        ]
+
     def build_vertices(self, IFC_model, vertices):
         for vertex in vertices:
             self.build_vertex(IFC_model, vertex)
@@ -50,10 +123,12 @@ class GeometryIO:
     # See for CityJSON geometries:
     # https://www.cityjson.org/dev/geom-arrays/
     # https://www.cityjson.org/specs/1.0.3/#geometry-objects
-    def create_IFC_geometry(self, IFC_model, geometry):
+    def create_IFC_geometry(self, IFC_model, geometry, json_geometry=None):
         IFC_Geometry = None
         geometry_type = "brep"
-        if geometry.type in ["MultiPoint"]:
+        if self.face_sets and geometry.type in FACE_SET_DEPTHS:
+            return self.create_IFC_face_sets(IFC_model, json_geometry, self.points), "Tessellation"
+        elif geometry.type in ["MultiPoint"]:
             IFC_geometry = self.create_IFC_cartesian_point_list3D(IFC_model, geometry)
             geometry_type = "PointCloud"
         elif geometry.type in ["MultiLineString"]:
@@ -125,13 +200,21 @@ class GeometryIO:
         #         for triangle in face:
         #             print(triangle)
 
-    def create_IFC_surface(self, IFC_model, geometry, surface_id=None):
+    def create_IFC_surface(self, IFC_model, geometry, surface_id=None, json_geometry=None):
         faces = []
 
         if surface_id is not None:
             face_ids = geometry.surfaces[surface_id]["surface_idx"]
             if face_ids is None:
                 return  # there is no geometry
+            if self.face_sets:
+                faces = []
+                for fid in face_ids:
+                    face = json_geometry["boundaries"]
+                    for i in fid:
+                        face = face[i]
+                    faces.append(face)
+                return self.create_IFC_face_set(IFC_model, faces, self.points)
             faces = [geometry.boundaries[fid[0]] for fid in face_ids]
         else:
             faces = geometry.boundaries
@@ -164,3 +247,72 @@ class GeometryIO:
             polyloop = IFC_model.create_entity("IfcPolyLoop", Polygon=vertices)
             innerbounds.append(IFC_model.create_entity("IfcFaceBound", Bound=polyloop, Orientation=False))
         return IFC_model.create_entity("IfcFace", Bounds=[outerbound] + innerbounds)
+
+    def create_IFC_face_sets(self, IFC_model, json_geometry, points):
+        # https://standards.buildingsmart.org/IFC/RELEASE/IFC4/ADD2_TC1/HTML/schema/ifcgeometricmodelresource/lexical/ifcpolygonalfaceset.htm
+        boundaries = json_geometry["boundaries"]
+        if json_geometry["type"] in ["CompositeSurface", "MultiSurface"]:
+            return self.create_IFC_face_set(IFC_model, boundaries, points)
+        elif json_geometry["type"] == "Solid":
+            if len(boundaries) > 1:
+                warnings.warn("Solid interior shell not yet supported")
+                return
+            return self.create_IFC_face_set(IFC_model, boundaries[0], points, closed=True)
+        # exterior shells
+        return [self.create_IFC_face_set(IFC_model, solid[0], points, closed=True) for solid in boundaries]
+
+    def create_IFC_face_set(self, IFC_model, faces, points, closed=False):
+        indices = points.indices
+        faces = [[[indices[vertex] for vertex in ring] for ring in face] for face in faces]
+        IFC_point_list = points.get_IFC_point_list(IFC_model)
+        if all(len(face) == 1 and len(face[0]) == 3 for face in faces):
+            return IFC_model.create_entity(
+                "IfcTriangulatedFaceSet",
+                Coordinates=IFC_point_list,
+                Closed=closed,
+                CoordIndex=[face[0] for face in faces],
+            )
+
+        IFC_faces = []
+        for face in faces:
+            if len(face) == 1:
+                IFC_faces.append(IFC_model.create_entity("IfcIndexedPolygonalFace", CoordIndex=face[0]))
+            else:
+                IFC_faces.append(
+                    IFC_model.create_entity(
+                        "IfcIndexedPolygonalFaceWithVoids", CoordIndex=face[0], InnerCoordIndices=face[1:]
+                    )
+                )
+        return IFC_model.create_entity(
+            "IfcPolygonalFaceSet", Coordinates=IFC_point_list, Closed=closed, Faces=IFC_faces
+        )
+
+    def create_IFC_template_geometry(self, IFC_model, template, vertices):
+        # Template vertices are never transformed
+        # https://www.cityjson.org/specs/1.1.3/#geometry-templates
+        if template["type"] not in FACE_SET_DEPTHS:
+            warnings.warn(f"{template['type']} geometry templates are not supported.")
+            return
+        vertex_ids = np.unique(self.get_vertex_indices(template))
+        points = PointList(np.asarray(vertices, dtype=np.float64)[vertex_ids], vertex_ids)
+        return self.create_IFC_face_sets(IFC_model, template, points)
+
+    def create_IFC_mapped_item(self, IFC_model, json_geometry, representation_map):
+        # https://www.cityjson.org/specs/1.1.3/#geometryinstance-geometry
+        # https://standards.buildingsmart.org/IFC/RELEASE/IFC4/ADD2_TC1/HTML/schema/ifcgeometryresource/lexical/ifccartesiantransformationoperator3dnonuniform.htm
+        matrix = np.asarray(json_geometry.get("transformationMatrix", np.eye(4).ravel()), dtype=np.float64)
+        matrix = matrix.reshape(4, 4)
+        reference_point = self.city_vertices[json_geometry["boundaries"][0]]
+        scales = np.linalg.norm(matrix[:3, :3], axis=0)
+        axes = matrix[:3, :3] / np.where(scales, scales, 1.0)
+        operator = IFC_model.create_entity(
+            "IfcCartesianTransformationOperator3DnonUniform",
+            Axis1=IFC_model.create_entity("IfcDirection", axes[:, 0].tolist()),
+            Axis2=IFC_model.create_entity("IfcDirection", axes[:, 1].tolist()),
+            LocalOrigin=IFC_model.create_entity("IfcCartesianPoint", (reference_point + matrix[:3, 3]).tolist()),
+            Scale=float(scales[0]),
+            Axis3=IFC_model.create_entity("IfcDirection", axes[:, 2].tolist()),
+            Scale2=float(scales[1]),
+            Scale3=float(scales[2]),
+        )
+        return IFC_model.create_entity("IfcMappedItem", MappingSource=representation_map, MappingTarget=operator)
@@ -22,6 +22,7 @@ import sys
 import json
 import logging
 import argparse
+import multiprocessing
 from .ifcclash import Clasher, ClashSettings
 
 parser = argparse.ArgumentParser(description="Clashes geometry between two IFC files")
@@ -29,17 +30,27 @@ parser.add_argument("input", type=str, help="A JSON dataset describing a series
 parser.add_argument(
     "-o", "--output", type=str, help="The JSON diff file to output. Defaults to output.json", default="output.json"
 )
-args = parser.parse_args()
+parser.add_argument(
+    "-p",
+    "--processes",
+    type=int,
+    help="The number of processes used to write BCF files. Defaults to the number of CPUs",
+    default=multiprocessing.cpu_count(),
+)
+
+if __name__ == "__main__":
+    args = parser.parse_args()
 
-settings = ClashSettings()
-settings.output = args.output
-settings.logger = logging.getLogger("Clash")
-settings.logger.setLevel(logging.DEBUG)
-handler = logging.StreamHandler(sys.stdout)
-handler.setLevel(logging.DEBUG)
-settings.logger.addHandler(handler)
-ifc_clasher = Clasher(settings)
-with open(args.input, "r") as clash_sets_file:
-    ifc_clasher.clash_sets = json.loads(clash_sets_file.read())
-ifc_clasher.clash()
-ifc_clasher.export()
+    settings = ClashSettings()
+    settings.output = args.output
+    settings.processes = args.processes
+    settings.logger = logging.getLogger("Clash")
+    settings.logger.setLevel(logging.DEBUG)
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setLevel(logging.DEBUG)
+    settings.logger.addHandler(handler)
+    ifc_clasher = Clasher(settings)
+    with open(args.input, "r") as clash_sets_file:
+        ifc_clasher.clash_sets = json.loads(clash_sets_file.read())
+    ifc_clasher.clash()
+    ifc_clasher.export()
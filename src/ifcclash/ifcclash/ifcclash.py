@@ -151,12 +151,41 @@ class Clasher:
         self.export_json()
 
     def export_bcfxml(self):
+        # Snapshots can only be taken one viewpoint at a time.
+        if getattr(self.get_viewpoint_snapshot, "__func__", None) is not Clasher.get_viewpoint_snapshot:
+            return self.export_bcfxml_with_snapshots()
+
+        from bcf.v2.bulk import write_topics
+
+        for i, clash_set in enumerate(self.clash_sets):
+            suffix = f".{i}" if i else ""
+            write_topics(
+                f"{self.settings.output}{suffix}",
+                self.get_clash_topics(clash_set),
+                project_name=clash_set["name"],
+                processes=self.settings.processes,
+            )
+
+    def get_clash_topics(self, clash_set):
+        from bcf.v2.bulk import NewTopic
+
+        for clash in clash_set["clashes"].values():
+            title = self.get_clash_title(clash)
+            yield NewTopic(
+                title=title,
+                description=title,
+                author="IfcClash",
+                position=np.array(clash["position"]),
+                guids=(clash["a_global_id"], clash["b_global_id"]),
+            )
+
+    def export_bcfxml_with_snapshots(self):
         from bcf.v2.bcfxml import BcfXml
 
         for i, clash_set in enumerate(self.clash_sets):
             bcfxml = BcfXml.create_new(clash_set["name"])
             for clash in clash_set["clashes"].values():
-                title = f'{clash["a_ifc_class"]}/{clash["a_name"]} and {clash["b_ifc_class"]}/{clash["b_name"]}'
+                title = self.get_clash_title(clash)
                 topic = bcfxml.add_topic(title, title, "IfcClash")
                 viewpoint = topic.add_viewpoint_from_point_and_guids(
                     np.array(clash["position"]),
@@ -170,6 +199,9 @@ class Clasher:
             suffix = f".{i}" if i else ""
             bcfxml.save_project(f"{self.settings.output}{suffix}")
 
+    def get_clash_title(self, clash):
+        return f'{clash["a_ifc_class"]}/{clash["a_name"]} and {clash["b_ifc_class"]}/{clash["b_name"]}'
+
     def get_viewpoint_snapshot(self, viewpoint):
         # Possible to overload this function in a GUI application if used as a library.
         # Should return a tuple of (filename, bytes).
@@ -280,3 +312,5 @@ class ClashSettings:
     def __init__(self):
         self.logger = None
         self.output = "clashes.json"
+        # Worker processes used to write BCF files
+        self.processes = 1
@@ -19,6 +19,7 @@
 import os
 import re
 import csv
+import contextlib
 import importlib
 
 try:
@@ -60,6 +61,12 @@ class Parser:
             self.config = preset
 
     def parse(self, ifc_file, name=None):
+        # Presets may gather lookups shared by many rows in bulk beforehand
+        prefetch = self.config.get("prefetch", None)
+        with prefetch(ifc_file) if prefetch else contextlib.nullcontext():
+            self.parse_categories(ifc_file)
+
+    def parse_categories(self, ifc_file):
         for category_name, category_config in self.config["categories"].items():
             self.categories.setdefault(category_name, {})
             for element in category_config["get_category_elements"](ifc_file):
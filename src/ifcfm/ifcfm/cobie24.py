@@ -16,7 +16,9 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with IfcFM.  If not, see <http://www.gnu.org/licenses/>.
 
+import contextlib
 import ifcopenshell
+import ifcopenshell.util.element
 import ifcopenshell.util.fm
 import ifcopenshell.util.date
 import ifcopenshell.util.system
@@ -34,6 +36,120 @@ import ifcopenshell.util.classification
 # Impact, Coordinate, Issue, Picklist
 
 
+class Prefetch:
+    """Lookups shared by many rows, gathered in bulk passes over the file
+
+    Types, components, and the latest owner history are used by several
+    categories, and psets, types, and systems are looked up for every row.
+    Rather than walking inverse attributes per row, each relationship class
+    is iterated once. Property sets are only parsed once, even if shared by
+    many elements or inherited from a type, and categories and owner history
+    details are only derived once per element.
+    """
+
+    def __init__(self, ifc_file):
+        self.file = ifc_file
+        self.types = get_types(ifc_file)
+        self.history = get_history(ifc_file)
+        self.element_types = {}
+        for rel in ifc_file.by_type("IfcRelDefinesByType"):
+            for element in rel.RelatedObjects:
+                self.element_types.setdefault(element, rel.RelatingType)
+        types = set(self.types)
+        self.components = {e for e, t in self.element_types.items() if t in types}
+        self.definitions = {}
+        for rel in ifc_file.by_type("IfcRelDefinesByProperties"):
+            for element in rel.RelatedObjects:
+                self.definitions.setdefault(element, []).append(rel.RelatingPropertyDefinition)
+        self.systems = {}
+        for rel in ifc_file.by_type("IfcRelAssignsToGroup"):
+            if rel.RelatingGroup.is_a() in ("IfcSystem", "IfcDistributionSystem", "IfcBuildingSystem", "IfcZone"):
+                for element in rel.RelatedObjects:
+                    self.systems.setdefault(element, []).append(rel.RelatingGroup)
+        self.properties = {}
+        self.psets = {}
+        self.lookups = {}
+
+    def lookup(self, function, element):
+        # Memoises lookups which are repeated for many rows, such as the
+        # category of a system or the author of an owner history.
+        results = self.lookups.setdefault(function, {})
+        if element not in results:
+            results[element] = function(element)
+        return results[element]
+
+    def get_property_definition(self, definition):
+        if (properties := self.properties.get(definition)) is None:
+            properties = ifcopenshell.util.element.get_property_definition(definition)
+            self.properties[definition] = properties
+        return properties
+
+    def get_psets(self, element):
+        # Equivalent to ifcopenshell.util.element.get_psets
+        if (psets := self.psets.get(element)) is not None:
+            return psets
+        if element.is_a("IfcTypeObject"):
+            psets = {}
+            for definition in element.HasPropertySets or []:
+                psets.setdefault(definition.Name, {}).update(self.get_property_definition(definition))
+        elif getattr(element, "IsDefinedBy", None) is not None:
+            psets = {}
+            if element_type := self.element_types.get(element):
+                psets = {name: props.copy() for name, props in self.get_psets(element_type).items()}
+            for definition in self.definitions.get(element, ()):
+                psets.setdefault(definition.Name, {}).update(self.get_property_definition(definition))
+        else:
+            psets = ifcopenshell.util.element.get_psets(element)
+        self.psets[element] = psets
+        return psets
+
+
+# Set while parsing, see prefetch()
+prefetched = None
+
+
+@contextlib.contextmanager
+def prefetch(ifc_file):
+    global prefetched
+    previous = prefetched
+    has_index = ifcopenshell.util.element.get_decomposition_index(ifc_file) is not None
+    if not has_index:
+        ifcopenshell.util.element.enable_decomposition_index(ifc_file)
+    prefetched = Prefetch(ifc_file)
+    try:
+        yield prefetched
+    finally:
+        prefetched = previous
+        if not has_index:
+            ifcopenshell.util.element.disable_decomposition_index(ifc_file)
+
+
+def get_prefetched(element):
+    # Lookups are only prefetched for the file being parsed
+    if prefetched is not None and element.file == prefetched.file:
+        return prefetched
+
+
+def get_psets(element):
+    if lookups := get_prefetched(element):
+        return lookups.get_psets(element)
+    return ifcopenshell.util.element.get_psets(element)
+
+
+def get_type(element):
+    if lookups := get_prefetched(element):
+        if element.is_a("IfcTypeObject"):
+            return element
+        return lookups.element_types.get(element)
+    return ifcopenshell.util.element.get_type(element)
+
+
+def get_element_systems(element):
+    if lookups := get_prefetched(element):
+        return lookups.systems.get(element, [])
+    return ifcopenshell.util.system.get_element_systems(element)
+
+
 def get_contacts(ifc_file):
     return ifc_file.by_type("IfcActor")
 
@@ -70,10 +186,14 @@ def get_zones(ifc_file):
 
 
 def get_types(ifc_file):
+    if prefetched is not None and prefetched.file == ifc_file:
+        return prefetched.types
     return ifcopenshell.util.fm.get_cobie_types(ifc_file)
 
 
 def get_components(ifc_file):
+    if prefetched is not None and prefetched.file == ifc_file:
+        return prefetched.components
     elements = set()
     for element_type in get_types(ifc_file):
         elements.update(ifcopenshell.util.element.get_types(element_type))
@@ -205,7 +325,7 @@ def get_attributes(ifc_file):
 
     for sheet_name, get_sheet in get_sheets.items():
         for element in get_sheet(ifc_file):
-            for pset_name, props in ifcopenshell.util.element.get_psets(element).items():
+            for pset_name, props in get_psets(element).items():
                 pset = ifc_file.by_id(props["id"])
                 pset_created_by = get_created_by(pset) or created_by
                 pset_created_on = get_created_on(pset) or created_on
@@ -357,7 +477,7 @@ def get_floor_data(ifc_file, element):
     }
 
     height = None
-    for _, props in ifcopenshell.util.element.get_psets(element).items():
+    for _, props in get_psets(element).items():
         if height is not None:
             break
         for name, value in props.items():
@@ -396,7 +516,7 @@ def get_space_data(ifc_file, element):
     gross_area_names = {"GrossFloorArea", "GSA"}
     net_area = None
     net_area_names = {"NetFloorArea", "GSA"}
-    for _, props in ifcopenshell.util.element.get_psets(element).items():
+    for _, props in get_psets(element).items():
         for name, value in props.items():
             if not room_tag and name in room_tag_names and val(value):
                 room_tag = str(value)
@@ -478,7 +598,7 @@ def get_type_data(ifc_file, element):
     code_performance = None
     sustainability_performance = None
 
-    for pset_name, props in ifcopenshell.util.element.get_psets(element).items():
+    for pset_name, props in get_psets(element).items():
         pset_warranty_type = None
         if pset_name == "COBie_Warranty":
             warranty_guarantor_parts = props.get("WarrantyGuarantorParts", None)
@@ -558,11 +678,11 @@ def get_type_data(ifc_file, element):
 def get_component_data(ifc_file, element):
     space = ifcopenshell.util.element.get_container(element)
     space_name = space.Name if space.is_a("IfcSpace") else None
-    systems = ifcopenshell.util.system.get_element_systems(element)
+    systems = get_element_systems(element)
     system = systems[0].Name if systems else None
 
     type_name = None
-    relating_type = ifcopenshell.util.element.get_type(element)
+    relating_type = get_type(element)
     if relating_type and val(relating_type.Name):
         type_name = relating_type.Name
     else:
@@ -576,7 +696,7 @@ def get_component_data(ifc_file, element):
     bar_code = None
     asset_identifier = None
 
-    for _, props in ifcopenshell.util.element.get_psets(element).items():
+    for _, props in get_psets(element).items():
         for name, value in props.items():
             if not serial_number and name == "SerialNumber" and val(value):
                 serial_number = str(value)
@@ -701,7 +821,7 @@ def get_spare_data(ifc_file, element):
     suppliers = None
     set_number = None
     part_number = None
-    for _, props in ifcopenshell.util.element.get_psets(element).items():
+    for _, props in get_psets(element).items():
         for name, value in props.items():
             if name == "Suppliers" and val(value):
                 suppliers = str(value)
@@ -760,7 +880,7 @@ def get_job_data(ifc_file, element):
     frequency = None
     frequency_unit = None
 
-    for _, props in ifcopenshell.util.element.get_psets(element).items():
+    for _, props in get_psets(element).items():
         pset = ifc_file.by_id(props["id"])
         for name, value in props.items():
             if not duration and name == "TaskDuration" and val(value):
@@ -879,6 +999,12 @@ def get_created_by(element):
 
 
 def get_email_from_history(element):
+    if prefetched is not None:
+        return prefetched.lookup(_get_email_from_history, element)
+    return _get_email_from_history(element)
+
+
+def _get_email_from_history(element):
     pao = element.OwningUser
     if pao.is_a("IfcPersonAndOrganization"):
         return get_email_from_pao(pao.ThePerson, pao.TheOrganization)
@@ -907,10 +1033,16 @@ def get_owner_name(element):
 
 def get_created_on(element):
     if getattr(element, "OwnerHistory", None):
-        return ifcopenshell.util.date.ifc2datetime(element.OwnerHistory.CreationDate).isoformat()
+        if prefetched is not None:
+            return prefetched.lookup(get_creation_date, element.OwnerHistory)
+        return get_creation_date(element.OwnerHistory)
     return "1900-12-31T23:59:59"  # Yes, really
 
 
+def get_creation_date(history):
+    return ifcopenshell.util.date.ifc2datetime(history.CreationDate).isoformat()
+
+
 def get_external_system(element):
     if getattr(element, "OwnerHistory", None):
         return val(element.OwnerHistory.OwningApplication.ApplicationFullName)
@@ -942,7 +1074,7 @@ def get_area_measurement(element):
             if result:
                 return result
 
-    psets = ifcopenshell.util.element.get_psets(element)
+    psets = get_psets(element)
     if psets:
         for _, props in psets.items():
             for name, value in props.items():
@@ -951,6 +1083,12 @@ def get_area_measurement(element):
 
 
 def get_category(element):
+    if prefetched is not None:
+        return prefetched.lookup(_get_category, element)
+    return _get_category(element)
+
+
+def _get_category(element):
     references = list(ifcopenshell.util.classification.get_references(element))
     results = []
     for reference in references:
@@ -991,6 +1129,8 @@ def get_property(psets, pset_name, prop_name, decimals=None):
 
 
 def get_history(ifc_file):
+    if prefetched is not None and prefetched.file == ifc_file:
+        return prefetched.history
     histories = ifc_file.by_type("IfcOwnerHistory")
     if histories:
         return sorted(histories, key=lambda x: x.id())[-1]
@@ -1037,6 +1177,7 @@ def get_sheet_name(element):
 
 config = {
     "name": "COBie 2.4",
+    "prefetch": prefetch,
     "description": "Construction-Operations Building information exchange specification by NBIMS-US and BS 1192-4:2014.",
     "colours": {
         "h": "c0c0c0",  # Header data
@@ -146,13 +146,24 @@ def open(path: Union[os.PathLike, str], format: Optional[str] = None, should_str
             return file(f)
         raise IOError(f"Failed to parse .ifcXML file from {path}")
     if format == ".ifcZIP":
-        with tempfile.TemporaryDirectory() as unzipped_path:
-            with zipfile.ZipFile(path) as zf:
-                for name in zf.namelist():
-                    if Path(name).suffix.lower() in (".ifc", ".ifcxml"):
+        with zipfile.ZipFile(path) as zf:
+            for name in zf.namelist():
+                suffix = Path(name).suffix.lower()
+                if suffix == ".ifc":
+                    # Parse straight from memory rather than extracting to a
+                    # temporary directory first.
+                    try:
+                        data = zf.read(name).decode("utf-8")
+                    except UnicodeDecodeError:
+                        pass
+                    else:
+                        return file.from_string(data)
+                if suffix in (".ifc", ".ifcxml"):
+                    # The ifcXML parser (and non UTF-8 IFC-SPF) requires a path.
+                    with tempfile.TemporaryDirectory() as unzipped_path:
                         return open(zf.extract(name, unzipped_path))
-                else:
-                    raise LookupError(f"No .ifc or .ifcXML file found in {path}")
+            else:
+                raise LookupError(f"No .ifc or .ifcXML file found in {path}")
     if format == ".ifcSQLite":
         return sqlite(path)
     if should_stream:
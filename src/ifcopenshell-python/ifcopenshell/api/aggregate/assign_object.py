@@ -154,6 +154,8 @@ def assign_object(
             }
         )
 
+    ifcopenshell.util.element.invalidate_decomposition_index(file, products_to_change)
+
     # localize placement relative to a new aggregate for affected products
     for product in products_to_change:
         placement = getattr(product, "ObjectPlacement", None)
@@ -75,3 +75,4 @@ def unassign_object(file: ifcopenshell.file, products: list[ifcopenshell.entity_
             file.remove(rel)
             if history:
                 ifcopenshell.util.element.remove_deep2(file, history)
+    ifcopenshell.util.element.invalidate_decomposition_index(file, products)
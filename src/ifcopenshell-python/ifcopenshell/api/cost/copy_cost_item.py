@@ -60,7 +60,10 @@ def copy_cost_item(
 class Usecase:
     def execute(self):
         self.new_cost_items = []
-        return self.duplicate_cost_item(self.settings["cost_item"])
+        new_cost_item = self.duplicate_cost_item(self.settings["cost_item"])
+        # The nesting of duplicates may be edited directly.
+        ifcopenshell.util.element.invalidate_decomposition_index(self.file, self.new_cost_items)
+        return new_cost_item
 
     def duplicate_cost_item(self, cost_item):
         new_cost_item = ifcopenshell.util.element.copy_deep(self.file, cost_item)
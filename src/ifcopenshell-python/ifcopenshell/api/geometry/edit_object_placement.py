@@ -76,6 +76,7 @@ class Usecase:
 
         new_placement.PlacementRelTo = placement_rel_to
         self.settings["product"].ObjectPlacement = new_placement
+        ifcopenshell.util.placement.invalidate_placement_cache(self.file, new_placement)
 
         ifcopenshell.api.owner.update_owner_history(self.file, **{"element": self.settings["product"]})
 
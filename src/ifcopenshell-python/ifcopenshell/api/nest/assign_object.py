@@ -172,6 +172,8 @@ def assign_object(
             }
         )
 
+    ifcopenshell.util.element.invalidate_decomposition_index(file, objects_to_change)
+
     # NOTE: Creating a nesting relationship doesn't localize the object's placement,
     # unlike assigning it to an aggregate or a container.
 
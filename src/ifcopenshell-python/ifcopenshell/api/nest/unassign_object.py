@@ -72,3 +72,4 @@ def unassign_object(file: ifcopenshell.file, related_objects: list[ifcopenshell.
             file.remove(rel)
             if history:
                 ifcopenshell.util.element.remove_deep2(file, history)
+    ifcopenshell.util.element.invalidate_decomposition_index(file, related_objects_set)
@@ -28,7 +28,9 @@ from .add_pset import add_pset
 from .add_qto import add_qto
 from .assign_pset import assign_pset
 from .edit_pset import edit_pset
+from .edit_psets import edit_psets
 from .edit_qto import edit_qto
+from .edit_qtos import edit_qtos
 from .remove_pset import remove_pset
 from .unassign_pset import unassign_pset
 from .unshare_pset import unshare_pset
@@ -40,7 +42,9 @@ __all__ = [
     "add_qto",
     "assign_pset",
     "edit_pset",
+    "edit_psets",
     "edit_qto",
+    "edit_qtos",
     "remove_pset",
     "unassign_pset",
     "unshare_pset",
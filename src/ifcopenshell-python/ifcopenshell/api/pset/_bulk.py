@@ -0,0 +1,88 @@
+# IfcOpenShell - IFC toolkit and geometry engine
+# Copyright (C) 2026 Dion Moult <dion@thinkmoult.com>
+#
+# This file is part of IfcOpenShell.
+#
+# IfcOpenShell is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# IfcOpenShell is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with IfcOpenShell.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Helpers shared by :func:`ifcopenshell.api.pset.edit_psets` and
+:func:`ifcopenshell.api.pset.edit_qtos`"""
+
+import ifcopenshell
+import ifcopenshell.api.owner
+import ifcopenshell.guid
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+def get_property_definitions(element: ifcopenshell.entity_instance) -> dict[str, ifcopenshell.entity_instance]:
+    """Returns the property and quantity sets of an element by name"""
+    if element.is_a("IfcTypeObject"):
+        return {definition.Name: definition for definition in element.HasPropertySets or []}
+    definitions = {}
+    for rel in element.IsDefinedBy or []:
+        if rel.is_a("IfcRelDefinesByProperties"):
+            definitions.setdefault(rel.RelatingPropertyDefinition.Name, rel.RelatingPropertyDefinition)
+    return definitions
+
+
+def get_factory_cache(create_factory: Callable[[str], T]) -> Callable[[str], T]:
+    """Returns a function which creates a factory once per set name"""
+    factories: dict[str, T] = {}
+
+    def get_factory(name: str) -> T:
+        if (factory := factories.get(name)) is None:
+            factory = factories[name] = create_factory(name)
+        return factory
+
+    return get_factory
+
+
+def add_property_definitions(
+    file: ifcopenshell.file,
+    ifc_class: str,
+    new_definitions: list[tuple[ifcopenshell.entity_instance, str, dict[str, Any]]],
+    get_attributes: Callable[[str, dict[str, Any]], dict[str, Any]],
+) -> None:
+    """Adds property or quantity sets along with their relationships
+
+    :param ifc_class: Either IfcPropertySet or IfcElementQuantity.
+    :param new_definitions: The elements, set names and properties to add.
+    :param get_attributes: Returns the attributes of a new set, such as its
+        properties, given its name and properties.
+    """
+    owner_history = ifcopenshell.api.owner.create_owner_history(file)
+    global_ids = iter(ifcopenshell.guid.new_many(2 * len(new_definitions)))
+    type_definitions: dict[ifcopenshell.entity_instance, list[ifcopenshell.entity_instance]] = {}
+    for element, name, properties in new_definitions:
+        definition = file.create_entity(
+            ifc_class,
+            GlobalId=next(global_ids),
+            OwnerHistory=owner_history,
+            Name=name,
+            **get_attributes(name, properties),
+        )
+        if element.is_a("IfcTypeObject"):
+            type_definitions.setdefault(element, []).append(definition)
+        else:
+            file.create_entity(
+                "IfcRelDefinesByProperties",
+                GlobalId=next(global_ids),
+                OwnerHistory=owner_history,
+                RelatedObjects=[element],
+                RelatingPropertyDefinition=definition,
+            )
+    for element, definitions in type_definitions.items():
+        element.HasPropertySets = list(element.HasPropertySets or []) + definitions
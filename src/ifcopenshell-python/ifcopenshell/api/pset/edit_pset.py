@@ -430,8 +430,11 @@ class Usecase:
             elif isinstance(new_value, int):
                 return "IfcInteger"
 
+    def get_value_type(self, primary_measure_type: str) -> str:
+        return self.file.create_entity(primary_measure_type).attribute_type(0)
+
     def cast_value_to_primary_measure_type(self, value, primary_measure_type):
-        type_str = self.file.create_entity(primary_measure_type).attribute_type(0)
+        type_str = self.get_value_type(primary_measure_type)
         type_fn = {
             "AGGREGATE OF DOUBLE": list,
             "AGGREGATE OF INT": list,
@@ -0,0 +1,175 @@
+# IfcOpenShell - IFC toolkit and geometry engine
+# Copyright (C) 2021 Dion Moult <dion@thinkmoult.com>
+#
+# This file is part of IfcOpenShell.
+#
+# IfcOpenShell is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# IfcOpenShell is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with IfcOpenShell.  If not, see <http://www.gnu.org/licenses/>.
+
+import ifcopenshell
+import ifcopenshell.api.pset
+import ifcopenshell.util.pset
+from ifcopenshell.api.pset._bulk import add_property_definitions, get_factory_cache, get_property_definitions
+from ifcopenshell.api.pset.edit_pset import Usecase as EditPsetUsecase
+from typing import Any, Union
+
+
+def edit_psets(
+    file: ifcopenshell.file,
+    psets: dict[ifcopenshell.entity_instance, dict[str, dict[str, Any]]],
+    should_purge: bool = True,
+) -> None:
+    """Adds or edits property sets on many elements at once
+
+    This gives the same result as calling
+    :func:`ifcopenshell.api.pset.add_pset` and
+    :func:`ifcopenshell.api.pset.edit_pset` for every element and property
+    set, but is significantly faster when writing properties to thousands
+    of elements, such as when enriching a model with COBie data.
+
+    Property set templates and data types are only looked up once per
+    property set and property name. Properties with identical names, values,
+    and units are shared between property sets instead of being duplicated.
+    New property sets are created along with their relationships in bulk.
+
+    Editing a property which is shared with another property set, either
+    using this function or :func:`ifcopenshell.api.pset.edit_pset`, will
+    never affect the other property set.
+
+    :param psets: A dictionary where keys are elements, and values are
+        dictionaries of property set names to properties. Properties are
+        specified in the same way as
+        :func:`ifcopenshell.api.pset.edit_pset`. If an element does not yet
+        have a property set with that name, it is added.
+    :param should_purge: If set as False, properties set to None will be
+        left as None but not removed. See
+        :func:`ifcopenshell.api.pset.edit_pset`.
+    :return: None
+
+    Example:
+
+    .. code:: python
+
+        walls = model.by_type("IfcWall")
+        ifcopenshell.api.pset.edit_psets(model, psets={
+            wall: {"Pset_WallCommon": {"FireRating": "2HR", "IsExternal": True}} for wall in walls
+        })
+    """
+    usecase = Usecase()
+    usecase.file = file
+    usecase.settings = {"psets": psets, "should_purge": should_purge}
+    return usecase.execute()
+
+
+class Usecase:
+    file: ifcopenshell.file
+    settings: dict[str, Any]
+
+    def execute(self) -> None:
+        self.get_factory = get_factory_cache(
+            lambda name: PropertyFactory(self.file, name, self.settings["should_purge"])
+        )
+        new_psets = []
+        for element, psets in self.settings["psets"].items():
+            if element.is_a("IfcObject") or element.is_a("IfcContext") or element.is_a("IfcTypeObject"):
+                existing_psets = get_property_definitions(element)
+                for name, properties in psets.items():
+                    if pset := existing_psets.get(name):
+                        self.get_factory(name).edit(pset, properties)
+                    else:
+                        new_psets.append((element, name, properties))
+            else:
+                # Material and profile properties are rare enough to be added
+                # one at a time.
+                for name, properties in psets.items():
+                    pset = ifcopenshell.api.pset.add_pset(self.file, product=element, name=name)
+                    self.get_factory(name).edit(pset, properties)
+        if new_psets:
+            add_property_definitions(
+                self.file,
+                "IfcPropertySet",
+                new_psets,
+                lambda name, properties: {"HasProperties": self.get_factory(name).create_properties(properties)},
+            )
+
+
+class PropertyFactory(EditPsetUsecase):
+    """Creates and edits properties of property sets with the same name
+
+    The property set template and the data types of properties are resolved
+    once, and properties with identical values are shared.
+    """
+
+    def __init__(self, file: ifcopenshell.file, name: str, should_purge: bool):
+        self.file = file
+        self.settings = {"pset": None, "name": None, "properties": {}, "should_purge": should_purge}
+        self.pset_template = ifcopenshell.util.pset.get_template(file.schema_identifier).get_by_name(name)
+        self.measure_types = {}
+        self.value_types = {}
+        self.properties = {}
+        self.property_keys = {}
+
+    def edit(self, pset: ifcopenshell.entity_instance, properties: dict[str, Any]) -> None:
+        self.settings["pset"] = pset
+        self.settings["properties"] = properties.copy()
+        # Properties of this property set may be edited in place, so they
+        # must no longer be shared.
+        for prop in self.get_properties():
+            if (key := self.property_keys.pop(prop.id(), None)) is not None:
+                del self.properties[key]
+        existing_props = self.update_existing_properties()
+        self.assign_new_properties(existing_props + self.create_properties(self.settings["properties"]))
+
+    def create_properties(self, properties: dict[str, Any]) -> list[ifcopenshell.entity_instance]:
+        results = []
+        for name, value in properties.items():
+            key = (name, get_value_key(value))
+            try:
+                prop = self.properties.get(key, ...)
+            except TypeError:  # Unhashable values are never shared
+                key, prop = None, ...
+            if prop is ...:
+                self.settings["properties"] = {name: value}
+                prop = next(iter(self.add_new_properties()), None)
+                if key is not None and prop is not None:
+                    self.properties[key] = prop
+                    self.property_keys[prop.id()] = key
+            if prop is not None:
+                results.append(prop)
+        return results
+
+    def get_primary_measure_type(self, name, old_value=None, new_value=None):
+        if old_value is not None:
+            return super().get_primary_measure_type(name, old_value=old_value, new_value=new_value)
+        key = (name, new_value.is_a() if hasattr(new_value, "is_a") else type(new_value))
+        if key not in self.measure_types:
+            self.measure_types[key] = super().get_primary_measure_type(name, new_value=new_value)
+        return self.measure_types[key]
+
+    def get_value_type(self, primary_measure_type: str) -> str:
+        if primary_measure_type not in self.value_types:
+            self.value_types[primary_measure_type] = super().get_value_type(primary_measure_type)
+        return self.value_types[primary_measure_type]
+
+
+def get_value_key(value: Any) -> Union[tuple, ifcopenshell.entity_instance]:
+    # Python considers 1 == 1.0 == True, so the type is part of the key.
+    if isinstance(value, ifcopenshell.entity_instance):
+        if value.id():
+            return value
+        return (value.is_a(), get_value_key(value.wrappedValue))
+    elif isinstance(value, dict):
+        return tuple((k, get_value_key(v)) for k, v in value.items())
+    elif isinstance(value, (tuple, list)):
+        return (type(value), tuple(get_value_key(v) for v in value))
+    return (type(value), value)
@@ -0,0 +1,117 @@
+# IfcOpenShell - IFC toolkit and geometry engine
+# Copyright (C) 2026 Dion Moult <dion@thinkmoult.com>
+#
+# This file is part of IfcOpenShell.
+#
+# IfcOpenShell is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# IfcOpenShell is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with IfcOpenShell.  If not, see <http://www.gnu.org/licenses/>.
+
+import ifcopenshell
+import ifcopenshell.util.pset
+from ifcopenshell.api.pset._bulk import add_property_definitions, get_factory_cache, get_property_definitions
+from ifcopenshell.api.pset.edit_qto import Usecase as EditQtoUsecase
+from typing import Any
+
+
+def edit_qtos(
+    file: ifcopenshell.file,
+    qtos: dict[ifcopenshell.entity_instance, dict[str, dict[str, Any]]],
+) -> None:
+    """Adds or edits quantity sets on many elements at once
+
+    This gives the same result as calling
+    :func:`ifcopenshell.api.pset.add_qto` and
+    :func:`ifcopenshell.api.pset.edit_qto` for every element and quantity
+    set, but is significantly faster when writing quantities to thousands
+    of elements, such as after a quantity take-off.
+
+    Quantity set templates and quantity types are only looked up once per
+    quantity set and quantity name. New quantity sets are created along with
+    their relationships in bulk.
+
+    :param qtos: A dictionary where keys are elements, and values are
+        dictionaries of quantity set names to quantities. Quantities are
+        specified in the same way as :func:`ifcopenshell.api.pset.edit_qto`.
+        If an element does not yet have a quantity set with that name, it is
+        added.
+    :return: None
+
+    Example:
+
+    .. code:: python
+
+        walls = model.by_type("IfcWall")
+        ifcopenshell.api.pset.edit_qtos(model, qtos={
+            wall: {"Qto_WallBaseQuantities": {"Length": 12, "NetVolume": 7.2}} for wall in walls
+        })
+    """
+    usecase = Usecase()
+    usecase.file = file
+    usecase.settings = {"qtos": qtos}
+    return usecase.execute()
+
+
+class Usecase:
+    file: ifcopenshell.file
+    settings: dict[str, Any]
+
+    def execute(self) -> None:
+        self.get_factory = get_factory_cache(lambda name: QuantityFactory(self.file, name))
+        new_qtos = []
+        for element, qtos in self.settings["qtos"].items():
+            if not (element.is_a("IfcObject") or element.is_a("IfcContext") or element.is_a("IfcTypeObject")):
+                continue
+            existing_qtos = get_property_definitions(element)
+            for name, properties in qtos.items():
+                if qto := existing_qtos.get(name):
+                    self.get_factory(name).edit(qto, properties)
+                else:
+                    new_qtos.append((element, name, properties))
+        if new_qtos:
+            add_property_definitions(
+                self.file,
+                "IfcElementQuantity",
+                new_qtos,
+                lambda name, properties: {"Quantities": self.get_factory(name).create_quantities(properties)},
+            )
+
+
+class QuantityFactory(EditQtoUsecase):
+    """Creates and edits quantities of quantity sets with the same name
+
+    The quantity set template and the types of quantities are resolved once.
+    """
+
+    def __init__(self, file: ifcopenshell.file, name: str):
+        self.file = file
+        self.settings = {"qto": None, "name": None, "properties": {}, "pset_template": None}
+        self.qto_template = ifcopenshell.util.pset.get_template(file.schema_identifier).get_by_name(name)
+        self.property_types = {}
+
+    def edit(self, qto: ifcopenshell.entity_instance, properties: dict[str, Any]) -> None:
+        self.settings["qto"] = qto
+        self.settings["properties"] = properties.copy()
+        self.qto_idx = 2 if qto.is_a("IfcPhysicalComplexQuantity") else 5
+        self.update_existing_properties()
+        self.extend_qto_with_new_properties(self.add_new_properties())
+
+    def create_quantities(self, properties: dict[str, Any]) -> list[ifcopenshell.entity_instance]:
+        self.settings["properties"] = properties
+        return self.add_new_properties()
+
+    def get_canonical_property_type(self, name, value):
+        if isinstance(value, ifcopenshell.entity_instance):
+            return super().get_canonical_property_type(name, value)
+        if (property_type := self.property_types.get(name)) is None:
+            property_type = self.property_types[name] = super().get_canonical_property_type(name, value)
+        return property_type
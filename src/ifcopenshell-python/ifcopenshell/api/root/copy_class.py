@@ -78,6 +78,7 @@ class Usecase:
         result = ifcopenshell.util.element.copy(self.file, self.settings["product"])
         self.copy_direct_attributes(result)
         self.copy_indirect_attributes(self.settings["product"], result)
+        ifcopenshell.util.element.invalidate_decomposition_index(self.file)
         return result
 
     def copy_direct_attributes(self, to_element):
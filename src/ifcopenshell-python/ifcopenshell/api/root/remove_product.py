@@ -229,3 +229,4 @@ def remove_product(file: ifcopenshell.file, product: ifcopenshell.entity_instanc
     file.remove(settings["product"])
     if history:
         ifcopenshell.util.element.remove_deep2(file, history)
+    ifcopenshell.util.element.invalidate_decomposition_index(file)
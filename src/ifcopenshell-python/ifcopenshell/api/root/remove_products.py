@@ -0,0 +1,145 @@
+# IfcOpenShell - IFC toolkit and geometry engine
+# Copyright (C) 2021 Dion Moult <dion@thinkmoult.com>
+#
+# This file is part of IfcOpenShell.
+#
+# IfcOpenShell is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# IfcOpenShell is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with IfcOpenShell.  If not, see <http://www.gnu.org/licenses/>.
+
+import ifcopenshell
+import ifcopenshell.api.material
+import ifcopenshell.api.owner
+import ifcopenshell.api.root
+import ifcopenshell.util.element
+from typing import Iterable
+
+# Relationships which remove_product() trims one member at a time, mapped to
+# the attribute holding the members.
+SHARED_RELATIONSHIPS = {
+    "IfcRelAggregates": "RelatedObjects",
+    "IfcRelAssignsToGroup": "RelatedObjects",
+    "IfcRelAssignsToProduct": "RelatedObjects",
+    "IfcRelConnectsWithRealizingElements": "RealizingElements",
+    "IfcRelContainedInSpatialStructure": "RelatedElements",
+    "IfcRelDefinesByProperties": "RelatedObjects",
+    "IfcRelDefinesByType": "RelatedObjects",
+    "IfcRelFlowControlElements": "RelatedControlElements",
+    "IfcRelNests": "RelatedObjects",
+}
+
+# Relationships which remove_product() deletes outright (without cascading to
+# other elements) if the product is the relating side.
+OWNED_RELATIONSHIPS = {
+    "IfcRelAggregates": "RelatingObject",
+    "IfcRelAssignsToProduct": "RelatingProduct",
+    "IfcRelContainedInSpatialStructure": "RelatingStructure",
+    "IfcRelFlowControlElements": "RelatingFlowElement",
+}
+
+
+def remove_products(file: ifcopenshell.file, products: Iterable[ifcopenshell.entity_instance]) -> None:
+    """Removes many products at once
+
+    This gives the same result as calling
+    :func:`ifcopenshell.api.root.remove_product` for each product, but is
+    significantly faster when removing thousands of products, such as when
+    purging everything in a demolition phase.
+
+    Relationships shared between many of the products (such as spatial
+    containment, aggregation, property sets, and types) are rewritten once,
+    rather than once per member. Relationships which would be deleted
+    outright are removed together in a single batch. Materials of all
+    products are unassigned in a single call to
+    :func:`ifcopenshell.api.material.unassign_material`, so that removing a
+    type also removes the layer and profile set usages of its occurrences.
+    The remaining cleanup (representations, placements, openings, ports, etc)
+    is still performed one product at a time using
+    :func:`ifcopenshell.api.root.remove_product`.
+
+    :param products: The elements to remove.
+    :type products: list[ifcopenshell.entity_instance]
+    :return: None
+    :rtype: None
+
+    Example:
+
+    .. code:: python
+
+        demolished = [e for e in model.by_type("IfcElement") if is_demolished(e)]
+        ifcopenshell.api.root.remove_products(model, products=demolished)
+    """
+    settings = {"products": list(dict.fromkeys(products))}
+
+    products = settings["products"]
+    product_set = set(products)
+
+    rels = set()
+    for product in products:
+        rels.update(file.get_inverse(product))
+
+    to_remove = set()
+    to_trim = []
+    material_products = set()
+    for rel in rels:
+        if rel.is_a("IfcRelAssociatesMaterial"):
+            material_products.update(o for o in rel.RelatedObjects if o in product_set)
+            continue
+        elif rel.is_a("IfcRelServicesBuildings"):
+            to_remove.add(rel)
+            continue
+        elif rel.is_a("IfcRelConnectsElements") and not rel.is_a("IfcRelConnectsWithRealizingElements"):
+            to_remove.add(rel)
+            continue
+        ifc_class = next((c for c in OWNED_RELATIONSHIPS if rel.is_a(c)), None)
+        if ifc_class and getattr(rel, OWNED_RELATIONSHIPS[ifc_class]) in product_set:
+            to_remove.add(rel)
+            continue
+        ifc_class = next((c for c in SHARED_RELATIONSHIPS if rel.is_a(c)), None)
+        if ifc_class:
+            to_trim.append((rel, SHARED_RELATIONSHIPS[ifc_class]))
+
+    if to_remove:
+        histories = {rel.OwnerHistory for rel in to_remove if rel.OwnerHistory}
+        file.batch()
+        try:
+            for rel in to_remove:
+                file.remove(rel)
+        finally:
+            file.unbatch()
+        for history in histories:
+            ifcopenshell.util.element.remove_deep2(file, history)
+
+    for rel, attribute in sorted(to_trim, key=lambda x: x[0].id()):
+        members = getattr(rel, attribute) or ()
+        remaining = [m for m in members if m not in product_set]
+        if len(remaining) == len(members):
+            continue
+        if not remaining:
+            # Leave a single removed member behind so that remove_product()
+            # purges the relationship (and e.g. its property set) as usual.
+            remaining = [next(m for m in members if m in product_set)]
+        setattr(rel, attribute, remaining)
+        if rel.is_a("IfcRelDefinesByType"):
+            ifcopenshell.api.owner.update_owner_history(file, element=rel)
+
+    if material_products:
+        ifcopenshell.api.material.unassign_material(file, products=list(material_products))
+
+    # Some products (e.g. ports) are removed along with their parent product.
+    product_ids = [p.id() for p in products]
+    for product_id in product_ids:
+        try:
+            product = file.by_id(product_id)
+        except RuntimeError:
+            continue
+        ifcopenshell.api.root.remove_product(file, product=product)
@@ -120,4 +120,7 @@ def assign_recurrence_pattern(
         if recurrence_old := settings["parent"].Recurrence and len(file.get_inverse(recurrence_old)) == 1:
             file.remove(recurrence_old)
         settings["parent"].Recurrence = recurrence
+
+    ifcopenshell.util.sequence.clear_calendar_cache()
+
     return recurrence
@@ -126,9 +126,28 @@ class Usecase:
             print("... which is cyclically a predecessor to ...", task)
             raise RecursionError("Recursive tasks found. Could not cascade schedule.")
 
-        if not task.TaskTime:
+        if not self.update_task(task, is_first_task=is_first_task):
             return
 
+        for rel in task.IsPredecessorTo:
+            self.cascade_task(rel.RelatedProcess, task_sequence=task_sequence + [task])
+
+        for rel in task.IsNestedBy:
+            [
+                self.cascade_task(nested_task, task_sequence=task_sequence + [task])
+                for nested_task in rel.RelatedObjects or []
+            ]
+
+    def update_task(self, task, is_first_task=False) -> bool:
+        """Updates the dates of a task from its predecessors
+
+        Returns whether the successors and nested tasks should be cascaded,
+        which is not the case if the task has no task time or if its dates are
+        unchanged (unless it is the first task).
+        """
+        if not task.TaskTime:
+            return False
+
         duration = (
             ifcopenshell.util.date.ifc2datetime(task.TaskTime.ScheduleDuration)
             if task.TaskTime.ScheduleDuration
@@ -256,13 +275,13 @@ class Usecase:
             if potential_finish > finish:
                 start_ifc = ifcopenshell.util.date.datetime2ifc(start, "IfcDateTime")
                 if task.TaskTime.ScheduleStart == start_ifc and not is_first_task:
-                    return
+                    return False
                 task.TaskTime.ScheduleStart = start_ifc
                 task.TaskTime.ScheduleFinish = ifcopenshell.util.date.datetime2ifc(potential_finish, "IfcDateTime")
             else:
                 finish_ifc = ifcopenshell.util.date.datetime2ifc(finish, "IfcDateTime")
                 if task.TaskTime.ScheduleFinish == finish_ifc and not is_first_task:
-                    return
+                    return False
                 task.TaskTime.ScheduleFinish = finish_ifc
                 task.TaskTime.ScheduleStart = ifcopenshell.util.date.datetime2ifc(
                     ifcopenshell.util.sequence.get_start_or_finish_date(
@@ -278,7 +297,7 @@ class Usecase:
             finish = max(finishes)
             finish_ifc = ifcopenshell.util.date.datetime2ifc(finish, "IfcDateTime")
             if task.TaskTime.ScheduleFinish == finish_ifc and not is_first_task:
-                return
+                return False
             task.TaskTime.ScheduleFinish = finish_ifc
             task.TaskTime.ScheduleStart = ifcopenshell.util.date.datetime2ifc(
                 ifcopenshell.util.sequence.get_start_or_finish_date(
@@ -294,7 +313,7 @@ class Usecase:
             start = max(starts)
             start_ifc = ifcopenshell.util.date.datetime2ifc(start, "IfcDateTime")
             if task.TaskTime.ScheduleStart == start_ifc and not is_first_task:
-                return
+                return False
             task.TaskTime.ScheduleStart = start_ifc
             task.TaskTime.ScheduleFinish = ifcopenshell.util.date.datetime2ifc(
                 ifcopenshell.util.sequence.get_start_or_finish_date(
@@ -306,15 +325,7 @@ class Usecase:
                 ),
                 "IfcDateTime",
             )
-
-        for rel in task.IsPredecessorTo:
-            self.cascade_task(rel.RelatedProcess, task_sequence=task_sequence + [task])
-
-        for rel in task.IsNestedBy:
-            [
-                self.cascade_task(nested_task, task_sequence=task_sequence + [task])
-                for nested_task in rel.RelatedObjects or []
-            ]
+        return True
 
     def get_lag_time_days(self, lag_time):
         return ifcopenshell.util.date.ifc2datetime(lag_time.LagValue.wrappedValue).days
@@ -59,6 +59,8 @@ class Usecase:
         self.tracker = {"current": [], "duplicate": []}
         self.duplicate_task(self.settings["task"])
         self.copy_sequence_relationship(self.tracker["current"], self.tracker["duplicate"])
+        # The nesting of duplicates may be edited directly.
+        ifcopenshell.util.element.invalidate_decomposition_index(self.file, self.tracker["duplicate"])
         return self.tracker["current"], self.tracker["duplicate"]
 
     def duplicate_task(self, task):
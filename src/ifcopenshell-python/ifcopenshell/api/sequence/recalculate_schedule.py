@@ -31,8 +31,10 @@ def recalculate_schedule(file: ifcopenshell.file, work_schedule: ifcopenshell.en
     marked as critical, and both the total and free floats will be
     populated for all task times.
 
-    Cyclical relationships are detected and will result in a recursion
-    error.
+    Tasks are resolved in topological order of the task graph, so every task
+    is visited once in each pass. Cyclical relationships are detected before
+    any calculation and will result in a recursion error listing the tasks
+    in the cycle.
 
     :param work_schedule: The IfcWorkSchedule to perform the calculation on.
     :type work_schedule: ifcopenshell.entity_instance
@@ -64,39 +66,22 @@ class Usecase:
         if not self.start_dates:
             return
 
-        is_cyclic = False
-        attempts = 0
-        self.pending_nodes = set(self.g.nodes)
-        max_worst_case_attempts = pow(len(self.pending_nodes), 2)
-        while self.pending_nodes:
-            attempts += 1
-            remaining_nodes = set()
-            for pending_node in self.pending_nodes:
-                if not self.forward_pass(pending_node):
-                    remaining_nodes.add(pending_node)
-            self.pending_nodes = remaining_nodes
-
-            # As we parse nodes, the remaining attempts can drop dramatically, so we recalculate the upper limit
-            max_remaining_attempts = pow(len(self.pending_nodes), 2)
-            if max_remaining_attempts < max_worst_case_attempts:
-                max_worst_case_attempts = max_remaining_attempts
-                attempts = 0
-
-            if attempts > max_worst_case_attempts:
-                is_cyclic = True
-                break  # We have an infinite loop due to a cyclic graph
-
-        if is_cyclic:
-            raise RecursionError("Task graph is cyclic and so critical path method cannot be performed.")
-            return
+        # Every node is visited once, after all of its predecessors (forward
+        # pass) or successors (backward pass) have been resolved.
+        try:
+            order = list(nx.topological_sort(self.g))
+        except nx.NetworkXUnfeasible:
+            cycle = [u for u, v in nx.find_cycle(self.g)]
+            raise RecursionError(
+                "Task graph is cyclic and so critical path method cannot be performed. Cycle: "
+                + " -> ".join(f"#{u}" for u in cycle + cycle[:1])
+            )
+
+        for node in order:
+            self.forward_pass(node)
 
-        self.pending_nodes = set(self.g.nodes)
-        while self.pending_nodes:
-            remaining_nodes = set()
-            for pending_node in self.pending_nodes:
-                if not self.backward_pass(pending_node):
-                    remaining_nodes.add(pending_node)
-            self.pending_nodes = remaining_nodes
+        for node in reversed(order):
+            self.backward_pass(node)
 
         self.update_task_times()
 
@@ -177,24 +162,24 @@ class Usecase:
             self.edges.append((task.id(), "finish", {"lag_time": 0, "type": "FF"}))
 
     def update_task_times(self):
-        for ifc_definition_id in self.g.nodes:
+        datetime2ifc = ifcopenshell.util.date.datetime2ifc
+        for ifc_definition_id, data in self.g.nodes(data=True):
             if ifc_definition_id in ("start", "finish"):
                 continue
-            data = self.g.nodes[ifc_definition_id]
-            task = self.file.by_id(ifc_definition_id)
-            if not task.TaskTime:
+            task_time = self.file.by_id(ifc_definition_id).TaskTime
+            if not task_time:
                 continue
             ifcopenshell.api.sequence.edit_task_time(
                 self.file,
-                task_time=task.TaskTime,
+                task_time=task_time,
                 attributes={
-                    "FreeFloat": ifcopenshell.util.date.datetime2ifc(data["free_float"], "IfcDuration"),
-                    "TotalFloat": ifcopenshell.util.date.datetime2ifc(data["total_float"], "IfcDuration"),
+                    "FreeFloat": datetime2ifc(data["free_float"], "IfcDuration"),
+                    "TotalFloat": datetime2ifc(data["total_float"], "IfcDuration"),
                     "IsCritical": data["total_float"].days == 0,
-                    "EarlyStart": ifcopenshell.util.date.datetime2ifc(data["early_start"], "IfcDateTime"),
-                    "EarlyFinish": ifcopenshell.util.date.datetime2ifc(data["early_finish"], "IfcDateTime"),
-                    "LateStart": ifcopenshell.util.date.datetime2ifc(data["late_start"], "IfcDateTime"),
-                    "LateFinish": ifcopenshell.util.date.datetime2ifc(data["late_finish"], "IfcDateTime"),
+                    "EarlyStart": datetime2ifc(data["early_start"], "IfcDateTime"),
+                    "EarlyFinish": datetime2ifc(data["early_finish"], "IfcDateTime"),
+                    "LateStart": datetime2ifc(data["late_start"], "IfcDateTime"),
+                    "LateFinish": datetime2ifc(data["late_finish"], "IfcDateTime"),
                 },
             )
 
@@ -17,6 +17,7 @@
 # along with IfcOpenShell.  If not, see <http://www.gnu.org/licenses/>.
 
 import ifcopenshell.api
+import ifcopenshell.util.sequence
 
 
 def remove_time_period(file: ifcopenshell.file, time_period: ifcopenshell.entity_instance) -> None:
@@ -58,3 +59,5 @@ def remove_time_period(file: ifcopenshell.file, time_period: ifcopenshell.entity
     settings = {"time_period": time_period}
 
     file.remove(settings["time_period"])
+
+    ifcopenshell.util.sequence.clear_calendar_cache()
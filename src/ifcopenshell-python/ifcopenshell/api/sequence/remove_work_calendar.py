@@ -21,6 +21,7 @@ import ifcopenshell.api.control
 import ifcopenshell.api.project
 import ifcopenshell.api.sequence
 import ifcopenshell.util.element
+import ifcopenshell.util.sequence
 
 
 def remove_work_calendar(file: ifcopenshell.file, work_calendar: ifcopenshell.entity_instance) -> None:
@@ -73,3 +74,5 @@ def remove_work_calendar(file: ifcopenshell.file, work_calendar: ifcopenshell.en
     file.remove(settings["work_calendar"])
     if history:
         ifcopenshell.util.element.remove_deep2(file, history)
+
+    ifcopenshell.util.sequence.clear_calendar_cache()
@@ -16,6 +16,7 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with IfcOpenShell.  If not, see <http://www.gnu.org/licenses/>.
 import ifcopenshell
+import ifcopenshell.util.sequence
 
 
 def unassign_recurrence_pattern(file: ifcopenshell.file, recurrence_pattern: ifcopenshell.entity_instance) -> None:
@@ -55,3 +56,5 @@ def unassign_recurrence_pattern(file: ifcopenshell.file, recurrence_pattern: ifc
     for time_period in settings["recurrence_pattern"].TimePeriods or []:
         file.remove(time_period)
     file.remove(settings["recurrence_pattern"])
+
+    ifcopenshell.util.sequence.clear_calendar_cache()
@@ -169,6 +169,8 @@ def assign_container(
             }
         )
 
+    ifcopenshell.util.element.invalidate_decomposition_index(file, products_to_change)
+
     # localize placement relative to a new container for affected products
     for product in products_to_change:
         placement = getattr(product, "ObjectPlacement", None)
@@ -71,3 +71,4 @@ def unassign_container(file: ifcopenshell.file, products: list[ifcopenshell.enti
             file.remove(rel)
             if history:
                 ifcopenshell.util.element.remove_deep2(file, history)
+    ifcopenshell.util.element.invalidate_decomposition_index(file, products)
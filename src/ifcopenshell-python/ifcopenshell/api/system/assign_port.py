@@ -20,6 +20,7 @@ import ifcopenshell
 import ifcopenshell.api.owner
 import ifcopenshell.api.geometry
 import ifcopenshell.guid
+import ifcopenshell.util.element
 import ifcopenshell.util.placement
 
 
@@ -93,6 +94,7 @@ class Usecase:
                 RelatingObject=self.settings["element"],
             )
 
+        ifcopenshell.util.element.invalidate_decomposition_index(self.file, [self.settings["port"]])
         self.update_port_placement()
 
         return rel
@@ -73,11 +73,13 @@ class Usecase:
                     self.file.remove(rel)
                     if history:
                         ifcopenshell.util.element.remove_deep2(self.file, history)
+                    ifcopenshell.util.element.invalidate_decomposition_index(self.file, [self.settings["port"]])
                     return
                 related_objects = set(rel.RelatedObjects) or set()
                 related_objects.remove(self.settings["port"])
                 rel.RelatedObjects = list(related_objects)
                 ifcopenshell.api.owner.update_owner_history(self.file, **{"element": rel})
+        ifcopenshell.util.element.invalidate_decomposition_index(self.file, [self.settings["port"]])
 
     def execute_ifc2x3(self):
         for rel in self.settings["element"].HasPorts or []:
@@ -114,9 +114,11 @@ def add_filling(
         if history:
             ifcopenshell.util.element.remove_deep2(file, history)
 
-    return file.create_entity(
+    rel = file.create_entity(
         "IfcRelFillsElement",
         GlobalId=ifcopenshell.guid.new(),
         RelatingOpeningElement=settings["opening"],
         RelatedBuildingElement=settings["element"],
     )
+    ifcopenshell.util.element.invalidate_decomposition_index(file, [settings["element"]])
+    return rel
@@ -125,6 +125,8 @@ def add_opening(
         }
     )
 
+    ifcopenshell.util.element.invalidate_decomposition_index(file, [settings["opening"]])
+
     placement = getattr(settings["opening"], "ObjectPlacement", None)
     if placement and placement.is_a("IfcLocalPlacement"):
         ifcopenshell.api.geometry.edit_object_placement(
@@ -61,3 +61,4 @@ def remove_filling(file: ifcopenshell.file, element: ifcopenshell.entity_instanc
             if history:
                 ifcopenshell.util.element.remove_deep2(file, history)
             break
+    ifcopenshell.util.element.invalidate_decomposition_index(file, [settings["element"]])
@@ -61,8 +61,17 @@ def set_unsupported_attribute(*args):
 # module.
 _method_dict = {}
 
+# Attribute accessors resolved for every fully qualified entity name and
+# attribute name, such as ("IFC4.IfcWall", "Name"). Resolving whether an
+# attribute is a forward, inverse, or derived attribute requires schema
+# introspection, which would otherwise be repeated for every access in
+# __getattr__.
+_accessors: dict[tuple[str, str], Callable[["entity_instance"], Any]] = {}
+
 
 def register_schema_attributes(schema: ifcopenshell_wrapper.schema_definition) -> None:
+    # Accessors may have been resolved against a previous schema of the same name.
+    _accessors.clear()
     for decl in schema.declarations():
         decl: ifcopenshell_wrapper.declaration
         if hasattr(decl, "argument_types"):
@@ -103,6 +112,68 @@ for nm in ifcopenshell_wrapper.schema_names():
     register_schema_attributes(schema)
 
 
+def _resolve_accessor(inst: "entity_instance", name: str) -> Callable[["entity_instance"], Any]:
+    INVALID, FORWARD, INVERSE = range(3)
+    attr_cat = inst.wrapped_data.get_attribute_category(name)
+    if attr_cat == FORWARD:
+        idx = inst.wrapped_data.get_argument_index(name)
+        if _method_dict[inst.is_a(True)][idx] != set_derived_attribute:
+
+            def get_forward(inst):
+                return entity_instance.wrap_value(inst.wrapped_data.get_argument(idx), inst.wrapped_data.file)
+
+            return get_forward
+        # A bit ugly, but we fall through to derived attribute handling below
+    elif attr_cat == INVERSE:
+        schema_name = inst.wrapped_data.is_a(True).split(".")[0]
+        ent = ifcopenshell_wrapper.schema_by_name(schema_name).declaration_by_name(inst.is_a())
+        inv = [i for i in ent.all_inverse_attributes() if i.name() == name][0]
+        is_non_aggregate = (inv.bound1(), inv.bound2()) == (-1, -1)
+
+        def get_inverse(inst):
+            vs = entity_instance.wrap_value(inst.wrapped_data.get_inverse(name), inst.wrapped_data.file)
+            if is_non_aggregate and settings.unpack_non_aggregate_inverses:
+                return vs[0] if vs else None
+            return vs
+
+        return get_inverse
+
+    # derived attribute perhaps?
+    schema_name = inst.wrapped_data.is_a(True).split(".")[0]
+    try:
+        rules = importlib.import_module(f"ifcopenshell.express.rules.{schema_name}")
+    except:
+        import os
+
+        current_dir_files = {fn.lower(): fn for fn in os.listdir(".")}
+        exp_filename = schema_name.lower() + ".exp"
+        schema_path = current_dir_files.get(exp_filename)
+        if schema_path is None:
+            raise Exception(
+                f"Couldn't find express file '{schema_name.lower()}.exp' in the current folder: '{os.getcwd()}'."
+            )
+        fn = schema_path[:-4] + ".py"
+        if not os.path.exists(fn):
+            subprocess.run([sys.executable, "-m", "ifcopenshell.express.rule_compiler", schema_path, fn], check=True)
+            time.sleep(1.0)
+        rules = importlib.import_module(schema_name)
+
+    decl = ifcopenshell_wrapper.schema_by_name(schema_name).declaration_by_name(inst.is_a())
+    while decl:
+        fn = getattr(rules, f"calc_{decl.name()}_{name}", None)
+        if fn:
+            return fn
+        decl = decl.supertype()
+
+    if attr_cat != FORWARD:
+        # Not cached, so that arbitrary missing names don't grow the accessor cache
+        raise AttributeError(
+            "entity instance of type '%s' has no attribute '%s'" % (inst.wrapped_data.is_a(True), name)
+        )
+
+    return lambda inst: None
+
+
 class entity_instance:
     """Represents an entity (wall, slab, property, etc) of an IFC model
 
@@ -181,63 +252,12 @@ class entity_instance:
         return file.from_pointer(self.wrapped_data.file_pointer())
 
     def __getattr__(self, name: str) -> Any:
-        INVALID, FORWARD, INVERSE = range(3)
-        attr_cat = self.wrapped_data.get_attribute_category(name)
-        if attr_cat == FORWARD:
-            idx = self.wrapped_data.get_argument_index(name)
-            if _method_dict[self.is_a(True)][idx] != set_derived_attribute:
-                # A bit ugly, but we fall through to derived attribute handling below
-                return entity_instance.wrap_value(self.wrapped_data.get_argument(idx), self.wrapped_data.file)
-        elif attr_cat == INVERSE:
-            vs = entity_instance.wrap_value(self.wrapped_data.get_inverse(name), self.wrapped_data.file)
-            if settings.unpack_non_aggregate_inverses:
-                schema_name = self.wrapped_data.is_a(True).split(".")[0]
-                ent = ifcopenshell_wrapper.schema_by_name(schema_name).declaration_by_name(self.is_a())
-                inv = [i for i in ent.all_inverse_attributes() if i.name() == name][0]
-                if (inv.bound1(), inv.bound2()) == (-1, -1):
-                    if vs:
-                        vs = vs[0]
-                    else:
-                        vs = None
-            return vs
-
-        # derived attribute perhaps?
-        schema_name = self.wrapped_data.is_a(True).split(".")[0]
+        key = (self.wrapped_data.is_a(True), name)
         try:
-            rules = importlib.import_module(f"ifcopenshell.express.rules.{schema_name}")
-        except:
-            import os
-
-            current_dir_files = {fn.lower(): fn for fn in os.listdir(".")}
-            exp_filename = schema_name.lower() + ".exp"
-            schema_path = current_dir_files.get(exp_filename)
-            if schema_path is None:
-                raise Exception(
-                    f"Couldn't find express file '{schema_name.lower()}.exp' in the current folder: '{os.getcwd()}'."
-                )
-            fn = schema_path[:-4] + ".py"
-            if not os.path.exists(fn):
-                subprocess.run(
-                    [sys.executable, "-m", "ifcopenshell.express.rule_compiler", schema_path, fn], check=True
-                )
-                time.sleep(1.0)
-            rules = importlib.import_module(schema_name)
-
-        def yield_supertypes():
-            decl = ifcopenshell_wrapper.schema_by_name(schema_name).declaration_by_name(self.is_a())
-            while decl:
-                yield decl.name()
-                decl = decl.supertype()
-
-        for sty in yield_supertypes():
-            fn = getattr(rules, f"calc_{sty}_{name}", None)
-            if fn:
-                return fn(self)
-
-        if attr_cat != FORWARD:
-            raise AttributeError(
-                "entity instance of type '%s' has no attribute '%s'" % (self.wrapped_data.is_a(True), name)
-            )
+            accessor = _accessors[key]
+        except KeyError:
+            accessor = _accessors[key] = _resolve_accessor(self, name)
+        return accessor(self)
 
     @staticmethod
     def walk(f: Callable[[Any], bool], g: Callable[[Any], Any], value: Any) -> Any:
@@ -1,10 +1,15 @@
 import os
 import re
 import ast
+import sys
+import types
+import marshal
+import hashlib
 import collections
 import ifcopenshell
 from logging import Logger
 from dataclasses import dataclass
+from typing import Optional, Iterable, Callable
 from codegen import indent
 
 
@@ -63,9 +68,117 @@ def fix_type(v):
     return v
 
 
-def run(f: ifcopenshell.file, logger: Logger) -> None:
+def get_cache_dir() -> str:
+    """Directory where the compiled rule modules are cached, can be overridden
+    using the IFCOPENSHELL_RULE_CACHE_DIR environment variable"""
+    return os.environ.get("IFCOPENSHELL_RULE_CACHE_DIR") or os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+        "ifcopenshell",
+        "rules",
+    )
+
+
+def get_rules_path(schema_identifier: str) -> str:
+    fn = os.path.join(os.path.dirname(__file__), "rules", f"{schema_identifier}.py")
+    if os.path.exists(fn):
+        return fn
+
+    import time
+    import subprocess
+
+    current_dir_files = {fn.lower(): fn for fn in os.listdir('.')}
+    schema_name = str(schema_identifier).split(' ')[-1].lower()
+    schema_path = current_dir_files.get(schema_name + '.exp')
+    fn = schema_path[:-4] + '.py'
+    if not os.path.exists(fn):
+        subprocess.run([sys.executable, "-m", "ifcopenshell.express.rule_compiler", schema_path, fn], check=True)
+        time.sleep(1.)
+    return fn
+
+
+def compile_rules(source: str, schema_identifier: str) -> types.CodeType:
+    """Compiles the rule module source with pytest's assertion rewriting, so that
+    the failing assertion values can be reported"""
     from _pytest import assertion
 
+    a = ast.parse(source)
+    assertion.rewrite.rewrite_asserts(mod=a, source=source)
+    return compile(a, f"{schema_identifier}.py", "exec")
+
+
+def load_code(source: str, schema_identifier: str) -> types.CodeType:
+    """Returns the compiled rule module, from the on-disk cache when available
+
+    The cache is keyed by the hash of the rule source, the Python version (the
+    marshal format of code objects is version specific) and the pytest version
+    (which determines the assertion rewriting).
+    """
+    import _pytest
+
+    digest = hashlib.sha256(source.encode("utf-8"))
+    digest.update(_pytest.__version__.encode("ascii"))
+    cache_fn = os.path.join(
+        get_cache_dir(), f"{schema_identifier}.{digest.hexdigest()[:32]}.{sys.implementation.cache_tag}.bin"
+    )
+
+    try:
+        with open(cache_fn, "rb") as f:
+            return marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    code = compile_rules(source, schema_identifier)
+
+    try:
+        os.makedirs(os.path.dirname(cache_fn), exist_ok=True)
+        # Write to a temporary file first so that concurrent processes never observe partial files
+        tmp_fn = f"{cache_fn}.{os.getpid()}.tmp"
+        with open(tmp_fn, "wb") as f:
+            marshal.dump(code, f)
+        os.replace(tmp_fn, cache_fn)
+    except OSError:
+        # The cache is an optimization only, e.g the directory may be read-only
+        pass
+
+    return code
+
+
+@dataclass
+class compiled_rules:
+    source_lines: list[str]
+    rules: list[type]
+
+
+compiled_rules_cache: dict[tuple[str, int, int], compiled_rules] = {}
+
+
+def load_rules(schema_identifier: str) -> compiled_rules:
+    """Returns the rule classes for a schema, executed once per process for every version of the rules file"""
+    fn = get_rules_path(schema_identifier)
+    st = os.stat(fn)
+    cache_key = os.path.abspath(fn), st.st_mtime_ns, st.st_size
+    from_cache = compiled_rules_cache.get(cache_key)
+    if from_cache:
+        return from_cache
+
+    with open(fn, "r") as f:
+        source = f.read()
+    scope = {}
+    exec(load_code(source, schema_identifier), scope)
+    compiled = compiled_rules_cache[cache_key] = compiled_rules(
+        source.split("\n"), list(filter(lambda x: hasattr(x, "SCOPE"), scope.values()))
+    )
+    return compiled
+
+
+def get_rule_names(R) -> set[str]:
+    """The names by which a rule can be selected in :func:`run`"""
+    if R.SCOPE == "file":
+        return {R.__name__}
+    return {R.TYPE_NAME, f"{R.TYPE_NAME}.{R.RULE_NAME}"}
+
+
+def get_annotators(logger: Logger):
     if hasattr(logger, "set_instance"):
         # when using the json logger, we notify it of the relevant instance
         pre_annotate_instance = lambda instance: logger.set_state('instance', instance) if hasattr(logger, 'set_state') else None
@@ -78,58 +191,18 @@ def run(f: ifcopenshell.file, logger: Logger) -> None:
         post_annotate_instance = lambda instance: instance
         pre_annotate_attribute = lambda attribute: None
         post_annotate_attribute = lambda attribute: attribute
+    return pre_annotate_instance, post_annotate_instance, pre_annotate_attribute, post_annotate_attribute
 
-    orig = ifcopenshell.settings.unpack_non_aggregate_inverses
-    ifcopenshell.settings.unpack_non_aggregate_inverses = True
-
-    fn = os.path.join(os.path.dirname(__file__), "rules", f"{f.schema_identifier}.py")
-    try:
-        source = open(fn, "r").read()
-    except FileNotFoundError as e:
-        import sys
-        import time
-        import subprocess
-
-        current_dir_files = {fn.lower(): fn for fn in os.listdir('.')}
-        schema_name = str(f.schema_identifier).split(' ')[-1].lower()
-        schema_path = current_dir_files.get(schema_name + '.exp')
-        fn = schema_path[:-4] + '.py'
-        if not os.path.exists(fn):
-            subprocess.run([sys.executable, "-m", "ifcopenshell.express.rule_compiler", schema_path, fn], check=True)
-            time.sleep(1.)
-        source = open(fn, "r").read()
-
-    a = ast.parse(source)
-    assertion.rewrite.rewrite_asserts(mod=a, source=source)
-    cd = compile(a, f"{f.schema_identifier}.py", "exec")
-    scope = {}
-    exec(cd, scope)
-    S = ifcopenshell.ifcopenshell_wrapper.schema_by_name(f.schema_identifier)
-
-    rules = list(filter(lambda x: hasattr(x, "SCOPE"), scope.values()))
 
-    if hasattr(logger, 'set_state'):
-        logger.set_state('type', 'global_rule')
-
-    for R in [r for r in rules if r.SCOPE == "file"]:
-        try:
-            R()(f)
-        except Exception as e:
-            ln = e.__traceback__.tb_next.tb_lineno
-            pre_annotate_attribute(R.__name__)
-            logger.error(
-                str(
-                    error(
-                        post_annotate_attribute(R.__name__),
-                        reverse_compile(source.split("\n")[ln - 1]),
-                        reverse_compile(e.args[0]),
-                    )
-                )
-            )
+def select_rules(compiled: compiled_rules, rule_names: Optional[Iterable[str]] = None) -> list[type]:
+    if rule_names is None:
+        return compiled.rules
+    rule_names = set(rule_names)
+    return [r for r in compiled.rules if get_rule_names(r) & rule_names]
 
-    if hasattr(logger, 'set_state'):
-        logger.set_state('type', 'simpletype_rule')
 
+def get_type_rules(S: ifcopenshell.ifcopenshell_wrapper.schema_definition, rules: list[type]) -> dict[str, list[type]]:
+    """Maps type declaration names to the rules that apply to them, including the rules of their supertypes"""
     types = {}
     subtypes = collections.defaultdict(list)
     for d in S.declarations():
@@ -150,6 +223,21 @@ def run(f: ifcopenshell.file, logger: Logger) -> None:
                     visit(nm2)
 
             visit(r.TYPE_NAME)
+    return D
+
+
+def run_type_rules(
+    S: ifcopenshell.ifcopenshell_wrapper.schema_definition,
+    rules: list[type],
+    source_lines: list[str],
+    logger: Logger,
+    instances: Iterable[ifcopenshell.entity_instance],
+    tag: Optional[Callable[[ifcopenshell.entity_instance], None]] = None,
+) -> None:
+    """Evaluates the type WHERE rules on the attribute values of `instances`"""
+    pre_annotate_instance, post_annotate_instance, pre_annotate_attribute, post_annotate_attribute = get_annotators(logger)
+
+    D = get_type_rules(S, rules)
 
     def type_name(ty):
         if isinstance(ty, ifcopenshell.ifcopenshell_wrapper.named_type):
@@ -178,7 +266,7 @@ def run(f: ifcopenshell.file, logger: Logger) -> None:
                         str(
                             error(
                                 post_annotate_attribute(f"{R.TYPE_NAME}.{R.RULE_NAME}"),
-                                reverse_compile(source.split("\n")[ln - 1]),
+                                reverse_compile(source_lines[ln - 1]),
                                 reverse_compile(e.args[0]),
                                 post_annotate_instance(instance),
                             )
@@ -217,7 +305,9 @@ def run(f: ifcopenshell.file, logger: Logger) -> None:
                 # unpack the type instance
                 check(value[0], S.declaration_by_name(value.is_a()), instance=inst)
 
-    for inst in f:
+    for inst in instances:
+        if tag:
+            tag(inst)
         try:
             values = list(inst)
         except Exception as e:
@@ -237,11 +327,21 @@ def run(f: ifcopenshell.file, logger: Logger) -> None:
             else:
                 check(val, attr.type_of_attribute(), instance=inst)
 
-    if hasattr(logger, 'set_state'):
-        logger.set_state('type', 'entity_rule')
 
-    for R in [r for r in rules if r.SCOPE == "entity"]:
-        for inst in f.by_type(R.TYPE_NAME):
+def run_entity_rules(
+    rules: list[type],
+    source_lines: list[str],
+    logger: Logger,
+    instances_by_rule: Callable[[type], Iterable[ifcopenshell.entity_instance]],
+    tag: Optional[Callable[[int, ifcopenshell.entity_instance], None]] = None,
+) -> None:
+    """Evaluates the entity WHERE rules on the instances provided by `instances_by_rule`"""
+    pre_annotate_instance, post_annotate_instance, pre_annotate_attribute, post_annotate_attribute = get_annotators(logger)
+
+    for rule_index, R in enumerate([r for r in rules if r.SCOPE == "entity"]):
+        for inst in instances_by_rule(R):
+            if tag:
+                tag(rule_index, inst)
             try:
                 R()(inst)
             except Exception as e:
@@ -252,13 +352,189 @@ def run(f: ifcopenshell.file, logger: Logger) -> None:
                     str(
                         error(
                             post_annotate_attribute(f"{R.TYPE_NAME}.{R.RULE_NAME}"),
-                            reverse_compile(source.split("\n")[ln - 1]),
+                            reverse_compile(source_lines[ln - 1]),
                             reverse_compile(e.args[0]),
                             post_annotate_instance(inst),
                         )
                     )
                 )
 
+
+def run_partition(filename: str, classes: list[str], rule_names: Optional[list[str]], json_output: bool) -> list:
+    """Worker function for :func:`run_parallel`, evaluates the type and entity
+    rules on the instances of `classes` (excluding subtypes)
+
+    Returns the recorded log statements, tagged with the phase, rule index and
+    instance id so that they can be merged deterministically.
+    """
+    from ifcopenshell.validate import recording_logger, json_recording_logger
+
+    ifcopenshell.settings.unpack_non_aggregate_inverses = True
+    f = ifcopenshell.open(filename)
+    S = ifcopenshell.ifcopenshell_wrapper.schema_by_name(f.schema_identifier)
+    compiled = load_rules(f.schema_identifier)
+    rules = select_rules(compiled, rule_names)
+    logger = json_recording_logger() if json_output else recording_logger()
+
+    def tag_type_rule(inst):
+        logger.key = (0, 0, inst.id())
+
+    def tag_entity_rule(rule_index, inst):
+        logger.key = (1, rule_index, inst.id())
+
+    if hasattr(logger, "set_state"):
+        logger.set_state("type", "simpletype_rule")
+
+    if get_type_rules(S, rules) or rule_names is None:
+        instances = (inst for ifc_class in classes for inst in f.by_type(ifc_class, include_subtypes=False))
+        run_type_rules(S, rules, compiled.source_lines, logger, instances, tag=tag_type_rule)
+
+    if hasattr(logger, "set_state"):
+        logger.set_state("type", "entity_rule")
+
+    supertypes = {}
+    for ifc_class in classes:
+        decl = S.declaration_by_name(ifc_class)
+        names = supertypes[ifc_class] = set()
+        while decl:
+            names.add(decl.name())
+            decl = decl.supertype()
+
+    def instances_by_rule(R):
+        for ifc_class in classes:
+            if R.TYPE_NAME in supertypes[ifc_class]:
+                yield from f.by_type(ifc_class, include_subtypes=False)
+
+    run_entity_rules(rules, compiled.source_lines, logger, instances_by_rule, tag=tag_entity_rule)
+
+    return logger.records
+
+
+def partition_classes(f: ifcopenshell.file, n: int) -> list[list[str]]:
+    """Distributes the entity classes present in `f` over `n` partitions of similar instance counts"""
+    counts = {ifc_class: len(f.by_type(ifc_class, include_subtypes=False)) for ifc_class in f.wrapped_data.types()}
+    partitions = [[] for _ in range(n)]
+    loads = [0] * n
+    # Largest first, to the least loaded partition
+    for ifc_class in sorted(counts, key=lambda c: (-counts[c], c)):
+        i = loads.index(min(loads))
+        partitions[i].append(ifc_class)
+        loads[i] += counts[ifc_class]
+    return [p for p in partitions if p]
+
+
+def run_parallel(
+    f: ifcopenshell.file,
+    logger: Logger,
+    rule_names: Optional[Iterable[str]],
+    processes: int,
+    filename: Optional[str] = None,
+) -> None:
+    """Evaluates the type and entity rules in worker processes, with instances partitioned by class
+
+    The statements of the workers are emitted on `logger` in a deterministic
+    order: type rules by instance id, followed by entity rules by rule and
+    instance id.
+    """
+    import tempfile
+    import itertools
+    from concurrent.futures import ProcessPoolExecutor
+    from ifcopenshell.validate import replay_records
+
+    json_output = hasattr(logger, "set_state")
+    if rule_names is not None:
+        rule_names = list(rule_names)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if filename is None:
+            # Workers open the model from disk, so it needs to be written once
+            filename = os.path.join(tmp, "model.ifc")
+            f.write(filename)
+
+        partitions = partition_classes(f, processes)
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = list(
+                executor.map(
+                    run_partition,
+                    itertools.repeat(filename),
+                    partitions,
+                    itertools.repeat(rule_names),
+                    itertools.repeat(json_output),
+                )
+            )
+
+    records = sorted(itertools.chain.from_iterable(results), key=lambda r: r[0:2])
+    replay_records(records, f, logger)
+
+
+def run(
+    f: ifcopenshell.file,
+    logger: Logger,
+    rule_names: Optional[Iterable[str]] = None,
+    processes: int = 1,
+    filename: Optional[str] = None,
+) -> None:
+    """Evaluates the EXPRESS rules of the schema of `f` and reports violations to `logger`
+
+    The rule module is compiled once per process and cached on disk, so that
+    only the first run for a schema version pays for parsing and compilation.
+
+    :param rule_names: Optionally, a subset of rules to evaluate. Global rules
+        are selected by their name, type and entity WHERE rules by their name
+        as reported in the log (e.g. ``IfcWall.CorrectPredefinedType``) or by
+        their type or entity name to select all of their rules.
+    :param processes: When larger than 1, the type and entity rules are
+        evaluated in this many worker processes, each opening the file
+        read-only and evaluating the rules for a partition of the entity
+        classes. Global rules are always evaluated in the calling process.
+    :param filename: Path to the file `f` was opened from. Used by the
+        worker processes, when omitted `f` is written to a temporary file.
+    """
+    pre_annotate_instance, post_annotate_instance, pre_annotate_attribute, post_annotate_attribute = get_annotators(logger)
+
+    orig = ifcopenshell.settings.unpack_non_aggregate_inverses
+    ifcopenshell.settings.unpack_non_aggregate_inverses = True
+
+    compiled = load_rules(f.schema_identifier)
+    source_lines = compiled.source_lines
+    rules = select_rules(compiled, rule_names)
+
+    S = ifcopenshell.ifcopenshell_wrapper.schema_by_name(f.schema_identifier)
+
+    if hasattr(logger, 'set_state'):
+        logger.set_state('type', 'global_rule')
+
+    for R in [r for r in rules if r.SCOPE == "file"]:
+        try:
+            R()(f)
+        except Exception as e:
+            ln = e.__traceback__.tb_next.tb_lineno
+            pre_annotate_attribute(R.__name__)
+            logger.error(
+                str(
+                    error(
+                        post_annotate_attribute(R.__name__),
+                        reverse_compile(source_lines[ln - 1]),
+                        reverse_compile(e.args[0]),
+                    )
+                )
+            )
+
+    if processes > 1:
+        run_parallel(f, logger, rule_names, processes, filename)
+    else:
+        if hasattr(logger, 'set_state'):
+            logger.set_state('type', 'simpletype_rule')
+
+        # When only a subset of rules is requested, skip the pass over all instances if it contains no type rules
+        if get_type_rules(S, rules) or rule_names is None:
+            run_type_rules(S, rules, source_lines, logger, f)
+
+        if hasattr(logger, 'set_state'):
+            logger.set_state('type', 'entity_rule')
+
+        run_entity_rules(rules, source_lines, logger, lambda R: f.by_type(R.TYPE_NAME))
+
     ifcopenshell.settings.unpack_non_aggregate_inverses = orig
 
 
@@ -281,7 +557,8 @@ if __name__ == "__main__":
 
         f = ifcopenshell.open(fn)
 
-        run(f, logger)
+        processes = next((int(x.split("=")[1]) for x in flags if x.startswith("--processes=")), 1)
+        run(f, logger, processes=processes, filename=fn)
 
         if "--json" in flags:
             print("\n".join(json.dumps(x, default=str) for x in logger.statements))
@@ -32,6 +32,10 @@ from .entity_instance import entity_instance
 if TYPE_CHECKING:
     import ifcopenshell.util.schema
 
+# Number of characters encoded and compressed at a time when writing zipped
+# IFC-SPF files.
+ZIP_CHUNK_SIZE = 1 << 24
+
 HEADER_FIELDS = {
     "file_description": [
         "description",
@@ -674,17 +678,18 @@ class file:
             return
         if format == ".ifcZIP":
             return self.write(path, ".ifc", zipped=True)
-        self.wrapped_data.write(str(path))
         if zipped:
-            unzipped_path = path.with_suffix(format)
-            path.rename(unzipped_path)
-            with zipfile.ZipFile(path, "w") as zip_file:
-                zip_file.write(
-                    unzipped_path,
-                    unzipped_path.name,
-                    compress_type=zipfile.ZIP_DEFLATED,
-                )
-                unzipped_path.unlink()
+            # Serialise straight into the archive rather than writing an
+            # uncompressed copy to disk and compressing it afterwards.
+            data = self.wrapped_data.to_string()
+            with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zip_file:
+                # A character takes at most 4 bytes once encoded.
+                force_zip64 = len(data) > zipfile.ZIP64_LIMIT // 4
+                with zip_file.open(path.with_suffix(format).name, "w", force_zip64=force_zip64) as member:
+                    for i in range(0, len(data), ZIP_CHUNK_SIZE):
+                        member.write(data[i : i + ZIP_CHUNK_SIZE].encode("utf-8", "surrogateescape"))
+            return
+        self.wrapped_data.write(str(path))
         return
 
     @staticmethod
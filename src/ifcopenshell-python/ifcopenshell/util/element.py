@@ -16,10 +16,11 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with IfcOpenShell.  If not, see <http://www.gnu.org/licenses/>.
 
+import weakref
 import ifcopenshell
 import ifcopenshell.guid
 import ifcopenshell.util.element
-from typing import Any, Callable, Optional, Union, Literal, overload
+from typing import Any, Callable, Iterable, Optional, Union, Literal, overload
 from collections import namedtuple
 
 
@@ -914,6 +915,8 @@ def get_container(
         element = file.by_type("IfcWall")[0]
         container = ifcopenshell.util.element.get_container(element)
     """
+    if decomposition_indexes and (index := get_decomposition_index(element.file)):
+        return index.get_container(element, should_get_direct, ifc_class)
     if should_get_direct:
         if (
             contained_in_structure := getattr(element, "ContainedInStructure", None)
@@ -1005,6 +1008,8 @@ def get_decomposition(element: ifcopenshell.entity_instance, is_recursive=True)
     """
     queue = [element]
     results = set()
+    if decomposition_indexes and (index := get_decomposition_index(element.file)):
+        return index.get_decomposition(element, is_recursive)
     while queue:
         element = queue.pop()
         for rel in getattr(element, "ContainsElements", []):
@@ -1134,6 +1139,8 @@ def get_filled_void(element: ifcopenshell.entity_instance) -> Union[ifcopenshell
         window = file.by_type("IfcWindow")[0]
         opening = ifcopenshell.util.element.get_filled_void(window)
     """
+    if decomposition_indexes and (index := get_decomposition_index(element.file)):
+        return index.get_filled_void(element)
     if rel := getattr(element, "FillsVoids", None):
         return rel[0].RelatingOpeningElement
 
@@ -1155,6 +1162,8 @@ def get_voided_element(element: ifcopenshell.entity_instance) -> Union[ifcopensh
         opening = file.by_type("IfcOpeningElement")[0]
         element = ifcopenshell.util.element.get_voided_element(opening)
     """
+    if decomposition_indexes and (index := get_decomposition_index(element.file)):
+        return index.get_voided_element(element)
     if rel := getattr(element, "VoidsElements", None):
         return rel[0].RelatingBuildingElement
 
@@ -1175,6 +1184,8 @@ def get_aggregate(element: ifcopenshell.entity_instance) -> Union[ifcopenshell.e
         element = file.by_type("IfcBeam")[0]
         aggregate = ifcopenshell.util.element.get_aggregate(element)
     """
+    if decomposition_indexes and (index := get_decomposition_index(element.file)):
+        return index.get_aggregate(element)
     if decomposes := getattr(element, "Decomposes", None):
         if decomposes[0].is_a("IfcRelAggregates"):  # IFC2X3
             return decomposes[0].RelatingObject
@@ -1196,6 +1207,8 @@ def get_nest(element: ifcopenshell.entity_instance) -> Union[ifcopenshell.entity
         element = file.by_type("IfcBeam")[0]
         aggregate = ifcopenshell.util.element.get_nest(element)
     """
+    if decomposition_indexes and (index := get_decomposition_index(element.file)):
+        return index.get_nest(element)
     if (nests := getattr(element, "Nests", None)) is not None:
         if nests:
             return nests[0].RelatingObject
@@ -1277,6 +1290,254 @@ def get_components(element: ifcopenshell.entity_instance, include_ports=False) -
     return []
 
 
+class DecompositionIndex:
+    """Stores the spatial and decomposition hierarchy of a file
+
+    Finding the parent or children of an element through inverse attributes
+    is slow when repeated for many elements, such as when building a tree of
+    the whole model or filtering elements by their location. The index is
+    built in a single pass over all containment, aggregation, nesting,
+    voiding, and filling relationships, and then answers these lookups from
+    dictionaries.
+    """
+
+    # The relationship class, the parent dictionary it populates, and the
+    # relating and related attributes.
+    relationships = (
+        ("IfcRelContainedInSpatialStructure", "containers", "RelatingStructure", "RelatedElements"),
+        ("IfcRelAggregates", "aggregates", "RelatingObject", "RelatedObjects"),
+        ("IfcRelNests", "nests", "RelatingObject", "RelatedObjects"),
+        ("IfcRelVoidsElement", "voided_elements", "RelatingBuildingElement", "RelatedOpeningElement"),
+        ("IfcRelFillsElement", "filled_voids", "RelatingOpeningElement", "RelatedBuildingElement"),
+    )
+
+    def __init__(self, file: ifcopenshell.file):
+        # Only ids and a weak reference to the file are stored, as the index
+        # is cached per file and entity instances keep their file alive.
+        self.file = weakref.ref(file)
+        self.build()
+
+    def build(self) -> None:
+        """Rebuilds the index from all relationships in the file"""
+        self.containers: dict[int, int] = {}
+        self.aggregates: dict[int, int] = {}
+        self.nests: dict[int, int] = {}
+        self.voided_elements: dict[int, int] = {}
+        self.filled_voids: dict[int, int] = {}
+        self.children: dict[int, set[int]] = {}
+        self.ancestors: dict[int, tuple[int, ...]] = {}
+        self.container_results: dict[tuple, Optional[int]] = {}
+        for ifc_class, name, relating_attribute, related_attribute in self.relationships:
+            parents = getattr(self, name)
+            for rel in self.file().by_type(ifc_class):
+                parent = getattr(rel, relating_attribute).id()
+                related = getattr(rel, related_attribute)
+                related = [e.id() for e in related] if isinstance(related, tuple) else [related.id()]
+                for element in related:
+                    parents.setdefault(element, parent)
+                self.children.setdefault(parent, set()).update(related)
+        self.is_dirty = False
+
+    def update(self, elements: Iterable[ifcopenshell.entity_instance]) -> None:
+        """Updates the parents of elements whose relationships have changed
+
+        :param elements: The elements which have been assigned to or
+            unassigned from a parent.
+        """
+        file = self.file()
+        for element in elements:
+            element_id = element.id()
+            for _, name, _, _ in self.relationships:
+                if (parent := getattr(self, name).pop(element_id, None)) is not None:
+                    self.children[parent].discard(element_id)
+            for rel in file.get_inverse(element):
+                for ifc_class, name, relating_attribute, related_attribute in self.relationships:
+                    if not rel.is_a(ifc_class):
+                        continue
+                    related = getattr(rel, related_attribute)
+                    if related == element or (isinstance(related, tuple) and element in related):
+                        parent = getattr(rel, relating_attribute).id()
+                        getattr(self, name).setdefault(element_id, parent)
+                        self.children.setdefault(parent, set()).add(element_id)
+                    break
+        self.ancestors.clear()
+        self.container_results.clear()
+
+    def get_instance(self, element_id: Optional[int]) -> Optional[ifcopenshell.entity_instance]:
+        if element_id is not None:
+            return self.file().by_id(element_id)
+
+    def get_aggregate(self, element: ifcopenshell.entity_instance) -> Optional[ifcopenshell.entity_instance]:
+        """See :func:`get_aggregate`"""
+        return self.get_instance(self.aggregates.get(element.id()))
+
+    def get_nest(self, element: ifcopenshell.entity_instance) -> Optional[ifcopenshell.entity_instance]:
+        """See :func:`get_nest`"""
+        return self.get_instance(self.nests.get(element.id()))
+
+    def get_filled_void(self, element: ifcopenshell.entity_instance) -> Optional[ifcopenshell.entity_instance]:
+        """See :func:`get_filled_void`"""
+        return self.get_instance(self.filled_voids.get(element.id()))
+
+    def get_voided_element(self, element: ifcopenshell.entity_instance) -> Optional[ifcopenshell.entity_instance]:
+        """See :func:`get_voided_element`"""
+        return self.get_instance(self.voided_elements.get(element.id()))
+
+    def get_decomposition(
+        self, element: ifcopenshell.entity_instance, is_recursive: bool = True
+    ) -> set[ifcopenshell.entity_instance]:
+        """See :func:`get_decomposition`"""
+        queue = [element.id()]
+        results = set()
+        while queue:
+            children = self.children.get(queue.pop(), ())
+            queue.extend(children)
+            results.update(children)
+            if not is_recursive:
+                break
+        file = self.file()
+        return {file.by_id(i) for i in results}
+
+    def get_parent_id(self, element_id: int) -> Optional[int]:
+        for parents in (self.containers, self.aggregates, self.nests, self.filled_voids, self.voided_elements):
+            if (parent := parents.get(element_id)) is not None:
+                return parent
+
+    def get_parent(self, element: ifcopenshell.entity_instance) -> Optional[ifcopenshell.entity_instance]:
+        """See :func:`get_parent`"""
+        return self.get_instance(self.get_parent_id(element.id()))
+
+    def get_ancestor_ids(self, element_id: int) -> tuple[int, ...]:
+        if (ancestors := self.ancestors.get(element_id)) is None:
+            if (parent := self.get_parent_id(element_id)) is None:
+                ancestors = ()
+            else:
+                ancestors = (parent,) + self.get_ancestor_ids(parent)
+            self.ancestors[element_id] = ancestors
+        return ancestors
+
+    def get_ancestors(self, element: ifcopenshell.entity_instance) -> tuple[ifcopenshell.entity_instance, ...]:
+        """Returns the chain of parents of an element, from nearest to furthest
+
+        :param element: Any physical or spatial element in the tree
+        :return: All parents up to and including the root, typically the
+            IfcProject.
+        """
+        file = self.file()
+        return tuple(file.by_id(i) for i in self.get_ancestor_ids(element.id()))
+
+    def get_container(
+        self, element: ifcopenshell.entity_instance, should_get_direct: bool = False, ifc_class: Optional[str] = None
+    ) -> Optional[ifcopenshell.entity_instance]:
+        """See :func:`get_container`"""
+        return self.get_instance(self.get_container_id(element.id(), should_get_direct, ifc_class))
+
+    def get_container_id(self, element_id: int, should_get_direct: bool, ifc_class: Optional[str]) -> Optional[int]:
+        key = (element_id, should_get_direct, ifc_class)
+        if key in self.container_results:
+            return self.container_results[key]
+        result = None
+        if should_get_direct:
+            container = self.containers.get(element_id)
+            if container is not None and (not ifc_class or self.file().by_id(container).is_a(ifc_class)):
+                result = container
+        elif (aggregate := self.aggregates.get(element_id)) is not None:
+            result = self.get_container_id(aggregate, should_get_direct, None)
+        elif (nest := self.nests.get(element_id)) is not None:
+            result = self.get_container_id(nest, should_get_direct, None)
+        elif (container := self.containers.get(element_id)) is not None:
+            if not ifc_class:
+                result = container
+            else:
+                file = self.file()
+                while container is not None:
+                    if file.by_id(container).is_a(ifc_class):
+                        result = container
+                        break
+                    container = self.aggregates.get(container)
+        self.container_results[key] = result
+        return result
+
+
+decomposition_indexes: "weakref.WeakKeyDictionary[ifcopenshell.file, DecompositionIndex]" = weakref.WeakKeyDictionary()
+
+
+def enable_decomposition_index(file: ifcopenshell.file) -> DecompositionIndex:
+    """Indexes the spatial and decomposition hierarchy of a file
+
+    Once enabled, :func:`get_container`, :func:`get_aggregate`,
+    :func:`get_nest`, :func:`get_filled_void`, :func:`get_voided_element`,
+    :func:`get_parent` and :func:`get_decomposition` (and therefore anything
+    which uses them, such as ``ifcopenshell.util.selector``) look up the index
+    instead of traversing inverse attributes. This is recommended when
+    querying the hierarchy of many elements.
+
+    Relationships edited using the ``aggregate``, ``nest``, ``spatial``, and
+    ``void`` API modules, ports assigned using the ``system`` API module, or
+    elements copied or removed using
+    :func:`ifcopenshell.api.root.copy_class`,
+    :func:`ifcopenshell.api.sequence.duplicate_task`,
+    :func:`ifcopenshell.api.cost.copy_cost_item` and
+    :func:`ifcopenshell.api.root.remove_product`, are kept up to date. If the
+    hierarchy is otherwise modified (including undoing a transaction), call
+    :func:`invalidate_decomposition_index`.
+
+    Example:
+
+    .. code:: python
+
+        ifcopenshell.util.element.enable_decomposition_index(model)
+        for element in model.by_type("IfcElement"):
+            storey = ifcopenshell.util.element.get_container(element, ifc_class="IfcBuildingStorey")
+        ifcopenshell.util.element.disable_decomposition_index(model)
+
+    :param file: The IFC file
+    :return: The decomposition index
+    """
+    if (index := decomposition_indexes.get(file)) is None:
+        index = decomposition_indexes[file] = DecompositionIndex(file)
+    return index
+
+
+def disable_decomposition_index(file: ifcopenshell.file) -> None:
+    """Stops indexing the hierarchy of a file
+
+    :param file: The IFC file
+    """
+    decomposition_indexes.pop(file, None)
+
+
+def get_decomposition_index(file: ifcopenshell.file) -> Optional[DecompositionIndex]:
+    """Returns the decomposition index of a file, if enabled
+
+    If the index has been invalidated, it is rebuilt first.
+
+    :param file: The IFC file
+    :return: The decomposition index, or None if indexing is not enabled
+    """
+    if (index := decomposition_indexes.get(file)) is not None and index.is_dirty:
+        index.build()
+    return index
+
+
+def invalidate_decomposition_index(
+    file: ifcopenshell.file, elements: Optional[Iterable[ifcopenshell.entity_instance]] = None
+) -> None:
+    """Marks the decomposition index of a file as out of date
+
+    :param file: The IFC file
+    :param elements: The elements which have been assigned to or unassigned
+        from a parent. If omitted, the whole index is rebuilt the next time it
+        is used. This is necessary if elements have been removed.
+    """
+    if (index := decomposition_indexes.get(file)) is None or index.is_dirty:
+        return
+    if elements is None:
+        index.is_dirty = True
+    else:
+        index.update(elements)
+
+
 ReferenceData = namedtuple("ReferenceData", "inverse_attribute, rel_class, relating_element_attribute")
 
 # References below are omitted because they do not introduce
@@ -1534,6 +1795,124 @@ def remove_deep2(
     # ifc_file.unbatch()
 
 
+def remove_deep2_many(
+    ifc_file: ifcopenshell.file,
+    elements: list[ifcopenshell.entity_instance],
+    also_consider: list[ifcopenshell.entity_instance] = [],
+    do_not_delete: list[ifcopenshell.entity_instance] = [],
+) -> None:
+    """Recursively purges the subgraphs of many elements at once
+
+    This is equivalent to calling remove_deep2() on each element, but is
+    significantly faster when removing thousands of subgraphs, such as when
+    purging representations. The union of all subgraphs is traversed once and
+    all elements are deleted in a single batch.
+
+    An element (including the starting elements) is purged only if all of its
+    inverses are also purged or are part of ``also_consider``. Elements in
+    ``do_not_delete``, and anything they reference, are never purged. Elements
+    in ``also_consider`` are never purged themselves, but are otherwise only
+    used to count the inverses of elements in the subgraph, so the elements
+    they reference may still be purged.
+
+    :param ifc_file: The IFC file object
+    :type ifc_file: ifcopenshell.file
+    :param elements: The starting elements that define the subgraphs
+    :type elements: list[ifcopenshell.entity_instance]
+    :param also_consider: elements to also consider as a part of a subgraph
+    :type also_consider: list[ifcopenshell.entity_instance], optional
+    :param do_not_delete: elements to protect from deletion
+    :type do_not_delete: list[ifcopenshell.entity_instance], optional
+
+    Example:
+
+    .. code:: python
+
+        representations = model.by_type("IfcShapeRepresentation")
+        ifcopenshell.util.element.remove_deep2_many(
+            model, representations, do_not_delete=model.by_type("IfcGeometricRepresentationContext")
+        )
+    """
+    also_consider = set(also_consider)
+    do_not_delete = set(do_not_delete)
+
+    # Traverse the union of all subgraphs once, recording forward references.
+    subgraph = list(dict.fromkeys(e for e in elements if e.id()))
+    children: dict[ifcopenshell.entity_instance, list[ifcopenshell.entity_instance]] = {}
+    parents: dict[ifcopenshell.entity_instance, set[ifcopenshell.entity_instance]] = {}
+    seen = set(subgraph)
+    i = 0
+    while i < len(subgraph):
+        element = subgraph[i]
+        i += 1
+        children[element] = element_children = []
+        for subelement in ifc_file.traverse(element, max_levels=1)[1:]:
+            if not subelement.id():
+                continue
+            element_children.append(subelement)
+            parents.setdefault(subelement, set()).add(element)
+            if subelement not in seen:
+                seen.add(subelement)
+                subgraph.append(subelement)
+    for element in also_consider:
+        for subelement in ifc_file.traverse(element, max_levels=1)[1:]:
+            if subelement in seen:
+                parents[subelement].add(element)
+
+    # Anything referenced from outside the subgraph is kept, along with
+    # everything it references in turn.
+    to_keep = []
+    for element in subgraph:
+        if element in do_not_delete:
+            to_keep.append(element)
+            continue
+        internal = parents.get(element, ())
+        # The total is never less than the number of distinct inverses.
+        if ifc_file.get_total_inverses(element) <= len(internal):
+            continue
+        if not ifc_file.get_inverse(element).issubset(internal):
+            to_keep.append(element)
+    kept = set()
+    while to_keep:
+        element = to_keep.pop()
+        if element not in kept:
+            kept.add(element)
+            to_keep.extend(children[element])
+
+    to_delete = [e for e in subgraph if e not in kept and e not in also_consider]
+    if not to_delete:
+        return
+
+    if getattr(ifc_file, "to_delete", None) is not None:
+        ifc_file.to_delete.update(to_delete)
+        return
+
+    # Sort topologically so that elements are deleted before what they
+    # reference, which is required for batching to work.
+    to_delete_set = set(to_delete)
+    total_parents = {e: len(parents.get(e, set()) & to_delete_set) for e in to_delete}
+    queue = [e for e in to_delete if not total_parents[e]]
+    i = 0
+    while i < len(queue):
+        for subelement in children[queue[i]]:
+            if subelement in to_delete_set:
+                total_parents[subelement] -= 1
+                if not total_parents[subelement]:
+                    queue.append(subelement)
+        i += 1
+    if len(queue) < len(to_delete):
+        # Cyclic references, which are rare in practice.
+        queued = set(queue)
+        queue.extend(e for e in to_delete if e not in queued)
+
+    ifc_file.batch()
+    try:
+        for element in reversed(queue):
+            ifc_file.remove(element)
+    finally:
+        ifc_file.unbatch()
+
+
 def copy(ifc_file: ifcopenshell.file, element: ifcopenshell.entity_instance) -> ifcopenshell.entity_instance:
     """
     Copy a single element. Any referenced elements are not copied.
@@ -16,10 +16,19 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with IfcOpenShell.  If not, see <http://www.gnu.org/licenses/>.
 
+import os
+import re
+import sqlite3
 import zipfile
-from typing import IO, Union, TypedDict
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Iterable, Optional, Union, TypedDict
 from typing_extensions import NotRequired
 
+# Matches the entity name of every instance in the DATA section, assuming
+# instances start on a new line, as written by practically all exporters.
+ENTITY_PATTERN = re.compile(rb"^[ \t]*#\d+[ \t]*=[ \t]*([A-Za-z0-9_]+)", re.MULTILINE)
+
 
 class HeaderMetadata(TypedDict):
     name: NotRequired[str]
@@ -29,13 +38,27 @@ class HeaderMetadata(TypedDict):
     schema_name: NotRequired[str]
 
 
+class FileStatistics(TypedDict):
+    header: HeaderMetadata
+    entity_counts: dict[str, int]
+    size: int
+
+
+class CatalogFile(TypedDict):
+    path: str
+    size: int
+    mtime: int
+    header: HeaderMetadata
+    total_entities: int
+
+
 class IfcHeaderExtractor:
     """An utility class for extracting header information from IFC files.
 
     This class provides functionality to extract key metadata from the header section of
     IFC files without recreating the entire file as `ifcopenshell.file`.
-    For optimization, extractor will search only for the first 50 lines
-    of the IFC file for metadata.
+    For optimization, extractor will only read the IFC file up to the end of
+    its header section.
 
     Supported formats: .ifc, .ifczip.
 
@@ -87,9 +110,7 @@ class IfcHeaderExtractor:
     def extract_ifc_spf(self, ifc_file: Union[IO[bytes], IO[str]]) -> HeaderMetadata:
         # https://www.steptools.com/stds/step/IS_final_p21e3.html#clause-8
         data = HeaderMetadata()
-        max_lines_to_parse = 50
-        for _ in range(max_lines_to_parse):
-            line = next(ifc_file)
+        for line in ifc_file:
             if isinstance(line, bytes):
                 line = line.decode("utf-8")
             if line.startswith("FILE_DESCRIPTION"):
@@ -107,8 +128,220 @@ class IfcHeaderExtractor:
             elif line.startswith("FILE_SCHEMA"):
                 data["schema_name"] = line.split("'")[1]
                 break
+            elif line.startswith("ENDSEC;"):
+                break
         return data
 
     def extract_ifc_zip(self) -> HeaderMetadata:
         archive = zipfile.ZipFile(self.filepath, "r")
         return self.extract_ifc_spf(archive.open(archive.filelist[0]))
+
+    def extract_statistics(self, chunk_size: int = 1 << 24) -> FileStatistics:
+        """Extracts the header along with entity counts in a single pass
+
+        The file is read in chunks, and instances are counted without being
+        parsed. This is much faster than opening the file with
+        :func:`ifcopenshell.open`, but unlike :meth:`extract` reads the whole
+        file.
+
+        :param chunk_size: The number of bytes to read at a time.
+        :return: The header metadata, the number of instances of each class
+            (named as they are in the file, typically uppercase), and the size
+            in bytes of the file on disk.
+        """
+        extension = self.filepath.split(".")[-1].lower()
+        if extension == "ifc":
+            with open(self.filepath, "rb") as ifc_file:
+                header, entity_counts = self.extract_ifc_spf_statistics(ifc_file, chunk_size)
+        elif extension == "ifczip":
+            with zipfile.ZipFile(self.filepath, "r") as archive:
+                with archive.open(archive.filelist[0]) as ifc_file:
+                    header, entity_counts = self.extract_ifc_spf_statistics(ifc_file, chunk_size)
+        else:
+            raise ValueError(f"Unsupported file extension: '{extension}'.")
+        return {"header": header, "entity_counts": entity_counts, "size": os.path.getsize(self.filepath)}
+
+    def extract_ifc_spf_statistics(self, ifc_file: IO[bytes], chunk_size: int) -> tuple[HeaderMetadata, dict[str, int]]:
+        header = self.extract_ifc_spf(ifc_file)
+        counts = Counter()
+        remainder = b""
+        while chunk := ifc_file.read(chunk_size):
+            chunk = remainder + chunk
+            end = chunk.rfind(b"\n") + 1
+            counts.update(ENTITY_PATTERN.findall(chunk, 0, end))
+            remainder = chunk[end:]
+        counts.update(ENTITY_PATTERN.findall(remainder))
+        return header, {k.decode("ascii"): v for k, v in counts.items()}
+
+
+class IfcCatalog:
+    """A persistent catalog of the headers and statistics of many IFC files
+
+    The catalog is stored in an SQLite database, so that listing models, or
+    routing them by schema, never requires opening a model. Directories are
+    scanned in parallel using :meth:`IfcHeaderExtractor.extract_statistics`,
+    and rescanning only reads files which have been added or changed (by
+    modification time or size) since they were last scanned.
+
+    Example:
+
+    .. code:: python
+
+        from ifcopenshell.util.file import IfcCatalog
+
+        with IfcCatalog("path/to/catalog.db") as catalog:
+            catalog.update("path/to/models")
+            for model in catalog.get_files(schema_name="IFC4"):
+                print(model["path"], model["total_entities"])
+            print(catalog.get_entity_counts("path/to/models/model.ifc").get("IFCWALL", 0))
+    """
+
+    def __init__(self, database: str):
+        self.connection = sqlite3.connect(database)
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                mtime INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                name TEXT,
+                description TEXT,
+                implementation_level TEXT,
+                time_stamp TEXT,
+                schema_name TEXT,
+                total_entities INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS files_schema_name ON files (schema_name);
+            CREATE TABLE IF NOT EXISTS entity_counts (
+                path TEXT NOT NULL REFERENCES files (path) ON DELETE CASCADE,
+                ifc_class TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (path, ifc_class)
+            );
+            """
+        )
+        self.connection.execute("PRAGMA foreign_keys = ON")
+
+    def __enter__(self) -> "IfcCatalog":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def update(
+        self,
+        directory: str,
+        extensions: Iterable[str] = (".ifc", ".ifczip"),
+        max_workers: Optional[int] = None,
+    ) -> list[str]:
+        """Scans a directory tree and updates the catalog
+
+        Files which are new or changed are scanned using a thread pool. Files
+        in the catalog which no longer exist in the directory are removed.
+
+        :param directory: The directory to recursively scan.
+        :param extensions: Case insensitive file extensions to include.
+        :param max_workers: The maximum number of threads, defaulting to that
+            of :class:`concurrent.futures.ThreadPoolExecutor`.
+        :return: The paths of files which were scanned.
+        """
+        directory = os.path.abspath(directory)
+        extensions = tuple(e.lower() for e in extensions)
+        prefix = os.path.join(directory, "")
+        cataloged = {
+            path: (mtime, size)
+            for path, mtime, size in self.connection.execute("SELECT path, mtime, size FROM files")
+            if path.startswith(prefix)
+        }
+
+        to_scan = {}
+        for root, _, filenames in os.walk(directory):
+            for filename in filenames:
+                if not filename.lower().endswith(extensions):
+                    continue
+                path = os.path.join(root, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    # Such as broken symlinks or files removed during the scan
+                    continue
+                if cataloged.pop(path, None) != (stat.st_mtime_ns, stat.st_size):
+                    to_scan[path] = stat.st_mtime_ns
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(self.scan_file, to_scan)
+            with self.connection:
+                self.connection.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in cataloged])
+                for path, statistics in zip(to_scan, results):
+                    self.add_file(path, to_scan[path], statistics)
+        return list(to_scan)
+
+    def scan_file(self, path: str) -> FileStatistics:
+        try:
+            return IfcHeaderExtractor(path).extract_statistics()
+        except (OSError, ValueError, StopIteration, zipfile.BadZipFile, IndexError):
+            # Unreadable files are still cataloged so they aren't rescanned
+            # until they change.
+            return {"header": {}, "entity_counts": {}, "size": os.path.getsize(path)}
+
+    def add_file(self, path: str, mtime: int, statistics: FileStatistics) -> None:
+        header = statistics["header"]
+        entity_counts = statistics["entity_counts"]
+        self.connection.execute("DELETE FROM files WHERE path = ?", (path,))
+        self.connection.execute(
+            "INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                path,
+                mtime,
+                statistics["size"],
+                header.get("name"),
+                header.get("description"),
+                header.get("implementation_level"),
+                header.get("time_stamp"),
+                header.get("schema_name"),
+                sum(entity_counts.values()),
+            ),
+        )
+        self.connection.executemany(
+            "INSERT INTO entity_counts VALUES (?, ?, ?)", [(path, k, v) for k, v in entity_counts.items()]
+        )
+
+    def get_files(self, schema_name: Optional[str] = None) -> list[CatalogFile]:
+        """Gets cataloged files, optionally filtered by schema
+
+        :param schema_name: The schema identifier as stored in the header,
+            such as IFC4 or IFC4X3_ADD2.
+        :return: A list of cataloged files, sorted by path.
+        """
+        query = "SELECT * FROM files"
+        parameters = ()
+        if schema_name is not None:
+            query += " WHERE schema_name = ?"
+            parameters = (schema_name,)
+        results = []
+        for row in self.connection.execute(query + " ORDER BY path", parameters):
+            path, mtime, size, *header, total_entities = row
+            keys = ("name", "description", "implementation_level", "time_stamp", "schema_name")
+            results.append(
+                {
+                    "path": path,
+                    "size": size,
+                    "mtime": mtime,
+                    "header": {k: v for k, v in zip(keys, header) if v is not None},
+                    "total_entities": total_entities,
+                }
+            )
+        return results
+
+    def get_entity_counts(self, path: str) -> dict[str, int]:
+        """Gets the number of instances of each class in a cataloged file
+
+        :param path: The path to the file.
+        :return: A dictionary of class names, as they are in the file, to
+            counts. Empty if the file is not cataloged.
+        """
+        query = "SELECT ifc_class, count FROM entity_counts WHERE path = ?"
+        return dict(self.connection.execute(query, (os.path.abspath(path),)))
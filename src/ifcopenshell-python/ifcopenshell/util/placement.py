@@ -16,6 +16,7 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with IfcOpenShell.  If not, see <http://www.gnu.org/licenses/>.
 
+import weakref
 import numpy as np
 import numpy.typing as npt
 import ifcopenshell
@@ -116,6 +117,9 @@ def get_local_placement(placement: Optional[ifcopenshell.entity_instance] = None
         placement = file.by_type("IfcBeam")[0].ObjectPlacement
         matrix = ifcopenshell.util.placement.get_local_placement(placement)
 
+    If a placement cache is enabled for the file (see
+    :func:`enable_placement_cache`), the matrix is looked up from the cache.
+
     :param placement: The IfcLocalPlacement entity
     :type placement: ifcopenshell.entity_instance, optional
     :return: A 4x4 numpy matrix
@@ -123,6 +127,8 @@ def get_local_placement(placement: Optional[ifcopenshell.entity_instance] = None
     """
     if placement is None:
         return np.eye(4)
+    if placement_caches and (cache := get_placement_cache(placement.file)):
+        return cache.get_local_placement(placement).copy()
     if (rel_to := placement.PlacementRelTo) is None:
         parent = np.eye(4)
     else:
@@ -130,6 +136,205 @@ def get_local_placement(placement: Optional[ifcopenshell.entity_instance] = None
     return np.dot(parent, get_axis2placement(placement.RelativePlacement))
 
 
+class PlacementCache:
+    """Stores the absolute matrices of all IfcLocalPlacements in a file
+
+    Placements are typically shared between many elements (e.g. all elements
+    placed relative to a storey), so resolving them individually repeats a
+    lot of work. The cache resolves all placements in the file at once, and
+    then lazily resolves any new placements.
+    """
+
+    def __init__(self, file: ifcopenshell.file):
+        self.matrices: dict[int, MatrixType] = {}
+        self.resolve_all(file)
+
+    def resolve_all(self, file: ifcopenshell.file) -> None:
+        """Resolves the absolute matrix of every IfcLocalPlacement in the file
+
+        Relative matrices of IfcAxis2Placement3Ds are built together, and
+        placements are then resolved one depth of the ``PlacementRelTo`` tree
+        at a time. Anything else (such as placements relative to grids) is
+        left to be resolved lazily.
+        """
+        placements = [p for p in file.by_type("IfcLocalPlacement") if p.id() not in self.matrices]
+        if not placements:
+            return
+        total = len(placements)
+        index = {p.id(): i for i, p in enumerate(placements)}
+        parents = np.full(total, -1)
+        relative = np.empty((total, 4, 4))
+        is_resolvable = np.ones(total, dtype=bool)
+        axes = {"o": [], "z": [], "x": []}
+        axes_indices = []
+        resolved_parents = []
+
+        for i, placement in enumerate(placements):
+            if (rel_to := placement.PlacementRelTo) is not None:
+                if (parent := index.get(rel_to.id())) is not None:
+                    parents[i] = parent
+                elif (matrix := self.matrices.get(rel_to.id())) is not None:
+                    resolved_parents.append((i, matrix))
+                else:
+                    is_resolvable[i] = False
+                    continue
+            relative_placement = placement.RelativePlacement
+            location = getattr(relative_placement.Location, "Coordinates", None)
+            if relative_placement.is_a("IfcAxis2Placement3D") and location:
+                axis = relative_placement.Axis
+                ref_direction = relative_placement.RefDirection
+                axes["o"].append(location)
+                axes["z"].append(axis.DirectionRatios if axis else (0, 0, 1))
+                axes["x"].append(ref_direction.DirectionRatios if ref_direction else (1, 0, 0))
+                axes_indices.append(i)
+            else:
+                try:
+                    relative[i] = get_axis2placement(relative_placement)
+                except Exception:
+                    is_resolvable[i] = False
+
+        if axes_indices:
+            x = np.array(axes["x"], dtype=float)
+            z = np.array(axes["z"], dtype=float)
+            x /= np.linalg.norm(x, axis=1)[:, None]
+            z /= np.linalg.norm(z, axis=1)[:, None]
+            y = np.cross(z, x)
+            y /= np.linalg.norm(y, axis=1)[:, None]
+            matrices = np.zeros((len(axes_indices), 4, 4))
+            matrices[:, :3, 0] = x
+            matrices[:, :3, 1] = y
+            matrices[:, :3, 2] = z
+            matrices[:, :3, 3] = np.array(axes["o"], dtype=float)
+            matrices[:, 3, 3] = 1.0
+            relative[axes_indices] = matrices
+
+        for i, matrix in resolved_parents:
+            relative[i] = matrix @ relative[i]
+
+        # Resolve depth by depth, so that each parent is resolved before its children.
+        depths = np.zeros(total, dtype=int)
+        ancestors = parents.copy()
+        for _ in range(total):
+            has_parent = ancestors != -1
+            if not has_parent.any():
+                break
+            depths[has_parent] += 1
+            ancestors[has_parent] = parents[ancestors[has_parent]]
+        else:
+            # A cyclic PlacementRelTo chain can't be resolved.
+            is_resolvable[ancestors != -1] = False
+
+        absolute = relative
+        for depth in range(1, depths.max() + 1):
+            indices = np.flatnonzero(depths == depth)
+            absolute[indices] = absolute[parents[indices]] @ relative[indices]
+            is_resolvable[indices] &= is_resolvable[parents[indices]]
+
+        for i, placement in enumerate(placements):
+            if is_resolvable[i]:
+                self.matrices[placement.id()] = absolute[i]
+
+    def get_local_placement(self, placement: ifcopenshell.entity_instance) -> MatrixType:
+        """Returns the absolute matrix of a placement
+
+        Note that the returned matrix is owned by the cache and must not be
+        modified.
+        """
+        if (matrix := self.matrices.get(placement.id())) is not None:
+            return matrix
+        if (rel_to := placement.PlacementRelTo) is None:
+            parent = np.eye(4)
+        elif rel_to.is_a("IfcLocalPlacement"):
+            parent = self.get_local_placement(rel_to)
+        else:
+            parent = get_local_placement(rel_to)
+        matrix = self.matrices[placement.id()] = np.dot(parent, get_axis2placement(placement.RelativePlacement))
+        return matrix
+
+    def invalidate(self, placement: ifcopenshell.entity_instance) -> None:
+        """Forgets a placement, and all placements relative to it"""
+        queue = [placement]
+        while queue:
+            placement = queue.pop()
+            self.matrices.pop(placement.id(), None)
+            queue.extend(placement.ReferencedByPlacements)
+
+
+placement_caches: "weakref.WeakKeyDictionary[ifcopenshell.file, PlacementCache]" = weakref.WeakKeyDictionary()
+
+
+def enable_placement_cache(file: ifcopenshell.file) -> PlacementCache:
+    """Caches the absolute matrices of all placements in a file
+
+    Once enabled, :func:`get_local_placement` (and therefore anything which
+    uses it, such as ``ifcopenshell.util.shape`` and
+    ``ifcopenshell.util.selector``) looks up matrices from the cache instead
+    of resolving the ``PlacementRelTo`` chain on every call. This is
+    recommended when querying the placements of many elements.
+
+    Placements edited using
+    :func:`ifcopenshell.api.geometry.edit_object_placement` are kept up to
+    date. If placements are otherwise modified (including undoing a
+    transaction), call :func:`invalidate_placement_cache`.
+
+    Example:
+
+    .. code:: python
+
+        ifcopenshell.util.placement.enable_placement_cache(model)
+        for element in model.by_type("IfcElement"):
+            matrix = ifcopenshell.util.placement.get_local_placement(element.ObjectPlacement)
+        ifcopenshell.util.placement.disable_placement_cache(model)
+
+    :param file: The IFC file
+    :type file: ifcopenshell.file
+    :return: The placement cache
+    :rtype: PlacementCache
+    """
+    if (cache := placement_caches.get(file)) is None:
+        cache = placement_caches[file] = PlacementCache(file)
+    return cache
+
+
+def disable_placement_cache(file: ifcopenshell.file) -> None:
+    """Stops caching placements in a file
+
+    :param file: The IFC file
+    :type file: ifcopenshell.file
+    """
+    placement_caches.pop(file, None)
+
+
+def get_placement_cache(file: ifcopenshell.file) -> Optional[PlacementCache]:
+    """Returns the placement cache of a file, if enabled
+
+    :param file: The IFC file
+    :type file: ifcopenshell.file
+    :return: The placement cache, or None if caching is not enabled
+    :rtype: PlacementCache, optional
+    """
+    return placement_caches.get(file)
+
+
+def invalidate_placement_cache(file: ifcopenshell.file, placement: Optional[ifcopenshell.entity_instance] = None) -> None:
+    """Marks cached placement matrices as out of date
+
+    :param file: The IFC file
+    :type file: ifcopenshell.file
+    :param placement: The placement which has changed. Placements relative to
+        it are also invalidated. If omitted, all placements in the file are
+        invalidated.
+    :type placement: ifcopenshell.entity_instance, optional
+    """
+    if (cache := placement_caches.get(file)) is None:
+        return
+    if placement is None:
+        cache.matrices.clear()
+        cache.resolve_all(file)
+    else:
+        cache.invalidate(placement)
+
+
 def get_cartesiantransformationoperator3d(inst: ifcopenshell.entity_instance) -> MatrixType:
     """Parses an IfcCartesianTransformationOperator into a 4x4 transformation matrix
 
@@ -18,6 +18,7 @@
 
 import re
 import lark
+import functools
 import numpy as np
 import ifcopenshell.api.pset
 import ifcopenshell.api.geometry
@@ -277,8 +278,13 @@ def format(query: str) -> str:
 
 
 def get_element_value(element: ifcopenshell.entity_instance, query: str) -> Any:
-    keys: list[str] = GetElementTransformer().transform(get_element_grammar.parse(query))
-    return _get_element_value(element, keys)
+    return _get_element_value(element, parse_element_query(query))
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_element_query(query: str) -> tuple[str, ...]:
+    # The same queries are typically evaluated for many elements.
+    return tuple(GetElementTransformer().transform(get_element_grammar.parse(query)))
 
 
 def _get_element_value(element: ifcopenshell.entity_instance, keys: list[str]) -> Any:
@@ -16,7 +16,11 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with IfcOpenShell.  If not, see <http://www.gnu.org/licenses/>.
 
+import bisect
 import datetime
+import itertools
+import weakref
+import ifcopenshell
 import ifcopenshell.util.date
 from math import floor
 from functools import lru_cache
@@ -92,18 +96,9 @@ def get_calendar(task: ifcopenshell.entity_instance) -> Union[ifcopenshell.entit
 
 
 def count_working_days(start, finish, calendar: ifcopenshell.entity_instance) -> int:
-    result = 0
     if start == finish:
         return 0
-    current_date = datetime.date(start.year, start.month, start.day)
-    finish_date = datetime.date(finish.year, finish.month, finish.day)
-    while current_date <= finish_date:
-        if calendar and calendar.WorkingTimes and is_working_day(current_date, calendar):
-            result += 1
-        elif not calendar or not is_calendar_applicable(current_date, calendar):
-            result += 1
-        current_date += datetime.timedelta(days=1)
-    return result
+    return get_compiled_calendar(calendar).count_working_days(start, finish)
 
 
 def get_start_or_finish_date(
@@ -131,43 +126,179 @@ def get_start_or_finish_date(
 
 
 def offset_date(start, duration, duration_type: DURATION_TYPE, calendar: ifcopenshell.entity_instance):
-    current_date = start
     months = getattr(duration, "months", 0)
     years = getattr(duration, "years", 0)
 
     abs_duration = abs((duration.days + months * 30 + years * 12 * 30))
-    date_offset = datetime.timedelta(days=1 if duration.days > 0 else -1)
-    while abs_duration > 0:
-        if duration_type == "ELAPSEDTIME" or not is_calendar_applicable(current_date, calendar):
-            abs_duration -= 1
-        elif is_working_day(current_date, calendar):
-            abs_duration -= 1
-        current_date += date_offset
-    if duration.days > 0:
-        current_date = get_soonest_working_day(current_date, duration_type, calendar)
-    else:
-        current_date = get_recent_working_day(current_date, duration_type, calendar)
-    return current_date
+    return get_compiled_calendar(calendar).offset_date(start, abs_duration, duration.days > 0, duration_type)
 
 
 def get_soonest_working_day(start, duration_type: DURATION_TYPE, calendar: ifcopenshell.entity_instance):
-    if duration_type == "ELAPSEDTIME" or not is_calendar_applicable(start, calendar):
+    if duration_type == "ELAPSEDTIME":
         return start
-    while not is_working_day(start, calendar):
-        if not is_calendar_applicable(start, calendar):
-            break
-        start += datetime.timedelta(days=1)
-    return start
+    return get_compiled_calendar(calendar).get_soonest_working_day(start)
 
 
 def get_recent_working_day(start, duration_type: DURATION_TYPE, calendar: ifcopenshell.entity_instance):
-    if duration_type == "ELAPSEDTIME" or not is_calendar_applicable(start, calendar):
+    if duration_type == "ELAPSEDTIME":
         return start
-    while not is_working_day(start, calendar):
-        if not is_calendar_applicable(start, calendar):
-            break
-        start -= datetime.timedelta(days=1)
-    return start
+    return get_compiled_calendar(calendar).get_recent_working_day(start)
+
+
+class CompiledCalendar:
+    """Precomputed working days of an IfcWorkCalendar
+
+    For every year that is queried, the working day and applicability flags
+    of all its days are evaluated once and stored together with the cumulative
+    number of counted days. A day is counted when it is a working day or when
+    the calendar does not apply to it (which is how durations are consumed in
+    :func:`offset_date` and :func:`count_working_days`). Offsets and counts are
+    then resolved through binary searches in the cumulative counts, rather
+    than by stepping one day at a time.
+
+    Instances are cached per file by :func:`get_compiled_calendar` and are
+    kept until :func:`clear_calendar_cache` is called.
+    """
+
+    def __init__(self, calendar: Optional[ifcopenshell.entity_instance]):
+        self.has_working_times = bool(calendar and calendar.WorkingTimes)
+        # Compiled calendars are cached per file, so they must not keep the file alive
+        self.file = weakref.ref(calendar.file) if calendar else None
+        self.calendar_id = calendar.id() if calendar else None
+        # year -> (first ordinal, applicable flags, working flags, cumulative counted days)
+        self.years: dict[int, tuple[int, bytearray, bytearray, list[int]]] = {}
+
+    def get_year(self, year: int) -> tuple[int, bytearray, bytearray, list[int]]:
+        data = self.years.get(year)
+        if data is not None:
+            return data
+        first = datetime.date(year, 1, 1).toordinal()
+        n_days = datetime.date(year + 1, 1, 1).toordinal() - first
+        if self.has_working_times:
+            calendar = self.file().by_id(self.calendar_id)
+            days = [datetime.date.fromordinal(first + i) for i in range(n_days)]
+            # Call the uncached implementations, not to fill their caches with every day of the year
+            applicable = bytearray(is_calendar_applicable.__wrapped__(day, calendar) for day in days)
+            working = bytearray(is_working_day.__wrapped__(day, calendar) for day in days)
+            counted = (w or not a for a, w in zip(applicable, working))
+        else:
+            applicable = working = bytearray(n_days)
+            counted = itertools.repeat(True, n_days)
+        cumulative = list(itertools.accumulate(counted, initial=0))
+        data = self.years[year] = (first, applicable, working, cumulative)
+        return data
+
+    def get_flags(self, day) -> tuple[bool, bool]:
+        first, applicable, working, _ = self.get_year(day.year)
+        i = day.toordinal() - first
+        return bool(applicable[i]), bool(working[i])
+
+    def is_calendar_applicable(self, day) -> bool:
+        return self.get_flags(day)[0]
+
+    def is_working_day(self, day) -> bool:
+        return self.get_flags(day)[1]
+
+    def count_working_days(self, start, finish) -> int:
+        """Number of counted days from start up to and including finish"""
+        start, finish = to_date(start), to_date(finish)
+        if finish < start:
+            return 0
+        total = 0
+        for year in range(start.year, finish.year + 1):
+            first, _, _, cumulative = self.get_year(year)
+            lo = start.toordinal() - first if year == start.year else 0
+            hi = finish.toordinal() - first + 1 if year == finish.year else len(cumulative) - 1
+            total += cumulative[hi] - cumulative[lo]
+        return total
+
+    def get_nth_counted_day(self, day: datetime.date, n: int, forward: bool) -> datetime.date:
+        """The n-th (n >= 1) counted day starting from and including day, in either direction"""
+        year = day.year
+        first, _, _, cumulative = self.get_year(year)
+        if forward:
+            i = day.toordinal() - first
+            while True:
+                available = cumulative[-1] - cumulative[i]
+                if n <= available:
+                    return datetime.date.fromordinal(first + bisect.bisect_left(cumulative, cumulative[i] + n, i) - 1)
+                n -= available
+                year += 1
+                first, _, _, cumulative = self.get_year(year)
+                i = 0
+        else:
+            i = day.toordinal() - first + 1
+            while True:
+                available = cumulative[i]
+                if n <= available:
+                    return datetime.date.fromordinal(
+                        first + bisect.bisect_right(cumulative, cumulative[i] - n, 0, i) - 1
+                    )
+                n -= available
+                year -= 1
+                first, _, _, cumulative = self.get_year(year)
+                i = len(cumulative) - 1
+
+    def offset_date(self, start, abs_duration: int, forward: bool, duration_type: DURATION_TYPE):
+        """See :func:`ifcopenshell.util.sequence.offset_date`, the returned value is of the same type as start"""
+        start_date = to_date(start)
+        if duration_type == "ELAPSEDTIME":
+            return start + datetime.timedelta(days=abs_duration if forward else -abs_duration)
+        # Consuming abs_duration counted days and then moving to the nearest working day
+        # in the direction of the offset is equivalent to finding the next counted day.
+        result = self.get_nth_counted_day(start_date, abs_duration + 1, forward)
+        return start + datetime.timedelta(days=result.toordinal() - start_date.toordinal())
+
+    def get_soonest_working_day(self, start):
+        start_date = to_date(start)
+        result = self.get_nth_counted_day(start_date, 1, True)
+        return start + datetime.timedelta(days=result.toordinal() - start_date.toordinal())
+
+    def get_recent_working_day(self, start):
+        start_date = to_date(start)
+        result = self.get_nth_counted_day(start_date, 1, False)
+        return start + datetime.timedelta(days=result.toordinal() - start_date.toordinal())
+
+
+# file -> calendar id -> compiled calendar
+compiled_calendars: "weakref.WeakKeyDictionary[ifcopenshell.file, dict[int, CompiledCalendar]]" = (
+    weakref.WeakKeyDictionary()
+)
+no_calendar = CompiledCalendar(None)
+
+
+def get_compiled_calendar(calendar: Optional[ifcopenshell.entity_instance]) -> CompiledCalendar:
+    """Returns the cached :class:`CompiledCalendar` for an IfcWorkCalendar (or None for no calendar)
+
+    Compiled calendars are cached per file, and are kept until
+    :func:`clear_calendar_cache` is called, which the API does whenever a
+    calendar, work time, recurrence pattern or time period is edited.
+    Editing other entities, such as task times, keeps them.
+    """
+    if calendar is None:
+        return no_calendar
+    cache = compiled_calendars.setdefault(calendar.file, {})
+    compiled = cache.get(calendar.id())
+    if compiled is None:
+        compiled = cache[calendar.id()] = CompiledCalendar(calendar)
+    return compiled
+
+
+def clear_calendar_cache() -> None:
+    """Discards all cached calendar data
+
+    Call this after editing calendars, work times, recurrence patterns or
+    time periods without using the API.
+    """
+    compiled_calendars.clear()
+    is_working_day.cache_clear()
+    is_calendar_applicable.cache_clear()
+
+
+def to_date(day) -> datetime.date:
+    if isinstance(day, datetime.datetime):
+        return datetime.date(day.year, day.month, day.day)
+    return day
 
 
 @lru_cache(maxsize=None)
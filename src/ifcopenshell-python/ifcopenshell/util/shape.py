@@ -475,6 +475,97 @@ def get_area(geometry: ShapeType) -> float:
     return get_area_vf(vertices, faces)
 
 
+def get_direction(axis: AXIS_LITERAL = "Z", direction: Optional[VECTOR_3D] = None) -> npt.NDArray[np.float64]:
+    """Gets a normalised direction vector from either an axis or a direction
+
+    :param axis: Either X, Y, or Z.
+    :type axis: str
+    :param direction: An XYZ iterable (e.g. (0., 0., 1.)). If a direction
+        vector is specified, this overrides the axis argument.
+    :type direction: iterable[float],optional
+    :return: The unit direction vector
+    :rtype: np.array[float]
+    """
+    if direction is None:
+        direction = {"X": (1.0, 0.0, 0.0), "Y": (0.0, 1.0, 0.0), "Z": (0.0, 0.0, 1.0)}[axis]
+    direction = np.array(direction, dtype=float)
+    return direction / np.linalg.norm(direction)
+
+
+def get_triangles(geometries: Iterable[ShapeType]) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.int64]]:
+    """Gets the triangles of many geometries as a single numpy array
+
+    :param geometries: Geometry outputs calculated by IfcOpenShell
+    :type geometries: iterable[geometry]
+    :return: A tuple of the triangles as an array of shape (n, 3, 3) holding
+        the XYZ coordinates of each triangle's vertices, and the number of
+        triangles of each geometry.
+    :rtype: tuple[np.array, np.array[int]]
+    """
+    triangles = [get_vertices(geometry)[get_faces(geometry)] for geometry in geometries]
+    counts = np.array([len(t) for t in triangles], dtype=np.int64)
+    if not triangles:
+        return np.empty((0, 3, 3)), counts
+    return np.concatenate(triangles), counts
+
+
+def get_triangle_normals(triangles: npt.NDArray[np.float64]) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    """Calculates the unit normals and areas of triangles
+
+    :param triangles: An array of shape (n, 3, 3), such as returned from get_triangles.
+    :type triangles: np.array
+    :return: A tuple of the unit normal vectors and the areas of each
+        triangle. Degenerate triangles have a NaN normal.
+    :rtype: tuple[np.array, np.array[float]]
+    """
+    normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    lengths = np.linalg.norm(normals, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        normals = normals / lengths[:, np.newaxis]
+    return normals, lengths / 2
+
+
+def sum_by_geometry(values: npt.NDArray[np.float64], counts: npt.NDArray[np.int64]) -> list[float]:
+    """Totals per-triangle values for each geometry, such as returned from get_triangles"""
+    totals = np.zeros(len(counts))
+    has_values = counts > 0
+    if has_values.any():
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        totals[has_values] = np.add.reduceat(values, offsets[has_values])
+    return totals.tolist()
+
+
+def get_areas(geometries: Iterable[ShapeType]) -> list[float]:
+    """Calculates the surface areas of many geometries at once
+
+    This is equivalent to calling :func:`get_area` for each geometry.
+
+    :param geometries: Geometry outputs calculated by IfcOpenShell
+    :type geometries: iterable[geometry]
+    :return: The surface area of each geometry, in the same order.
+    :rtype: list[float]
+    """
+    triangles, counts = get_triangles(geometries)
+    _, areas = get_triangle_normals(triangles)
+    return sum_by_geometry(areas, counts)
+
+
+def get_volumes(geometries: Iterable[ShapeType]) -> list[float]:
+    """Calculates the volumes of many geometries at once
+
+    This is equivalent to calling :func:`get_volume` for each geometry.
+
+    :param geometries: Geometry outputs calculated by IfcOpenShell
+    :type geometries: iterable[geometry]
+    :return: The volume of each geometry, in the same order.
+    :rtype: list[float]
+    """
+    triangles, counts = get_triangles(geometries)
+    # The signed volume of the tetrahedron formed by each triangle and the origin.
+    volumes = np.einsum("ij,ij->i", triangles[:, 0], np.cross(triangles[:, 1], triangles[:, 2])) / 6.0
+    return [abs(volume) for volume in sum_by_geometry(volumes, counts)]
+
+
 def get_side_area(
     geometry: ShapeType,
     axis: AXIS_LITERAL = "Y",
@@ -501,28 +592,35 @@ def get_side_area(
     :return: The surface area.
     :rtype: float
     """
-    if direction is None:
-        direction = {"X": (1.0, 0.0, 0.0), "Y": (0.0, 1.0, 0.0), "Z": (0.0, 0.0, 1.0)}[axis]
+    return get_side_areas([geometry], axis=axis, direction=direction)[0]
 
-    vertices = get_vertices(geometry)
-    faces = get_faces(geometry)
 
-    # Calculate the triangle normal vectors
-    v1 = vertices[faces[:, 1]] - vertices[faces[:, 0]]
-    v2 = vertices[faces[:, 2]] - vertices[faces[:, 0]]
-    triangle_normals = np.cross(v1, v2)
+def get_side_areas(
+    geometries: Iterable[ShapeType],
+    axis: AXIS_LITERAL = "Y",
+    direction: Optional[VECTOR_3D] = None,
+) -> list[float]:
+    """Calculates the side areas of many geometries at once
 
-    # Normalize the normal vectors
-    triangle_normals = triangle_normals / np.linalg.norm(triangle_normals, axis=1)[:, np.newaxis]
-    direction = np.array(direction) / np.linalg.norm(direction)
+    This is equivalent to calling :func:`get_side_area` for each geometry, but
+    processes the triangles of all geometries together.
 
-    # Find the faces with a normal vector pointing in the desired +Y normal direction
+    :param geometries: Geometry outputs calculated by IfcOpenShell
+    :type geometries: iterable[geometry]
+    :param axis: Either X, Y, or Z. Defaults to Y, which is used for standard
+        walls.
+    :type axis: str
+    :return: The surface area of each geometry, in the same order.
+    :rtype: list[float]
+    """
+    direction = get_direction(axis, direction)
+    triangles, counts = get_triangles(geometries)
+    normals, areas = get_triangle_normals(triangles)
+
+    # Find the faces with a normal vector pointing in the desired direction.
     # normal_tol < 0 is pointing away, = 0 is perpendicular, and > 0 is pointing towards.
     normal_tol = 0.01  # Close to perpendicular, but with a fuzz for numerical tolerance
-    dot_products = np.dot(triangle_normals, direction)
-    filtered_face_indices = np.where(dot_products > normal_tol)[0]
-    filtered_faces = faces[filtered_face_indices]
-    return get_area_vf(vertices, filtered_faces)
+    return sum_by_geometry(np.where(normals @ direction > normal_tol, areas, 0.0), counts)
 
 
 def get_max_side_area(geometry: ShapeType) -> float:
@@ -535,7 +633,24 @@ def get_max_side_area(geometry: ShapeType) -> float:
     :return: The maximum surface area from either the X, Y, or Z axis.
     :rtype: float
     """
-    return max(get_side_area(geometry, axis="X"), get_side_area(geometry, axis="Y"), get_side_area(geometry, axis="Z"))
+    return get_max_side_areas([geometry])[0]
+
+
+def get_max_side_areas(geometries: Iterable[ShapeType]) -> list[float]:
+    """Returns the maximum X, Y, or Z side area of many geometries at once
+
+    See :func:`get_side_area` for how side area is calculated.
+
+    :param geometries: Geometry outputs calculated by IfcOpenShell
+    :type geometries: iterable[geometry]
+    :return: The maximum surface area of each geometry, in the same order.
+    :rtype: list[float]
+    """
+    triangles, counts = get_triangles(geometries)
+    normals, areas = get_triangle_normals(triangles)
+    normal_tol = 0.01
+    side_areas = [sum_by_geometry(np.where(normals[:, i] > normal_tol, areas, 0.0), counts) for i in range(3)]
+    return [max(areas) for areas in zip(*side_areas)]
 
 
 def get_footprint_area(
@@ -566,59 +681,61 @@ def get_footprint_area(
     :return: The surface area.
     :rtype: float
     """
-    if direction is None:
-        direction = {"X": (1.0, 0.0, 0.0), "Y": (0.0, 1.0, 0.0), "Z": (0.0, 0.0, 1.0)}[axis]
+    return get_footprint_areas([geometry], axis=axis, direction=direction)[0]
 
-    vertices = get_vertices(geometry)
-    faces = get_faces(geometry)
 
-    # Calculate the triangle normal vectors
-    v1 = vertices[faces[:, 1]] - vertices[faces[:, 0]]
-    v2 = vertices[faces[:, 2]] - vertices[faces[:, 0]]
-    triangle_normals = np.cross(v1, v2)
+def get_footprint_areas(
+    geometries: Iterable[ShapeType],
+    axis: AXIS_LITERAL = "Z",
+    direction: Optional[VECTOR_3D] = None,
+) -> list[float]:
+    """Calculates the footprint areas of many geometries at once
 
-    # Normalize the normal vectors
-    triangle_normals = triangle_normals / np.linalg.norm(triangle_normals, axis=1)[:, np.newaxis]
-    direction = np.array(direction) / np.linalg.norm(direction)
+    This is equivalent to calling :func:`get_footprint_area` for each
+    geometry, but projects the triangles of all geometries together and
+    creates all polygons in a single call.
+
+    :param geometries: Geometry outputs calculated by IfcOpenShell
+    :type geometries: iterable[geometry]
+    :param axis: Either X, Y, or Z. Defaults to Z.
+    :type axis: str,optional
+    :param direction: An XYZ iterable (e.g. (0., 0., 1.)). If a direction
+        vector is specified, this overrides the axis argument.
+    :type axis: iterable[float],optional
+    :return: The footprint area of each geometry, in the same order.
+    :rtype: list[float]
+    """
+    d = get_direction(axis, direction)
+    triangles, counts = get_triangles(geometries)
+    normals, _ = get_triangle_normals(triangles)
 
     # Find the faces with a normal vector pointing in the desired direction using dot product
     # normal_tol < 0 is pointing away, = 0 is perpendicular, and > 0 is pointing towards.
     normal_tol = 0.01  # Close to perpendicular, but with a fuzz for numerical tolerance
-    dot_products = np.dot(triangle_normals, direction)
-    filtered_face_indices = np.where(dot_products > normal_tol)[0]
-    filtered_faces = faces[filtered_face_indices]
-
-    # Flatten vertices along the direction
-    vertices = vertices.copy()  # Buffers are read-only.
-    for idx in range(len(vertices)):
-        vertices[idx] = vertices[idx] - np.dot(vertices[idx], direction) * direction
+    is_visible = normals @ d > normal_tol
+    triangles = triangles[is_visible]
+    starts = np.cumsum(counts) - counts
+    total_visible = np.concatenate(([0], np.cumsum(is_visible, dtype=np.int64)))
+    offsets = total_visible[starts]
+    counts = total_visible[starts + counts] - offsets
 
     # Now flatten 3D vertices into 2D polygons which can be unioned to find a footprint.
-
-    # Create an orthonormal basis using the direction
-    d = np.array(direction) / np.linalg.norm(direction)
-
-    # Find a vector not parallel to d
+    # Create an orthonormal basis using the direction. Find a vector not parallel to d.
     a = np.array(d)
-    if not np.isclose(a[2], 1.0, atol=0.01):  # If d is not along the Z-axis
+    if not np.isclose(abs(a[2]), 1.0, atol=0.01):  # If d is not along the Z-axis
         a[2] += 0.01  # Small perturbation to make it not parallel
     else:
-        a = np.array([1, 0, 0])
-
-    # First basis vector
+        a = np.array([1.0, 0.0, 0.0])
     b = np.cross(d, a)
     b /= np.linalg.norm(b)
-
-    # Second basis vector
     c = np.cross(d, b)
 
-    # Project the flattened vertices onto the basis to get 2D coordinates
-    vertices_2d = np.array([[np.dot(v, b), np.dot(v, c)] for v in vertices])
-
-    polygons = [shapely.Polygon(vertices_2d[face]) for face in filtered_faces]
-    unioned_polygon = shapely.ops.unary_union(polygons)
-
-    return unioned_polygon.area
+    # Projecting onto the basis also flattens the vertices along the direction.
+    polygons = shapely.polygons(triangles @ np.column_stack((b, c))) if len(triangles) else []
+    return [
+        shapely.union_all(polygons[offset : offset + count]).area if count else 0.0
+        for offset, count in zip(offsets.tolist(), counts.tolist())
+    ]
 
 
 def get_outer_surface_area(geometry: ShapeType) -> float:
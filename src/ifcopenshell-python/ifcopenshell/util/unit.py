@@ -17,9 +17,11 @@
 # along with IfcOpenShell.  If not, see <http://www.gnu.org/licenses/>.
 
 from fractions import Fraction
+from functools import lru_cache
 from math import pi
 from typing import Iterable, Any, Union, Literal, Optional
 
+import numpy as np
 import ifcopenshell
 import ifcopenshell.ifcopenshell_wrapper as ifcopenshell_wrapper
 import ifcopenshell.api.unit
@@ -768,43 +770,92 @@ def is_attr_type(
     return None
 
 
+@lru_cache(maxsize=None)
+def get_attributes_per_type(
+    schema_identifier: str, ifc_class: str, attr_type_name: str
+) -> tuple[tuple[int, ifcopenshell_wrapper.attribute], ...]:
+    """Returns the attributes of an IFC class which hold a particular type
+
+    The result is cached per schema and class, so that checking many
+    instances of the same class only inspects the schema once.
+
+    :param schema_identifier: The schema identifier, such as ``IFC4``.
+    :param ifc_class: The name of the IFC class to check.
+    :param attr_type_name: The name of the type to check for, such as
+        ``IfcLengthMeasure``. See :func:`is_attr_type`.
+    :return: A tuple of attribute indices and attributes. Derived attributes
+        are excluded.
+    """
+    schema = ifcopenshell_wrapper.schema_by_name(schema_identifier)
+    entity = schema.declaration_by_name(ifc_class)
+    results = []
+    for i, (attr, is_derived) in enumerate(zip(entity.all_attributes(), entity.derived())):
+        if is_derived:
+            continue
+        if is_attr_type(attr.type_of_attribute(), attr_type_name) is not None:
+            results.append((i, attr))
+    return tuple(results)
+
+
 def iter_element_and_attributes_per_type(
     ifc_file: ifcopenshell.file, attr_type_name: str
 ) -> Iterable[tuple[ifcopenshell.entity_instance, ifcopenshell_wrapper.attribute, Any]]:
     schema: ifcopenshell_wrapper.schema_definition = ifcopenshell_wrapper.schema_by_name(ifc_file.schema_identifier)
 
-    for element in ifc_file:
-        entity = schema.declaration_by_name(element.is_a())
-        attrs = entity.all_attributes()
-        for attr, val, is_derived in zip(attrs, list(element), entity.derived()):
-            if is_derived:
-                continue
+    for entity in schema.entities():
+        if entity.is_abstract():
+            continue
+        attributes = get_attributes_per_type(ifc_file.schema_identifier, entity.name(), attr_type_name)
+        if not attributes:
+            continue
+        for element in ifc_file.by_type(entity.name(), include_subtypes=False):
+            for i, attr in attributes:
+                val = element[i]
 
-            # Get all methods and attributes of the element
-            attr_type = attr.type_of_attribute()
-            base_type = is_attr_type(attr_type, attr_type_name)
-            if base_type is None:
-                continue
+                if val is None:
+                    continue
 
-            if val is None:
-                continue
+                if isinstance(val, ifcopenshell.entity_instance) and not val.is_a(attr_type_name):
+                    continue
 
-            if isinstance(val, ifcopenshell.entity_instance) and not val.is_a(attr_type_name):
-                continue
+                yield element, attr, val
 
-            yield element, attr, val
 
+def convert_file_length_units(
+    ifc_file: ifcopenshell.file, target_units: str = "METER", in_place: bool = False
+) -> ifcopenshell.file:
+    """Converts all units in an IFC file to the specified target units.
 
-def convert_file_length_units(ifc_file: ifcopenshell.file, target_units: str = "METER") -> ifcopenshell.file:
-    """Converts all units in an IFC file to the specified target units. Returns a new file."""
+    :param ifc_file: The IFC file to convert.
+    :param target_units: A singular unit name, such as "METER" or "FOOT".
+    :param in_place: If True, the file is modified directly instead of first
+        being copied. This avoids serialising and reparsing the whole file,
+        which is significantly faster for large models.
+    :return: The converted file. This is a new file, unless in_place is True.
+    """
     import ifcopenshell.util.element
     import ifcopenshell.util.geolocation
 
     prefix = get_prefix(target_units)
     si_unit = get_unit_name(target_units)
 
-    # Copy all elements from the original file to the patched file
-    file_patched = ifcopenshell.file.from_string(ifc_file.wrapped_data.to_string())
+    has_map_unit = False
+    if (
+        ifc_file.schema == "IFC2X3"
+        and (crs := ifcopenshell.util.element.get_pset(ifc_file.by_type("IfcProject")[0], name="ePSet_ProjectedCRS"))
+        and crs.get("MapUnit")
+    ) or (ifc_file.schema != "IFC2X3" and (crs := ifc_file.by_type("IfcProjectedCRS")) and crs[0].MapUnit):
+        has_map_unit = True
+
+    if has_map_unit:
+        # Read from the original units before anything is converted.
+        parameters = ifcopenshell.util.geolocation.get_helmert_transformation_parameters(ifc_file)
+
+    if in_place:
+        file_patched = ifc_file
+    else:
+        # Copy all elements from the original file to the patched file
+        file_patched = ifcopenshell.file.from_string(ifc_file.wrapped_data.to_string())
 
     old_length = get_project_unit(file_patched, "LENGTHUNIT")
     if si_unit:
@@ -818,11 +869,12 @@ def convert_file_length_units(ifc_file: ifcopenshell.file, target_units: str = "
             )
         new_length = ifcopenshell.api.unit.add_conversion_based_unit(file_patched, name=target_units)
 
-    # support tuple of tuples, as in IfcCartesianPointList3D.CoordList
+    # Support tuple of tuples, as in IfcCartesianPointList3D.CoordList. These
+    # are converted as a whole with the same operations as a single value.
     def convert_value(value):
         if not isinstance(value, tuple):
             return convert_unit(value, old_length, new_length)
-        return tuple(convert_value(v) for v in value)
+        return convert_unit(np.array(value, dtype=float), old_length, new_length).tolist()
 
     # Traverse all elements and their nested attributes in the file and convert them
     for element, attr, val in iter_element_and_attributes_per_type(file_patched, "IfcLengthMeasure"):
@@ -833,16 +885,7 @@ def convert_file_length_units(ifc_file: ifcopenshell.file, target_units: str = "
             new_value = convert_value(val)
             setattr(element, attr.name(), new_value)
 
-    has_map_unit = False
-    if (
-        ifc_file.schema == "IFC2X3"
-        and (crs := ifcopenshell.util.element.get_pset(ifc_file.by_type("IfcProject")[0], name="ePSet_ProjectedCRS"))
-        and crs.get("MapUnit")
-    ) or (ifc_file.schema != "IFC2X3" and (crs := ifc_file.by_type("IfcProjectedCRS")) and crs[0].MapUnit):
-        has_map_unit = True
-
     if has_map_unit:
-        parameters = ifcopenshell.util.geolocation.get_helmert_transformation_parameters(ifc_file)
         ifcopenshell.api.georeference.edit_georeferencing(
             file_patched,
             coordinate_operation={
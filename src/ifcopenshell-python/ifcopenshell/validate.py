@@ -30,15 +30,17 @@ Available flags:
 - ``--rules``: Also check express rules.
 - ``--json``: Produce JSON output.
 - ``--fields``: Output more detailed information about failed entities (available only with ``--json``).
+- ``--processes=N``: Validate instances in ``N`` worker processes.
 """
 
 import os
 import sys
 import json
 import functools
+import itertools
 
 from collections import namedtuple
-from typing import Union, Iterator, Any, Optional
+from typing import Union, Iterator, Any, Optional, Callable
 from logging import Logger, Handler
 
 import ifcopenshell
@@ -84,6 +86,79 @@ class json_logger:
         return functools.partial(self.log, level)
 
 
+instance_reference = namedtuple("instance_reference", ("id",))
+
+
+def to_transferable(value: Any) -> Any:
+    """Converts a logging argument into something that can be pickled across process boundaries"""
+    if isinstance(value, ifcopenshell.entity_instance):
+        return instance_reference(value.id())
+    elif value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def from_transferable(value: Any, f: ifcopenshell.file) -> Any:
+    if isinstance(value, instance_reference):
+        return f.by_id(value.id)
+    return value
+
+
+class recording_logger:
+    """Records log statements so that they can be emitted later, possibly in another process
+
+    Every record is tagged with the current value of :attr:`key`, so that records
+    coming from several workers can be merged in a deterministic order.
+    """
+
+    def __init__(self):
+        self.records = []
+        self.key = ()
+
+    def log(self, level, message, *args):
+        self.records.append((self.key, len(self.records), level, message, tuple(map(to_transferable, args)), None))
+
+    def debug(self, message, *args):
+        self.log("debug", message, *args)
+
+    def info(self, message, *args):
+        self.log("info", message, *args)
+
+    def warning(self, message, *args):
+        self.log("warning", message, *args)
+
+    def error(self, message, *args):
+        self.log("error", message, *args)
+
+
+class json_recording_logger(recording_logger):
+    """Counterpart of :class:`recording_logger` for when the final logger is a :class:`json_logger`"""
+
+    def __init__(self):
+        super().__init__()
+        self.state = {}
+
+    def set_state(self, key, value):
+        self.state[key] = to_transferable(value)
+
+    def log(self, level, message, *args):
+        self.records.append(
+            (self.key, len(self.records), level, message, tuple(map(to_transferable, args)), dict(self.state))
+        )
+
+    def __getattr__(self, level):
+        return functools.partial(self.log, level)
+
+
+def replay_records(records, f: ifcopenshell.file, logger: Logger) -> None:
+    """Emits the records collected by a :class:`recording_logger` on the actual logger"""
+    for _, _, level, message, args, state in records:
+        if state is not None and hasattr(logger, "set_state"):
+            for k, v in state.items():
+                logger.set_state(k, from_transferable(v, f))
+        getattr(logger, level)(message, *(from_transferable(a, f) for a in args))
+
+
 simple_type_python_mapping = {
     # @todo should include unicode for Python2
     "string": str,
@@ -259,6 +334,86 @@ def assert_valid(
         return True
 
 
+declaration_check_cache: dict[tuple[str, str], Optional[Callable[[Any], bool]]] = {}
+
+
+def get_wrapped_value_check(schema: schema_definition, name: str) -> Optional[Callable[[Any], bool]]:
+    """Returns the check for the wrapped value of type instances of ``name``, None for entities"""
+    cache_key = schema.name(), name
+    try:
+        return declaration_check_cache[cache_key]
+    except KeyError:
+        pass
+    decl = schema.declaration_by_name(name)
+    v = declaration_check_cache[cache_key] = None if isinstance(decl, entity_type) else compile_type_check(schema, decl)
+    return v
+
+
+def compile_resolved_type_check(schema: schema_definition, attr_type: attribute_types) -> Callable[[Any], bool]:
+    entity_instance = ifcopenshell.entity_instance
+
+    if isinstance(attr_type, simple_type):
+        simple_type_python = simple_type_python_mapping[attr_type.declared_type()]
+        if type(simple_type_python) == set:
+            return simple_type_python.__contains__
+        return lambda val: type(val) == simple_type_python
+    elif isinstance(attr_type, (entity_type, type_declaration)):
+        name = attr_type.name()
+        return lambda val: isinstance(val, entity_instance) and val.is_a(name)
+    elif isinstance(attr_type, select_type):
+        members = get_select_members(schema, attr_type)
+
+        def check_select(val):
+            if not isinstance(val, entity_instance):
+                return False
+            name = val.is_a()
+            if name not in members:
+                return False
+            check_wrapped = get_wrapped_value_check(schema, name)
+            return check_wrapped is None or check_wrapped(val.wrappedValue)
+
+        return check_select
+    elif isinstance(attr_type, enumeration_type):
+        return frozenset(attr_type.enumeration_items()).__contains__
+    elif isinstance(attr_type, aggregation_type):
+        b1, b2 = attr_type.bound1(), attr_type.bound2()
+        check_element = compile_type_check(schema, attr_type.type_of_element())
+
+        def check_aggregate(val):
+            n = len(val)
+            return n >= b1 and (b2 == -1 or n <= b2) and all(map(check_element, val))
+
+        return check_aggregate
+    # Let assert_valid() raise NotImplementedError
+    return lambda val: False
+
+
+def compile_type_check(schema: schema_definition, attr_type: attribute_types) -> Callable[[Any], bool]:
+    """Precomputes a predicate equivalent to ``assert_valid(attr_type, val, schema, no_throw=True)``
+
+    The type declaration unwrapping and select leaf lookups are resolved once, so that
+    the returned function only inspects the value. It does not format any messages, on
+    failure :func:`assert_valid` is to be called to obtain the actual error.
+    """
+
+    def resolve(ty, type_wrappers):
+        while isinstance(ty, type_wrappers):
+            ty = ty.declared_type()
+        return ty
+
+    # See assert_valid(), type declarations are only unpacked for non-instance values
+    check_instance = compile_resolved_type_check(schema, resolve(attr_type, (named_type,)))
+    check_value = compile_resolved_type_check(schema, resolve(attr_type, (named_type, type_declaration)))
+    entity_instance = ifcopenshell.entity_instance
+
+    def check(val):
+        if isinstance(val, entity_instance):
+            return check_instance(val)
+        return check_value(val)
+
+    return check
+
+
 def log_internal_cpp_errors(f: ifcopenshell.file, filename: str, logger: Logger) -> None:
     import re
     import bisect
@@ -327,7 +482,325 @@ def get_entity_attributes(schema: schema_definition, entity: str) -> tuple[entit
     return entity_attrs
 
 
-def validate(f: Union[ifcopenshell.file, str], logger: Logger, express_rules=False) -> None:
+entity_check_table = namedtuple(
+    "entity_check_table",
+    (
+        "entity",
+        "is_abstract",
+        # per attribute tuples
+        "attributes",
+        "qualified_names",
+        "optional",
+        "derived",
+        "checks",
+        # per inverse attribute tuples
+        "inverses",
+        "inverse_names",
+        "inverse_qualified_names",
+        "inverse_bounds",
+        # zipped per attribute and per inverse attribute tuples
+        "per_attribute",
+        "per_inverse",
+        # the position of the GlobalId attribute, if any
+        "global_id_index",
+    ),
+)
+
+entity_check_table_map: dict[tuple[str, str], entity_check_table] = {}
+
+
+def get_entity_check_table(schema: schema_definition, entity: str) -> entity_check_table:
+    """Returns the attribute checks for an entity, computed once per schema and entity"""
+    cache_key = schema.name(), entity
+    from_cache = entity_check_table_map.get(cache_key)
+    if from_cache:
+        return from_cache
+
+    ent, attrs = get_entity_attributes(schema, entity)
+    derived = tuple(ent.derived())
+    inverses = tuple(ent.all_inverse_attributes())
+    qualified_names = tuple(f"{ent.name()}.{attr.name()}" for attr in attrs)
+    optional = tuple(attr.optional() for attr in attrs)
+    checks = tuple(
+        None if is_derived else compile_type_check(schema, attr.type_of_attribute())
+        for attr, is_derived in zip(attrs, derived)
+    )
+    inverse_names = tuple(attr.name() for attr in inverses)
+    inverse_qualified_names = tuple(f"{ent.name()}.{attr.name()}" for attr in inverses)
+    inverse_bounds = tuple((attr.bound1(), attr.bound2()) for attr in inverses)
+    attribute_names = [attr.name() for attr in attrs]
+
+    table = entity_check_table_map[cache_key] = entity_check_table(
+        entity=ent,
+        is_abstract=ent.is_abstract(),
+        attributes=attrs,
+        qualified_names=qualified_names,
+        optional=optional,
+        derived=derived,
+        checks=checks,
+        inverses=inverses,
+        inverse_names=inverse_names,
+        inverse_qualified_names=inverse_qualified_names,
+        inverse_bounds=inverse_bounds,
+        per_attribute=tuple(zip(range(len(attrs)), attrs, derived, optional, checks, qualified_names)),
+        per_inverse=tuple(zip(inverses, inverse_names, inverse_qualified_names, inverse_bounds)),
+        global_id_index=attribute_names.index("GlobalId") if "GlobalId" in attribute_names else None,
+    )
+    return table
+
+
+def get_global_id(table: entity_check_table, inst: ifcopenshell.entity_instance) -> Optional[str]:
+    if table.global_id_index is None:
+        return None
+    try:
+        return inst[table.global_id_index]
+    except:
+        # Reported as an invalid attribute value by the schema checks
+        return None
+
+
+class global_id_register:
+    """Checks the uniqueness of GlobalId values (IfcRoot.UR1) of the instances passed, in that order"""
+
+    rule = "Rule IfcRoot.UR1:\n    The attribute GlobalId should be unique"
+
+    def __init__(self):
+        self.used_guids: dict[str, ifcopenshell.entity_instance] = {}
+
+    def check(self, inst: ifcopenshell.entity_instance, guid: Optional[str], logger: Logger) -> None:
+        if guid is None:
+            return
+        previous_element = self.used_guids.get(guid)
+        if previous_element is None:
+            self.used_guids[guid] = inst
+            return
+        if hasattr(logger, "set_state"):
+            logger.set_state("instance", inst)
+            logger.set_state("attribute", None)
+        logger.error(
+            "On instance:\n    %s\n    %s\n%s\nViolated by:\n    %s\n    %s",
+            inst,
+            annotate_inst_attr_pos(inst, 0),
+            self.rule,
+            previous_element,
+            annotate_inst_attr_pos(previous_element, 0),
+        )
+
+
+def validate_instances(
+    table: entity_check_table,
+    instances: Iterator[ifcopenshell.entity_instance],
+    schema: schema_definition,
+    logger: Logger,
+) -> None:
+    """Validates a batch of instances of the same entity using the precomputed checks in ``table``
+
+    Messages are only formatted when an issue is found, valid attribute values are
+    only checked through the precompiled predicates.
+    """
+    has_state = hasattr(logger, "set_state")
+    entity = table.entity
+    attrs = table.attributes
+    n_attrs = len(attrs)
+    attribute_value_derived = ifcopenshell.ifcopenshell_wrapper.attribute_value_derived
+    per_attribute = table.per_attribute
+    per_inverse = table.per_inverse
+
+    for inst in instances:
+        if has_state:
+            logger.set_state("instance", inst)
+
+        if table.is_abstract:
+            e = "Entity %s is abstract" % entity.name()
+            if has_state:
+                logger.set_state("attribute", None)
+                logger.error(e)
+            else:
+                logger.error("For instance:\n    %s\n%s", inst, e)
+
+        has_invalid_value = False
+        values = [None] * n_attrs
+        for i in range(n_attrs):
+            try:
+                values[i] = inst[i]
+            except:
+                if has_state:
+                    logger.set_state("attribute", table.qualified_names[i])
+                    logger.error("Invalid attribute value")
+                else:
+                    logger.error(
+                        "For instance:\n    %s\n    %s\nInvalid attribute value for %s.%s",
+                        inst,
+                        annotate_inst_attr_pos(inst, i),
+                        entity,
+                        attrs[i],
+                    )
+                has_invalid_value = True
+
+        if not has_invalid_value:
+            for (i, attr, is_derived, is_optional, check, qualified_name), val in zip(per_attribute, values):
+                if is_derived:
+                    if not isinstance(val, attribute_value_derived):
+                        if has_state:
+                            logger.set_state("attribute", qualified_name)
+                            logger.error("Attribute is derived in subtype")
+                        else:
+                            logger.error(
+                                "For instance:\n    %s\n    %s\nWith attribute:\n    %s\nDerived in subtype\n",
+                                inst,
+                                annotate_inst_attr_pos(inst, i),
+                                attr,
+                            )
+                    continue
+
+                if val is None:
+                    if not is_optional:
+                        if has_state:
+                            logger.set_state("attribute", qualified_name)
+                            logger.error("Attribute not optional")
+                        else:
+                            logger.error(
+                                "For instance:\n    %s\n    %s\nWith attribute:\n    %s\nNot optional\n",
+                                inst,
+                                annotate_inst_attr_pos(inst, i),
+                                attr,
+                            )
+                    continue
+
+                try:
+                    if check(val):
+                        continue
+                except Exception:
+                    pass
+
+                # Slow path, only taken for invalid values, to obtain the error message
+                try:
+                    assert_valid(attr.type_of_attribute(), val, schema, attr=attr)
+                except ValidationError as e:
+                    if has_state:
+                        logger.set_state("attribute", e.attribute)
+                        logger.error(str(e))
+                    else:
+                        logger.error(
+                            "For instance:\n    %s\n    %s\n%s",
+                            inst,
+                            annotate_inst_attr_pos(inst, i),
+                            e,
+                        )
+
+        for attr, name, qualified_name, (b1, b2) in per_inverse:
+            try:
+                val = getattr(inst, name)
+            except Exception as e:
+                if has_state:
+                    logger.set_state("attribute", qualified_name)
+                    logger.error(str(e))
+                else:
+                    logger.error("For instance:\n    %s\n%s", inst, e)
+                continue
+
+            n = len(val)
+            if (b1, b2) == (-1, -1):
+                if n == 1:
+                    continue
+            elif n >= b1 and (b2 == -1 or n <= b2):
+                continue
+
+            try:
+                assert_valid_inverse(attr, val, schema)
+            except ValidationError as e:
+                if has_state:
+                    logger.set_state("attribute", qualified_name)
+                    logger.error(str(e))
+                else:
+                    logger.error("For instance:\n    %s\n%s", inst, e)
+
+
+# The file, filename and output format of a worker process of validate_parallel()
+worker_state: Optional[tuple[ifcopenshell.file, str, bool]] = None
+
+
+def init_worker(filename: str, json_output: bool) -> None:
+    """Initializer of the worker processes of :func:`validate_parallel`, opens ``filename`` once per worker"""
+    global worker_state
+    ifcopenshell.ifcopenshell_wrapper.set_feature("use_attribute_value_derived", True)
+    ifcopenshell.ifcopenshell_wrapper.set_log_format_json()
+    worker_state = (ifcopenshell.open(filename), filename, json_output)
+    # Errors at parse time are already reported by the main process
+    ifcopenshell.get_log()
+
+
+def validate_id_range(lo: int, hi: int) -> tuple[list, list, list]:
+    """Worker function for parallel validation of the instances with ids in [lo, hi)
+
+    Validates the file opened by :func:`init_worker`. Returns the recorded
+    schema validation statements, the internal C++ errors reported while
+    parsing the attributes of these instances, and the ids and GlobalIds of
+    rooted instances, so that the main process can check their uniqueness
+    without parsing the instances again.
+    """
+    f, filename, json_output = worker_state
+    schema = ifcopenshell.ifcopenshell_wrapper.schema_by_name(f.schema_identifier)
+    logger = json_recording_logger() if json_output else recording_logger()
+
+    guids = []
+    tables = {}
+    for id in sorted(id for id in f.wrapped_data.entity_names() if lo <= id < hi):
+        inst = f[id]
+        ifc_class = inst.is_a()
+        if (table := tables.get(ifc_class)) is None:
+            table = tables[ifc_class] = get_entity_check_table(schema, ifc_class)
+        if (guid := get_global_id(table, inst)) is not None:
+            guids.append((id, guid))
+        # GlobalId statements of an instance precede its attribute statements
+        logger.key = (id, 1)
+        validate_instances(table, (inst,), schema, logger)
+
+    cpp_logger = json_recording_logger() if json_output else recording_logger()
+    log_internal_cpp_errors(f, filename, cpp_logger)
+    return logger.records, cpp_logger.records, guids
+
+
+def validate_parallel(f: ifcopenshell.file, filename: str, logger: Logger, processes: int) -> None:
+    """Validates the instances of ``f`` in worker processes, partitioned by contiguous id ranges
+
+    Every worker opens ``filename`` once and is then only sent id ranges. The statements
+    are emitted on ``logger`` in the same order as in the sequential case. The main process does not parse the
+    instances, so internal C++ errors are only reported once, by the workers.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    ids = sorted(f.wrapped_data.entity_names())
+    if not ids:
+        return
+
+    # Use more chunks than processes to balance out ranges with expensive instances
+    n_chunks = min(len(ids), processes * 4)
+    chunk_size = -(-len(ids) // n_chunks)
+    bounds = [ids[i] for i in range(0, len(ids), chunk_size)] + [ids[-1] + 1]
+    ranges = list(zip(bounds, bounds[1:]))
+
+    json_output = hasattr(logger, "set_state")
+    with ProcessPoolExecutor(
+        max_workers=processes, initializer=init_worker, initargs=(filename, json_output)
+    ) as executor:
+        results = list(executor.map(validate_id_range, [lo for lo, hi in ranges], [hi for lo, hi in ranges]))
+
+    guid_logger = json_recording_logger() if json_output else recording_logger()
+    global_ids = global_id_register()
+    for id, guid in sorted(itertools.chain.from_iterable(guids for _, _, guids in results)):
+        guid_logger.key = (id, 0)
+        global_ids.check(f[id], guid, guid_logger)
+
+    records = itertools.chain(guid_logger.records, itertools.chain.from_iterable(r for r, _, _ in results))
+    replay_records(sorted(records, key=lambda r: r[0:2]), f, logger)
+    for _, cpp_records, _ in results:
+        replay_records(cpp_records, f, logger)
+    # Discard the errors of parsing instances for the messages above, the workers reported them
+    ifcopenshell.get_log()
+
+
+def validate(f: Union[ifcopenshell.file, str], logger: Logger, express_rules=False, processes: int = 1) -> None:
     """
     For an IFC population model `f` (or filepath to such a file) validate whether the entity attribute values are correctly supplied. As this
     is a function that is applied after a file has been parsed, certain types of errors in syntax, duplicate
@@ -346,6 +819,10 @@ def validate(f: Union[ifcopenshell.file, str], logger: Logger, express_rules=Fal
     It is recommended to supply the path to the file, so that internal C++ errors reported during the parse stage
     are also captured.
 
+    The attribute checks are precomputed once per entity and instances are checked in file order. When the path to
+    the file is supplied and `processes` is larger than 1, the instances are partitioned by id range and checked in
+    that many worker processes. The resulting log statements are identical to those of the sequential run. The same applies to the type and entity rules when `express_rules` is set.
+
     Example:
 
     .. code:: python
@@ -394,127 +871,26 @@ def validate(f: Union[ifcopenshell.file, str], logger: Logger, express_rules=Fal
 
     validate_ifc_header(f, logger)
 
-    schema = ifcopenshell.ifcopenshell_wrapper.schema_by_name(f.schema_identifier)
-    used_guids: dict[str, ifcopenshell.entity_instance] = dict()
-
-    for inst in f:
-        if hasattr(logger, "set_state"):
-            logger.set_state("instance", inst)
-
-        if hasattr(inst, "GlobalId"):
-            guid = inst.GlobalId
-            if guid is not None and guid in used_guids:
-                rule = "Rule IfcRoot.UR1:\n    The attribute GlobalId should be unique"
-                previous_element = used_guids[guid]
-                logger.error(
-                    "On instance:\n    %s\n    %s\n%s\nViolated by:\n    %s\n    %s",
-                    inst,
-                    annotate_inst_attr_pos(inst, 0),
-                    rule,
-                    previous_element,
-                    annotate_inst_attr_pos(previous_element, 0),
-                )
-            else:
-                used_guids[guid] = inst
-
-        entity, attrs = get_entity_attributes(schema, inst.is_a())
-
-        if entity.is_abstract():
-            e = "Entity %s is abstract" % entity.name()
-            if hasattr(logger, "set_state"):
-                logger.set_state("attribute", None)
-                logger.error(e)
-            else:
-                logger.error("For instance:\n    %s\n%s", inst, e)
-
-        has_invalid_value = False
-        values = [None] * len(attrs)
-        for i in range(len(attrs)):
-            try:
-                values[i] = inst[i]
-                pass
-            except:
-                if hasattr(logger, "set_state"):
-                    logger.set_state("attribute", f"{entity.name()}.{attrs[i].name()}")
-                    logger.error("Invalid attribute value")
-                else:
-                    logger.error(
-                        "For instance:\n    %s\n    %s\nInvalid attribute value for %s.%s",
-                        inst,
-                        annotate_inst_attr_pos(inst, i),
-                        entity,
-                        attrs[i],
-                    )
-                has_invalid_value = True
-
-        if not has_invalid_value:
-            for i, (attr, val, is_derived) in enumerate(zip(attrs, values, entity.derived())):
-                if is_derived and not isinstance(val, ifcopenshell.ifcopenshell_wrapper.attribute_value_derived):
-                    if hasattr(logger, "set_state"):
-                        logger.set_state("attribute", f"{entity.name()}.{attr.name()}")
-                        logger.error("Attribute is derived in subtype")
-                    else:
-                        logger.error(
-                            "For instance:\n    %s\n    %s\nWith attribute:\n    %s\nDerived in subtype\n",
-                            inst,
-                            annotate_inst_attr_pos(inst, i),
-                            attr,
-                        )
-
-                if val is None and not attr.optional() and not is_derived:
-                    if hasattr(logger, "set_state"):
-                        logger.set_state("attribute", f"{entity.name()}.{attr.name()}")
-                        logger.error("Attribute not optional")
-                    else:
-                        logger.error(
-                            "For instance:\n    %s\n    %s\nWith attribute:\n    %s\nNot optional\n",
-                            inst,
-                            annotate_inst_attr_pos(inst, i),
-                            attr,
-                        )
-
-                if val is not None and not is_derived:
-                    attr_type = attr.type_of_attribute()
-                    try:
-                        assert_valid(attr_type, val, schema, attr=attr)
-                    except ValidationError as e:
-                        if hasattr(logger, "set_state"):
-                            logger.set_state("attribute", e.attribute)
-                            logger.error(str(e))
-                        else:
-                            logger.error(
-                                "For instance:\n    %s\n    %s\n%s",
-                                inst,
-                                annotate_inst_attr_pos(inst, i),
-                                e,
-                            )
-
-        for attr in entity.all_inverse_attributes():
-            try:
-                val = getattr(inst, attr.name())
-            except Exception as e:
-                if hasattr(logger, "set_state"):
-                    logger.set_state("attribute", f"{entity.name()}.{attr.name()}")
-                    logger.error(str(e))
-                else:
-                    logger.error("For instance:\n    %s\n%s", inst, e)
-                continue
-            try:
-                assert_valid_inverse(attr, val, schema)
-            except ValidationError as e:
-                if hasattr(logger, "set_state"):
-                    logger.set_state("attribute", f"{entity.name()}.{attr.name()}")
-                    logger.error(str(e))
-                else:
-                    logger.error("For instance:\n    %s\n%s", inst, e)
-
-    if filename:
-        # IfcOpenShell uses lazy-loading, so entity instance
-        # attributes aren't parsed yet, and counts aren't verified yet.
-        # Re capturing the log when validate() is finished
-        # iterating over every instance so that all attribute counts
-        # are verified.
-        log_internal_cpp_errors(f, filename, logger)
+    if filename and processes > 1:
+        validate_parallel(f, filename, logger, processes)
+    else:
+        schema = ifcopenshell.ifcopenshell_wrapper.schema_by_name(f.schema_identifier)
+        global_ids = global_id_register()
+        tables = {}
+        for inst in f:
+            ifc_class = inst.is_a()
+            if (table := tables.get(ifc_class)) is None:
+                table = tables[ifc_class] = get_entity_check_table(schema, ifc_class)
+            global_ids.check(inst, get_global_id(table, inst), logger)
+            validate_instances(table, (inst,), schema, logger)
+
+        if filename:
+            # IfcOpenShell uses lazy-loading, so entity instance
+            # attributes aren't parsed yet, and counts aren't verified yet.
+            # Re capturing the log when validate() is finished
+            # iterating over every instance so that all attribute counts
+            # are verified.
+            log_internal_cpp_errors(f, filename, logger)
 
     # Restore the original value for 'use_attribute_value_derived'
     ifcopenshell.ifcopenshell_wrapper.set_feature("use_attribute_value_derived", attribute_value_derived_org)
@@ -523,7 +899,7 @@ def validate(f: Union[ifcopenshell.file, str], logger: Logger, express_rules=Fal
         if hasattr(logger, "set_state"):
             logger.set_state("instance", None)
             logger.set_state("attribute", None)
-        ifcopenshell.express.rule_executor.run(f, logger)
+        ifcopenshell.express.rule_executor.run(f, logger, processes=processes, filename=filename)
 
 
 def validate_ifc_header(f: ifcopenshell.file, logger: Logger) -> None:
@@ -613,7 +989,8 @@ if __name__ == "__main__":
             logger.setLevel(logging.DEBUG)
 
         print("Validating", fn, file=sys.stderr)
-        validate(fn, logger, "--rules" in flags)
+        processes = next((int(x.split("=")[1]) for x in flags if x.startswith("--processes=")), 1)
+        validate(fn, logger, "--rules" in flags, processes=processes)
 
         if "--json" in flags:
             sys.stdout.reconfigure(encoding="utf-8")
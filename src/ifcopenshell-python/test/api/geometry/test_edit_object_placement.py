@@ -469,6 +469,31 @@ class TestEditObjectPlacement(test.bootstrap.IFC4):
         )
         assert subelement.ObjectPlacement.PlacementRelTo == element.ObjectPlacement
 
+    def test_changing_placements_with_a_placement_cache(self):
+        ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcProject")
+        ifcopenshell.api.unit.assign_unit(self.file)
+        element = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcBuilding")
+        subelement = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWall")
+        matrix = numpy.eye(4)
+        matrix[:, 3] = (1.0, 1.0, 1.0, 1.0)
+        submatrix = numpy.eye(4)
+        submatrix[:, 3] = (1.0, 2.0, 3.0, 1.0)
+        ifcopenshell.api.spatial.assign_container(self.file, products=[subelement], relating_structure=element)
+        ifcopenshell.api.geometry.edit_object_placement(self.file, product=element, matrix=matrix.copy(), is_si=False)
+        ifcopenshell.api.geometry.edit_object_placement(
+            self.file, product=subelement, matrix=submatrix.copy(), is_si=False
+        )
+        ifcopenshell.util.placement.enable_placement_cache(self.file)
+        try:
+            ifcopenshell.api.geometry.edit_object_placement(
+                self.file, product=element, matrix=submatrix.copy(), is_si=False, should_transform_children=True
+            )
+            cached = ifcopenshell.util.placement.get_local_placement(subelement.ObjectPlacement)
+        finally:
+            ifcopenshell.util.placement.disable_placement_cache(self.file)
+        assert numpy.allclose(cached, ifcopenshell.util.placement.get_local_placement(subelement.ObjectPlacement))
+        assert cached[:, 3].tolist() == [1.0, 3.0, 5.0, 1.0]
+
     def test_changing_placements_with_children_using_non_si_units(self):
         ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcProject")
         ifcopenshell.api.unit.assign_unit(self.file)
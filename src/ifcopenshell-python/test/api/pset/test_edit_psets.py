@@ -0,0 +1,146 @@
+# IfcOpenShell - IFC toolkit and geometry engine
+# Copyright (C) 2021 Dion Moult <dion@thinkmoult.com>
+#
+# This file is part of IfcOpenShell.
+#
+# IfcOpenShell is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# IfcOpenShell is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with IfcOpenShell.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import test.bootstrap
+import ifcopenshell.api.pset
+import ifcopenshell.api.root
+import ifcopenshell.util.element
+
+
+class TestEditPsetsIFC2X3(test.bootstrap.IFC2X3):
+    def test_adding_psets_to_many_elements(self):
+        walls = [ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWall") for _ in range(3)]
+        ifcopenshell.api.pset.edit_psets(
+            self.file,
+            psets={wall: {"Pset_WallCommon": {"ThermalTransmittance": "42", "Reference": "Foo"}} for wall in walls},
+        )
+        for wall in walls:
+            assert ifcopenshell.util.element.get_pset(wall, "Pset_WallCommon", "Reference") == "Foo"
+            pset = wall.IsDefinedBy[0].RelatingPropertyDefinition
+            assert pset.GlobalId
+            assert pset.HasProperties[0].Name == "ThermalTransmittance"
+            assert pset.HasProperties[0].NominalValue.is_a("IfcThermalTransmittanceMeasure")
+            assert pset.HasProperties[0].NominalValue.wrappedValue == 42
+        assert len(self.file.by_type("IfcPropertySet")) == 3
+        assert len(self.file.by_type("IfcRelDefinesByProperties")) == 3
+
+    def test_sharing_identical_properties(self):
+        wall1 = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWall")
+        wall2 = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWall")
+        wall3 = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWall")
+        ifcopenshell.api.pset.edit_psets(
+            self.file,
+            psets={
+                wall1: {"Foo_Bar": {"Foo": "Bar", "Number": 1}},
+                wall2: {"Foo_Bar": {"Foo": "Bar", "Number": 1.0}},
+                wall3: {"Foo_Bar": {"Foo": "Baz"}},
+            },
+        )
+        props1 = wall1.IsDefinedBy[0].RelatingPropertyDefinition.HasProperties
+        props2 = wall2.IsDefinedBy[0].RelatingPropertyDefinition.HasProperties
+        props3 = wall3.IsDefinedBy[0].RelatingPropertyDefinition.HasProperties
+        assert props1[0] == props2[0]
+        assert props1[0] != props3[0]
+        assert props1[1].NominalValue.is_a("IfcInteger")
+        assert props2[1].NominalValue.is_a("IfcReal")
+
+    def test_editing_existing_psets(self):
+        wall = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWall")
+        pset = ifcopenshell.api.pset.add_pset(self.file, product=wall, name="Foo_Bar")
+        ifcopenshell.api.pset.edit_pset(self.file, pset=pset, properties={"Foo": "Bar", "Baz": "Qux"})
+        ifcopenshell.api.pset.edit_psets(self.file, psets={wall: {"Foo_Bar": {"Foo": "Bar2", "Baz": None}}})
+        assert len(wall.IsDefinedBy) == 1
+        assert ifcopenshell.util.element.get_pset(wall, "Foo_Bar") == {"Foo": "Bar2", "id": pset.id()}
+
+    def test_editing_a_shared_property_does_not_affect_other_psets(self):
+        wall1 = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWall")
+        wall2 = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWall")
+        ifcopenshell.api.pset.edit_psets(
+            self.file, psets={wall1: {"Foo_Bar": {"Foo": "Bar"}}, wall2: {"Foo_Bar": {"Foo": "Bar"}}}
+        )
+        ifcopenshell.api.pset.edit_psets(self.file, psets={wall1: {"Foo_Bar": {"Foo": "Baz"}}})
+        assert ifcopenshell.util.element.get_pset(wall1, "Foo_Bar", "Foo") == "Baz"
+        assert ifcopenshell.util.element.get_pset(wall2, "Foo_Bar", "Foo") == "Bar"
+        pset = ifcopenshell.util.element.get_pset(wall2, "Foo_Bar")
+        ifcopenshell.api.pset.edit_pset(self.file, pset=self.file.by_id(pset["id"]), properties={"Foo": "Qux"})
+        assert ifcopenshell.util.element.get_pset(wall1, "Foo_Bar", "Foo") == "Baz"
+        assert ifcopenshell.util.element.get_pset(wall2, "Foo_Bar", "Foo") == "Qux"
+
+    def test_editing_a_pset_shared_by_many_elements(self):
+        wall1 = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWall")
+        wall2 = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWall")
+        wall3 = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWall")
+        pset = ifcopenshell.api.pset.add_pset(self.file, product=wall1, name="Foo_Bar")
+        ifcopenshell.api.pset.assign_pset(self.file, products=[wall2], pset=pset)
+        ifcopenshell.api.pset.edit_psets(
+            self.file,
+            psets={
+                wall1: {"Foo_Bar": {"Foo": "Bar"}},
+                wall2: {"Foo_Bar": {"Foo": "Baz"}},
+                wall3: {"Foo_Bar": {"Foo": "Bar"}},
+            },
+        )
+        assert ifcopenshell.util.element.get_pset(wall1, "Foo_Bar", "Foo") == "Baz"
+        assert ifcopenshell.util.element.get_pset(wall2, "Foo_Bar", "Foo") == "Baz"
+        assert ifcopenshell.util.element.get_pset(wall3, "Foo_Bar", "Foo") == "Bar"
+
+    def test_adding_psets_to_types(self):
+        wall_type = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWallType")
+        ifcopenshell.api.pset.add_pset(self.file, product=wall_type, name="Foo_Bar")
+        ifcopenshell.api.pset.edit_psets(
+            self.file, psets={wall_type: {"Foo_Bar": {"Foo": "Bar"}, "Foo_Baz": {"Foo": "Baz"}}}
+        )
+        assert [p.Name for p in wall_type.HasPropertySets] == ["Foo_Bar", "Foo_Baz"]
+        assert ifcopenshell.util.element.get_pset(wall_type, "Foo_Bar", "Foo") == "Bar"
+        assert ifcopenshell.util.element.get_pset(wall_type, "Foo_Baz", "Foo") == "Baz"
+
+    def test_adding_a_property_if_it_is_none(self):
+        wall = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWall")
+        ifcopenshell.api.pset.edit_psets(self.file, psets={wall: {"Foo_Bar": {"Foo": None}}}, should_purge=False)
+        assert len(wall.IsDefinedBy[0].RelatingPropertyDefinition.HasProperties) == 1
+        ifcopenshell.api.pset.edit_psets(self.file, psets={wall: {"Foo_Bar": {"Foo": None}}})
+        assert len(wall.IsDefinedBy[0].RelatingPropertyDefinition.HasProperties) == 0
+
+    def test_undoing_in_a_transaction(self):
+        wall = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWall")
+        total_elements = len(list(self.file))
+        self.file.begin_transaction()
+        ifcopenshell.api.pset.edit_psets(self.file, psets={wall: {"Foo_Bar": {"Foo": "Bar"}}})
+        self.file.end_transaction()
+        assert ifcopenshell.util.element.get_pset(wall, "Foo_Bar", "Foo") == "Bar"
+        self.file.undo()
+        assert not ifcopenshell.util.element.get_pset(wall, "Foo_Bar")
+        assert len(list(self.file)) == total_elements
+
+
+class TestEditPsetsIFC4(test.bootstrap.IFC4, TestEditPsetsIFC2X3):
+    def test_adding_list_valued_properties(self):
+        ports = [
+            ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcDistributionPort", predefined_type="CABLE")
+            for _ in range(2)
+        ]
+        ifcopenshell.api.pset.edit_psets(
+            self.file,
+            psets={port: {"Pset_DistributionPortTypeCable": {"Protocols": ["One", "Two"]}} for port in ports},
+        )
+        for port in ports:
+            prop = port.IsDefinedBy[0].RelatingPropertyDefinition.HasProperties[0]
+            assert prop.is_a("IfcPropertyListValue")
+            assert [v.wrappedValue for v in prop.ListValues] == ["One", "Two"]
+        assert len(self.file.by_type("IfcPropertyListValue")) == 1
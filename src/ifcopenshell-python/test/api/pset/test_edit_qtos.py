@@ -0,0 +1,85 @@
+# IfcOpenShell - IFC toolkit and geometry engine
+# Copyright (C) 2021 Dion Moult <dion@thinkmoult.com>
+#
+# This file is part of IfcOpenShell.
+#
+# IfcOpenShell is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# IfcOpenShell is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with IfcOpenShell.  If not, see <http://www.gnu.org/licenses/>.
+
+import test.bootstrap
+import ifcopenshell.api.pset
+import ifcopenshell.api.root
+import ifcopenshell.util.element
+
+
+class TestEditQtos(test.bootstrap.IFC4):
+    def test_adding_qtos_to_many_elements(self):
+        walls = [ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWall") for _ in range(3)]
+        ifcopenshell.api.pset.edit_qtos(
+            self.file,
+            qtos={wall: {"Qto_WallBaseQuantities": {"Length": i, "NetVolume": 3}} for i, wall in enumerate(walls)},
+        )
+        for i, wall in enumerate(walls):
+            qto = wall.IsDefinedBy[0].RelatingPropertyDefinition
+            assert qto.is_a("IfcElementQuantity")
+            assert qto.GlobalId
+            assert qto.Quantities[0].is_a("IfcQuantityLength")
+            assert qto.Quantities[0].LengthValue == i
+            assert qto.Quantities[1].is_a("IfcQuantityVolume")
+            assert qto.Quantities[1].VolumeValue == 3
+        assert len(self.file.by_type("IfcElementQuantity")) == 3
+        assert len(self.file.by_type("IfcRelDefinesByProperties")) == 3
+
+    def test_giving_the_same_result_as_adding_and_editing_each_qto(self):
+        wall1 = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWall")
+        wall2 = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWall")
+        quantities = {"Length": 1, "NetSideArea": 2, "Foo": self.file.createIfcAreaMeasure(4)}
+        ifcopenshell.api.pset.edit_qtos(self.file, qtos={wall1: {"Qto_WallBaseQuantities": quantities}})
+        qto = ifcopenshell.api.pset.add_qto(self.file, product=wall2, name="Qto_WallBaseQuantities")
+        ifcopenshell.api.pset.edit_qto(self.file, qto=qto, properties=quantities)
+        assert ifcopenshell.util.element.get_pset(wall1, "Qto_WallBaseQuantities", "Foo") == 4
+        results = [wall.IsDefinedBy[0].RelatingPropertyDefinition.Quantities for wall in (wall1, wall2)]
+        assert [(q.is_a(), q.Name, q[3]) for q in results[0]] == [(q.is_a(), q.Name, q[3]) for q in results[1]]
+
+    def test_editing_existing_qtos(self):
+        wall = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWall")
+        qto = ifcopenshell.api.pset.add_qto(self.file, product=wall, name="Qto_WallBaseQuantities")
+        ifcopenshell.api.pset.edit_qto(self.file, qto=qto, properties={"Length": 1, "NetSideArea": 2})
+        ifcopenshell.api.pset.edit_qtos(
+            self.file, qtos={wall: {"Qto_WallBaseQuantities": {"Length": 42, "NetSideArea": None, "NetVolume": 3}}}
+        )
+        assert len(wall.IsDefinedBy) == 1
+        assert ifcopenshell.util.element.get_pset(wall, "Qto_WallBaseQuantities") == {
+            "Length": 42.0,
+            "NetVolume": 3.0,
+            "id": qto.id(),
+        }
+
+    def test_adding_qtos_to_types(self):
+        wall_type = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWallType")
+        ifcopenshell.api.pset.add_qto(self.file, product=wall_type, name="Foo_Bar")
+        ifcopenshell.api.pset.edit_qtos(self.file, qtos={wall_type: {"Foo_Bar": {"Foo": 1}, "Foo_Baz": {"Foo": 2}}})
+        assert [p.Name for p in wall_type.HasPropertySets] == ["Foo_Bar", "Foo_Baz"]
+        assert ifcopenshell.util.element.get_pset(wall_type, "Foo_Bar", "Foo") == 1
+        assert ifcopenshell.util.element.get_pset(wall_type, "Foo_Baz", "Foo") == 2
+
+    def test_undoing_in_a_transaction(self):
+        wall = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWall")
+        total_elements = len(list(self.file))
+        self.file.begin_transaction()
+        ifcopenshell.api.pset.edit_qtos(self.file, qtos={wall: {"Qto_WallBaseQuantities": {"Length": 1}}})
+        self.file.end_transaction()
+        assert ifcopenshell.util.element.get_pset(wall, "Qto_WallBaseQuantities", "Length") == 1
+        self.file.undo()
+        assert not ifcopenshell.util.element.get_pset(wall, "Qto_WallBaseQuantities")
+        assert len(list(self.file)) == total_elements
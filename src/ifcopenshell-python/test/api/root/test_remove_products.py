@@ -0,0 +1,120 @@
+# IfcOpenShell - IFC toolkit and geometry engine
+# Copyright (C) 2022 Dion Moult <dion@thinkmoult.com>
+#
+# This file is part of IfcOpenShell.
+#
+# IfcOpenShell is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# IfcOpenShell is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with IfcOpenShell.  If not, see <http://www.gnu.org/licenses/>.
+
+from collections import Counter
+
+import test.bootstrap
+import ifcopenshell.api.root
+import ifcopenshell.api.nest
+import ifcopenshell.api.pset
+import ifcopenshell.api.type
+import ifcopenshell.api.group
+import ifcopenshell.api.system
+import ifcopenshell.api.project
+import ifcopenshell.api.spatial
+import ifcopenshell.api.geometry
+import ifcopenshell.api.material
+import ifcopenshell.api.aggregate
+
+
+class TestRemoveProducts(test.bootstrap.IFC4):
+    def create_model(self):
+        storey = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcBuildingStorey")
+        assembly = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcElementAssembly")
+        wall_type = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWallType")
+        material = ifcopenshell.api.material.add_material(self.file, name="Foo")
+        group = ifcopenshell.api.group.add_group(self.file, name="Demolition")
+        walls = [ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWall") for _ in range(6)]
+        for wall in walls:
+            ifcopenshell.api.geometry.edit_object_placement(self.file, product=wall)
+        ifcopenshell.api.spatial.assign_container(self.file, products=walls, relating_structure=storey)
+        ifcopenshell.api.aggregate.assign_object(self.file, products=walls[:3], relating_object=assembly)
+        ifcopenshell.api.type.assign_type(self.file, related_objects=walls, relating_type=wall_type)
+        ifcopenshell.api.material.assign_material(self.file, products=walls, material=material)
+        ifcopenshell.api.group.assign_group(self.file, products=walls[:4], group=group)
+        pset = ifcopenshell.api.pset.add_pset(self.file, product=walls[0], name="Foo_Bar")
+        ifcopenshell.api.pset.edit_pset(self.file, pset=pset, properties={"Foo": "Bar"})
+        ifcopenshell.api.pset.assign_pset(self.file, products=walls[1:4], pset=pset)
+        segment = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcFlowSegment")
+        ifcopenshell.api.system.add_port(self.file, element=segment)
+        ifcopenshell.api.system.add_port(self.file, element=segment)
+        return [assembly, *walls[:4], segment]
+
+    def get_model_summary(self):
+        return Counter(e.is_a() for e in self.file)
+
+    def test_removing_products_equivalent_to_removing_each_product(self):
+        for product in self.create_model():
+            ifcopenshell.api.root.remove_product(self.file, product=product)
+        expected = self.get_model_summary()
+
+        self.file = ifcopenshell.api.project.create_file(version=self.file.schema)
+        ifcopenshell.api.root.remove_products(self.file, products=self.create_model())
+        assert self.get_model_summary() == expected
+
+    def test_trimming_shared_relationships(self):
+        products = self.create_model()
+        walls = self.file.by_type("IfcWall")
+        ifcopenshell.api.root.remove_products(self.file, products=products)
+        assert len(self.file.by_type("IfcWall")) == 2
+        assert not self.file.by_type("IfcElementAssembly")
+        assert not self.file.by_type("IfcRelAggregates")
+        assert not self.file.by_type("IfcRelAssignsToGroup")
+        assert not self.file.by_type("IfcDistributionPort")
+        assert not self.file.by_type("IfcPropertySet")
+        assert len(self.file.by_type("IfcObjectPlacement")) == 2
+        rel = self.file.by_type("IfcRelContainedInSpatialStructure")[0]
+        assert set(rel.RelatedElements) == set(self.file.by_type("IfcWall"))
+        rel = self.file.by_type("IfcRelDefinesByType")[0]
+        assert set(rel.RelatedObjects) == set(self.file.by_type("IfcWall"))
+        rel = self.file.by_type("IfcRelAssociatesMaterial")[0]
+        assert set(rel.RelatedObjects) == set(self.file.by_type("IfcWall"))
+
+    def create_layered_model(self):
+        wall_types = [ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWallType") for _ in range(2)]
+        material = ifcopenshell.api.material.add_material(self.file, name="Foo")
+        layer_set = ifcopenshell.api.material.add_material_set(self.file, name="Bar", set_type="IfcMaterialLayerSet")
+        layer = ifcopenshell.api.material.add_layer(self.file, layer_set=layer_set, material=material)
+        ifcopenshell.api.material.edit_layer(self.file, layer=layer, attributes={"LayerThickness": 0.2})
+        ifcopenshell.api.material.assign_material(self.file, products=wall_types, material=layer_set)
+        walls = [ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWall") for _ in range(4)]
+        ifcopenshell.api.type.assign_type(self.file, related_objects=walls[:3], relating_type=wall_types[0])
+        ifcopenshell.api.type.assign_type(self.file, related_objects=walls[3:], relating_type=wall_types[1])
+        return [wall_types[0], walls[0]]
+
+    def test_removing_a_type_equivalent_to_removing_each_product(self):
+        for product in self.create_layered_model():
+            ifcopenshell.api.root.remove_product(self.file, product=product)
+        expected = self.get_model_summary()
+        assert not expected["IfcMaterialLayerSetUsage"]
+
+        self.file = ifcopenshell.api.project.create_file(version=self.file.schema)
+        ifcopenshell.api.root.remove_products(self.file, products=self.create_layered_model())
+        assert self.get_model_summary() == expected
+
+    def test_removing_a_product_and_its_ports(self):
+        segment = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcFlowSegment")
+        port = ifcopenshell.api.system.add_port(self.file, element=segment)
+        ifcopenshell.api.root.remove_products(self.file, products=[segment, port])
+        assert not self.file.by_type("IfcFlowSegment")
+        assert not self.file.by_type("IfcDistributionPort")
+        assert not self.file.by_type("IfcRelNests")
+
+
+class TestRemoveProductsIFC2X3(TestRemoveProducts, test.bootstrap.IFC2X3):
+    pass
@@ -272,6 +272,17 @@ class TestRecalculateSchedule(test.bootstrap.IFC4):
         assert task2.TaskTime.FreeFloat == "P0D"
         assert task2.TaskTime.IsCritical is True
 
+    def test_recalculating_a_long_chain_of_finish_to_start(self):
+        self._add_work_schedule()
+        tasks = [self._create_task("P1D") for i in range(50)]
+        for predecessor, successor in zip(tasks, tasks[1:]):
+            self._create_sequence(predecessor, successor, "FINISH_START")
+        ifcopenshell.api.sequence.recalculate_schedule(self.file, work_schedule=self.work_schedule)
+        assert tasks[0].TaskTime.EarlyStart == "2000-01-01T09:00:00"
+        assert tasks[-1].TaskTime.EarlyStart == "2000-02-19T09:00:00"
+        assert tasks[-1].TaskTime.EarlyFinish == "2000-02-19T17:00:00"
+        assert all(t.TaskTime.IsCritical is True for t in tasks)
+
     def _add_work_schedule(self):
         ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcProject")
         self.work_schedule = ifcopenshell.api.sequence.add_work_schedule(self.file)
@@ -22,6 +22,7 @@ import ifcopenshell.api.unit
 import ifcopenshell.api.root
 import ifcopenshell.api.system
 import ifcopenshell.api.geometry
+import ifcopenshell.util.element
 import ifcopenshell.util.placement
 import ifcopenshell.util.system
 
@@ -40,6 +41,16 @@ class TestAssignPort(test.bootstrap.IFC4):
         ifcopenshell.api.system.assign_port(self.file, element=element, port=port)
         assert ifcopenshell.util.system.get_ports(element) == [port]
 
+    def test_updating_the_decomposition_index(self):
+        port = self.file.createIfcDistributionPort()
+        element = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcFlowSegment")
+        ifcopenshell.util.element.enable_decomposition_index(self.file)
+        assert ifcopenshell.util.element.get_nest(port) is None
+        ifcopenshell.api.system.assign_port(self.file, element=element, port=port)
+        assert ifcopenshell.util.system.get_ports(element) == [port]
+        if self.file.schema != "IFC2X3":
+            assert ifcopenshell.util.element.get_nest(port) == element
+
     def test_updating_the_placement_to_be_relative_if_it_exists(self):
         ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcProject")
         ifcopenshell.api.unit.assign_unit(self.file)
@@ -19,6 +19,7 @@
 import test.bootstrap
 import ifcopenshell.api.root
 import ifcopenshell.api.system
+import ifcopenshell.util.element
 import ifcopenshell.util.system
 
 
@@ -30,6 +31,15 @@ class TestAssignPort(test.bootstrap.IFC4):
         ifcopenshell.api.system.unassign_port(self.file, element=element, port=port)
         assert ifcopenshell.util.system.get_ports(element) == []
 
+    def test_updating_the_decomposition_index(self):
+        port = self.file.createIfcDistributionPort()
+        element = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcFlowSegment")
+        ifcopenshell.api.system.assign_port(self.file, element=element, port=port)
+        ifcopenshell.util.element.enable_decomposition_index(self.file)
+        ifcopenshell.api.system.unassign_port(self.file, element=element, port=port)
+        assert ifcopenshell.util.system.get_ports(element) == []
+        assert ifcopenshell.util.element.get_nest(port) is None
+
 
 class TestAssignPortIFC2X3(test.bootstrap.IFC2X3, TestAssignPort):
     pass
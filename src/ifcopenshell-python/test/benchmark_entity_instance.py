@@ -0,0 +1,72 @@
+# IfcOpenShell - IFC toolkit and geometry engine
+# Copyright (C) 2026 Dion Moult <dion@thinkmoult.com>
+#
+# This file is part of IfcOpenShell.
+#
+# IfcOpenShell is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# IfcOpenShell is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with IfcOpenShell.  If not, see <http://www.gnu.org/licenses/>.
+
+# Compares reading forward, inverse, derived, and missing attributes with
+# accessors resolved on every read (as entity_instance.__getattr__ used to do)
+# against reading them using the cached accessors.
+#
+# Usage: python benchmark_entity_instance.py [number of reads]
+
+import sys
+import time
+import ifcopenshell
+from ifcopenshell.entity_instance import _accessors
+import ifcopenshell.guid
+
+
+def create_file() -> ifcopenshell.file:
+    f = ifcopenshell.file(schema="IFC4")
+    wall = f.createIfcWall(ifcopenshell.guid.new(), Name="Wall")
+    opening = f.createIfcOpeningElement(ifcopenshell.guid.new())
+    f.createIfcRelVoidsElement(ifcopenshell.guid.new(), RelatingBuildingElement=wall, RelatedOpeningElement=opening)
+    f.createIfcDirection((1.0, 0.0, 0.0))
+    return f
+
+
+def read(f: ifcopenshell.file, total: int, clear: bool) -> list:
+    wall = f.by_type("IfcWall")[0]
+    opening = f.by_type("IfcOpeningElement")[0]
+    direction = f.by_type("IfcDirection")[0]
+    reads = (
+        ("forward", lambda: wall.Name),
+        ("inverse", lambda: wall.HasOpenings),
+        ("non aggregate inverse", lambda: opening.VoidsElements),
+        ("derived", lambda: direction.Dim),
+        ("missing", lambda: getattr(wall, "Foo", None)),
+    )
+    results = []
+    for label, fn in reads:
+        start = time.perf_counter()
+        for _ in range(total):
+            if clear:
+                _accessors.clear()
+            result = fn()
+        name = "uncached" if clear else "cached"
+        print(f"{name} {label} x {total}: {time.perf_counter() - start:.2f}s")
+        results.append(result)
+    return results
+
+
+def run(total: int) -> None:
+    f = create_file()
+    ifcopenshell.settings.unpack_non_aggregate_inverses = True
+    assert read(f, total, clear=True) == read(f, total, clear=False)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
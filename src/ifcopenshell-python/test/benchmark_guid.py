@@ -0,0 +1,60 @@
+# IfcOpenShell - IFC toolkit and geometry engine
+# Copyright (C) 2026 Dion Moult <dion@thinkmoult.com>
+#
+# This file is part of IfcOpenShell.
+#
+# IfcOpenShell is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# IfcOpenShell is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with IfcOpenShell.  If not, see <http://www.gnu.org/licenses/>.
+
+# Compares generating, compressing and expanding GlobalIds one at a time
+# against doing so in bulk.
+#
+# Usage: python benchmark_guid.py [number of GlobalIds]
+
+import sys
+import time
+import uuid
+import ifcopenshell.guid
+
+
+def run(total: int) -> None:
+    start = time.perf_counter()
+    [ifcopenshell.guid.new() for _ in range(total)]
+    print(f"new x {total}: {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    ifcopenshell.guid.new_many(total)
+    print(f"new_many({total}): {time.perf_counter() - start:.2f}s")
+
+    hexes = [uuid.uuid4().hex for _ in range(total)]
+
+    start = time.perf_counter()
+    guids = [ifcopenshell.guid.compress(g) for g in hexes]
+    print(f"compress x {total}: {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    assert ifcopenshell.guid.compress_many(hexes) == guids
+    print(f"compress_many({total}): {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    expanded = [ifcopenshell.guid.expand(g) for g in guids]
+    print(f"expand x {total}: {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    assert ifcopenshell.guid.expand_many(guids) == expanded
+    print(f"expand_many({total}): {time.perf_counter() - start:.2f}s")
+    assert expanded == hexes
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,67 @@
+# IfcOpenShell - IFC toolkit and geometry engine
+# Copyright (C) 2026 Dion Moult <dion@thinkmoult.com>
+#
+# This file is part of IfcOpenShell.
+#
+# IfcOpenShell is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# IfcOpenShell is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with IfcOpenShell.  If not, see <http://www.gnu.org/licenses/>.
+
+# Compares removing tessellated representations one at a time using
+# remove_deep2() against removing them all at once using remove_deep2_many().
+#
+# Usage: python benchmark_remove_deep2.py [number of representations]
+
+import sys
+import time
+import ifcopenshell
+import ifcopenshell.api.context
+import ifcopenshell.api.project
+import ifcopenshell.api.root
+import ifcopenshell.util.element
+
+
+def create_file(total: int) -> ifcopenshell.file:
+    f = ifcopenshell.api.project.create_file()
+    ifcopenshell.api.root.create_entity(f, ifc_class="IfcProject")
+    model = ifcopenshell.api.context.add_context(f, context_type="Model")
+    body = ifcopenshell.api.context.add_context(
+        f, context_type="Model", context_identifier="Body", target_view="MODEL_VIEW", parent=model
+    )
+    coordinates = ((0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (1.0, 1.0, 0.0), (0.0, 1.0, 0.0), (0.5, 0.5, 1.0))
+    indices = ((1, 2, 5), (2, 3, 5), (3, 4, 5), (4, 1, 5), (1, 3, 2), (1, 4, 3))
+    for _ in range(total):
+        points = f.createIfcCartesianPointList3D(coordinates)
+        face_set = f.createIfcTriangulatedFaceSet(Coordinates=points, CoordIndex=indices)
+        f.createIfcShapeRepresentation(body, "Body", "Tessellation", [face_set])
+    return f
+
+
+def run(total: int) -> None:
+    f = create_file(total)
+    contexts = f.by_type("IfcGeometricRepresentationContext")
+    start = time.perf_counter()
+    for representation in f.by_type("IfcShapeRepresentation"):
+        ifcopenshell.util.element.remove_deep2(f, representation, do_not_delete=contexts)
+    print(f"remove_deep2 x {total}: {time.perf_counter() - start:.2f}s")
+    remaining = len(list(f))
+
+    f = create_file(total)
+    contexts = f.by_type("IfcGeometricRepresentationContext")
+    start = time.perf_counter()
+    ifcopenshell.util.element.remove_deep2_many(f, f.by_type("IfcShapeRepresentation"), do_not_delete=contexts)
+    print(f"remove_deep2_many x {total}: {time.perf_counter() - start:.2f}s")
+    assert len(list(f)) == remaining
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -21,6 +21,7 @@ import test.bootstrap
 import ifcopenshell
 import ifcopenshell.api
 import ifcopenshell.util.element
+from ifcopenshell.entity_instance import _accessors
 
 
 class TestGetInfo2(test.bootstrap.IFC4):
@@ -58,3 +59,76 @@ class TestGetInfo2(test.bootstrap.IFC4):
                 {"Coordinates": (3.0,), "id": 5, "type": "IfcCartesianPoint"},
             ),
         )
+
+
+class TestGetAttribute(test.bootstrap.IFC4):
+    def test_forward_attribute(self):
+        wall = self.file.create_entity("IfcWall", Name="Foo")
+        assert wall.Name == "Foo"
+        wall.Name = "Bar"
+        assert wall.Name == "Bar"
+        assert self.file.create_entity("IfcSlab").Name is None
+
+    def test_inverse_attribute(self):
+        wall = self.file.create_entity("IfcWall")
+        assert wall.IsDefinedBy == ()
+        rel = self.file.create_entity("IfcRelDefinesByProperties", RelatedObjects=[wall])
+        assert wall.IsDefinedBy == (rel,)
+
+    def test_non_aggregate_inverse_attribute(self):
+        element = self.file.create_entity("IfcWall")
+        opening = self.file.create_entity("IfcOpeningElement")
+        rel = self.file.create_entity(
+            "IfcRelVoidsElement", RelatingBuildingElement=element, RelatedOpeningElement=opening
+        )
+        assert opening.VoidsElements == (rel,)
+        ifcopenshell.settings.unpack_non_aggregate_inverses = True
+        try:
+            assert opening.VoidsElements == rel
+            assert self.file.create_entity("IfcOpeningElement").VoidsElements is None
+            assert element.HasOpenings == (rel,)
+        finally:
+            ifcopenshell.settings.unpack_non_aggregate_inverses = False
+        assert opening.VoidsElements == (rel,)
+
+    def test_derived_attribute(self):
+        direction = self.file.create_entity("IfcDirection", (1.0, 0.0, 0.0))
+        assert direction.Dim == 3
+        assert self.file.create_entity("IfcDirection", (1.0, 0.0)).Dim == 2
+
+    def test_invalid_attribute(self):
+        wall = self.file.create_entity("IfcWall")
+        for _ in range(2):
+            with pytest.raises(AttributeError):
+                wall.Foo
+            assert getattr(wall, "Foo", None) is None
+            assert not hasattr(wall, "Foo")
+        assert (wall.is_a(True), "Foo") not in _accessors
+
+    def test_same_attribute_name_on_different_classes(self):
+        point = self.file.create_entity("IfcCartesianPoint", (0.0, 0.0, 0.0))
+        assert point.Dim == 3
+        with pytest.raises(AttributeError):
+            self.file.create_entity("IfcWall").Dim
+
+    def test_cached_reads_match_uncached_reads(self):
+        wall = self.file.create_entity("IfcWall", Name="Foo")
+        opening = self.file.create_entity("IfcOpeningElement")
+        self.file.create_entity("IfcRelVoidsElement", RelatingBuildingElement=wall, RelatedOpeningElement=opening)
+        direction = self.file.create_entity("IfcDirection", (1.0, 0.0, 0.0))
+        reads = (
+            lambda: wall.Name,
+            lambda: wall.HasOpenings,
+            lambda: opening.VoidsElements,
+            lambda: direction.Dim,
+            lambda: getattr(wall, "Foo", None),
+        )
+        for unpack_non_aggregate_inverses in (False, True):
+            ifcopenshell.settings.unpack_non_aggregate_inverses = unpack_non_aggregate_inverses
+            try:
+                for read in reads:
+                    _accessors.clear()
+                    uncached = read()
+                    assert read() == uncached
+            finally:
+                ifcopenshell.settings.unpack_non_aggregate_inverses = False
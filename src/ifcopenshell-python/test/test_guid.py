@@ -0,0 +1,65 @@
+# IfcOpenShell - IFC toolkit and geometry engine
+# Copyright (C) 2021 Thomas Krijnen <thomas@aecgeeks.com>
+#
+# This file is part of IfcOpenShell.
+#
+# IfcOpenShell is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# IfcOpenShell is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with IfcOpenShell.  If not, see <http://www.gnu.org/licenses/>.
+
+import uuid
+import pytest
+import ifcopenshell.guid
+
+
+class TestGuid:
+    def test_compress(self):
+        assert ifcopenshell.guid.compress("00000000000000000000000000000000") == "0" * 22
+        assert ifcopenshell.guid.compress("ffffffffffffffffffffffffffffffff") == "3" + "$" * 21
+        assert ifcopenshell.guid.compress("28a9e7d4ba1b4b0f8a40c21be8c5b7d1") == "0egUVKkXjB3uf0mXlenRVH"
+
+    def test_expand(self):
+        assert ifcopenshell.guid.expand("0" * 22) == "00000000000000000000000000000000"
+        assert ifcopenshell.guid.expand("3" + "$" * 21) == "ffffffffffffffffffffffffffffffff"
+        assert ifcopenshell.guid.expand("0egUVKkXjB3uf0mXlenRVH") == "28a9e7d4ba1b4b0f8a40c21be8c5b7d1"
+
+    def test_expanding_an_invalid_guid(self):
+        with pytest.raises(ValueError):
+            ifcopenshell.guid.expand("0egUVKkXjB3uf0mXlenRV!")
+
+    def test_round_trip(self):
+        for _ in range(100):
+            g = uuid.uuid4().hex
+            assert ifcopenshell.guid.expand(ifcopenshell.guid.compress(g)) == g
+
+    def test_compress_many(self):
+        guids = [uuid.uuid4().hex for _ in range(100)]
+        assert ifcopenshell.guid.compress_many(guids) == [ifcopenshell.guid.compress(g) for g in guids]
+        assert ifcopenshell.guid.compress_many([]) == []
+
+    def test_expand_many(self):
+        guids = [ifcopenshell.guid.new() for _ in range(100)]
+        assert ifcopenshell.guid.expand_many(guids) == [ifcopenshell.guid.expand(g) for g in guids]
+        with pytest.raises(ValueError):
+            ifcopenshell.guid.expand_many(["0egUVKkXjB3uf0mXlenRV!"])
+        with pytest.raises(ValueError):
+            ifcopenshell.guid.expand_many(["0egUVKkXjB3uf0mXlenRV"])
+
+    def test_new_many(self):
+        guids = ifcopenshell.guid.new_many(1000)
+        assert len(set(guids)) == 1000
+        for g in guids:
+            assert len(g) == 22
+            assert g[0] in "0123"
+            u = uuid.UUID(ifcopenshell.guid.expand(g))
+            assert u.version == 4
+            assert u.variant == uuid.RFC_4122
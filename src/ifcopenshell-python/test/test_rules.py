@@ -1,5 +1,6 @@
 import os
 import sys
+import json
 import glob
 
 import pytest
@@ -45,5 +46,41 @@ def test_file(filename):
         assert len(results) == 0
 
 
+def test_rule_subset_and_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("IFCOPENSHELL_RULE_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(ifcopenshell.express.rule_executor, "compiled_rules_cache", {})
+    filename = sorted(glob.glob(os.path.join(os.path.dirname(__file__), "fixtures/rules/fail-*.ifc")))[0]
+    file = ifcopenshell.open(filename)
+
+    logger = ifcopenshell.validate.json_logger()
+    ifcopenshell.express.rule_executor.run(file, logger)
+    assert os.listdir(tmp_path)
+    rule_name = logger.statements[0]["attribute"]
+
+    # Loaded from the on-disk cache this time
+    monkeypatch.setattr(ifcopenshell.express.rule_executor, "compiled_rules_cache", {})
+    subset_logger = ifcopenshell.validate.json_logger()
+    ifcopenshell.express.rule_executor.run(file, subset_logger, rule_names=[rule_name])
+    assert subset_logger.statements
+    assert all(s["attribute"] == rule_name for s in subset_logger.statements)
+    assert len(subset_logger.statements) == len([s for s in logger.statements if s["attribute"] == rule_name])
+
+
+@pytest.mark.parametrize(
+    "filename",
+    glob.glob(os.path.join(os.path.dirname(__file__), "fixtures/rules/fail-*.ifc")),
+)
+def test_parallel_file(filename):
+    file = ifcopenshell.open(filename)
+    sequential = ifcopenshell.validate.json_logger()
+    ifcopenshell.express.rule_executor.run(file, sequential)
+    parallel = ifcopenshell.validate.json_logger()
+    ifcopenshell.express.rule_executor.run(file, parallel, processes=2, filename=filename)
+    # Only the order of the statements may differ
+    assert sorted(json.dumps(x, default=str) for x in parallel.statements) == sorted(
+        json.dumps(x, default=str) for x in sequential.statements
+    )
+
+
 if __name__ == "__main__":
     pytest.main(["-sx", __file__])
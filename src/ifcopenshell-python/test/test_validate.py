@@ -18,6 +18,7 @@
 
 import os
 import glob
+import json
 
 import pytest
 
@@ -41,5 +42,34 @@ def test_file(file):
         assert len(logger.statements) == 0
 
 
+@pytest.mark.parametrize(
+    "file",
+    glob.glob(os.path.join(os.path.dirname(__file__), "fixtures/validate/fail-*.ifc")),
+)
+def test_parallel_file(file):
+    sequential = ifcopenshell.validate.json_logger()
+    parallel = ifcopenshell.validate.json_logger()
+    try:
+        ifcopenshell.validate.validate(file, sequential)
+    except ifcopenshell.SchemaError as e:
+        pytest.skip()
+    ifcopenshell.validate.validate(file, parallel, processes=2)
+    assert [json.dumps(x, default=str) for x in parallel.statements] == [
+        json.dumps(x, default=str) for x in sequential.statements
+    ]
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_statements_in_file_order_without_repetition(processes):
+    file = os.path.join(os.path.dirname(__file__), "fixtures/validate/fail-duplicated-guids-invalid-attributes.ifc")
+    logger = ifcopenshell.validate.json_logger()
+    ifcopenshell.validate.validate(file, logger, processes=processes)
+    statements = [json.dumps(x, default=str) for x in logger.statements]
+    assert len(statements) == len(set(statements))
+    # Attribute count errors are reported by the parser rather than per instance
+    ids = [x["instance"].id() for x in logger.statements if not x["message"].startswith("Expected")]
+    assert ids == [1, 2, 4, 6]
+
+
 if __name__ == "__main__":
     pytest.main(["-sx", __file__])
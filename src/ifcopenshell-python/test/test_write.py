@@ -17,6 +17,7 @@
 # along with IfcOpenShell.  If not, see <http://www.gnu.org/licenses/>.
 
 import tempfile
+import zipfile
 from pathlib import Path
 import pytest
 import ifcopenshell
@@ -64,3 +65,14 @@ class TestWrite:
 
     def test_write_to_non_existing_dir(self):
         self.assert_model_is_written("tmp/model.ifczip")
+
+    def test_write_ifc_zip_ifcspf_format_without_uncompressed_copy(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = Path(temp_dir) / "model.ifcZIP"
+            self.model.write(file_path)
+            assert [p.name for p in Path(temp_dir).iterdir()] == ["model.ifcZIP"]
+            with zipfile.ZipFile(file_path) as zf:
+                assert zf.namelist() == ["model.ifc"]
+                assert zf.read("model.ifc").decode() == self.model.wrapped_data.to_string()
+            model = ifcopenshell.open(file_path)
+            assert [e.id() for e in model] == [e.id() for e in self.model]
@@ -16,6 +16,8 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with IfcOpenShell.  If not, see <http://www.gnu.org/licenses/>.
 
+import gc
+import weakref
 import ifcopenshell.api.profile
 import pytest
 import test.bootstrap
@@ -828,6 +830,110 @@ class TestGetNestIFC2X3(test.bootstrap.IFC2X3, TestGetNestIFC4):
     pass
 
 
+class DecompositionIndex:
+    @pytest.fixture(autouse=True)
+    def setup_index(self, setup):
+        # The index is enabled on a blank file, so it must be kept up to date
+        # by the API usecases.
+        subject.enable_decomposition_index(self.file)
+
+
+class TestGetContainerWithIndexIFC4(DecompositionIndex, TestGetContainerIFC4):
+    pass
+
+
+class TestGetDecompositionWithIndexIFC4(DecompositionIndex, TestGetDecompositionIFC4):
+    pass
+
+
+class TestGetAggregateWithIndexIFC4(DecompositionIndex, TestGetAggregateIFC4):
+    pass
+
+
+class TestGetNestWithIndexIFC4(DecompositionIndex, TestGetNestIFC4):
+    pass
+
+
+class TestGetNestWithIndexIFC2X3(DecompositionIndex, TestGetNestIFC2X3):
+    pass
+
+
+class TestDecompositionIndexIFC4(test.bootstrap.IFC4):
+    def test_indexing_an_existing_hierarchy(self):
+        site = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcSite")
+        storey = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcBuildingStorey")
+        wall = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWall")
+        opening = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcOpeningElement")
+        window = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWindow")
+        ifcopenshell.api.aggregate.assign_object(self.file, products=[storey], relating_object=site)
+        ifcopenshell.api.spatial.assign_container(self.file, products=[wall], relating_structure=storey)
+        ifcopenshell.api.void.add_opening(self.file, element=wall, opening=opening)
+        ifcopenshell.api.void.add_filling(self.file, element=window, opening=opening)
+        index = subject.enable_decomposition_index(self.file)
+        assert subject.get_decomposition_index(self.file) is index
+        assert subject.get_container(wall, ifc_class="IfcSite") == site
+        assert subject.get_filled_void(window) == opening
+        assert subject.get_voided_element(opening) == wall
+        assert subject.get_parent(window) == opening
+        assert subject.get_decomposition(site) == {storey, wall, opening, window}
+        assert subject.get_decomposition(site, is_recursive=False) == {storey}
+        assert index.get_ancestors(window) == (opening, wall, storey, site)
+        subject.disable_decomposition_index(self.file)
+        assert subject.get_decomposition_index(self.file) is None
+
+    def test_updating_the_index_when_moving_elements(self):
+        storey1 = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcBuildingStorey")
+        storey2 = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcBuildingStorey")
+        wall = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWall")
+        index = subject.enable_decomposition_index(self.file)
+        ifcopenshell.api.spatial.assign_container(self.file, products=[wall], relating_structure=storey1)
+        assert index.get_ancestors(wall) == (storey1,)
+        ifcopenshell.api.spatial.assign_container(self.file, products=[wall], relating_structure=storey2)
+        assert subject.get_container(wall) == storey2
+        assert index.get_ancestors(wall) == (storey2,)
+        assert subject.get_decomposition(storey1) == set()
+        assert subject.get_decomposition(storey2) == {wall}
+        ifcopenshell.api.spatial.unassign_container(self.file, products=[wall])
+        assert subject.get_container(wall) is None
+        assert subject.get_decomposition(storey2) == set()
+
+    def test_updating_the_index_when_removing_elements(self):
+        storey = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcBuildingStorey")
+        wall = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWall")
+        ifcopenshell.api.spatial.assign_container(self.file, products=[wall], relating_structure=storey)
+        subject.enable_decomposition_index(self.file)
+        assert subject.get_decomposition(storey) == {wall}
+        ifcopenshell.api.root.remove_product(self.file, product=wall)
+        assert subject.get_decomposition(storey) == set()
+
+    def test_invalidating_the_index(self):
+        storey = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcBuildingStorey")
+        wall = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWall")
+        subject.enable_decomposition_index(self.file)
+        self.file.createIfcRelContainedInSpatialStructure(
+            ifcopenshell.guid.new(), RelatedElements=[wall], RelatingStructure=storey
+        )
+        assert subject.get_container(wall) is None
+        subject.invalidate_decomposition_index(self.file, [wall])
+        assert subject.get_container(wall) == storey
+        self.file.remove(wall.ContainedInStructure[0])
+        subject.invalidate_decomposition_index(self.file)
+        assert subject.get_container(wall) is None
+
+    def test_the_index_does_not_keep_the_file_alive(self):
+        storey = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcBuildingStorey")
+        wall = ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcWall")
+        ifcopenshell.api.spatial.assign_container(self.file, products=[wall], relating_structure=storey)
+        subject.enable_decomposition_index(self.file)
+        assert subject.get_container(wall) == storey
+        file = weakref.ref(self.file)
+        assert file() in subject.decomposition_indexes
+        del storey, wall
+        self.file = None
+        gc.collect()
+        assert file() is None
+
+
 class TestGetReferencedElements(test.bootstrap.IFC4):
     # TODO: test other references:
     # IfcExternallyDefinedHatchStyle
@@ -962,6 +1068,64 @@ class TestRemoveDeep2IFC4(test.bootstrap.IFC4):
         assert self.file.by_guid("id1")
 
 
+class TestRemoveDeep2ManyIFC4(test.bootstrap.IFC4):
+    def test_removing_many_elements_along_with_all_direct_attributes_recursively(self):
+        owner = self.file.createIfcOwnerHistory()
+        element1 = self.file.createIfcWall(GlobalId="id1", OwnerHistory=owner)
+        element2 = self.file.createIfcWall(GlobalId="id2", OwnerHistory=owner)
+        subject.remove_deep2_many(self.file, [element1, element2])
+        assert len(list(self.file)) == 0
+
+    def test_removing_many_elements_except_if_an_element_is_referenced_elsewhere(self):
+        owner = self.file.createIfcOwnerHistory()
+        element1 = self.file.createIfcWall(GlobalId="id1", OwnerHistory=owner)
+        element2 = self.file.createIfcWall(GlobalId="id2", OwnerHistory=owner)
+        element3 = self.file.createIfcWall(GlobalId="id3", OwnerHistory=owner)
+        subject.remove_deep2_many(self.file, [element1, element2])
+        assert self.file.by_id(owner.id())
+        assert self.file.by_guid("id3")
+        assert len(list(self.file)) == 2
+
+    def test_not_removing_an_element_still_referenced_somewhere(self):
+        owner = self.file.createIfcOwnerHistory()
+        element = self.file.createIfcWall(GlobalId="id1", OwnerHistory=owner)
+        subject.remove_deep2_many(self.file, [owner])
+        assert self.file.by_id(owner.id())
+        assert self.file.by_guid("id1")
+
+    def test_removing_elements_referenced_only_by_other_removed_elements(self):
+        points = self.file.createIfcCartesianPointList3D(((0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (1.0, 1.0, 0.0)))
+        face_set = self.file.createIfcTriangulatedFaceSet(Coordinates=points, CoordIndex=((1, 2, 3),))
+        subject.remove_deep2_many(self.file, [face_set, points])
+        assert len(list(self.file)) == 0
+
+    def test_removing_elements_only_referenced_by_also_considered_elements(self):
+        context = self.file.createIfcGeometricRepresentationContext()
+        point = self.file.createIfcCartesianPoint((0.0, 0.0, 0.0))
+        representation = self.file.createIfcShapeRepresentation(ContextOfItems=context, Items=[point])
+        style = self.file.createIfcStyledItem(Item=point)
+        representation_id, point_id = representation.id(), point.id()
+        subject.remove_deep2_many(self.file, [representation], also_consider=[style], do_not_delete=[context])
+        assert self.file.by_id(context.id())
+        assert self.file.by_id(style.id())
+        with pytest.raises(RuntimeError):
+            self.file.by_id(representation_id)
+        with pytest.raises(RuntimeError):
+            self.file.by_id(point_id)
+
+    def test_not_keeping_elements_only_referenced_by_also_considered_elements(self):
+        point = self.file.createIfcCartesianPoint((0.0, 0.0, 0.0))
+        style = self.file.createIfcStyledItem(Item=point)
+        representation = self.file.createIfcShapeRepresentation(Items=[point, style])
+        representation_id, point_id = representation.id(), point.id()
+        subject.remove_deep2_many(self.file, [representation], also_consider=[style])
+        assert self.file.by_id(style.id())
+        with pytest.raises(RuntimeError):
+            self.file.by_id(representation_id)
+        with pytest.raises(RuntimeError):
+            self.file.by_id(point_id)
+
+
 class TestBatchRemoveDeep2IFC4(test.bootstrap.IFC4):
     def test_run(self):
         owner = self.file.createIfcOwnerHistory()
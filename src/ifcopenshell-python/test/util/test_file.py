@@ -64,3 +64,70 @@ class TestExtractHeaderMetadata(test.bootstrap.IFC4):
         with zipfile.ZipFile(zip_filepath, mode="w") as zf:
             zf.write(str(ifc_filepath))
         self.check_metadata_fields(str(zip_filepath))
+
+    def test_ifc_with_a_long_header(self) -> None:
+        filepath = self.get_ifc_filepath()
+        filepath.write_text(HEADER_EXTRACTOR_TEST_FILE_STR.replace("HEADER;\n", "HEADER;\n" + "/* Comment */\n" * 100))
+        self.check_metadata_fields(str(filepath))
+
+    def test_ifc_statistics(self) -> None:
+        statistics = subject.IfcHeaderExtractor(str(self.get_ifc_filepath())).extract_statistics(chunk_size=16)
+        assert statistics["header"]["schema_name"] == "IFC4X3_ADD2"
+        assert statistics["entity_counts"] == {"IFCPROJECT": 1}
+        assert statistics["size"] == self.get_ifc_filepath().stat().st_size
+
+
+class TestIfcCatalog:
+    def write_ifc(self, filepath: Path) -> None:
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        filepath.write_text(HEADER_EXTRACTOR_TEST_FILE_STR)
+
+    def test_cataloging_a_directory(self, tmp_path: Path) -> None:
+        self.write_ifc(tmp_path / "models" / "a.ifc")
+        self.write_ifc(tmp_path / "models" / "sub" / "b.ifc")
+        (tmp_path / "models" / "readme.txt").write_text("")
+        with subject.IfcCatalog(str(tmp_path / "catalog.db")) as catalog:
+            assert len(catalog.update(str(tmp_path / "models"))) == 2
+            files = catalog.get_files()
+            assert [f["path"] for f in files] == [
+                str(tmp_path / "models" / "a.ifc"),
+                str(tmp_path / "models" / "sub" / "b.ifc"),
+            ]
+            assert files[0]["header"]["schema_name"] == "IFC4X3_ADD2"
+            assert files[0]["total_entities"] == 1
+            assert catalog.get_entity_counts(str(tmp_path / "models" / "a.ifc")) == {"IFCPROJECT": 1}
+
+    def test_filtering_by_schema(self, tmp_path: Path) -> None:
+        self.write_ifc(tmp_path / "a.ifc")
+        (tmp_path / "b.ifc").write_text(HEADER_EXTRACTOR_TEST_FILE_STR.replace("IFC4X3_ADD2", "IFC2X3"))
+        with subject.IfcCatalog(str(tmp_path / "catalog.db")) as catalog:
+            catalog.update(str(tmp_path))
+            assert [f["path"] for f in catalog.get_files(schema_name="IFC2X3")] == [str(tmp_path / "b.ifc")]
+
+    def test_only_rescanning_changed_files(self, tmp_path: Path) -> None:
+        self.write_ifc(tmp_path / "models" / "a.ifc")
+        self.write_ifc(tmp_path / "models" / "b.ifc")
+        database = str(tmp_path / "catalog.db")
+        with subject.IfcCatalog(database) as catalog:
+            catalog.update(str(tmp_path / "models"))
+        with subject.IfcCatalog(database) as catalog:
+            assert catalog.update(str(tmp_path / "models")) == []
+            with open(tmp_path / "models" / "a.ifc", "a") as f:
+                f.write("\n")
+            (tmp_path / "models" / "b.ifc").unlink()
+            assert catalog.update(str(tmp_path / "models")) == [str(tmp_path / "models" / "a.ifc")]
+            assert [f["path"] for f in catalog.get_files()] == [str(tmp_path / "models" / "a.ifc")]
+            assert catalog.get_entity_counts(str(tmp_path / "models" / "b.ifc")) == {}
+
+    def test_cataloging_unreadable_files(self, tmp_path: Path) -> None:
+        (tmp_path / "a.ifc").write_text("Not an IFC")
+        with subject.IfcCatalog(str(tmp_path / "catalog.db")) as catalog:
+            catalog.update(str(tmp_path))
+            assert catalog.get_files()[0]["header"] == {}
+            assert catalog.update(str(tmp_path)) == []
+
+    def test_skipping_broken_symlinks(self, tmp_path: Path) -> None:
+        self.write_ifc(tmp_path / "a.ifc")
+        (tmp_path / "b.ifc").symlink_to(tmp_path / "missing.ifc")
+        with subject.IfcCatalog(str(tmp_path / "catalog.db")) as catalog:
+            assert catalog.update(str(tmp_path)) == [str(tmp_path / "a.ifc")]
@@ -16,6 +16,7 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with IfcOpenShell.  If not, see <http://www.gnu.org/licenses/>.
 
+import numpy as np
 import ifcopenshell
 import test.bootstrap
 import ifcopenshell.util.placement as subject
@@ -41,3 +42,58 @@ class TestGetStoreyElevationIFC4(test.bootstrap.IFC4):
         assert subject.get_storey_elevation(storey) == 0.0
         building = self.file.createIfcBuilding()
         assert subject.get_storey_elevation(building) == 0.0
+
+
+class TestPlacementCacheIFC4(test.bootstrap.IFC4):
+    def create_placement(self, location, rel_to=None, axis=None, ref_direction=None):
+        return self.file.createIfcLocalPlacement(
+            rel_to,
+            self.file.createIfcAxis2Placement3D(
+                self.file.createIfcCartesianPoint(location),
+                self.file.createIfcDirection(axis) if axis else None,
+                self.file.createIfcDirection(ref_direction) if ref_direction else None,
+            ),
+        )
+
+    def create_placements(self):
+        building = self.create_placement((10.0, 0.0, 0.0), ref_direction=(0.0, 1.0, 0.0))
+        storey = self.create_placement((0.0, 0.0, 3.0), rel_to=building)
+        wall = self.create_placement(
+            (1.0, 2.0, 0.0), rel_to=storey, axis=(1.0, 0.0, 0.0), ref_direction=(0.0, 0.0, 1.0)
+        )
+        return building, storey, wall
+
+    def test_getting_cached_placements(self):
+        placements = self.create_placements()
+        expected = [subject.get_local_placement(p) for p in placements]
+        subject.enable_placement_cache(self.file)
+        try:
+            for placement, matrix in zip(placements, expected):
+                assert np.allclose(subject.get_local_placement(placement), matrix)
+            new = self.create_placement((0.0, 0.0, 1.0), rel_to=placements[2])
+            assert np.allclose(
+                subject.get_local_placement(new), expected[2] @ subject.get_axis2placement(new.RelativePlacement)
+            )
+        finally:
+            subject.disable_placement_cache(self.file)
+
+    def test_cached_placements_are_not_modified_by_callers(self):
+        building, storey, wall = self.create_placements()
+        subject.enable_placement_cache(self.file)
+        try:
+            subject.get_local_placement(wall)[0][3] = 100.0
+            assert subject.get_local_placement(wall)[0][3] != 100.0
+        finally:
+            subject.disable_placement_cache(self.file)
+
+    def test_invalidating_a_placement_and_its_children(self):
+        building, storey, wall = self.create_placements()
+        subject.enable_placement_cache(self.file)
+        try:
+            storey.RelativePlacement.Location.Coordinates = (0.0, 0.0, 6.0)
+            subject.invalidate_placement_cache(self.file, storey)
+            assert subject.get_local_placement(storey)[2][3] == 6.0
+            assert subject.get_local_placement(wall)[2][3] == 6.0
+        finally:
+            subject.disable_placement_cache(self.file)
+        assert subject.get_placement_cache(self.file) is None
@@ -0,0 +1,164 @@
+# IfcOpenShell - IFC toolkit and geometry engine
+# Copyright (C) 2021 Dion Moult <dion@thinkmoult.com>
+#
+# This file is part of IfcOpenShell.
+#
+# IfcOpenShell is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# IfcOpenShell is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with IfcOpenShell.  If not, see <http://www.gnu.org/licenses/>.
+
+import datetime
+import test.bootstrap
+import ifcopenshell.api.control
+import ifcopenshell.api.root
+import ifcopenshell.api.sequence
+import ifcopenshell.util.sequence as subject
+
+
+class CalendarTest(test.bootstrap.IFC4):
+    def add_weekday_calendar(self):
+        ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcProject")
+        calendar = ifcopenshell.api.sequence.add_work_calendar(self.file)
+        work_time = ifcopenshell.api.sequence.add_work_time(self.file, work_calendar=calendar, time_type="WorkingTimes")
+        pattern = ifcopenshell.api.sequence.assign_recurrence_pattern(
+            self.file, parent=work_time, recurrence_type="WEEKLY"
+        )
+        ifcopenshell.api.sequence.edit_recurrence_pattern(
+            self.file, recurrence_pattern=pattern, attributes={"WeekdayComponent": [1, 2, 3, 4, 5]}
+        )
+        return calendar
+
+    def offset_date_by_day(self, start, days, calendar):
+        # Reference implementation, stepping one day at a time
+        current_date = start
+        remaining = abs(days)
+        step = datetime.timedelta(days=1 if days > 0 else -1)
+        while remaining > 0:
+            if subject.is_working_day(current_date, calendar):
+                remaining -= 1
+            current_date += step
+        while not subject.is_working_day(current_date, calendar):
+            current_date += step
+        return current_date
+
+
+class TestOffsetDate(CalendarTest):
+    def test_offsetting_with_elapsed_time(self):
+        start = datetime.date(2020, 1, 1)
+        assert subject.offset_date(start, datetime.timedelta(days=10), "ELAPSEDTIME", None) == datetime.date(
+            2020, 1, 11
+        )
+        assert subject.offset_date(start, datetime.timedelta(days=-10), "ELAPSEDTIME", None) == datetime.date(
+            2019, 12, 22
+        )
+
+    def test_offsetting_with_working_days(self):
+        calendar = self.add_weekday_calendar()
+        start = datetime.date(2020, 1, 1)  # A wednesday
+        assert subject.offset_date(start, datetime.timedelta(days=2), "WORKTIME", calendar) == datetime.date(2020, 1, 3)
+        assert subject.offset_date(start, datetime.timedelta(days=3), "WORKTIME", calendar) == datetime.date(2020, 1, 6)
+
+    def test_offsetting_across_years_matches_day_by_day_offsets(self):
+        calendar = self.add_weekday_calendar()
+        start = datetime.date(2020, 11, 20)
+        for days in (1, 30, 300, 700, -1, -30, -300, -700):
+            expected = self.offset_date_by_day(start, days, calendar)
+            assert subject.offset_date(start, datetime.timedelta(days=days), "WORKTIME", calendar) == expected
+
+    def test_preserving_the_time_of_a_datetime(self):
+        calendar = self.add_weekday_calendar()
+        start = datetime.datetime(2020, 1, 3, 9)  # A friday
+        result = subject.offset_date(start, datetime.timedelta(days=1), "WORKTIME", calendar)
+        assert result == datetime.datetime(2020, 1, 6, 9)
+
+
+class TestCountWorkingDays(CalendarTest):
+    def test_counting_without_a_calendar(self):
+        assert subject.count_working_days(datetime.date(2020, 1, 1), datetime.date(2020, 1, 10), None) == 10
+
+    def test_counting_across_years(self):
+        calendar = self.add_weekday_calendar()
+        assert subject.count_working_days(datetime.date(2020, 1, 1), datetime.date(2021, 12, 31), calendar) == 523
+
+    def test_calendar_changes_are_taken_into_account(self):
+        calendar = self.add_weekday_calendar()
+        start, finish = datetime.date(2020, 1, 1), datetime.date(2020, 1, 31)
+        assert subject.count_working_days(start, finish, calendar) == 23
+        pattern = calendar.WorkingTimes[0].RecurrencePattern
+        ifcopenshell.api.sequence.edit_recurrence_pattern(
+            self.file, recurrence_pattern=pattern, attributes={"WeekdayComponent": [1, 2, 3, 4]}
+        )
+        assert subject.count_working_days(start, finish, calendar) == 18
+
+    def test_direct_edits_are_taken_into_account_after_clearing_the_cache(self):
+        calendar = self.add_weekday_calendar()
+        start, finish = datetime.date(2020, 1, 1), datetime.date(2020, 1, 31)
+        assert subject.count_working_days(start, finish, calendar) == 23
+        calendar.WorkingTimes[0].RecurrencePattern.WeekdayComponent = [1, 2, 3, 4]
+        subject.clear_calendar_cache()
+        assert subject.count_working_days(start, finish, calendar) == 18
+
+
+class TestGetCompiledCalendar(CalendarTest):
+    def test_calendars_are_compiled_once_per_file(self):
+        calendar = self.add_weekday_calendar()
+        assert subject.get_compiled_calendar(calendar) is subject.get_compiled_calendar(calendar)
+
+    def test_unrelated_writes_keep_the_compiled_calendars_of_a_file(self):
+        calendar = self.add_weekday_calendar()
+        compiled = subject.get_compiled_calendar(calendar)
+        self.file.createIfcPerson()
+        assert subject.get_compiled_calendar(calendar) is compiled
+
+    def test_calendar_edits_discard_the_compiled_calendars(self):
+        calendar = self.add_weekday_calendar()
+        compiled = subject.get_compiled_calendar(calendar)
+        ifcopenshell.api.sequence.edit_work_calendar(self.file, work_calendar=calendar, attributes={"Name": "Foo"})
+        assert subject.get_compiled_calendar(calendar) is not compiled
+
+    def test_cascading_a_schedule_compiles_each_calendar_once(self, monkeypatch):
+        calendar = self.add_weekday_calendar()
+        work_schedule = ifcopenshell.api.sequence.add_work_schedule(self.file)
+        tasks = []
+        for i in range(5):
+            task = ifcopenshell.api.sequence.add_task(self.file, work_schedule=work_schedule)
+            task_time = ifcopenshell.api.sequence.add_task_time(self.file, task=task)
+            ifcopenshell.api.sequence.edit_task_time(
+                self.file,
+                task_time=task_time,
+                attributes={"ScheduleStart": datetime.date(2020, 1, 1), "ScheduleDuration": "P5D"},
+            )
+            ifcopenshell.api.control.assign_control(self.file, relating_control=calendar, related_objects=[task])
+            if tasks:
+                ifcopenshell.api.sequence.assign_sequence(self.file, relating_process=tasks[-1], related_process=task)
+            tasks.append(task)
+        subject.clear_calendar_cache()
+
+        compiled = []
+        compiled_calendar = subject.CompiledCalendar
+
+        def count_compilations(calendar):
+            compiled.append(calendar)
+            return compiled_calendar(calendar)
+
+        monkeypatch.setattr(subject, "CompiledCalendar", count_compilations)
+        ifcopenshell.api.sequence.cascade_schedule(self.file, task=tasks[0])
+        assert compiled == [calendar]
+        assert tasks[-1].TaskTime.ScheduleFinish == "2020-02-03T17:00:00"
+
+    def test_compiled_calendars_do_not_keep_files_alive(self):
+        calendar = self.add_weekday_calendar()
+        subject.get_compiled_calendar(calendar)
+        assert len(subject.compiled_calendars) == 1
+        del calendar
+        self.file = None
+        assert len(subject.compiled_calendars) == 0
@@ -0,0 +1,96 @@
+# IfcOpenShell - IFC toolkit and geometry engine
+# Copyright (C) 2022 Dion Moult <dion@thinkmoult.com>
+#
+# This file is part of IfcOpenShell.
+#
+# IfcOpenShell is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# IfcOpenShell is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with IfcOpenShell.  If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+import pytest
+import ifcopenshell.util.shape as subject
+
+
+class Geometry:
+    def __init__(self, vertices, faces):
+        self.verts_buffer = np.array(vertices, dtype="d").tobytes()
+        self.faces_buffer = np.array(faces, dtype="i").tobytes()
+        self.verts = tuple(np.array(vertices, dtype="d").ravel())
+        self.faces = tuple(np.array(faces, dtype="i").ravel())
+
+
+def create_box(x: float, y: float, z: float) -> Geometry:
+    vertices = [(0, 0, 0), (x, 0, 0), (x, y, 0), (0, y, 0), (0, 0, z), (x, 0, z), (x, y, z), (0, y, z)]
+    faces = [
+        (0, 2, 1), (0, 3, 2), (4, 5, 6), (4, 6, 7), (0, 1, 5), (0, 5, 4),
+        (1, 2, 6), (1, 6, 5), (2, 3, 7), (2, 7, 6), (3, 0, 4), (3, 4, 7),
+    ]  # fmt: skip
+    return Geometry(vertices, faces)
+
+
+def create_boxes() -> list[Geometry]:
+    boxes = [create_box(1.0, 2.0, 3.0), Geometry([], []), create_box(0.5, 4.0, 0.25)]
+    # A box away from the origin, as volumes are summed from tetrahedra to the origin
+    vertices = np.frombuffer(create_box(2.0, 2.0, 2.0).verts_buffer, "d").reshape(-1, 3) + (10.0, -5.0, 3.0)
+    boxes.append(Geometry(vertices, np.frombuffer(boxes[0].faces_buffer, "i").reshape(-1, 3)))
+    return boxes
+
+
+class TestGetArea:
+    def test_run(self):
+        assert subject.get_area(create_box(1.0, 2.0, 3.0)) == pytest.approx(22.0)
+
+    def test_many_geometries(self):
+        boxes = create_boxes()
+        assert subject.get_areas(boxes) == pytest.approx([22.0, 0.0, 6.25, 24.0])
+        assert subject.get_areas(boxes) == pytest.approx([subject.get_area(box) for box in boxes])
+        assert subject.get_areas([]) == []
+
+
+class TestGetVolume:
+    def test_run(self):
+        assert subject.get_volume(create_box(1.0, 2.0, 3.0)) == pytest.approx(6.0)
+
+    def test_many_geometries(self):
+        boxes = create_boxes()
+        assert subject.get_volumes(boxes) == pytest.approx([6.0, 0.0, 0.5, 8.0])
+        assert subject.get_volumes(boxes) == pytest.approx([subject.get_volume(box) for box in boxes])
+        assert subject.get_volumes([]) == []
+
+
+class TestGetSideArea:
+    def test_run(self):
+        box = create_box(1.0, 2.0, 3.0)
+        assert subject.get_side_area(box, axis="X") == pytest.approx(6.0)
+        assert subject.get_side_area(box, axis="Y") == pytest.approx(3.0)
+        assert subject.get_side_area(box, axis="Z") == pytest.approx(2.0)
+        assert subject.get_max_side_area(box) == pytest.approx(6.0)
+
+    def test_many_geometries(self):
+        boxes = [create_box(1.0, 2.0, 3.0), Geometry([], []), create_box(2.0, 2.0, 2.0)]
+        assert subject.get_side_areas(boxes, axis="Y") == pytest.approx([3.0, 0.0, 4.0])
+        assert subject.get_max_side_areas(boxes) == pytest.approx([6.0, 0.0, 4.0])
+
+
+class TestGetFootprintArea:
+    def test_run(self):
+        box = create_box(1.0, 2.0, 3.0)
+        assert subject.get_footprint_area(box) == pytest.approx(2.0)
+        assert subject.get_footprint_area(box, axis="X") == pytest.approx(6.0)
+        assert subject.get_footprint_area(box, direction=(0.0, 0.0, -1.0)) == pytest.approx(2.0)
+        assert subject.get_footprint_area(box, direction=(1.0, 0.0, 1.0)) == pytest.approx(8.0 / np.sqrt(2))
+
+    def test_many_geometries(self):
+        boxes = [create_box(1.0, 2.0, 3.0), Geometry([], []), create_box(2.0, 2.0, 2.0)]
+        assert subject.get_footprint_areas(boxes) == pytest.approx([2.0, 0.0, 4.0])
+        assert subject.get_footprint_areas([]) == []
@@ -96,6 +96,15 @@ class TestIsAttrType(test.bootstrap.IFC4):
         assert not subject.is_attr_type(nominal_value, "IfcLengthMeasure", include_select_types=False)
 
 
+class TestGetAttributesPerType(test.bootstrap.IFC4):
+    def test_run(self):
+        attributes = subject.get_attributes_per_type("IFC4", "IfcCartesianPointList3D", "IfcLengthMeasure")
+        assert [(i, a.name()) for i, a in attributes] == [(0, "CoordList")]
+        attributes = subject.get_attributes_per_type("IFC4", "IfcPropertySingleValue", "IfcLengthMeasure")
+        assert [(i, a.name()) for i, a in attributes] == [(2, "NominalValue")]
+        assert subject.get_attributes_per_type("IFC4", "IfcWall", "IfcLengthMeasure") == ()
+
+
 class TestConvertFileLengthUnits(test.bootstrap.IFC4):
     def test_run(self):
         ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcProject")
@@ -104,6 +113,31 @@ class TestConvertFileLengthUnits(test.bootstrap.IFC4):
         output = subject.convert_file_length_units(self.file, target_units="METER")
         assert subject.get_full_unit_name(subject.get_project_unit(output, "LENGTHUNIT")) == "METRE"
 
+    def test_converting_values(self):
+        ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcProject")
+        unit = ifcopenshell.api.unit.add_si_unit(self.file, unit_type="LENGTHUNIT", prefix="MILLI")
+        ifcopenshell.api.unit.assign_unit(self.file, units=[unit])
+        point = self.file.createIfcCartesianPoint((1000.0, 2000.0, 3000.0))
+        point_list = self.file.createIfcCartesianPointList3D(((0.0, 0.0, 0.0), (1000.0, 500.0, 250.0)))
+        prop = self.file.createIfcPropertySingleValue("Width", NominalValue=self.file.createIfcLengthMeasure(1500.0))
+        label = self.file.createIfcPropertySingleValue("Label", NominalValue=self.file.createIfcLabel("1000"))
+        output = subject.convert_file_length_units(self.file, target_units="METER")
+        assert output.by_id(point.id()).Coordinates == (1.0, 2.0, 3.0)
+        assert output.by_id(point_list.id()).CoordList == ((0.0, 0.0, 0.0), (1.0, 0.5, 0.25))
+        assert output.by_id(prop.id()).NominalValue.wrappedValue == 1.5
+        assert output.by_id(label.id()).NominalValue.wrappedValue == "1000"
+        assert point.Coordinates == (1000.0, 2000.0, 3000.0)
+
+    def test_converting_in_place(self):
+        ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcProject")
+        unit = ifcopenshell.api.unit.add_si_unit(self.file, unit_type="LENGTHUNIT", prefix="MILLI")
+        ifcopenshell.api.unit.assign_unit(self.file, units=[unit])
+        point_list = self.file.createIfcCartesianPointList3D(((0.0, 0.0, 0.0), (1000.0, 500.0, 250.0)))
+        output = subject.convert_file_length_units(self.file, target_units="METER", in_place=True)
+        assert output is self.file
+        assert subject.get_full_unit_name(subject.get_project_unit(self.file, "LENGTHUNIT")) == "METRE"
+        assert point_list.CoordList == ((0.0, 0.0, 0.0), (1.0, 0.5, 0.25))
+
     def test_converting_map_conversion_if_there_is_no_map_unit(self):
         ifcopenshell.api.root.create_entity(self.file, ifc_class="IfcProject")
         unit = ifcopenshell.api.unit.add_si_unit(self.file, unit_type="LENGTHUNIT", prefix="MILLI")
@@ -57,15 +57,14 @@ class Patcher:
     def patch(self):
         for filepath in self.filepath:
             if isinstance(filepath, ifcopenshell.file):
-                other = filepath
+                self.merge(filepath)
             else:
-                other = ifcopenshell.open(filepath)
+                # The file is only used for merging, so it is safe to modify.
+                self.merge(ifcopenshell.open(filepath), is_temporary=True)
 
-            self.merge(other)
-
-    def merge(self, other):
+    def merge(self, other, is_temporary=False):
         if (main_unit := self.get_unit_name(self.file)) != self.get_unit_name(other):
-            other = ifcopenshell.util.unit.convert_file_length_units(other, main_unit)
+            other = ifcopenshell.util.unit.convert_file_length_units(other, main_unit, in_place=is_temporary)
 
         existing_origin = np.array(
             ifcopenshell.util.geolocation.auto_xyz2enh(self.file, 0, 0, 0, should_return_in_map_units=False)
@@ -77,5 +77,6 @@ class Patcher:
             print("Replaced %s duplicate GlobalIds" % duplicates)
             print("Replaced %s invalid GlobalIds" % invalid_ids)
         else:
-            for element in self.file.by_type("IfcRoot"):
-                element.GlobalId = ifcopenshell.guid.new()
+            elements = self.file.by_type("IfcRoot")
+            for element, global_id in zip(elements, ifcopenshell.guid.new_many(len(elements))):
+                element.GlobalId = global_id
@@ -1,12 +1,14 @@
 import collections
+import hashlib
 import os
+import re
 import shutil
 import traceback
 import sys
 
 from fastapi import HTTPException, status, APIRouter, Request, Depends
-from fastapi import UploadFile, Form
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi import BackgroundTasks, UploadFile, Form
+from fastapi.responses import FileResponse, HTMLResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.encoders import jsonable_encoder
 
@@ -29,6 +31,74 @@ router = APIRouter(route_class=LoggingRoute)
 
 templates = Jinja2Templates(directory="templates")
 
+# Documents may be several gigabytes, so they are streamed to and from disk in
+# chunks rather than being held in memory.
+CHUNK_SIZE = 1 << 20
+
+
+def append_file(destination, source_path):
+    # Copy in the kernel where possible, otherwise in chunks.
+    with open(source_path, "rb") as source:
+        if not hasattr(os, "sendfile"):
+            shutil.copyfileobj(source, destination, CHUNK_SIZE)
+            return
+        destination.flush()
+        offset = 0
+        size = os.fstat(source.fileno()).st_size
+        while offset < size:
+            try:
+                sent = os.sendfile(destination.fileno(), source.fileno(), offset, size - offset)
+            except OSError:
+                # Not every file system supports sendfile, so copy the rest.
+                source.seek(offset)
+                shutil.copyfileobj(source, destination, CHUNK_SIZE)
+                return
+            if not sent:
+                break
+            offset += sent
+
+
+def iter_file(path, start, length):
+    with open(path, "rb") as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def ranged_file_response(request: Request, path: str, media_type: str, filename: str):
+    # Supports a single byte range, so that large downloads may be resumed or
+    # fetched in parallel. Anything else is answered with the whole file.
+    size = os.path.getsize(path)
+    match = re.fullmatch(r"bytes=(\d*)-(\d*)", request.headers.get("range", "").strip())
+    if not match or match.group(1) == match.group(2) == "":
+        return FileResponse(path, media_type=media_type, filename=filename, headers={"Accept-Ranges": "bytes"})
+    if match.group(1) == "":
+        start = max(0, size - int(match.group(2)))
+        end = size - 1
+    else:
+        start = int(match.group(1))
+        end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE, headers={"Content-Range": f"bytes */{size}"}
+        )
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Range": f"bytes {start}-{end}/{size}",
+        "Content-Length": str(end - start + 1),
+        "Content-Disposition": f'attachment; filename="{filename}"',
+    }
+    return StreamingResponse(
+        iter_file(path, start, end - start + 1),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=media_type,
+        headers=headers,
+    )
+
 
 ################################################################
 # DOCUMENTS API UPLOAD FLOW
@@ -230,37 +300,44 @@ async def upload_part(part_id: str, request: Request, current_user: User = Depen
     # and get the document_id of the part
     document = doc_db.user_has_part(part_id, current_user)
 
-    request_body = await request.body()
-
     if document:
 
-        # try to receive the uploaded part
-        try:
-            print("File contents: ", request_body)
-
-            # use document_id instead as dir_name
-            # dir_name = doc_db.safe_path(document.document_id)
-            dir_name = document.document_id
+        # use document_id instead as dir_name
+        # dir_name = doc_db.safe_path(document.document_id)
+        dir_name = document.document_id
 
-            path = "./data/document_parts/" + dir_name + "/"
+        path = "./data/document_parts/" + dir_name + "/"
 
-            if not os.path.exists(path):
-                os.makedirs(path)
+        if not os.path.exists(path):
+            os.makedirs(path)
 
-            with open(path + file_name, "wb") as f:
-                f.write(request_body)
+        # try to receive the uploaded part, streaming it to disk and hashing it as it arrives,
+        # and only keep the part if it was completely received
+        part_hash = hashlib.sha256()
+        try:
+            with open(path + file_name + ".tmp", "wb") as f:
+                async for chunk in request.stream():
+                    part_hash.update(chunk)
+                    f.write(chunk)
+            os.replace(path + file_name + ".tmp", path + file_name)
 
         except Exception:
             print("Error uploading file")
             print(traceback.format_exc())
             print("Error uploading file")
             print(sys.exc_info()[2])
+            if os.path.exists(path + file_name + ".tmp"):
+                os.remove(path + file_name + ".tmp")
+            raise HTTPException(status_code=400, detail="Part could not be uploaded.")
 
-        finally:
-            # We will write to the database, information about part successfully uploaded.
-            doc_db.mark_part_as_uploaded(part_id, current_user)
+        # We will write to the database, information about part successfully uploaded.
+        doc_db.mark_part_as_uploaded(part_id, current_user, part_hash.hexdigest())
 
-        doc_db.debug(endpoint="upload-part", request={"part_id": part_id}, response={"uploaded": True})
+        doc_db.debug(
+            endpoint="upload-part",
+            request={"part_id": part_id},
+            response={"uploaded": True, "sha256": part_hash.hexdigest()},
+        )
 
         return {"message": f"Successfully uploaded part {file_name}"}
 
@@ -321,18 +398,23 @@ def upload_completion(
     new_doc_path = "./data/documents/"
     new_doc_path_name = new_doc_path + document.file_description.name
 
-    # Read parts and write to temp doc.
-    with open(temp_doc_file_name, "ab") as temp_doc:
-        for part in parts:
-            part = doc_db.safe_path(part)
-            with open(temp_doc_path + part, "rb") as part_doc:
-                temp_doc.write(part_doc.read())
+    # The first part becomes the temp doc, and the remaining parts are appended to it.
+    parts = [doc_db.safe_path(part) for part in parts]
+    if parts:
+        os.replace(temp_doc_path + parts[0], temp_doc_file_name)
+    else:
+        open(temp_doc_file_name, "wb").close()
+    # Not opened for appending, which the kernel can not copy to.
+    with open(temp_doc_file_name, "r+b") as temp_doc:
+        temp_doc.seek(0, os.SEEK_END)
+        for part in parts[1:]:
+            append_file(temp_doc, temp_doc_path + part)
 
     # move document to new location in documents dir
     os.rename(temp_doc_file_name, new_doc_path_name)
 
     # remove temp parts
-    for part in parts:
+    for part in parts[1:]:
         os.remove(temp_doc_path + part)
 
     # remove temp path
@@ -633,15 +715,15 @@ def document_version_metadata(
 
 @router.get("/documents/1.0/document/{document_id}/version/{version_index}/download", tags=[""])
 def document_version_download(
-    document_id: str, version_index: int, current_user: User = Depends(get_current_active_user)
-) -> FileResponse:
+    request: Request, document_id: str, version_index: int, current_user: User = Depends(get_current_active_user)
+) -> Union[FileResponse, StreamingResponse]:
     # The url to download the binary content of this document version.
     # May either directly return the result or redirect to a storage provider
     keep_characters = (" ", ".", "_", "-")
     document_id = "".join(c for c in document_id if c.isalnum() or c in keep_characters).rstrip()
     file_location = "./data/documents/" + document_id + ".ifc"
-    return FileResponse(
-        file_location, media_type="application/x-step", filename="6dbd4d52-14db-11ee-be56-0242ac120002.ifc"
+    return ranged_file_response(
+        request, file_location, media_type="application/x-step", filename="6dbd4d52-14db-11ee-be56-0242ac120002.ifc"
     )
 
 
@@ -732,7 +814,10 @@ def document_version_details(
 
 @router.post("/documents/1.0/upload_file_to_project", tags=[""])
 async def upload_documents_post(
-    file: UploadFile, project: str = Form(...), selection_session: str = Form(...)
+    background_tasks: BackgroundTasks,
+    file: UploadFile,
+    project: str = Form(...),
+    selection_session: str = Form(...),
 ) -> Document:
 
     # Get the file size (in bytes)
@@ -782,12 +867,13 @@ async def upload_documents_post(
     upload_directory = "./data/documents/"
     destination_path = os.path.join(upload_directory, name)
     with open(destination_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+        shutil.copyfileobj(file.file, buffer, CHUNK_SIZE)
 
     # create database record
     inserted_document = doc_db.create_node_for_uploaded_file(selection_session, project, document_version_model)
     print("Created node for document id: " + str(inserted_document.document_id))
-    doc_db.create_ifc_graph_for_document(inserted_document.document_id)
+    # Parsing the IFC and building its graph may take a long time, so is done after responding
+    background_tasks.add_task(doc_db.create_ifc_graph_for_document, inserted_document.document_id)
 
     # return document version of database record
     return inserted_document
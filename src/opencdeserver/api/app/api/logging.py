@@ -1,5 +1,5 @@
 from fastapi import FastAPI, APIRouter, Response, Request
-from starlette.background import BackgroundTask
+from starlette.background import BackgroundTask, BackgroundTasks
 from starlette.responses import StreamingResponse
 from fastapi.routing import APIRoute
 from starlette.types import Message
@@ -13,32 +13,55 @@ def log_info(req_body, res_body, route_url):
     logging.info("response:" + route_url + ":" + str(res_body))
 
 
+# Uploaded and downloaded files may be too large to hold in memory, so are not logged.
+def is_file_content(media_type):
+    media_type = (media_type or "").split(";")[0].strip().lower()
+    return not (
+        media_type.startswith("text/") or media_type in ("application/json", "application/x-www-form-urlencoded")
+    )
+
+
+def add_background_task(response, task):
+    # Keep any background tasks of the route, such as creating an IFC graph.
+    if response.background is None:
+        response.background = task
+    else:
+        response.background = BackgroundTasks([response.background, task])
+
+
 class LoggingRoute(APIRoute):
     def get_route_handler(self) -> Callable:
         original_route_handler = super().get_route_handler()
 
         async def custom_route_handler(request: Request) -> Response:
-            req_body = await request.body()
+            if is_file_content(request.headers.get("content-type")) and request.method in ("POST", "PUT"):
+                req_body = "<not logged>"
+            else:
+                req_body = await request.body()
             response = await original_route_handler(request)
             route_url = str(request.url)
-            if isinstance(response, StreamingResponse):
+            if isinstance(response, StreamingResponse) and is_file_content(response.media_type):
+                add_background_task(response, BackgroundTask(log_info, req_body, "<not logged>", route_url))
+                return response
+            elif isinstance(response, StreamingResponse):
                 res_body = b""
                 async for item in response.body_iterator:
                     res_body += item
-                task = BackgroundTask(log_info, req_body, res_body, route_url)
-                return Response(
+                buffered_response = Response(
                     content=res_body,
                     status_code=response.status_code,
                     headers=dict(response.headers),
                     media_type=response.media_type,
-                    background=task,
+                    background=response.background,
                 )
+                add_background_task(buffered_response, BackgroundTask(log_info, req_body, res_body, route_url))
+                return buffered_response
             else:
                 if hasattr(response, "body"):
                     res_body = response.body
                 else:
                     res_body = {"no response": True}
-                response.background = BackgroundTask(log_info, req_body, res_body, route_url)
+                add_background_task(response, BackgroundTask(log_info, req_body, res_body, route_url))
                 return response
 
         return custom_route_handler
@@ -0,0 +1,107 @@
+# Compares loading an IFC graph node by node using create_full_graph against
+# the batched UNWIND statements of load_full_graph.
+#
+# Without a Neo4j URI, both are run against an in-memory stand-in for the
+# graph, which measures the time spent preparing the graph and counts round
+# trips to the database. Both graphs are checked to be the same, other than
+# the Root label which py2neo adds to the nodes merged by create_full_graph.
+#
+# With a Neo4j URI, each loader writes to its own (empty) database.
+#
+# Usage: python benchmark_ifcgraph.py /path/to/model.ifc [neo4j://uri user password reference_db bulk_db]
+
+import contextlib
+import io
+import re
+import sys
+import time
+import ifcopenshell
+from py2neo import Graph
+from ifcgraph import create_full_graph, load_full_graph
+
+
+LABELS = r"((?::`?\w+`?)*)"
+NODE_QUERY = re.compile(rf"UNWIND \$rows AS row MERGE \(n{LABELS} \{{id: row.id\}}\)(?: SET n{LABELS})? SET n \+= row")
+RELATIONSHIP_QUERY = re.compile(
+    rf"UNWIND \$rows AS row MERGE \(a{LABELS} \{{id: row.start\}}\) MERGE \(b{LABELS} \{{id: row.end\}}\) "
+    rf"MERGE \(a\)-\[:`?(\w+)`?\]->\(b\)"
+)
+
+
+def get_labels(labels):
+    return re.findall(r":`?(\w+)`?", labels or "")
+
+
+class MemoryGraph:
+    def __init__(self):
+        self.nodes = {}
+        self.relationships = set()
+        self.statements = 0
+
+    def merge_node(self, labels, properties):
+        node = self.nodes.setdefault(properties["id"], [set(), {}])
+        node[0].update(labels)
+        node[1].update(properties)
+
+    def merge(self, subgraph):
+        self.statements += 1
+        for node in subgraph.nodes:
+            self.merge_node({node.__primarylabel__, *node.labels}, dict(node))
+        for relationship in subgraph.relationships:
+            start, end = relationship.start_node["id"], relationship.end_node["id"]
+            self.relationships.add((type(relationship).__name__, start, end))
+
+    def run(self, cypher, rows=()):
+        self.statements += 1
+        if cypher.startswith("CREATE INDEX"):
+            return
+        elif match := RELATIONSHIP_QUERY.fullmatch(cypher):
+            start_labels, end_labels, relationship_type = match.groups()
+            for row in rows:
+                self.merge_node(get_labels(start_labels), {"id": row["start"]})
+                self.merge_node(get_labels(end_labels), {"id": row["end"]})
+                self.relationships.add((relationship_type, row["start"], row["end"]))
+        elif match := NODE_QUERY.fullmatch(cypher):
+            labels = get_labels(match.group(1)) + get_labels(match.group(2))
+            for row in rows:
+                self.merge_node(labels, row)
+        else:
+            raise ValueError(f"Unexpected statement: {cypher}")
+
+    def summary(self, ignored_labels=()):
+        # Type values get random ids, so are only compared by count.
+        nodes = {
+            k: (v[0] - set(ignored_labels), {p: str(x) for p, x in v[1].items()})
+            for k, v in self.nodes.items()
+            if isinstance(k, int)
+        }
+        relationships = {r for r in self.relationships if isinstance(r[1], int) and isinstance(r[2], int)}
+        return len(self.nodes), len(self.relationships), nodes, relationships
+
+
+def run(path, reference_graph=None, bulk_graph=None):
+    f = ifcopenshell.open(path)
+    print(f"{len(f.wrapped_data.entity_names())} entities")
+
+    reference = reference_graph or MemoryGraph()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        create_full_graph(reference, f)
+    print(f"create_full_graph: {time.perf_counter() - start:.2f}s")
+
+    bulk = bulk_graph or MemoryGraph()
+    start = time.perf_counter()
+    statements = load_full_graph(bulk, f)
+    print(f"load_full_graph: {time.perf_counter() - start:.2f}s, {statements} statements")
+
+    if reference_graph is None:
+        print(f"create_full_graph: {reference.statements} statements")
+        assert reference.summary(ignored_labels={"Root"}) == bulk.summary()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        uri, auth = sys.argv[2], (sys.argv[3], sys.argv[4])
+        run(sys.argv[1], Graph(uri, auth=auth, name=sys.argv[5]), Graph(uri, auth=auth, name=sys.argv[6]))
+    else:
+        run(sys.argv[1])
@@ -21,9 +21,12 @@
 from py2neo.data import Node, Relationship
 from uuid import uuid4
 import ifcopenshell
+import ifcopenshell.ifcopenshell_wrapper
 import ifcopenshell.util.schema
 from py2neo import Graph
 
+BATCH_SIZE = 10000
+
 
 # Create the basic node with literal attributes and the class hierarchy
 def create_pure_node_from_ifc_entity(ifc_entity, ifc_file, hierarchy=True):
@@ -35,9 +38,10 @@ def create_pure_node_from_ifc_entity(ifc_entity, ifc_file, hierarchy=True):
     node["name"] = ifc_entity.is_a()
     if hierarchy:
         node.add_label(ifc_entity.is_a())
-        declaration = ifcopenshell.util.schema.get_declaration(ifc_entity)
-        for supertype in ifcopenshell.util.schema.get_supertypes(declaration):
-            node.add_label(supertype.name())
+        # Type values, such as IfcLabel in a select, have no supertypes
+        if declaration := ifcopenshell.util.schema.get_declaration(ifc_entity):
+            for supertype in ifcopenshell.util.schema.get_supertypes(declaration):
+                node.add_label(supertype.name())
     else:
         node.add_label(ifc_entity.is_a())
     attributes_type = ["ENTITY INSTANCE", "AGGREGATE OF ENTITY INSTANCE", "DERIVED"]
@@ -89,3 +93,189 @@ def create_full_graph(graph, ifc_file):
         create_graph_from_ifc_entity_all(graph, entity, ifc_file)
         idx += 1
     return
+
+
+# Bulk loading
+#
+# Rather than merging each node and relationship separately, the graph is
+# streamed as rows which are merged in batches using UNWIND. Labels and
+# relationship types cannot be parameterised in Cypher, so rows are batched
+# per set of labels and per relationship type and class of the related
+# nodes. Nodes are merged by their class and id, so an index on the id is
+# created for each class. Node labels, attribute types and inverse
+# attributes are looked up once per class.
+
+
+class GraphExporter:
+    def __init__(self, ifc_file):
+        self.ifc_file = ifc_file
+        self.schema = ifcopenshell.ifcopenshell_wrapper.schema_by_name(ifc_file.schema_identifier)
+        self.labels = {}
+        self.attributes = {}
+        self.inverses = {}
+        for entity in self.schema.entities():
+            # Only inverse attributes declared by the entity, not its supertypes
+            supertype = entity.supertype()
+            inherited = {i.name() for i in supertype.all_inverse_attributes()} if supertype else set()
+            for inverse in entity.all_inverse_attributes():
+                if inverse.name() in inherited:
+                    continue
+                key = (inverse.entity_reference().name(), inverse.attribute_reference().name())
+                self.inverses.setdefault(key, []).append((entity.name(), inverse.name()))
+
+    def get_labels(self, ifc_entity):
+        ifc_class = ifc_entity.is_a()
+        if (labels := self.labels.get(ifc_class)) is None:
+            labels = [ifc_class]
+            if declaration := ifcopenshell.util.schema.get_declaration(ifc_entity):
+                labels.extend(supertype.name() for supertype in ifcopenshell.util.schema.get_supertypes(declaration))
+            labels = self.labels[ifc_class] = tuple(labels)
+        return labels
+
+    def get_attributes(self, ifc_entity):
+        # Returns (index, name, argument type, inverses) per attribute, where
+        # inverses are (class, inverse attribute name) pairs which point back
+        # to the entity from the referenced entities.
+        ifc_class = ifc_entity.is_a()
+        if (attributes := self.attributes.get(ifc_class)) is None:
+            classes = self.get_labels(ifc_entity)
+            attributes = []
+            for i in range(len(ifc_entity)):
+                name = ifc_entity.wrapped_data.get_argument_name(i)
+                inverses = [inverse for c in classes for inverse in self.inverses.get((c, name), ())]
+                attributes.append((i, name, ifc_entity.wrapped_data.get_argument_type(i), inverses))
+            attributes = self.attributes[ifc_class] = attributes
+        return attributes
+
+    def create_node(self, ifc_entity):
+        # Equivalent to create_pure_node_from_ifc_entity
+        properties = {"id": ifc_entity.id() or str(uuid4()), "name": ifc_entity.is_a()}
+        for i, name, argument_type, _ in self.get_attributes(ifc_entity):
+            if argument_type not in ("ENTITY INSTANCE", "AGGREGATE OF ENTITY INSTANCE", "DERIVED"):
+                value = ifc_entity.wrapped_data.get_argument(i)
+                if value is None:
+                    continue
+                elif isinstance(value, tuple) and value and isinstance(value[0], tuple):
+                    # Neo4j properties cannot be nested lists
+                    value = str(value)
+                properties[name] = value
+        return self.get_labels(ifc_entity), properties
+
+    def get_node_id(self, ifc_entity, nodes):
+        if entity_id := ifc_entity.id():
+            return entity_id
+        # Type values (e.g. IfcLabel in a select) get a node per use
+        labels, properties = self.create_node(ifc_entity)
+        nodes.append((labels, properties))
+        return properties["id"]
+
+    def export_entity(self, ifc_entity):
+        """Returns the nodes and relationships of an entity
+
+        Nodes are (labels, properties) and relationships are (type, start
+        class, start id, end class, end id), equivalent to
+        create_graph_from_ifc_entity_all.
+        """
+        nodes = [self.create_node(ifc_entity)]
+        relationships = {}
+        entity_id = ifc_entity.id()
+        ifc_class = ifc_entity.is_a()
+        is_project = ifc_class == "IfcProject"
+        for i, name, argument_type, inverses in self.get_attributes(ifc_entity):
+            if argument_type == "ENTITY INSTANCE":
+                if not (value := ifc_entity[i]):
+                    continue
+                elif value.is_a() == "IfcOwnerHistory" and not is_project:
+                    continue
+                values = (value,)
+            elif argument_type == "AGGREGATE OF ENTITY INSTANCE":
+                if not (values := ifc_entity[i]):
+                    continue
+            else:
+                continue
+            for value in values:
+                value_class = value.is_a()
+                relationships[(name, ifc_class, entity_id, value_class, self.get_node_id(value, nodes))] = None
+                if value.id():
+                    # Inverse relationships are found from the forward
+                    # attribute, rather than calling get_inverse() for each
+                    # inverse attribute of every entity.
+                    for inverse_class, inverse_name in inverses:
+                        if value.is_a(inverse_class):
+                            relationships[(inverse_name, value_class, value.id(), ifc_class, entity_id)] = None
+        return nodes, list(relationships)
+
+    def export(self):
+        """Yields the nodes and relationships of all entities in the file"""
+        for entity_id in self.ifc_file.wrapped_data.entity_names():
+            yield self.export_entity(self.ifc_file.by_id(entity_id))
+
+
+def get_index_query(ifc_class):
+    return f"CREATE INDEX IF NOT EXISTS FOR (n:`{ifc_class}`) ON (n.id)"
+
+
+def get_node_query(labels):
+    # The first label is the class, which with the id identifies the node
+    query = f"UNWIND $rows AS row MERGE (n:`{labels[0]}` {{id: row.id}})"
+    if supertypes := "".join(f":`{label}`" for label in labels[1:]):
+        query += f" SET n{supertypes}"
+    return query + " SET n += row"
+
+
+def get_relationship_query(key):
+    relationship_type, start_class, end_class = key
+    return (
+        "UNWIND $rows AS row "
+        f"MERGE (a:`{start_class}` {{id: row.start}}) "
+        f"MERGE (b:`{end_class}` {{id: row.end}}) "
+        f"MERGE (a)-[:`{relationship_type}`]->(b)"
+    )
+
+
+def load_full_graph(graph, ifc_file, batch_size=BATCH_SIZE):
+    """Bulk equivalent of create_full_graph
+
+    :param graph: Anything which runs Cypher with parameters as keyword
+        arguments, such as a py2neo Graph or a neo4j Session.
+    :param batch_size: The number of rows merged per statement.
+    :return: The number of statements which were run.
+    """
+    total_statements = 0
+    indexed_classes = set()
+    node_batches = {}
+    relationship_batches = {}
+
+    def index(ifc_class):
+        # Merging by id is only fast with an index
+        nonlocal total_statements
+        if ifc_class not in indexed_classes:
+            indexed_classes.add(ifc_class)
+            graph.run(get_index_query(ifc_class))
+            total_statements += 1
+
+    def flush(batches, get_query, key):
+        nonlocal total_statements
+        graph.run(get_query(key), rows=batches.pop(key))
+        total_statements += 1
+
+    for nodes, relationships in GraphExporter(ifc_file).export():
+        for labels, properties in nodes:
+            index(labels[0])
+            rows = node_batches.setdefault(labels, [])
+            rows.append(properties)
+            if len(rows) >= batch_size:
+                flush(node_batches, get_node_query, labels)
+        for relationship_type, start_class, start, end_class, end in relationships:
+            index(start_class)
+            index(end_class)
+            key = (relationship_type, start_class, end_class)
+            rows = relationship_batches.setdefault(key, [])
+            rows.append({"start": start, "end": end})
+            if len(rows) >= batch_size:
+                flush(relationship_batches, get_relationship_query, key)
+    for labels in list(node_batches):
+        flush(node_batches, get_node_query, labels)
+    for key in list(relationship_batches):
+        flush(relationship_batches, get_relationship_query, key)
+    return total_statements
@@ -0,0 +1,69 @@
+import ifcopenshell
+import ifcopenshell.guid
+from ifcgraph import GraphExporter, get_index_query, get_node_query, get_relationship_query, load_full_graph
+
+
+class RecordingGraph:
+    def __init__(self):
+        self.statements = []
+
+    def run(self, cypher, rows=None):
+        self.statements.append((cypher, rows))
+
+
+def create_file():
+    f = ifcopenshell.file(schema="IFC4")
+    storey = f.createIfcBuildingStorey(ifcopenshell.guid.new(), Name="Storey")
+    walls = [f.createIfcWall(ifcopenshell.guid.new(), Name=f"Wall {i}") for i in range(5)]
+    f.createIfcRelContainedInSpatialStructure(ifcopenshell.guid.new(), RelatedElements=walls, RelatingStructure=storey)
+    return f
+
+
+def test_node_query():
+    assert get_node_query(("IfcWall", "IfcBuildingElement", "IfcRoot")) == (
+        "UNWIND $rows AS row MERGE (n:`IfcWall` {id: row.id}) SET n:`IfcBuildingElement`:`IfcRoot` SET n += row"
+    )
+    assert get_node_query(("IfcLabel",)) == "UNWIND $rows AS row MERGE (n:`IfcLabel` {id: row.id}) SET n += row"
+
+
+def test_relationship_query():
+    assert get_relationship_query(("ContainedInStructure", "IfcWall", "IfcRelContainedInSpatialStructure")) == (
+        "UNWIND $rows AS row "
+        "MERGE (a:`IfcWall` {id: row.start}) "
+        "MERGE (b:`IfcRelContainedInSpatialStructure` {id: row.end}) "
+        "MERGE (a)-[:`ContainedInStructure`]->(b)"
+    )
+
+
+def test_index_query():
+    assert get_index_query("IfcWall") == "CREATE INDEX IF NOT EXISTS FOR (n:`IfcWall`) ON (n.id)"
+
+
+def test_loading_in_batches():
+    f = create_file()
+    graph = RecordingGraph()
+    total_statements = load_full_graph(graph, f, batch_size=2)
+    assert total_statements == len(graph.statements)
+
+    indexes = [cypher for cypher, rows in graph.statements if rows is None]
+    assert sorted(indexes) == [
+        get_index_query(ifc_class)
+        for ifc_class in ("IfcBuildingStorey", "IfcRelContainedInSpatialStructure", "IfcWall")
+    ]
+
+    batches = {}
+    for cypher, rows in graph.statements:
+        if rows is not None:
+            assert 0 < len(rows) <= 2
+            batches.setdefault(cypher, []).extend(rows)
+    wall_query = get_node_query(GraphExporter(f).get_labels(f.by_type("IfcWall")[0]))
+    assert sorted(row["Name"] for row in batches[wall_query]) == [f"Wall {i}" for i in range(5)]
+
+    rel = f.by_type("IfcRelContainedInSpatialStructure")[0]
+    related_elements = get_relationship_query(("RelatedElements", "IfcRelContainedInSpatialStructure", "IfcWall"))
+    contained_in_structure = get_relationship_query(
+        ("ContainedInStructure", "IfcWall", "IfcRelContainedInSpatialStructure")
+    )
+    walls = sorted(wall.id() for wall in f.by_type("IfcWall"))
+    assert sorted(row["end"] for row in batches[related_elements] if row["start"] == rel.id()) == walls
+    assert sorted(row["start"] for row in batches[contained_in_structure] if row["end"] == rel.id()) == walls
@@ -2,7 +2,7 @@ import os
 import math
 
 from uuid import UUID, uuid4
-from typing import Union
+from typing import Optional, Union
 
 from fastapi import HTTPException
 
@@ -14,9 +14,8 @@ from models.documents_common import *
 from models.documents_other import *
 
 import ifcopenshell
-from py2neo import Graph
 
-from ifcgraph.ifcgraph import create_full_graph
+from ifcgraph.ifcgraph import load_full_graph
 
 
 class DOCDB(MyDB):
@@ -138,8 +137,8 @@ class DOCDB(MyDB):
     def create_ifc_graph_for_document(self, document_id):
         document = self.get_document(document_id)
         my_ifc_file = ifcopenshell.open("./data/documents/" + document.file_description.name)
-        my_graph = Graph(os.environ["NEO4J_URI"], auth=(os.environ["NEO4J_USER"], os.environ["NEO4J_INITIAL_PASSWORD"]))
-        create_full_graph(my_graph, my_ifc_file)
+        with self.driver.session() as session:
+            load_full_graph(session, my_ifc_file)
 
     # ---- UPLOAD FUNCTIONS ----
 
@@ -504,16 +503,16 @@ class DOCDB(MyDB):
         with self.driver.session() as session:
             return session.execute_read(user_has_part_work)
 
-    def mark_part_as_uploaded(self, part_id: str, current_user: User) -> bool:
+    def mark_part_as_uploaded(self, part_id: str, current_user: User, sha256: Optional[str] = None) -> bool:
         def mark_part_as_uploaded_work(tx) -> bool:
             cypher = """
                 MATCH (u:User)-[r1:HAS]->(us:Session:Upload)-[r2:CONTAINS]->(d:Document)-[r3:HAS]->(p:Part)
                 WHERE u.username = $username
                     AND p.uuid = $part_id
-                SET p.uploaded = True
+                SET p.uploaded = True, p.sha256 = $sha256
             """
 
-            result = tx.run(cypher, username=current_user.username, part_id=part_id)
+            result = tx.run(cypher, username=current_user.username, part_id=part_id, sha256=sha256)
 
             summary = result.consume()
             if summary.counters.properties_set < 1: